@@ -32,6 +32,18 @@ IDLE_CHECK_INTERVAL = 300          # 5 minutes between idle recovery checks
 # GPU Acceleration
 GPU_TEMPLATE_MATCHING = True       # Use GPU (CUDA) for template matching (20x faster for large frames)
 
+# Coarse-to-fine template search: {template_name: scale} matches these templates
+# at 1/scale (2 or 4) to find candidates, then refines at full resolution around
+# them. Opt-in per template; validate with scripts/benchmarks/bench_pyramid.py.
+PYRAMID_TEMPLATES: dict[str, int] = {}
+
+# Template registry: seconds between mtime checks of a cached template
+# (edited templates are hot-reloaded); -1 disables the checks
+TEMPLATE_HOT_RELOAD_INTERVAL = 2.0
+# Serve templates from the memory-mapped pack in templates/pack/ when present
+# and fresh (build: python scripts/build_template_pack.py); PNGs otherwise
+TEMPLATE_PACK_ENABLED = True
+
 # Debug screenshots
 DEBUG_SCREENSHOTS_ENABLED = False  # Set to True to save debug screenshots (fills disk quickly!)
 
@@ -72,6 +84,53 @@ SANDSTORM_CAPTURE_ENABLED = True
 # thread - detection keeps running DURING flows instead of going blind. Set False
 # to fall back to the legacy inline per-iteration scanning.
 DETECTOR_THREAD_ENABLED = True
+# Dirty-tile reuse: the detector splits each frame into tiles of this size and
+# reuses a spec's last reading while every tile under its region is unchanged
+# (None disables). Reused readings are re-matched at least every
+# DETECTOR_MAX_REUSE_S seconds regardless.
+DETECTOR_TILE_SIZE: int | None = 64
+DETECTOR_MAX_REUSE_S = 5.0
+# Detector worker threads: >1 evaluates the specs of a tick concurrently
+# (tick time ~ slowest spec instead of the sum). Compare settings with
+# python -m scripts.benchmarks.bench_detector_workers
+DETECTOR_WORKERS = 1
+# Seconds of matching per detector tick: due specs are admitted by priority
+# within it and the rest carried over to the next tick (None = run them all)
+DETECTOR_TICK_BUDGET_S: float | None = 0.3
+# Native-scale perception: the detector's own (heartbeat) captures skip the
+# 4K upscale and are matched at capture resolution with downscaled templates;
+# readings stay in 4K coordinates. Check score drift first with
+# python -m scripts.benchmarks.bench_native_scale --validate
+DETECTOR_NATIVE_SCALE = False
+# FrameBus history: the last N published frames are kept (shared references,
+# ~25 MB each at 4K) for temporal readers - consensus OCR, vote histories -
+# so they reuse frames the process already captured instead of capturing.
+# The oldest are evicted beyond FRAME_BUS_MAX_MB.
+FRAME_BUS_HISTORY = 6
+FRAME_BUS_MAX_MB = 160.0
+# Mirror the newest bus frame into a shared-memory segment (utils/frame_shm.py)
+# so other processes - the dashboard screenshot endpoint, tools - read it
+# without a capture of their own. Costs one ~25 MB memcpy per published frame.
+FRAME_SHM_ENABLED = True
+FRAME_SHM_NAME = "xclash_frame_bus"
+# Capture buffers recycled per frame shape (utils/frame_pool.py); a buffer is
+# reused once nothing holds the frame. Must exceed FRAME_BUS_HISTORY plus the
+# frames held elsewhere (detector tick, action-capture writes, flows), or
+# captures fall back to fresh allocations (pool "misses" in the status).
+FRAME_POOL_SIZE = 12
+# Capture governor: a get_screenshot_cv2() call while the FrameBus holds a 4K
+# frame younger than this (s) returns that frame instead of capturing again.
+# get_screenshot_cv2(fresh=True) always captures; 0 disables the governor.
+CAPTURE_GOVERNOR_MAX_AGE = 0.1
+# OCR result cache (utils/ocr_client.py): a crop whose pixels, endpoint and
+# prompt match a read from the last OCR_CACHE_TTL seconds gets that result
+# instead of another VLM call. Consensus readers opt out (cache=False).
+# OCR_CACHE_SIZE = 0 disables it.
+OCR_CACHE_SIZE = 512
+OCR_CACHE_TTL = 600.0
+# Post-tap waits via frame_bus.settle(): proceed as soon as the screen stops
+# changing (bounded by the old fixed delay). False = plain fixed sleeps.
+SETTLE_WAIT_ENABLED = True
 
 # Per-flow debug flags (override global setting for specific flows)
 # NOTE: these dump full 4K PNGs on every flow step with no working cleanup - they
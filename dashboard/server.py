@@ -33,6 +33,8 @@ from utils.scheduler import get_scheduler
 # Global reference to daemon instance (set by icon_daemon.py on startup)
 _daemon_instance: Any = None
 _dashboard_port: int | None = None
+# /api/screenshot reuses the daemon's shared-memory frame if it is at most this old (s).
+SCREENSHOT_MAX_FRAME_AGE = 2.0
 
 
 def set_daemon_instance(daemon: Any) -> None:
@@ -809,12 +811,30 @@ async def api_return_to_base() -> dict[str, Any]:
 
 @app.get("/api/screenshot")
 async def api_screenshot() -> dict[str, Any]:
-    """Take a screenshot and save to debug folder. Returns the file path."""
+    """Take a screenshot and save to debug folder. Returns the file path.
+
+    Uses the daemon's newest frame from the shared-memory FrameBus mirror
+    when it is fresh; captures only when no daemon is mirroring."""
     import cv2
     try:
-        from utils.windows_screenshot_helper import WindowsScreenshotHelper
-        win = WindowsScreenshotHelper()
-        frame = win.get_screenshot_cv2()
+        from config import FRAME_SHM_NAME
+    except ImportError:
+        FRAME_SHM_NAME = "xclash_frame_bus"
+    try:
+        from utils.frame_context import FRAME_H, FRAME_W
+        from utils.frame_shm import read_shared_frame
+        frame = read_shared_frame(max_age=SCREENSHOT_MAX_FRAME_AGE, name=FRAME_SHM_NAME)
+        source = "frame_bus"
+        if frame is None:
+            from utils.capture_backend import capture_tag
+            from utils.windows_screenshot_helper import WindowsScreenshotHelper
+            win = WindowsScreenshotHelper()
+            with capture_tag("dashboard"):
+                frame = win.get_screenshot_cv2()
+            source = "capture"
+        elif frame.shape[1] != FRAME_W:
+            # Native-scale detector frame: save at 4K like a capture would.
+            frame = cv2.resize(frame, (FRAME_W, FRAME_H), interpolation=cv2.INTER_LINEAR)
 
         # Save to debug folder with timestamp
         debug_dir = PROJECT_ROOT / "screenshots" / "debug"
@@ -828,7 +848,8 @@ async def api_screenshot() -> dict[str, Any]:
             "success": True,
             "filename": filename,
             "path": str(filepath),
-            "timestamp": timestamp
+            "timestamp": timestamp,
+            "source": source,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Screenshot failed: {str(e)}")
@@ -0,0 +1 @@
+# Perception/capture micro-benchmarks (run as: python -m scripts.benchmarks.<name>)
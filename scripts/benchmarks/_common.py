@@ -0,0 +1,61 @@
+"""
+Shared helpers for the perception benchmarks: synthetic 4K frames and timing.
+
+Benchmarks run anywhere (no BlueStacks/Windows needed) - frames are random
+noise with real ground-truth templates pasted at their production positions,
+so every matcher does the same amount of work it does on a live frame.
+"""
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+TEMPLATE_DIR = PROJECT_ROOT / "templates" / "ground_truth"
+FRAME_H, FRAME_W = 2160, 3840
+
+
+def synthetic_frame(
+    pastes: list[tuple[str, int, int]] | None = None,
+    seed: int = 0,
+) -> npt.NDArray[Any]:
+    """4K BGR noise frame with (template_name, x, y) pasted top-left at x, y."""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, (FRAME_H, FRAME_W, 3), dtype=np.uint8)
+    for name, x, y in pastes or []:
+        tmpl = cv2.imread(str(TEMPLATE_DIR / name), cv2.IMREAD_COLOR)
+        if tmpl is None:
+            continue
+        th, tw = tmpl.shape[:2]
+        th, tw = min(th, FRAME_H - y), min(tw, FRAME_W - x)
+        frame[y:y + th, x:x + tw] = tmpl[:th, :tw]
+    return frame
+
+
+def time_ms(fn: Callable[[], Any], runs: int = 20, warmup: int = 2) -> list[float]:
+    """Wall-clock ms per call over `runs` calls (after `warmup` untimed calls)."""
+    for _ in range(warmup):
+        fn()
+    out = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000.0)
+    return out
+
+
+def summarize(samples: list[float]) -> str:
+    s = sorted(samples)
+    p95 = s[min(len(s) - 1, int(round(0.95 * (len(s) - 1))))]
+    return (f"mean={statistics.fmean(s):7.2f}ms  p50={statistics.median(s):7.2f}ms  "
+            f"p95={p95:7.2f}ms  n={len(s)}")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Raw PrintWindow bitmap -> 4K BGR frame: PIL path vs bgrx_to_bgr.
+
+Feeds a synthetic BGRX buffer the size of the BlueStacks window
+(1822x1040 by default, 30px top/right borders) through
+
+- pil:      Image.frombuffer -> crop -> np.array -> cv2.resize -> RGB2BGR
+            (the WindowsScreenshotHelper path before bgrx_to_bgr)
+- view:     bgrx_to_bgr into a fresh output frame with a reused scratch
+            buffer
+- reuse:    bgrx_to_bgr into a preallocated output frame as well (what the
+            helper does in steady state: the output is a FramePool buffer)
+
+and reports ms per frame plus the bytes allocated per frame (tracemalloc
+peak; numpy and cv2 output arrays are traced).
+
+Usage:
+    python -m scripts.benchmarks.bench_capture_convert
+    python -m scripts.benchmarks.bench_capture_convert --size 1920x1080 --runs 50
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from typing import Any, Callable
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from scripts.benchmarks._common import FRAME_H, FRAME_W, summarize, time_ms
+from utils.capture_backend import bgrx_to_bgr
+
+BORDERS = (0, 30, 30, 0)   # WindowsScreenshotHelper LEFT/TOP/RIGHT/BOTTOM_BORDER
+
+
+def pil_path(raw: bytes, width: int, height: int) -> Any:
+    left, top, right, bottom = BORDERS
+    img = Image.frombuffer("RGB", (width, height), raw, "raw", "BGRX", 0, 1)
+    img = img.crop((left, top, width - right, height - bottom))
+    rgb = cv2.resize(np.array(img), (FRAME_W, FRAME_H), interpolation=cv2.INTER_LINEAR)
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+
+def allocated_mb(fn: Callable[[], Any]) -> float:
+    fn()                                            # warm: first-call allocations don't count
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", default="1822x1040", help="raw window bitmap WxH")
+    ap.add_argument("--runs", type=int, default=30)
+    args = ap.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    raw = np.random.default_rng(0).integers(0, 256, (height, width, 4), dtype=np.uint8).tobytes()
+    out = np.empty((FRAME_H, FRAME_W, 3), np.uint8)
+    scratch = np.empty((height - BORDERS[1] - BORDERS[3], width - BORDERS[0] - BORDERS[2], 3), np.uint8)
+
+    paths: dict[str, Callable[[], Any]] = {
+        "pil": lambda: pil_path(raw, width, height),
+        "view": lambda: bgrx_to_bgr(raw, width, height, BORDERS, scratch=scratch),
+        "reuse": lambda: bgrx_to_bgr(raw, width, height, BORDERS, out=out, scratch=scratch),
+    }
+    reference = paths["pil"]()
+    print(f"{width}x{height} BGRX -> {FRAME_W}x{FRAME_H} BGR, {args.runs} runs")
+    for name, fn in paths.items():
+        same = "identical" if np.array_equal(fn(), reference) else "DIFFERS"
+        print(f"  {name:6s} {summarize(time_ms(fn, args.runs))}  "
+              f"alloc={allocated_mb(fn):6.1f}MB/frame  ({same})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
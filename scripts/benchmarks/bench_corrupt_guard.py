@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Corrupt-frame guard cost per frame: full-frame pass vs mostly_black.
+
+- full:        gray conversion of the whole 4K frame + 256x144 INTER_AREA
+               resize (the CaptureBackend guard before mostly_black)
+- sample-4k:   mostly_black on the 4K frame (what ReplayBackend and any
+               backend without a raw buffer run)
+- sample-raw:  mostly_black on the border-cropped raw BGRX capture buffer
+               (what WindowsScreenshotHelper runs, before the upscale)
+
+each on a real-looking frame (noise with ground-truth templates - the scan
+stops after a couple of bands) and an all-black unwritten capture (the scan
+has to confirm it). Also checks that the verdicts agree with the full pass
+on frames lit from 0% to 100%, in 1% steps around the 90% threshold; a
+frame lit exactly at the threshold can differ, since the full pass
+averages the one grid cell the edge cuts through and the sample does not.
+
+Usage:
+    python -m scripts.benchmarks.bench_corrupt_guard
+    python -m scripts.benchmarks.bench_corrupt_guard --runs 100
+"""
+from __future__ import annotations
+
+import argparse
+from functools import partial
+from typing import Any, Callable
+
+import cv2
+import numpy as np
+
+from scripts.benchmarks._common import FRAME_H, FRAME_W, summarize, synthetic_frame, time_ms
+from utils.capture_backend import NATIVE_H, NATIVE_W, CaptureBackend, bgrx_view, mostly_black
+
+BORDERS = (0, 30, 30, 0)   # WindowsScreenshotHelper LEFT/TOP/RIGHT/BOTTOM_BORDER
+DARK, FRAC = CaptureBackend.CORRUPT_DARK_MAX, CaptureBackend.CORRUPT_ALLBLACK_FRAC
+
+
+def full_pass(frame: Any) -> bool:
+    small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (256, 144), interpolation=cv2.INTER_AREA)
+    return float((small <= DARK).mean()) >= FRAC
+
+
+def raw_of(frame: Any) -> Any:
+    """The raw BGRX window bitmap this 4K frame would have been upscaled from."""
+    small = cv2.resize(frame, (NATIVE_W, NATIVE_H), interpolation=cv2.INTER_AREA)
+    padded = np.pad(small, ((BORDERS[1], BORDERS[3]), (BORDERS[0], BORDERS[2]), (0, 0)))
+    h, w = padded.shape[:2]
+    return bgrx_view(cv2.cvtColor(padded, cv2.COLOR_BGR2BGRA).tobytes(), w, h, BORDERS)
+
+
+def agreement() -> tuple[int, int, list[int]]:
+    same = total = 0
+    differ = []
+    for lit_pct in list(range(0, 101, 10)) + [7, 8, 9, 11, 12]:
+        frame = np.zeros((FRAME_H, FRAME_W, 3), np.uint8)
+        rows = FRAME_H * lit_pct // 100
+        if rows:
+            frame[FRAME_H - rows:] = 120
+        expected = full_pass(frame)
+        for verdict in (mostly_black(frame, DARK, FRAC), mostly_black(raw_of(frame), DARK, FRAC)):
+            same += int(verdict == expected)
+            total += 1
+            if verdict != expected and lit_pct not in differ:
+                differ.append(lit_pct)
+    return same, total, differ
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=50)
+    args = ap.parse_args()
+
+    frames = {
+        "real": synthetic_frame([("rally_search_button_4k.png", 3400, 1800)]),
+        "unwritten": np.zeros((FRAME_H, FRAME_W, 3), np.uint8),
+    }
+    print(f"guard cost per frame, {args.runs} runs")
+    for label, frame in frames.items():
+        raw = raw_of(frame)
+        paths: dict[str, Callable[[], bool]] = {
+            "full": partial(full_pass, frame),
+            "sample-4k": partial(mostly_black, frame, DARK, FRAC),
+            "sample-raw": partial(mostly_black, raw, DARK, FRAC),
+        }
+        for name, fn in paths.items():
+            print(f"  {label:9s} {name:10s} -> {str(fn()):5s} {summarize(time_ms(fn, args.runs))}")
+    same, total, differ = agreement()
+    print(f"  verdicts agreeing with the full pass: {same}/{total}"
+          + (f" (differ at {differ}% lit)" if differ else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
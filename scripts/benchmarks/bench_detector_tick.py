@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Per-tick detector latency: serial match_template calls vs one batched
+match_templates call sharing a FrameContext.
+
+Runs the view classification plus the detector's plain template specs (the
+ones built with DetectorSpec.template in icon_daemon) against a synthetic 4K
+WORLD frame.
+
+Usage:
+    python -m scripts.benchmarks.bench_detector_tick
+    python -m scripts.benchmarks.bench_detector_tick --runs 50
+"""
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from scripts.benchmarks._common import summarize, synthetic_frame, time_ms
+from utils.frame_context import FrameContext
+from utils.template_matcher import MatchRequest, match_template, match_templates
+from utils.view_state_detector import (
+    BUTTON_H, BUTTON_W, BUTTON_X, BUTTON_Y, THRESHOLD, detect_view,
+)
+
+# Mirrors the DetectorSpec.template specs in IconDaemon.initialize()
+TICK_SPECS = [
+    MatchRequest("cobra_icon_4k.png", (20, 1380, 580, 210), 0.08),
+    MatchRequest("sandstorm_rally_4k.png", (30, 1428, 520, 104), 0.10),
+    MatchRequest("map_gift_box_4k.png", None, 0.05),
+    MatchRequest("assist_help_briefcase_4k.png", (120, 1400, 220, 200), 0.03),
+    MatchRequest("assist_help_helmet_4k.png", (120, 1400, 220, 200), 0.03),
+    MatchRequest("assist_help_handshake_4k.png", (120, 1400, 220, 200), 0.03),
+]
+
+# Old detect_view: one match_template per button template until a hit
+VIEW_TEMPLATES = [
+    "world_button_4k.png", "world_button_ice_4k.png", "town_button_4k.png",
+    "town_button_zoomed_out_4k.png", "town_button_ice_4k.png",
+]
+
+
+def tick_serial(frame: Any) -> None:
+    for name in VIEW_TEMPLATES:
+        found, _, _ = match_template(frame, name, search_region=(BUTTON_X, BUTTON_Y, BUTTON_W, BUTTON_H),
+                                     threshold=THRESHOLD)
+        if found:
+            break
+    for req in TICK_SPECS:
+        match_template(frame, req.template_name, search_region=req.search_region, threshold=req.threshold)
+
+
+def tick_batched(frame: Any) -> None:
+    ctx = FrameContext(frame)
+    detect_view(ctx)
+    match_templates(ctx, TICK_SPECS)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--no-full-frame", action="store_true",
+                    help="drop the full-frame map_gift_box spec (fixed-region specs only)")
+    args = ap.parse_args()
+
+    if args.no_full_frame:
+        TICK_SPECS[:] = [r for r in TICK_SPECS if r.search_region is not None]
+
+    # WORLD frame: town button at the view toggle, helmet in the union strip
+    frame = synthetic_frame([("town_button_4k.png", BUTTON_X, BUTTON_Y),
+                             ("assist_help_helmet_4k.png", 150, 1420)])
+
+    print(f"Synthetic 4K frame, {len(TICK_SPECS)} template specs + view classification")
+    print(f"  serial : {summarize(time_ms(lambda: tick_serial(frame), args.runs))}")
+    print(f"  batched: {summarize(time_ms(lambda: tick_batched(frame), args.runs))}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
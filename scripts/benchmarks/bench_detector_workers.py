@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Detector tick latency vs worker count (DetectorThread(workers=N)).
+
+Builds the daemon's detector spec set (template batch + fixed-spot matchers +
+state monitors + rally march), feeds a frame set through DetectorThread._tick
+with dirty-tile reuse off (every tick does the full matching work) and
+reports the tick-time distribution for each worker count. Also checks that
+every worker count produces the same readings as the serial run.
+
+Frames: every PNG/JPG in --frames (e.g. a folder of recorded screenshots),
+or synthetic 4K TOWN/WORLD frames when omitted.
+
+Usage:
+    python -m scripts.benchmarks.bench_detector_workers
+    python -m scripts.benchmarks.bench_detector_workers --frames screenshots/ --workers 1 2 4 8 --runs 3
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any
+
+import cv2
+
+from scripts.benchmarks._common import summarize, synthetic_frame
+from utils.frame_bus import FrameBus
+from utils.opportunity_detector import DetectorSpec, DetectorThread, OpportunityBoard
+from utils.view_state_detector import BUTTON_X, BUTTON_Y, ViewState
+
+
+def build_specs() -> list[DetectorSpec]:
+    """The detector specs of IconDaemon.run() that need no daemon state."""
+    from utils.afk_rewards_matcher import AfkRewardsMatcher
+    from utils.bloodlust_matcher import is_bloodlust_active
+    from utils.cabbage_matcher import CabbageMatcher
+    from utils.corn_harvest_matcher import CornHarvestMatcher
+    from utils.dog_house_matcher import DogHouseMatcher
+    from utils.equipment_enhancement_matcher import EquipmentEnhancementMatcher
+    from utils.gem_matcher import GemMatcher
+    from utils.gold_coin_matcher import GoldCoinMatcher
+    from utils.handshake_icon_matcher import HandshakeIconMatcher
+    from utils.harvest_box_matcher import HarvestBoxMatcher
+    from utils.iron_bar_matcher import IronBarMatcher
+    from utils.rally_march_button_matcher import RallyMarchButtonMatcher
+    from utils.shield_active_matcher import is_shield_active
+    from utils.treasure_map_matcher import TreasureMapMatcher
+    from utils.under_attack_matcher import is_under_attack
+    from utils.union_war_panel_detector import UnionWarPanelDetector
+
+    def p2(is_present: Any) -> Any:
+        def fn(f: Any) -> tuple[bool, float, tuple[int, int] | None]:
+            found, score = is_present(f)
+            return found, score, None
+        return fn
+
+    march = RallyMarchButtonMatcher()
+
+    def march_fn(f: Any) -> tuple[bool, float, tuple[int, int] | None]:
+        m = march.find_march_button(f)
+        return (False, 1.0, None) if m is None else (True, m[2], (m[0], m[1]))
+
+    TOWN, WORLD = ViewState.TOWN, ViewState.WORLD
+    strip = (120, 1400, 220, 200)
+    specs = [
+        DetectorSpec("rally_march", {TOWN, WORLD}, march_fn),
+        DetectorSpec.template("cobra_icon", {WORLD}, "cobra_icon_4k.png",
+                              search_region=(20, 1380, 580, 210), threshold=0.08),
+        DetectorSpec.template("sandstorm", {WORLD}, "sandstorm_rally_4k.png",
+                              search_region=(30, 1428, 520, 104), threshold=0.10),
+        DetectorSpec.template("map_gift_box", {WORLD}, "map_gift_box_4k.png", threshold=0.05),
+        DetectorSpec.template("union_briefcase", None, "assist_help_briefcase_4k.png",
+                              search_region=strip, threshold=0.03),
+        DetectorSpec.template("union_helmet", None, "assist_help_helmet_4k.png",
+                              search_region=strip, threshold=0.03),
+        DetectorSpec.template("union_handshake", None, "assist_help_handshake_4k.png",
+                              search_region=strip, threshold=0.03),
+        DetectorSpec("handshake", None, p2(HandshakeIconMatcher().is_present)),
+        DetectorSpec("treasure_map", {TOWN, WORLD}, p2(TreasureMapMatcher().is_present)),
+        DetectorSpec("harvest_box", {TOWN}, p2(HarvestBoxMatcher().is_present)),
+        DetectorSpec("afk_rewards", {TOWN}, p2(AfkRewardsMatcher().is_present)),
+        DetectorSpec("dog_house_aligned", {TOWN}, p2(DogHouseMatcher().is_aligned)),
+        DetectorSpec("under_attack", None, p2(is_under_attack)),
+        DetectorSpec("bloodlust", None, p2(is_bloodlust_active)),
+        DetectorSpec("shield_active", None, p2(is_shield_active)),
+        DetectorSpec("union_war_panel", None, p2(UnionWarPanelDetector().is_union_war_panel)),
+    ]
+    for cls, name in ((CornHarvestMatcher, "corn"), (GoldCoinMatcher, "gold_coin"),
+                      (IronBarMatcher, "iron_bar"), (GemMatcher, "gem"),
+                      (CabbageMatcher, "cabbage"), (EquipmentEnhancementMatcher, "equipment")):
+        specs.append(DetectorSpec(name, {TOWN}, p2(cls().is_present)))
+    return specs
+
+
+def load_frames(folder: str | None, count: int) -> list[Any]:
+    if folder:
+        paths = sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in (".png", ".jpg"))
+        frames = [f for f in (cv2.imread(str(p), cv2.IMREAD_COLOR) for p in paths[:count or None])
+                  if f is not None]
+        if not frames:
+            raise SystemExit(f"no readable frames in {folder}")
+        return frames
+    views = ["town_button_4k.png", "world_button_4k.png"]   # WORLD, TOWN
+    return [synthetic_frame([(views[i % 2], BUTTON_X, BUTTON_Y)], seed=i) for i in range(count)]
+
+
+def snapshot(det: DetectorThread) -> dict[str, Any]:
+    out = {}
+    for spec in det.specs:
+        r = det.state.get(spec.name)
+        out[spec.name] = None if r is None else (r.found, round(r.score, 6), r.center)
+    return out
+
+
+def run(frames: list[Any], workers: int, runs: int) -> tuple[list[float], list[dict[str, Any]]]:
+    bus = FrameBus()
+    det = DetectorThread(bus, OpportunityBoard(), build_specs(), tick_interval=0.0,
+                         tile_size=None, workers=workers)
+    readings: list[dict[str, Any]] = []
+    ts = 0.0
+    try:
+        for r in range(runs + 1):                   # first pass warms template caches
+            for frame in frames:
+                ts = max(time.time(), ts + 1e-6)    # distinct ts even on coarse clocks
+                bus.publish(frame, ts=ts)
+                det._tick()
+                if r == 0:
+                    readings.append(snapshot(det))
+            if r == 0:
+                det.tick_ms.clear()
+    finally:
+        if det._pool is not None:
+            det._pool.shutdown()
+    return list(det.tick_ms), readings
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", help="folder of recorded 4K screenshots (default: synthetic)")
+    ap.add_argument("--count", type=int, default=6, help="frames to use (0 = all in --frames)")
+    ap.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4, 8])
+    ap.add_argument("--runs", type=int, default=5, help="timed passes over the frame set")
+    args = ap.parse_args()
+
+    frames = load_frames(args.frames, args.count)
+    print(f"{len(frames)} frames x {args.runs} passes, {len(build_specs())} specs, tile reuse off")
+    baseline = None
+    for n in args.workers:
+        ticks, readings = run(frames, n, args.runs)
+        if baseline is None:
+            baseline = readings
+        same = "same readings" if readings == baseline else "READINGS DIFFER"
+        print(f"  workers={n}: {summarize(ticks)}  ({same})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
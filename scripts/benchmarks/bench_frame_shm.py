@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cross-process frame latency: shared-memory FrameBus mirror vs a pipe.
+
+The parent publishes 4K frames at --rate; a child process receives them
+and reports, per frame, the time from publish to
+
+- shm-view:  the child noticing the new generation (zero-copy view ready)
+- shm-copy:  the child holding a consistent copy (FrameShmReader.read)
+- pipe:      the child holding the frame sent over a multiprocessing Pipe
+             (send_bytes / recv_bytes - what a socket-based reader pays)
+
+plus the publisher-side cost of each (FrameShmWriter.write vs send_bytes).
+The child polls the generation every --poll ms, so latencies include up to
+one poll interval.
+
+Usage:
+    python -m scripts.benchmarks.bench_frame_shm
+    python -m scripts.benchmarks.bench_frame_shm --frames 100 --rate 10
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import time
+from typing import Any
+
+import numpy as np
+
+from scripts.benchmarks._common import FRAME_H, FRAME_W, summarize
+from utils.frame_shm import FrameShmReader, FrameShmWriter
+
+
+def shm_child(name: str, frames: int, poll: float, out: Any) -> None:
+    view_ms: list[float] = []
+    copy_ms: list[float] = []
+    with FrameShmReader(name) as reader:
+        seen = reader.generation
+        while len(copy_ms) < frames:
+            gen = reader.generation
+            if gen == seen or gen % 2:
+                time.sleep(poll)
+                continue
+            view, gen = reader.view()
+            if view is None:
+                continue
+            t_view = time.time()
+            item = reader.read()
+            t_copy = time.time()
+            if item is None:
+                continue
+            seen = gen
+            ts = item[1]
+            view_ms.append((t_view - ts) * 1000.0)
+            copy_ms.append((t_copy - ts) * 1000.0)
+    out.send((view_ms, copy_ms))
+
+
+def pipe_child(conn: Any, frames: int, out: Any) -> None:
+    latency = []
+    for _ in range(frames):
+        data = conn.recv_bytes()
+        frame = np.frombuffer(data, np.uint8, offset=8).reshape(FRAME_H, FRAME_W, 3)
+        ts = float(np.frombuffer(data[:8], np.float64)[0])
+        latency.append((time.time() - ts) * 1000.0)
+        del frame
+    out.send(latency)
+
+
+def bench_shm(frames: list[Any], rate: float, poll: float) -> tuple[list[float], list[float], list[float]]:
+    ctx = mp.get_context("spawn")
+    writer = FrameShmWriter(f"xclash_bench_{os.getpid()}")
+    parent, child = ctx.Pipe()
+    proc = ctx.Process(target=shm_child, args=(writer.name, len(frames), poll, child))
+    proc.start()
+    time.sleep(1.0)                                  # child import + attach
+    write_ms = []
+    try:
+        for f in frames:
+            t0 = time.time()
+            writer.write(f, t0)
+            write_ms.append((time.time() - t0) * 1000.0)
+            time.sleep(max(0.0, 1.0 / rate - (time.time() - t0)))
+        view_ms, copy_ms = parent.recv()
+    finally:
+        proc.join(timeout=10)
+        writer.close()
+    return write_ms, view_ms, copy_ms
+
+
+def bench_pipe(frames: list[Any], rate: float) -> tuple[list[float], list[float]]:
+    ctx = mp.get_context("spawn")
+    send, recv = ctx.Pipe()
+    parent, child = ctx.Pipe()
+    proc = ctx.Process(target=pipe_child, args=(recv, len(frames), child))
+    proc.start()
+    time.sleep(1.0)
+    send_ms = []
+    for f in frames:
+        t0 = time.time()
+        send.send_bytes(np.float64(t0).tobytes() + f.tobytes())
+        send_ms.append((time.time() - t0) * 1000.0)
+        time.sleep(max(0.0, 1.0 / rate - (time.time() - t0)))
+    latency = parent.recv()
+    proc.join(timeout=10)
+    return send_ms, latency
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=40)
+    ap.add_argument("--rate", type=float, default=5.0, help="frames published per second")
+    ap.add_argument("--poll", type=float, default=1.0, help="reader poll interval, ms")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (FRAME_H, FRAME_W, 3), dtype=np.uint8) for _ in range(4)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+
+    write_ms, view_ms, copy_ms = bench_shm(frames, args.rate, args.poll / 1000.0)
+    send_ms, pipe_ms = bench_pipe(frames, args.rate)
+    print(f"{args.frames} x {FRAME_W}x{FRAME_H} BGR frames at {args.rate:g}/s, poll {args.poll:g}ms, "
+          f"{os.cpu_count()} CPU(s)")
+    print(f"  publisher  shm write  {summarize(write_ms)}")
+    print(f"  publisher  pipe send  {summarize(send_ms)}")
+    print(f"  reader     shm-view   {summarize(view_ms)}")
+    print(f"  reader     shm-copy   {summarize(copy_ms)}")
+    print(f"  reader     pipe       {summarize(pipe_ms)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
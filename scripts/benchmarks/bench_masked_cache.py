@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+CPU masked matching: per-call artifact preparation vs the artifact cache.
+
+For every masked template in templates/ground_truth, times one CPU masked
+match over a search region twice the template size - once rebuilding the
+masked-template artifacts (the old per-call behaviour) and once with the
+(template, grayscale) artifact cache warm. The "prep" column is the
+artifact build cost alone, i.e. what the cache saves on every match.
+
+Usage:
+    python -m scripts.benchmarks.bench_masked_cache
+    python -m scripts.benchmarks.bench_masked_cache --runs 50 --grayscale
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+
+import numpy as np
+
+from scripts.benchmarks._common import TEMPLATE_DIR, time_ms
+from utils import template_matcher as tm
+
+
+def masked_templates() -> list[str]:
+    names = []
+    for mask_path in sorted(TEMPLATE_DIR.glob("*mask*.png")):
+        for candidate in sorted(TEMPLATE_DIR.glob("*.png")):
+            if "mask" not in candidate.name and tm._get_mask_name(candidate.name) == mask_path.name:
+                names.append(candidate.name)
+    return names
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--grayscale", action="store_true")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'template':44s} {'size':>9s} {'prep':>9s} {'uncached':>10s} {'cached':>10s} {'saved':>7s}")
+    totals = [0.0, 0.0, 0.0]
+    for name in masked_templates():
+        template = tm._load_template(name, grayscale=args.grayscale)
+        mask = tm._load_mask(name)
+        if template is None or mask is None or mask.shape[:2] != template.shape[:2]:
+            continue
+        th, tw = template.shape[:2]
+        shape = (th * 2, tw * 2) + template.shape[2:]
+        area = rng.integers(0, 256, shape, dtype=np.uint8)
+
+        prep = statistics.median(time_ms(
+            lambda: tm._prepare_masked_template_data(template, mask), args.runs))
+        uncached = statistics.median(time_ms(
+            lambda: tm._match_template_cpu_masked(area, template, mask), args.runs))
+        cached = statistics.median(time_ms(
+            lambda: tm._match_template_cpu_masked(area, template, mask, template_name=name,
+                                                  grayscale=args.grayscale), args.runs))
+        totals[0] += uncached
+        totals[1] += cached
+        totals[2] += prep
+        print(f"{name:44s} {tw:>4d}x{th:<4d} {prep:7.3f}ms {uncached:8.3f}ms {cached:8.3f}ms "
+              f"{100 * (1 - cached / uncached):6.1f}%")
+    print(f"{'TOTAL (sum of medians)':54s} {totals[2]:7.3f}ms {totals[0]:8.3f}ms {totals[1]:8.3f}ms "
+          f"{100 * (1 - totals[1] / max(totals[0], 1e-9)):6.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
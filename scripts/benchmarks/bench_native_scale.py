@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Native-scale perception: score drift per template, and detector throughput.
+
+--validate: every ground-truth template is pasted into a synthetic 4K frame
+and matched in a region around it twice - on the 4K frame, and on the same
+frame shrunk to capture resolution (1792x1010, INTER_AREA) through a
+native-scale FrameContext (downscaled template, location mapped back to 4K).
+Reports the score drift, the location error and every template whose
+found/not-found verdict at its default threshold differs between the modes.
+
+--bench: ticks the daemon's detector spec set (bench_detector_workers) over
+4K frames and over the same frames at capture resolution, and reports tick
+latency plus how many spec verdicts differ.
+
+Neither flag runs both.
+
+Usage:
+    python -m scripts.benchmarks.bench_native_scale
+    python -m scripts.benchmarks.bench_native_scale --validate --worst 20
+    python -m scripts.benchmarks.bench_native_scale --bench --runs 3
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+from typing import Any
+
+import cv2
+import numpy as np
+
+from scripts.benchmarks._common import FRAME_H, FRAME_W, TEMPLATE_DIR, summarize, synthetic_frame
+from scripts.benchmarks.bench_detector_workers import load_frames, run
+from utils.capture_backend import NATIVE_H, NATIVE_W
+from utils.frame_context import FrameContext
+from utils.template_matcher import DEFAULT_MASKED_THRESHOLD, DEFAULT_THRESHOLD, has_mask, match_template
+
+
+def to_native(frame: Any) -> Any:
+    return cv2.resize(frame, (NATIVE_W, NATIVE_H), interpolation=cv2.INTER_AREA)
+
+
+def templates() -> list[str]:
+    return sorted(p.name for p in TEMPLATE_DIR.glob("*.png") if "_mask" not in p.name)
+
+
+def validate(worst: int) -> None:
+    rows = []
+    skipped = 0
+    for i, name in enumerate(templates()):
+        tmpl = cv2.imread(str(TEMPLATE_DIR / name), cv2.IMREAD_COLOR)
+        if tmpl is None:
+            skipped += 1
+            continue
+        th, tw = tmpl.shape[:2]
+        pad = max(64, tw // 2, th // 2)
+        if tw + 2 * pad > FRAME_W or th + 2 * pad > FRAME_H:
+            skipped += 1
+            continue
+        rng = np.random.default_rng(i)
+        x = int(rng.integers(pad, FRAME_W - tw - pad + 1))
+        y = int(rng.integers(pad, FRAME_H - th - pad + 1))
+        frame = synthetic_frame([(name, x, y)], seed=i)
+        region = (x - pad, y - pad, tw + 2 * pad, th + 2 * pad)
+
+        found_4k, score_4k, loc_4k = match_template(FrameContext(frame), name, search_region=region)
+        found_n, score_n, loc_n = match_template(FrameContext.for_frame(to_native(frame)), name,
+                                                 search_region=region)
+        err = (float(np.hypot(loc_n[0] - loc_4k[0], loc_n[1] - loc_4k[1]))
+               if loc_4k is not None and loc_n is not None else float("inf"))
+        rows.append((name, score_4k, score_n, err, found_4k, found_n))
+
+    drift = [abs(r[2] - r[1]) for r in rows]
+    errs = [r[3] for r in rows if np.isfinite(r[3])]
+    flips = [r for r in rows if r[4] != r[5]]
+    print(f"{len(rows)} templates ({skipped} skipped), native {NATIVE_W}x{NATIVE_H}")
+    print(f"  |score drift|: mean={statistics.fmean(drift):.4f}  p50={statistics.median(drift):.4f}  "
+          f"max={max(drift):.4f}")
+    print(f"  location error (4K px): mean={statistics.fmean(errs):.2f}  max={max(errs):.2f}")
+    print(f"  verdict flips at default threshold "
+          f"({DEFAULT_THRESHOLD} / masked {DEFAULT_MASKED_THRESHOLD}): {len(flips)}")
+    print(f"  {'template':48s} {'4k':>8s} {'native':>8s} {'drift':>8s} {'err px':>7s} mask")
+    for name, s4, sn, err, f4, fn in sorted(rows, key=lambda r: -abs(r[2] - r[1]))[:worst]:
+        flag = "  FLIP" if f4 != fn else ""
+        print(f"  {name:48s} {s4:8.4f} {sn:8.4f} {sn - s4:+8.4f} {err:7.1f} "
+              f"{'yes' if has_mask(name) else 'no ':3s}{flag}")
+
+
+def bench(count: int, runs: int) -> None:
+    frames = load_frames(None, count)
+    natives = [to_native(f) for f in frames]
+    ticks_4k, readings_4k = run(frames, 1, runs)
+    ticks_n, readings_n = run(natives, 1, runs)
+    print(f"{count} frames x {runs} passes, serial, tile reuse off")
+    print(f"  4K     {summarize(ticks_4k)}")
+    print(f"  native {summarize(ticks_n)}  "
+          f"({statistics.fmean(ticks_4k) / statistics.fmean(ticks_n):.2f}x)")
+    differ = sum(1 for a, b in zip(readings_4k, readings_n) for name in a
+                 if (a[name] is None) != (b[name] is None) or (a[name] and b[name] and a[name][0] != b[name][0]))
+    total = sum(len(a) for a in readings_4k)
+    print(f"  spec verdicts differing: {differ}/{total}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--validate", action="store_true", help="score drift per ground-truth template")
+    ap.add_argument("--bench", action="store_true", help="detector tick throughput, 4K vs native")
+    ap.add_argument("--worst", type=int, default=15, help="templates listed by drift")
+    ap.add_argument("--count", type=int, default=4)
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    both = not (args.validate or args.bench)
+    if args.validate or both:
+        validate(args.worst)
+    if args.bench or both:
+        bench(args.count, args.runs)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
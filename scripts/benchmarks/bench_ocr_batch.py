@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+OCR throughput: N single /ocr/number calls vs one /ocr/batch of N crops.
+
+Needs the OCR server running (python services/ocr_server.py - the model on
+the GPU); unlike the perception benchmarks this one measures the server.
+Each batch size from 1 to --max-batch reads N distinct number crops (a
+rendered "12345"-style value per crop, like the arms-race chest thresholds),
+with the client result cache off so every read reaches the model:
+
+- single:  N extract_number() calls, one HTTP round trip + forward each
+- batch:   one extract_many() call - one round trip, one batched generate
+
+and reports ms per call and crops/s for both, plus the speed-up.
+
+Usage:
+    python -m scripts.benchmarks.bench_ocr_batch
+    python -m scripts.benchmarks.bench_ocr_batch --runs 10 --max-batch 8
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+
+import cv2
+import numpy as np
+
+from scripts.benchmarks._common import summarize, time_ms
+from utils.ocr_client import OCRClient, OCRRequest
+
+CROP_W, CROP_H = 220, 70
+
+
+def number_strip(n: int) -> tuple[np.ndarray, list[tuple[int, int, int, int]]]:
+    """A BGR strip of n number crops side by side, and their regions."""
+    strip = np.full((CROP_H, CROP_W * n, 3), 40, np.uint8)
+    regions = []
+    for i in range(n):
+        cv2.putText(strip, str(1200 + 37 * i), (i * CROP_W + 12, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.4, (255, 255, 255), 3)
+        regions.append((i * CROP_W, 0, CROP_W, CROP_H))
+    return strip, regions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--max-batch", type=int, default=8)
+    args = ap.parse_args()
+
+    if not OCRClient.check_server(force=True):
+        print("OCR server not running - start it with: python services/ocr_server.py")
+        return 1
+    client = OCRClient(auto_start=False)
+
+    print(f"OCR throughput, {args.runs} runs per batch size")
+    for n in range(1, args.max_batch + 1):
+        strip, regions = number_strip(n)
+        requests = [OCRRequest(r, "number") for r in regions]
+        single = time_ms(lambda: [client.extract_number(strip, r, cache=False) for r in regions], args.runs, 1)
+        batch = time_ms(lambda: client.extract_many(strip, requests, cache=False), args.runs, 1)
+        values = client.extract_many(strip, requests, cache=False)
+        s_rate = n * 1000.0 / statistics.median(single)
+        b_rate = n * 1000.0 / statistics.median(batch)
+        print(f"  n={n}  single {summarize(single)}  {s_rate:6.1f} crops/s")
+        print(f"       batch  {summarize(batch)}  {b_rate:6.1f} crops/s  x{b_rate / s_rate:.2f}  {values}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+OCR client per-call HTTP overhead against a local stub server (no model).
+
+The stub answers every POST with {"number": 1} at once, so what is left is
+the client + transport cost of one OCR call:
+
+- before:  urllib.request.urlopen (a new TCP connection per call, body built
+           with repeated bytes +=) against an HTTP/1.0 server - the old
+           OCRClient._post_multipart and ocr_server handler
+- after:   OCRClient._post_multipart - keep-alive ConnectionPool, body built
+           with one join - against an HTTP/1.1 server with TCP_NODELAY,
+           like services/ocr_server.py now
+
+for a stamina-sized crop and an 8-crop /ocr/batch body, sequentially and
+from 4 threads at once (the daemon's stamina tracker plus flows). Also times
+multipart body assembly on its own.
+
+Usage:
+    python -m scripts.benchmarks.bench_ocr_http
+    python -m scripts.benchmarks.bench_ocr_http --runs 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from scripts.benchmarks._common import summarize, time_ms
+from utils import ocr_client
+from utils.ocr_client import ConnectionPool, OCRClient, multipart_body
+
+BOUNDARY = b"----OCRClientBoundary"
+CROP = b"P6\n96 60\n255\n" + bytes(96 * 60 * 3)          # STAMINA_REGION as raw PPM
+
+
+class _Stub(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = json.dumps({"number": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _KeepAliveStub(_Stub):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+
+def serve(handler: type[BaseHTTPRequestHandler]) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def concat_body(images: list[bytes], fields: dict[str, Any]) -> bytes:
+    """The old multipart assembly: one bytes += per piece."""
+    body = b""
+    for i, data in enumerate(images):
+        body += b"--" + BOUNDARY + b"\r\n"
+        body += f'Content-Disposition: form-data; name="image{i}"; filename="image{i}.ppm"\r\n'.encode()
+        body += b"Content-Type: image/x-portable-anymap\r\n\r\n"
+        body += data + b"\r\n"
+    for name, value in fields.items():
+        body += b"--" + BOUNDARY + b"\r\n"
+        body += f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+        body += json.dumps(value).encode() + b"\r\n"
+    body += b"--" + BOUNDARY + b"--\r\n"
+    return body
+
+
+def old_post(port: int, endpoint: str, images: list[bytes], fields: dict[str, Any]) -> dict[str, Any]:
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{port}{endpoint}", data=concat_body(images, fields),
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY.decode()}"}, method="POST")
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        result: dict[str, Any] = json.loads(resp.read())
+        return result
+
+
+def threaded_ms(fn: Callable[[], Any], threads: int, calls: int) -> float:
+    """Wall ms per call with `threads` threads making `calls` calls each."""
+    workers = [threading.Thread(target=lambda: [fn() for _ in range(calls)]) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return (time.perf_counter() - t0) * 1000.0 / (threads * calls)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=200)
+    args = ap.parse_args()
+
+    before, after = serve(_Stub), serve(_KeepAliveStub)
+    ocr_client._pool = ConnectionPool("127.0.0.1", after.server_address[1])
+    client = OCRClient(auto_start=False)
+    cases = {
+        "single": ("/ocr/number", [CROP], {}),
+        "batch-8": ("/ocr/batch", [CROP] * 8, {"items": [{"mode": "number"}] * 8}),
+    }
+
+    print(f"per-call overhead vs a local stub OCR server, {args.runs} runs")
+    for label, (endpoint, images, fields) in cases.items():
+        def old() -> dict[str, Any]:
+            return old_post(before.server_address[1], endpoint, images, fields)
+
+        def new() -> dict[str, Any]:
+            return client._post_multipart(endpoint, images if len(images) > 1 else images[0], fields or None)
+
+        assert old() == new() == {"number": 1}
+        print(f"  {label} ({len(concat_body(images, fields)) / 1024:.0f} KB body)")
+        print(f"    before          {summarize(time_ms(old, args.runs))}")
+        print(f"    after           {summarize(time_ms(new, args.runs))}")
+        print(f"    before 4 threads {threaded_ms(old, 4, args.runs // 4):6.3f}ms/call")
+        print(f"    after  4 threads {threaded_ms(new, 4, args.runs // 4):6.3f}ms/call")
+        assert multipart_body(images, fields) == concat_body(images, fields)
+        print(f"    body += concat  {summarize(time_ms(lambda: concat_body(images, fields), args.runs))}")
+        print(f"    body join       {summarize(time_ms(lambda: multipart_body(images, fields), args.runs))}")
+    print(f"  pool: {ocr_client._pool.stats()}")
+    before.shutdown()
+    after.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+OCR request serialisation cost per call, for the regions the bot reads.
+
+- png-full:   the old OCRClient._image_to_bytes - BGR->RGB flip of the whole
+              4K frame, full-size PIL image, PIL crop, PNG encode
+- ppm-crop:   the current one - NumPy slice of the region, flip of the crop
+              only, binary PPM (header + raw RGB bytes)
+
+plus what the server pays to turn each payload back into an RGB image
+(PNG decode vs PPM), and the payload size. Runs anywhere: no OCR server.
+The frame is noise, so PNG sizes here are worst case; on real UI crops PNG
+is smaller than PPM, which costs nothing over the loopback socket.
+
+Usage:
+    python -m scripts.benchmarks.bench_ocr_transport
+    python -m scripts.benchmarks.bench_ocr_transport --runs 50
+"""
+from __future__ import annotations
+
+import argparse
+import io
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+from scripts.benchmarks._common import summarize, synthetic_frame, time_ms
+from utils.ocr_client import OCRClient
+
+REGIONS = {
+    "stamina": (69, 203, 96, 60),             # config.STAMINA_REGION
+    "tavern-counter": (1700, 545, 120, 65),   # tavern_counter_reader.ASSIST_ALLIES_REGION
+    "quest-timer": (1500, 900, 160, 60),      # tavern_quest_flow TIMER_WIDTH x TIMER_HEIGHT
+    "arms-race-chest": (1363, 1054, 349, 92), # arms_race_ocr.CHEST1_REGION
+    "panel": (1200, 500, 900, 600),           # a large text panel (hero/skill descriptions)
+}
+
+
+def png_full(frame: Any, region: tuple[int, int, int, int]) -> bytes:
+    x, y, w, h = region
+    pil_image = Image.fromarray(frame[:, :, ::-1]).crop((x, y, x + w, y + h))
+    buffer = io.BytesIO()
+    pil_image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def decode(payload: bytes) -> Image.Image:
+    """services/ocr_server._decode_image without the server's imports."""
+    with Image.open(io.BytesIO(payload)) as pil_image:
+        return pil_image.convert("RGB")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=30)
+    args = ap.parse_args()
+
+    frame = synthetic_frame([("rally_search_button_4k.png", 3400, 1800)])
+    client = OCRClient(auto_start=False)
+    print(f"serialisation per OCR call, 4K frame, {args.runs} runs")
+    for label, region in REGIONS.items():
+        old = png_full(frame, region)
+        new = client._image_to_bytes(frame, region)
+        assert np.array_equal(np.asarray(decode(old)), np.asarray(decode(new)))   # same pixels
+        print(f"  {label} {region[2]}x{region[3]}  png {len(old) / 1024:.1f} KB, ppm {len(new) / 1024:.1f} KB")
+        print(f"    client png-full  {summarize(time_ms(lambda: png_full(frame, region), args.runs))}")
+        print(f"    client ppm-crop  {summarize(time_ms(lambda: client._image_to_bytes(frame, region), args.runs))}")
+        print(f"    server png       {summarize(time_ms(lambda: decode(old), args.runs))}")
+        print(f"    server ppm       {summarize(time_ms(lambda: decode(new), args.runs))}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
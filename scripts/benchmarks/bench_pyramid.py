@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Pyramid (coarse-to-fine) search: accuracy and latency vs exhaustive search.
+
+Validation harness for config.PYRAMID_TEMPLATES. For each ground-truth
+template large enough to downscale, pastes it at a random position into a
+smoothed-noise 4K frame and searches a window around it (--window, default
+1280x720; 0 = full frame) exhaustively and at pyramid scales 2 and 4.
+Reports per template whether the pyramid found the same location, the score
+drift against the exhaustive score, and the median latency of each mode.
+A template is safe to enable when every row is "same" with negligible drift.
+
+Usage:
+    python -m scripts.benchmarks.bench_pyramid
+    python -m scripts.benchmarks.bench_pyramid --limit 0 --window 0 --runs 3
+    python -m scripts.benchmarks.bench_pyramid --templates cobra_icon_4k.png map_gift_box_4k.png
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+
+import cv2
+import numpy as np
+
+from scripts.benchmarks._common import FRAME_H, FRAME_W, TEMPLATE_DIR, time_ms
+from utils import template_matcher as tm
+from utils.frame_context import FrameContext
+
+SCALES = (2, 4)
+
+
+def candidate_templates(names: list[str] | None, limit: int) -> list[str]:
+    if names:
+        return names
+    out = []
+    for path in sorted(TEMPLATE_DIR.glob("*_4k.png")):
+        if "mask" in path.name:
+            continue
+        img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if img is None or min(img.shape[:2]) < tm.PYRAMID_MIN_TEMPLATE_PX * 2:
+            continue
+        out.append(path.name)
+    return out[:limit] if limit > 0 else out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--templates", nargs="*", help="template names (default: all large enough)")
+    ap.add_argument("--limit", type=int, default=20, help="max templates (0 = all)")
+    ap.add_argument("--window", type=int, default=1280, help="search window width (0 = full frame)")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    # Smoothed noise: textured like a game frame, unlike white noise which
+    # makes every coarse pass trivially unambiguous.
+    base = cv2.GaussianBlur(rng.integers(0, 256, (FRAME_H, FRAME_W, 3), dtype=np.uint8), (9, 9), 0)
+
+    header = f"{'template':40s} {'size':>9s} {'exhaustive':>11s}"
+    for s in SCALES:
+        header += f" {'x' + str(s):>9s} {'loc':>5s} {'drift':>8s}"
+    print(header)
+
+    totals = {1: 0.0, **{s: 0.0 for s in SCALES}}
+    mismatches = 0
+    for name in candidate_templates(args.templates, args.limit):
+        template = cv2.imread(str(TEMPLATE_DIR / name), cv2.IMREAD_COLOR)
+        if template is None:
+            continue
+        th, tw = template.shape[:2]
+        x = int(rng.integers(0, FRAME_W - tw))
+        y = int(rng.integers(0, FRAME_H - th))
+        frame = base.copy()
+        frame[y:y + th, x:x + tw] = template
+
+        if args.window > 0:
+            ww, wh = max(args.window, tw * 4), max(args.window * 9 // 16, th * 4)
+            rx = min(max(0, x + tw // 2 - ww // 2), FRAME_W - ww)
+            ry = min(max(0, y + th // 2 - wh // 2), FRAME_H - wh)
+            region: tuple[int, int, int, int] | None = (rx, ry, ww, wh)
+        else:
+            region = None
+
+        def run(scale: int) -> tuple[bool, float, tuple[int, int] | None]:
+            # Fresh context per call: the timing includes the frame-side
+            # conversions (downscale / float32) a detector tick would pay.
+            return tm.match_template(FrameContext(frame), name, search_region=region, pyramid=scale)
+
+        exact = run(1)
+        t_exact = statistics.median(time_ms(lambda: run(1), args.runs, warmup=1))
+        totals[1] += t_exact
+        line = f"{name:40s} {tw:>4d}x{th:<4d} {t_exact:9.1f}ms"
+        for s in SCALES:
+            got = run(s)
+            t = statistics.median(time_ms(lambda: run(s), args.runs, warmup=1))
+            totals[s] += t
+            same = got[2] == exact[2]
+            mismatches += 0 if same else 1
+            line += f" {t:7.1f}ms {'same' if same else 'DIFF':>5s} {got[1] - exact[1]:+8.4f}"
+        print(line)
+
+    summary = f"{'TOTAL (sum of medians)':50s} {totals[1]:9.1f}ms"
+    for s in SCALES:
+        summary += f" {totals[s]:7.1f}ms {'':>5s} {'x%.1f' % (totals[1] / max(totals[s], 1e-9)):>8s}"
+    print(summary)
+    print(f"location mismatches: {mismatches}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
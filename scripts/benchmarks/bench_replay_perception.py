@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+End-to-end perception throughput/latency on replayed frames (no BlueStacks).
+
+A ReplayBackend producer thread publishes recorded frames to a FrameBus at
+--rate frames/s (0 = as fast as frames load) while a running DetectorThread
+(the daemon's spec set from bench_detector_workers) consumes them. Reports
+how many published frames were actually perceived, the tick-latency
+distribution and the publish -> readings-recorded lag.
+
+Frames: a directory of screenshots (--frames), an action_capture session
+(--session, before + after shots in recorded order), or synthetic 4K
+TOWN/WORLD frames written to a temp dir when neither is given.
+
+Usage:
+    python -m scripts.benchmarks.bench_replay_perception
+    python -m scripts.benchmarks.bench_replay_perception --session screenshots/action_capture/20250101_120000 --rate 5
+    python -m scripts.benchmarks.bench_replay_perception --frames screenshots/ --rate 0 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import cv2
+
+from scripts.benchmarks._common import summarize
+from scripts.benchmarks.bench_detector_workers import build_specs, load_frames
+from utils.capture_backend import ReplayBackend
+from utils.frame_bus import FrameBus
+from utils.opportunity_detector import DetectorThread, OpportunityBoard
+
+
+def make_source(args: argparse.Namespace, tmp: Path) -> ReplayBackend:
+    rate = args.rate or None
+    if args.session:
+        return ReplayBackend.from_session(args.session, rate=rate)
+    if args.frames:
+        return ReplayBackend.from_directory(args.frames, rate=rate)
+    for i, frame in enumerate(load_frames(None, args.count)):
+        cv2.imwrite(str(tmp / f"synthetic_{i:03d}.png"), frame)
+    return ReplayBackend.from_directory(tmp, rate=rate)
+
+
+def run(source: ReplayBackend, workers: int, tile_size: int | None) -> None:
+    bus = FrameBus()
+    det = DetectorThread(bus, OpportunityBoard(), build_specs(), tick_interval=0.05,
+                         tile_size=tile_size, workers=workers)
+    # The backend publishes to the process-wide bus; forward into ours so
+    # repeated runs start from an empty one.
+    source._publish_to_bus = bus.publish  # type: ignore[method-assign]
+    det.start()
+    published = 0
+    t0 = time.perf_counter()
+
+    def produce() -> None:
+        nonlocal published
+        while not source.exhausted:
+            source.get_screenshot_cv2()
+            published += 1
+
+    producer = threading.Thread(target=produce, name="ReplayProducer")
+    producer.start()
+    producer.join()
+    last = bus.latest()
+    deadline = time.monotonic() + 120.0
+    while time.monotonic() < deadline:  # drain: the newest frame's tick has finished
+        if last is None or (det._last_ts >= last[1] and len(det.tick_ms) >= min(det.ticks, 256)):
+            break
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - t0
+    det.stop()                          # not join(): DetectorThread._stop shadows Thread._stop
+
+    stats = det.tick_stats()
+    print(f"  workers={workers}: published {published} frames in {elapsed:.1f}s "
+          f"({published / elapsed:.1f} fps), perceived {det.ticks} "
+          f"({det.ticks / elapsed:.1f} fps)")
+    if det.tick_ms:
+        print(f"    tick  {summarize(list(det.tick_ms))}")
+        print(f"    lag   {summarize(list(det.lag_ms))}  (publish -> readings)")
+    else:
+        print(f"    no ticks recorded: {stats}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--frames", help="directory of recorded screenshots")
+    src.add_argument("--session", help="action_capture session directory (actions.jsonl)")
+    ap.add_argument("--count", type=int, default=12, help="synthetic frames when no source given")
+    ap.add_argument("--rate", type=float, default=2.0, help="replay frames/s (0 = as fast as possible)")
+    ap.add_argument("--workers", type=int, nargs="*", default=[1, 4])
+    ap.add_argument("--tile-size", type=int, default=64, help="dirty-tile size (0 = reuse off)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_source(args, Path(tmp))
+        print(f"{len(source.frames)} frames at {args.rate or 'max'} fps, "
+              f"{len(build_specs())} specs, tile reuse {'off' if not args.tile_size else args.tile_size}")
+        for n in args.workers:
+            source.rewind()
+            run(source, n, args.tile_size or None)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Template startup cost: PNG decode vs the memory-mapped template pack.
+
+Loads every template under templates/ground_truth (colour + grayscale, the
+variants the registry serves) three ways, each in a fresh registry:
+- png:        cv2.imread of every file (the pre-pack cold start)
+- pack-map:   open the pack + create a zero-copy view of every array
+- pack-touch: as pack-map, then read every byte (pages the blob in; the
+              worst case where every template is used right away)
+
+Builds a pack into a temporary directory first unless --pack is given.
+OS file caching makes repeated runs warm; the first run after boot is the
+real cold start.
+
+Usage:
+    python -m scripts.benchmarks.bench_template_pack
+    python -m scripts.benchmarks.bench_template_pack --pack templates/pack --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from scripts.benchmarks._common import TEMPLATE_DIR
+from utils.template_pack import TemplatePack, build_pack
+from utils.template_registry import TemplateRegistry
+
+
+def _names() -> list[str]:
+    return [p.relative_to(TEMPLATE_DIR).as_posix() for p in sorted(TEMPLATE_DIR.rglob("*.png"))]
+
+
+def _load_all(pack_dir: Path | None, touch: bool = False) -> float:
+    t0 = time.perf_counter()
+    pack = TemplatePack.open(pack_dir) if pack_dir is not None else None
+    reg = TemplateRegistry(path_fn=lambda n: TEMPLATE_DIR / n, pack=pack)
+    total = 0
+    for name in _names():
+        for variant in ("color", "gray"):
+            img = reg.get(name, variant)
+            if touch and img is not None:
+                total += int(np.bitwise_xor.reduce(img, axis=None))
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pack", type=Path, default=None, help="existing pack dir (default: build a temp one)")
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pack_dir = args.pack
+        if pack_dir is None:
+            pack_dir = Path(tmp)
+            t0 = time.perf_counter()
+            summary = build_pack(TEMPLATE_DIR, pack_dir)
+            print(f"built pack: {summary['files']} files, {summary['bytes'] / 1e6:.1f} MB "
+                  f"in {time.perf_counter() - t0:.1f}s")
+
+        rows: list[tuple[str, Callable[[], float]]] = [
+            ("png", lambda: _load_all(None)),
+            ("pack-map", lambda: _load_all(pack_dir)),
+            ("pack-touch", lambda: _load_all(pack_dir, touch=True)),
+        ]
+        print(f"{len(_names())} templates x 2 variants, median of {args.runs}")
+        for label, fn in rows:
+            samples = [fn() for _ in range(args.runs)]
+            print(f"  {label:11s} {statistics.median(samples):9.1f}ms  (min {min(samples):.1f}ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+"""
+Compile templates/ground_truth into the memory-mappable template pack.
+
+Decodes every template and mask PNG (colour + grayscale) once and writes
+templates/pack/templates.npy + index.json, which the template registry maps
+at import instead of decoding PNGs (see utils/template_pack.py). Rebuild
+after adding or editing templates - until then, changed files are served
+from their PNGs. Run with the daemon stopped.
+
+Usage: python scripts/build_template_pack.py [--out DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.template_pack import DEFAULT_PACK_DIR, build_pack  # noqa: E402
+
+TEMPLATE_DIR = Path(project_root) / "templates" / "ground_truth"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", type=Path, default=DEFAULT_PACK_DIR, help="pack directory")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    try:
+        summary = build_pack(TEMPLATE_DIR, args.out)
+    except PermissionError as e:
+        print(f"Could not replace the pack (is the daemon running and mapping it?): {e}")
+        return 1
+    print(f"Packed {summary['files']} templates ({summary['arrays']} arrays, "
+          f"{summary['bytes'] / 1e6:.1f} MB) into {args.out} in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
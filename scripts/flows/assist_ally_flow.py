@@ -142,11 +142,9 @@ def _find_helmet(frame: Any) -> tuple[bool, float, tuple[int, int] | None]:
     not correlation. Returns (found, score, center)."""
     global _HELMET_TMPL, _HELMET_MASK
     import numpy as np
-    from pathlib import Path
-    if _HELMET_TMPL is None:
-        base = Path(__file__).parent.parent.parent / "templates" / "ground_truth"
-        _HELMET_TMPL = cv2.imread(str(base / HELMET_TEMPLATE))
-        _HELMET_MASK = cv2.imread(str(base / "assist_helmet_mask_4k.png"))
+    from utils.template_matcher import get_template
+    _HELMET_TMPL = get_template(HELMET_TEMPLATE)
+    _HELMET_MASK = get_template("assist_helmet_mask_4k.png")   # 3-channel mask
     if _HELMET_TMPL is None or _HELMET_MASK is None:
         return False, 1.0, None
     th, tw = _HELMET_TMPL.shape[:2]
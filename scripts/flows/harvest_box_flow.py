@@ -17,12 +17,12 @@ from __future__ import annotations
 
 from pathlib import Path
 import time
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING
 
 import cv2
-import numpy.typing as npt
 
 from utils.windows_screenshot_helper import WindowsScreenshotHelper
+from utils.template_matcher import get_template
 
 if TYPE_CHECKING:
     from utils.adb_helper import ADBHelper
@@ -71,8 +71,7 @@ def harvest_box_flow(
     win = screenshot_helper if screenshot_helper else WSHelper()
     frame = win.get_screenshot_cv2()
 
-    # Load template (cast needed because cv2.imread can return None at runtime)
-    template = cast(npt.NDArray[Any] | None, cv2.imread(str(SURPRISE_BOX_TEMPLATE)))
+    template = get_template(SURPRISE_BOX_TEMPLATE)
     if template is None:
         print(f"    [HARVEST] Template not found: {SURPRISE_BOX_TEMPLATE}")
         return False
@@ -111,7 +111,7 @@ def check_enhance_hero_progress(
 
             x, y, w, h = CURRENT_POINTS_REGION
             roi = frame[y:y+h, x:x+w]
-            points_text = ocr.extract_text(roi)
+            points_text = ocr.extract_text(roi, cache=False)  # independent reads
 
             if points_text:
                 points_text = points_text.strip().replace(",", "").replace(" ", "")
@@ -40,6 +40,7 @@ from utils.back_button_matcher import BackButtonMatcher
 from utils.debug_screenshot import save_debug_screenshot
 from utils.safe_grass_matcher import find_safe_grass
 from utils.current_state import update_rally_join_result
+from utils.template_matcher import get_template
 
 # Flow name for debug screenshots
 FLOW_NAME = "rally_join"
@@ -242,7 +243,7 @@ def _wait_for_team_up_panel(
     Returns:
         frame: Screenshot with panel loaded, or None if timeout
     """
-    template: npt.NDArray[Any] | None = cv2.imread(str(TEAM_UP_TEMPLATE_PATH))
+    template: npt.NDArray[Any] | None = get_template(TEAM_UP_TEMPLATE_PATH)
     if template is None:
         print("[RALLY-JOIN] WARNING: team_up_button_4k.png not found")
         return None
@@ -277,7 +278,7 @@ def _check_daily_limit_dialog(
     Returns:
         True if dialog detected (need to cancel), False if no dialog
     """
-    template: npt.NDArray[Any] | None = cv2.imread(str(DAILY_LIMIT_DIALOG_PATH))
+    template: npt.NDArray[Any] | None = get_template(DAILY_LIMIT_DIALOG_PATH)
     if template is None:
         print("[RALLY-JOIN] WARNING: daily_rally_rewards_dialog_4k.png not found")
         return False
@@ -594,7 +595,7 @@ def rally_join_flow(adb: ADBHelper, union_boss_mode: bool = False) -> dict[str,
     # Step 6: Click Team Up button (poll for it at fixed region)
     print("[RALLY-JOIN] Step 6: Clicking Team Up button")
 
-    team_up_template: npt.NDArray[Any] | None = cv2.imread(str(TEAM_UP_TEMPLATE_PATH))
+    team_up_template: npt.NDArray[Any] | None = get_template(TEAM_UP_TEMPLATE_PATH)
     if team_up_template is None:
         print("[RALLY-JOIN] WARNING: team_up_button_4k.png not found, aborting")
         _save_debug_screenshot(frame, "STEP6 FAIL no teamup template")
@@ -638,7 +639,7 @@ def rally_join_flow(adb: ADBHelper, union_boss_mode: bool = False) -> dict[str,
             print(f"[RALLY-JOIN]   Daily limit reached for {monster_name}!")
 
             # Poll for Cancel button at fixed region (2s timeout)
-            cancel_template: npt.NDArray[Any] | None = cv2.imread(str(CANCEL_BUTTON_TEMPLATE_PATH))
+            cancel_template: npt.NDArray[Any] | None = get_template(CANCEL_BUTTON_TEMPLATE_PATH)
             if cancel_template is not None:
                 found, frame = _poll_for_button(win, cancel_template, CANCEL_REGION,
                                                 CANCEL_CLICK, "Cancel button", timeout=2.0, threshold=0.1)
@@ -726,7 +727,7 @@ def _cleanup_and_exit(
     """
     # Check for daily limit dialog that may have appeared late
     # This dialog can appear with server delay AFTER the main check in Step 6b
-    daily_limit_template: npt.NDArray[Any] | None = cv2.imread(str(DAILY_LIMIT_DIALOG_PATH))
+    daily_limit_template: npt.NDArray[Any] | None = get_template(DAILY_LIMIT_DIALOG_PATH)
     if daily_limit_template is not None:
         frame = win.get_screenshot_cv2()
         _save_debug_screenshot(frame, "CLEANUP checking for late dialog")
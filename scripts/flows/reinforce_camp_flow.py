@@ -23,7 +23,7 @@ import numpy.typing as npt
 
 from utils.view_state_detector import go_to_world
 from utils.return_to_base_view import return_to_base_view
-from utils.template_matcher import match_template, has_mask
+from utils.template_matcher import get_template, match_template, has_mask
 
 from utils.windows_screenshot_helper import WindowsScreenshotHelper
 
@@ -130,8 +130,7 @@ def find_all_go_buttons(
     Returns:
         List of (x, y, score) tuples sorted by Y (top to bottom)
     """
-    template_path = TEMPLATE_DIR / "go_button_4k.png"
-    template = cv2.imread(str(template_path))
+    template = get_template("go_button_4k.png")
     if template is None:
         if debug:
             print("    ERROR: Could not load go_button_4k.png")
@@ -32,7 +32,7 @@ import time
 import logging
 
 from utils.windows_screenshot_helper import WindowsScreenshotHelper
-from utils.template_matcher import match_template
+from utils.template_matcher import find_all_templates, get_template, match_template
 
 # Debug screenshot helper
 DEBUG_DIR = Path(__file__).parent.parent.parent / "screenshots" / "debug"
@@ -167,7 +167,7 @@ SCROLL_DURATION = 500  # ms - longer for smoother scroll
 
 def load_template_color(path: str) -> npt.NDArray[Any]:
     """Load template as COLOR (BGR)."""
-    template = cv2.imread(path, cv2.IMREAD_COLOR)
+    template = get_template(path)
     if template is None:
         raise FileNotFoundError(f"Template not found: {path}")
     return template
@@ -358,21 +358,23 @@ def find_quest_timers(frame: npt.NDArray[Any], ocr: OCRClient | None = None) ->
         if is_distinct:
             filtered.append((x, y, score))
 
-    timers: list[dict[str, Any]] = []
-    for clock_x, clock_y, _ in filtered:
-        timer_x = clock_x + TIMER_OFFSET_X
-        timer_y = clock_y
-        timer_region = (timer_x, timer_y, TIMER_WIDTH, TIMER_HEIGHT)
+    timer_regions = [(clock_x + TIMER_OFFSET_X, clock_y, TIMER_WIDTH, TIMER_HEIGHT)
+                     for clock_x, clock_y, _ in filtered]
 
-        timer_text: str | None = None
-        seconds: int | None = None
+    # All visible timers in one batched OCR call
+    timer_texts: list[str | None] = [None] * len(timer_regions)
+    if ocr is not None and timer_regions:
+        from utils.ocr_client import OCRRequest
+        try:
+            timer_texts = [str(t) for t in ocr.extract_many(frame, [OCRRequest(r) for r in timer_regions])]
+        except Exception as e:
+            logger.warning(f"OCR failed for {len(timer_regions)} timers at {[r[:2] for r in timer_regions]}: {e}")
 
-        if ocr is not None:
-            try:
-                timer_text = ocr.extract_text(frame, region=timer_region)
-                seconds = parse_timer_string(timer_text)
-            except Exception as e:
-                logger.warning(f"OCR failed for timer at ({timer_x}, {timer_y}): {e}")
+    timers: list[dict[str, Any]] = []
+    for (clock_x, clock_y, _), timer_region, timer_text in zip(filtered, timer_regions, timer_texts):
+        seconds: int | None = None
+        if timer_text is not None:
+            seconds = parse_timer_string(timer_text)
 
         timers.append({
             "clock_pos": (clock_x, clock_y),
@@ -469,51 +471,20 @@ def find_claim_buttons_with_score(frame: npt.NDArray[Any], template: npt.NDArray
     Returns (list of (x, y) click positions, best_score).
     best_score is the minimum score found (lower = better match for SQDIFF_NORMED).
     """
-    # Extract column ROI
-    column_roi = frame[:, CLAIM_X_START:CLAIM_X_END]
-
-    result = cv2.matchTemplate(column_roi, template, cv2.TM_SQDIFF_NORMED)
-
-    # Get best score in the entire search region (for debugging)
-    best_score = float(result.min())
-
-    # Find all matches below threshold
-    locations = np.where(result < CLAIM_THRESHOLD)
-
-    if len(locations[0]) == 0:
-        return [], best_score
-
-    # Get template dimensions for click center calculation
-    th, tw = template.shape[:2]
-
-    # Collect all match positions with scores
-    matches = []
-    for y, x in zip(locations[0], locations[1]):
-        score = result[y, x]
-        # Convert back to full frame coordinates
-        full_x = CLAIM_X_START + x + tw // 2
-        full_y = y + th // 2
-        matches.append((full_x, full_y, score))
-
-    # Sort by Y position
-    matches.sort(key=lambda m: m[1])
-
-    # Non-maximum suppression - keep distinct Y positions (min spacing 100px)
-    filtered: list[tuple[int, int]] = []
-    min_spacing = 100
-
-    for full_x, full_y, score in matches:
-        # Check if this Y is far enough from all kept positions
-        is_distinct = True
-        for _, kept_y in filtered:
-            if abs(full_y - kept_y) < min_spacing:
-                is_distinct = False
-                break
-
-        if is_distinct:
-            filtered.append((full_x, full_y))
+    # Column search, one hit per row (min spacing 100px vertically)
+    column = (CLAIM_X_START, 0, CLAIM_X_END - CLAIM_X_START, frame.shape[0])
+    hits = find_all_templates(
+        frame, template, search_region=column, threshold=CLAIM_THRESHOLD,
+        min_distance=(column[2], 100), sort_by="y",
+    )
+    if hits:
+        best_score = min(score for _, _, score in hits)
+    else:
+        # Nothing under threshold: the closest miss is still worth logging
+        roi = frame[:, CLAIM_X_START:CLAIM_X_END]
+        best_score = float(cv2.matchTemplate(roi, template, cv2.TM_SQDIFF_NORMED).min())
 
-    return filtered, best_score
+    return [(x, y) for x, y, _ in hits], best_score
 
 
 def find_gold_scroll_go_buttons(frame: npt.NDArray[Any]) -> list[tuple[int, int]]:
@@ -525,40 +496,26 @@ def find_gold_scroll_go_buttons(frame: npt.NDArray[Any]) -> list[tuple[int, int]
     2. Use quest row Y from each scroll with fixed Go column X
     3. Return click positions sorted top-to-bottom
     """
-    gold_scroll_template = load_template_color(GOLD_SCROLL_TEMPLATE)
-    gold_scroll_mask = cv2.imread(GOLD_SCROLL_MASK, cv2.IMREAD_GRAYSCALE)
-
-    # Find all gold scroll positions using masked matching (TM_CCORR_NORMED - higher is better)
-    scroll_result = cv2.matchTemplate(frame, gold_scroll_template, cv2.TM_CCORR_NORMED, mask=gold_scroll_mask)
-    scroll_locations = np.where(scroll_result >= GOLD_SCROLL_THRESHOLD)
+    # Masked matching (gold_scroll_mask_4k.png is picked up automatically),
+    # only where an icon center can fall: the quest icon column of the list
+    scroll_h, scroll_w = load_template_color(GOLD_SCROLL_TEMPLATE).shape[:2]
+    icon_area = (
+        QUEST_ICON_X_MIN - scroll_w // 2, QUEST_LIST_Y_MIN - scroll_h // 2,
+        QUEST_ICON_X_MAX - QUEST_ICON_X_MIN + scroll_w, QUEST_LIST_Y_MAX - QUEST_LIST_Y_MIN + scroll_h,
+    )
+    # Masked score is 1 - correlation (lower=better); min spacing 100px
+    hits = find_all_templates(
+        frame, Path(GOLD_SCROLL_TEMPLATE).name, search_region=icon_area,
+        threshold=1.0 - GOLD_SCROLL_THRESHOLD, min_distance=100,
+    )
 
-    scroll_h, scroll_w = gold_scroll_template.shape[:2]
-    scrolls = []
-    for y, x in zip(scroll_locations[0], scroll_locations[1]):
-        score = scroll_result[y, x]
-        center_x = x + scroll_w // 2
-        center_y = y + scroll_h // 2
-        if center_x < QUEST_ICON_X_MIN or center_x > QUEST_ICON_X_MAX:
-            continue
-        if center_y < QUEST_LIST_Y_MIN or center_y > QUEST_LIST_Y_MAX:
-            continue
+    filtered_scrolls: list[tuple[int, int, float]] = []
+    for center_x, center_y, score in hits:
         if not _row_has_go_button(frame, center_y):
             continue
-        if not _is_gold_quest_icon(frame, x, y, scroll_w, scroll_h):
+        if not _is_gold_quest_icon(frame, center_x - scroll_w // 2, center_y - scroll_h // 2, scroll_w, scroll_h):
             continue
-        scrolls.append((x, center_y, score))
-
-    # Non-maximum suppression for scrolls (min spacing 100px)
-    scrolls.sort(key=lambda s: -s[2])  # Sort by score (highest first for CCORR)
-    filtered_scrolls: list[tuple[Any, Any, Any]] = []
-    for x, y, score in scrolls:
-        is_distinct = True
-        for fx, fy, _ in filtered_scrolls:
-            if abs(y - fy) < 100 and abs(x - fx) < 100:
-                is_distinct = False
-                break
-        if is_distinct:
-            filtered_scrolls.append((x, y, score))
+        filtered_scrolls.append((center_x, center_y, score))
 
     if not filtered_scrolls:
         return []
@@ -632,35 +589,18 @@ def find_question_mark_go_buttons(frame: npt.NDArray[Any]) -> list[tuple[int, in
         logger.warning("Question mark tile template not found")
         return []
 
-    # Find all question mark tile positions (COLOR)
-    tile_result = cv2.matchTemplate(frame, question_mark_template, cv2.TM_SQDIFF_NORMED)
-    tile_locations = np.where(tile_result < QUESTION_MARK_THRESHOLD)
-
+    # Find all question mark tiles (COLOR) whose center lies in the quest icon
+    # column of the list (min spacing 100px)
     tile_h, tile_w = question_mark_template.shape[:2]
-    tiles = []
-    for y, x in zip(tile_locations[0], tile_locations[1]):
-        score = tile_result[y, x]
-        center_x = x + tile_w // 2
-        center_y = y + tile_h // 2
-        if center_x < QUEST_ICON_X_MIN or center_x > QUEST_ICON_X_MAX:
-            continue
-        if center_y < QUEST_LIST_Y_MIN or center_y > QUEST_LIST_Y_MAX:
-            continue
-        if not _row_has_go_button(frame, center_y):
-            continue
-        tiles.append((x, center_y, score))
-
-    # Non-maximum suppression for tiles (min spacing 100px)
-    tiles.sort(key=lambda t: t[2])  # Sort by score
-    filtered_tiles: list[tuple[Any, Any, Any]] = []
-    for x, y, score in tiles:
-        is_distinct = True
-        for fx, fy, _ in filtered_tiles:
-            if abs(y - fy) < 100 and abs(x - fx) < 100:
-                is_distinct = False
-                break
-        if is_distinct:
-            filtered_tiles.append((x, y, score))
+    icon_area = (
+        QUEST_ICON_X_MIN - tile_w // 2, QUEST_LIST_Y_MIN - tile_h // 2,
+        QUEST_ICON_X_MAX - QUEST_ICON_X_MIN + tile_w, QUEST_LIST_Y_MAX - QUEST_LIST_Y_MIN + tile_h,
+    )
+    hits = find_all_templates(
+        frame, question_mark_template, search_region=icon_area,
+        threshold=QUESTION_MARK_THRESHOLD, min_distance=100,
+    )
+    filtered_tiles = [(x, y, score) for x, y, score in hits if _row_has_go_button(frame, y)]
 
     if not filtered_tiles:
         return []
@@ -40,6 +40,7 @@ if TYPE_CHECKING:
     from utils.adb_helper import ADBHelper
 
 from utils.windows_screenshot_helper import WindowsScreenshotHelper
+from utils.frame_bus import settle
 from utils.view_state_detector import detect_view, ViewState
 from utils.template_matcher import match_template
 from utils.debug_screenshot import save_debug_screenshot
@@ -113,36 +114,28 @@ def union_gifts_flow(adb: ADBHelper) -> bool:
     # Step 1: Click Union button
     _log(f"Step 1: Clicking Union button at {UNION_BUTTON_CLICK}")
     adb.tap(*UNION_BUTTON_CLICK, source="flow:union_gifts:union_button")
-    time.sleep(SCREEN_TRANSITION_DELAY)
-
-    frame = win.get_screenshot_cv2()
+    frame = settle(win.get_screenshot_cv2, SCREEN_TRANSITION_DELAY, "union_gifts:union_panel")
     if frame is not None:
         _save_debug_screenshot(frame, "01_after_union_click")
 
     # Step 2: Click Union Rally Gifts
     _log(f"Step 2: Clicking Union Rally Gifts at {UNION_RALLY_GIFTS_CLICK}")
     adb.tap(*UNION_RALLY_GIFTS_CLICK, source="flow:union_gifts:rally_gifts")
-    time.sleep(SCREEN_TRANSITION_DELAY)
-
-    frame = win.get_screenshot_cv2()
+    frame = settle(win.get_screenshot_cv2, SCREEN_TRANSITION_DELAY, "union_gifts:rally_gifts")
     if frame is not None:
         _save_debug_screenshot(frame, "02_after_rally_gifts_click")
 
     # Step 3: Click Loot Chest tab
     _log(f"Step 3: Clicking Loot Chest tab at {LOOT_CHEST_TAB_CLICK}")
     adb.tap(*LOOT_CHEST_TAB_CLICK, source="flow:union_gifts:loot_chest_tab")
-    time.sleep(CLICK_DELAY)
-
-    frame = win.get_screenshot_cv2()
+    frame = settle(win.get_screenshot_cv2, CLICK_DELAY, "union_gifts:loot_chest_tab")
     if frame is not None:
         _save_debug_screenshot(frame, "03_after_loot_chest_tab")
 
     # Step 4: Click Claim All (for loot chests)
     _log(f"Step 4: Clicking Claim All at {LOOT_CHEST_CLAIM_ALL_CLICK}")
     adb.tap(*LOOT_CHEST_CLAIM_ALL_CLICK, source="flow:union_gifts:claim_all_loot")
-    time.sleep(CLAIM_DELAY)
-
-    frame = win.get_screenshot_cv2()
+    frame = settle(win.get_screenshot_cv2, CLAIM_DELAY, "union_gifts:claim_loot")
     if frame is not None:
         _save_debug_screenshot(frame, "04_after_loot_claim")
 
@@ -161,9 +154,7 @@ def union_gifts_flow(adb: ADBHelper) -> bool:
     # Step 6: Click Claim All ONCE (for rare gifts)
     _log(f"Step 6: Clicking Claim All at {RARE_GIFTS_CLAIM_ALL_CLICK}")
     adb.tap(*RARE_GIFTS_CLAIM_ALL_CLICK, source="flow:union_gifts:claim_all_rare")
-    time.sleep(CLAIM_DELAY)
-
-    frame = win.get_screenshot_cv2()
+    frame = settle(win.get_screenshot_cv2, CLAIM_DELAY, "union_gifts:claim_rare")
     if frame is not None:
         _save_debug_screenshot(frame, "06_after_rare_claim")
 
@@ -776,6 +776,14 @@ class IconDaemon:
 
         print(f"  OK - All {len(required_templates)} templates verified")
 
+        from utils.template_matcher import get_template_registry
+        pack = get_template_registry().pack
+        if pack is not None:
+            stats = pack.stats()
+            print(f"  Template pack mapped: {stats['files']} templates, {stats['mapped_bytes'] / 1e6:.0f} MB")
+        else:
+            print("  No template pack - decoding PNGs (build: python scripts/build_template_pack.py)")
+
     def _kill_other_daemon_instances(self) -> None:
         """Kill any OTHER icon_daemon python processes before binding ports.
 
@@ -897,8 +905,8 @@ class IconDaemon:
         except Exception as _e:
             print(f"  Action capture unavailable: {_e}")
 
-        # Stamina OCR (via OCR server)
-        self.ocr_client = OCRClient()
+        # Stamina OCR (via OCR server) - periodic tracker reads queue behind flow reads
+        self.ocr_client = OCRClient(priority="background")
         print("  OCR client initialized (uses OCR server)")
 
         # Load persisted Arms Race event data (chest thresholds)
@@ -990,49 +998,82 @@ class IconDaemon:
                         return found, score, None
                     return fn
 
+                def _roi(m: Any) -> tuple[int, int, int, int]:
+                    """A fixed-spot matcher's search region: the detector reuses
+                    its last reading while those pixels are unchanged."""
+                    return (m.ICON_X, m.ICON_Y, m.ICON_WIDTH, m.ICON_HEIGHT)
+
+                from utils.under_attack_matcher import UNDER_ATTACK_POSITION, UNDER_ATTACK_SIZE
+                from utils.bloodlust_matcher import BLOODLUST_POSITION, BLOODLUST_SIZE
+                from utils.shield_active_matcher import SHIELD_ACTIVE_POSITION, SHIELD_ACTIVE_SIZE
+
+                # Cadence: fast-decaying on-sight targets run every tick at high
+                # priority; slow/rare ones back off while absent. Specs the loop
+                # reads via _perceive (max_age 4s) keep max_interval <= 2s so
+                # their readings never go stale into the inline fallback.
                 TOWN, WORLD = ViewState.TOWN, ViewState.WORLD
+                BUBBLE_MIN, BUBBLE_MAX = 1.0, 2.0   # on-screen bubbles: 1s, backing off to 2s
                 _specs = [
                     # --- on-sight opportunities (Phase 1) ---
-                    DetectorSpec("rally_march", {TOWN, WORLD}, _march_fn),
-                    DetectorSpec("cobra_icon", {WORLD},
-                                 lambda f: match_template(f, "cobra_icon_4k.png",
-                                                          search_region=(20, 1380, 580, 210), threshold=0.08)),
-                    DetectorSpec("sandstorm", {WORLD},
-                                 lambda f: match_template(f, "sandstorm_rally_4k.png",
-                                                          search_region=(30, 1428, 520, 104), threshold=0.10)),
-                    DetectorSpec("assist_helmet", {WORLD}, _find_helmet),
-                    DetectorSpec("map_gift_box", {WORLD},
-                                 lambda f: match_template(f, "map_gift_box_4k.png", threshold=0.05)),
+                    DetectorSpec("rally_march", {TOWN, WORLD}, _march_fn, priority=10),
+                    DetectorSpec.template("cobra_icon", {WORLD}, "cobra_icon_4k.png",
+                                          search_region=(20, 1380, 580, 210), threshold=0.08, priority=5),
+                    DetectorSpec.template("sandstorm", {WORLD}, "sandstorm_rally_4k.png",
+                                          search_region=(30, 1428, 520, 104), threshold=0.10, priority=5),
+                    DetectorSpec("assist_helmet", {WORLD}, _find_helmet, priority=5),
+                    # full-frame search for a rare target: back off to 8s while absent
+                    DetectorSpec.template("map_gift_box", {WORLD}, "map_gift_box_4k.png", threshold=0.05,
+                                          min_interval=1.0, max_interval=8.0, priority=-5),
                     # Union-heal toolbar slot (fixed strip right of the magnifier):
                     # scanned CONTINUOUSLY in ANY view - the icons appear in both
                     # TOWN and WORLD and must be clicked on sight (user spec).
-                    DetectorSpec("union_briefcase", None,
-                                 lambda f: match_template(f, "assist_help_briefcase_4k.png",
-                                                          search_region=(120, 1400, 220, 200), threshold=0.03)),
-                    DetectorSpec("union_helmet", None,
-                                 lambda f: match_template(f, "assist_help_helmet_4k.png",
-                                                          search_region=(120, 1400, 220, 200), threshold=0.03)),
-                    DetectorSpec("union_handshake", None,
-                                 lambda f: match_template(f, "assist_help_handshake_4k.png",
-                                                          search_region=(120, 1400, 220, 200), threshold=0.03)),
+                    DetectorSpec.template("union_briefcase", None, "assist_help_briefcase_4k.png",
+                                          search_region=(120, 1400, 220, 200), threshold=0.03, priority=5),
+                    DetectorSpec.template("union_helmet", None, "assist_help_helmet_4k.png",
+                                          search_region=(120, 1400, 220, 200), threshold=0.03, priority=5),
+                    DetectorSpec.template("union_handshake", None, "assist_help_handshake_4k.png",
+                                          search_region=(120, 1400, 220, 200), threshold=0.03, priority=5),
                     # --- stateless fixed-spot icons (C1 migration) ---
-                    DetectorSpec("handshake", None, _p2(self.handshake_matcher.is_present)),  # any view
-                    DetectorSpec("treasure_map", {TOWN, WORLD}, _p2(self.treasure_matcher.is_present)),
-                    DetectorSpec("harvest_box", {TOWN}, _p2(self.harvest_box_matcher.is_present)),
-                    DetectorSpec("afk_rewards", {TOWN}, _p2(self.afk_rewards_matcher.is_present)),
-                    DetectorSpec("dog_house_aligned", {TOWN}, _p2(self.dog_house_matcher.is_aligned)),
+                    DetectorSpec("handshake", None, _p2(self.handshake_matcher.is_present),
+                                 region=_roi(self.handshake_matcher)),  # any view
+                    DetectorSpec("treasure_map", {TOWN, WORLD}, _p2(self.treasure_matcher.is_present),
+                                 region=_roi(self.treasure_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
+                    DetectorSpec("harvest_box", {TOWN}, _p2(self.harvest_box_matcher.is_present),
+                                 region=_roi(self.harvest_box_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
+                    DetectorSpec("afk_rewards", {TOWN}, _p2(self.afk_rewards_matcher.is_present),
+                                 region=_roi(self.afk_rewards_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
+                    DetectorSpec("dog_house_aligned", {TOWN}, _p2(self.dog_house_matcher.is_aligned),
+                                 region=self.dog_house_matcher.REGION),
                     # --- TOWN harvest bubbles ---
-                    DetectorSpec("corn", {TOWN}, _p2(self.corn_matcher.is_present)),
-                    DetectorSpec("gold_coin", {TOWN}, _p2(self.gold_matcher.is_present)),
-                    DetectorSpec("iron_bar", {TOWN}, _p2(self.iron_matcher.is_present)),
-                    DetectorSpec("gem", {TOWN}, _p2(self.gem_matcher.is_present)),
-                    DetectorSpec("cabbage", {TOWN}, _p2(self.cabbage_matcher.is_present)),
-                    DetectorSpec("equipment", {TOWN}, _p2(self.equipment_enhancement_matcher.is_present)),
+                    DetectorSpec("corn", {TOWN}, _p2(self.corn_matcher.is_present),
+                                 region=_roi(self.corn_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
+                    DetectorSpec("gold_coin", {TOWN}, _p2(self.gold_matcher.is_present),
+                                 region=_roi(self.gold_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
+                    DetectorSpec("iron_bar", {TOWN}, _p2(self.iron_matcher.is_present),
+                                 region=_roi(self.iron_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
+                    DetectorSpec("gem", {TOWN}, _p2(self.gem_matcher.is_present),
+                                 region=_roi(self.gem_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
+                    DetectorSpec("cabbage", {TOWN}, _p2(self.cabbage_matcher.is_present),
+                                 region=_roi(self.cabbage_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
+                    DetectorSpec("equipment", {TOWN}, _p2(self.equipment_enhancement_matcher.is_present),
+                                 region=_roi(self.equipment_enhancement_matcher),
+                                 min_interval=BUBBLE_MIN, max_interval=BUBBLE_MAX),
                     # --- state monitors (C2): any view; the loop diffs the
                     # snapshot and keeps ownership of broadcasts/current_state ---
-                    DetectorSpec("under_attack", None, _p2(is_under_attack)),
-                    DetectorSpec("bloodlust", None, _p2(is_bloodlust_active)),
-                    DetectorSpec("shield_active", None, _p2(is_shield_active)),
+                    DetectorSpec("under_attack", None, _p2(is_under_attack),
+                                 region=(*UNDER_ATTACK_POSITION, *UNDER_ATTACK_SIZE), priority=8),
+                    DetectorSpec("bloodlust", None, _p2(is_bloodlust_active),
+                                 region=(*BLOODLUST_POSITION, *BLOODLUST_SIZE)),
+                    DetectorSpec("shield_active", None, _p2(is_shield_active),
+                                 region=(*SHIELD_ACTIVE_POSITION, *SHIELD_ACTIVE_SIZE)),
                     DetectorSpec("union_war_panel", None, _p2(self.union_war_panel_detector.is_union_war_panel)),
                 ]
                 # --- stateful trackers (C3): perception is the ONLY writer of
@@ -1100,23 +1141,38 @@ class IconDaemon:
 
                 _trackers = [
                     TrackerSpec("hospital_votes", {TOWN}, 2.0,
-                                self.hospital_matcher.get_state, _hospital_sink),
+                                self.hospital_matcher.get_state, _hospital_sink,
+                                uses_context=True),
                     TrackerSpec("barracks_votes", {TOWN}, 2.0,
-                                _barracks_sample, _barracks_sink),
+                                _barracks_sample, _barracks_sink,
+                                uses_context=True),
                     TrackerSpec("stamina", {TOWN, WORLD}, 2.0,
                                 _stamina_sample, _stamina_sink),
                 ]
 
                 self.opportunity_board = OpportunityBoard()
+                try:
+                    from config import (
+                        DETECTOR_MAX_REUSE_S, DETECTOR_NATIVE_SCALE, DETECTOR_TICK_BUDGET_S,
+                        DETECTOR_TILE_SIZE, DETECTOR_WORKERS,
+                    )
+                except ImportError:
+                    DETECTOR_TILE_SIZE, DETECTOR_MAX_REUSE_S, DETECTOR_WORKERS = 64, 5.0, 1
+                    DETECTOR_TICK_BUDGET_S = None
+                    DETECTOR_NATIVE_SCALE = False
                 self.perception_state = PerceptionState()
                 self.detector_thread = DetectorThread(
                     get_frame_bus(), self.opportunity_board, _specs, win=self.windows_helper,
                     state=self.perception_state, paused_fn=lambda: self.paused,
                     trackers=_trackers,
                     busy_fn=lambda: self.critical_flow_active or bool(self.active_flows),
+                    tile_size=DETECTOR_TILE_SIZE, max_reuse_age=DETECTOR_MAX_REUSE_S,
+                    workers=DETECTOR_WORKERS, tick_budget=DETECTOR_TICK_BUDGET_S,
+                    native=DETECTOR_NATIVE_SCALE,
                 )
                 self.detector_thread.start()
-                print(f"  Detector thread: {len(_specs)} specs + {len(_trackers)} trackers, continuous")
+                print(f"  Detector thread: {len(_specs)} specs + {len(_trackers)} trackers, continuous"
+                      f" ({DETECTOR_WORKERS} worker{'s' if DETECTOR_WORKERS != 1 else ''})")
                 self.logger.info(f"DETECTOR: continuous detection started ({len(_specs)} specs, {len(_trackers)} trackers)")
             except Exception as e:
                 self.logger.error(f"DETECTOR: failed to start ({e}) - falling back to inline scanning")
@@ -1626,7 +1682,7 @@ class IconDaemon:
 
             self.active_flows.add(flow_name)
 
-        thread = threading.Thread(target=wrapper, daemon=True)
+        thread = threading.Thread(target=wrapper, daemon=True, name=f"flow:{flow_name}")
         if critical:
             with self.flow_lock:
                 self.critical_flow_thread = thread
@@ -1664,7 +1720,7 @@ class IconDaemon:
         OCRClient._auto_start_attempted = False
         if start_ocr_server():
             self.logger.info("OCR server restarted successfully")
-            self.ocr_client = OCRClient()  # Recreate client
+            self.ocr_client = OCRClient(priority="background")  # Recreate client
             return True
         else:
             self.logger.error("OCR server restart FAILED!")
@@ -1864,8 +1920,9 @@ class IconDaemon:
             current_roi = frame[y:y+h, x:x+w]
 
             # Load both templates
-            template_4k = cv2.imread('templates/ground_truth/world_button_4k.png')
-            template_lowres = cv2.imread('templates/ground_truth/world_button_lowres_4k.png')
+            from utils.template_matcher import get_template
+            template_4k = get_template('world_button_4k.png')
+            template_lowres = get_template('world_button_lowres_4k.png')
 
             if template_4k is None or template_lowres is None:  # noqa: E501
                 self.logger.warning(f"[{iteration}] Resolution check: missing templates, falling back to wm size")  # type: ignore[unreachable]
@@ -2629,7 +2686,13 @@ class IconDaemon:
 
         Returns comprehensive status dict for monitoring.
         """
+        from utils.frame_bus import get_frame_bus, settle_stats
+        from utils.frame_pool import get_frame_pool
+        from utils.capture_backend import capture_stats
+        from utils.ocr_client import OCRClient
+
         arms_race = get_arms_race_status()
+        detector, perception = self.detector_thread, self.perception_state
         return {
             "paused": self.paused,
             "active_flows": list(self.active_flows),
@@ -2646,6 +2709,14 @@ class IconDaemon:
             "overlord_first_kill_done": self.scheduler.is_overlord_first_kill_done(),
             "server_port": DAEMON_SERVER_PORT,
             "intent_queue": self.intent_queue.snapshot(),
+            "perception": perception.spec_counters() if perception is not None else None,
+            "detector_ticks": detector.tick_stats() if detector is not None else None,
+            "detector_schedule": detector.schedule() if detector is not None else None,
+            "frame_bus": get_frame_bus().stats(),
+            "frame_pool": get_frame_pool().stats(),
+            "capture": capture_stats(),
+            "settle": settle_stats(),
+            "ocr_cache": OCRClient.cache_stats(),
         }
 
     def set_config(self, key: str, value: Any) -> dict[str, Any]:
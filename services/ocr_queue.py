@@ -0,0 +1,272 @@
+"""
+Inference queue for the OCR server - priority classes, micro-batching,
+per-request deadlines and cancellation.
+
+Request handler threads submit crops as jobs and wait; one scheduler thread
+owns the model. It takes the most urgent queued job, holds a short batching
+window (window_s) for more to arrive, and runs up to max_batch jobs as one
+batched model call. Interactive jobs (flow reads) are always taken before
+background ones (the daemon's stamina tracker); both can share a batch.
+
+A job whose deadline passes while it is still queued is dropped
+(DeadlineExceeded); a job whose client went away is cancelled and never
+reaches the model. A job that is already running finishes - there is no
+aborting a generate() mid-way.
+
+Usage (services/ocr_server.py):
+    queue = InferenceQueue(extract_batch, max_batch=16, window_s=0.01)
+    queue.start()
+    jobs = queue.submit(images, items, priority="background", deadline_s=15)
+    results = queue.wait(jobs, client_gone)   # one result dict per item
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+PRIORITIES = {"interactive": 0, "background": 1}
+
+_WAIT_SAMPLES = 256   # queue-wait samples kept per priority for the percentiles
+
+
+class QueueFull(RuntimeError):
+    """More items queued than max_depth: the caller should retry shortly."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """The job's deadline passed before the model got to it."""
+
+
+class Job:
+    __slots__ = ("priority", "seq", "image", "item", "deadline", "enqueued",
+                 "started", "state", "result", "error", "done")
+
+    def __init__(self, priority: int, seq: int, image: Any, item: dict[str, Any], deadline: float) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.image = image
+        self.item = item
+        self.deadline = deadline
+        self.enqueued = time.monotonic()
+        self.started = 0.0
+        self.state = "queued"          # queued -> running -> done | cancelled | expired
+        self.result: dict[str, Any] | None = None
+        self.error: BaseException | None = None
+        self.done = threading.Event()
+
+    def __lt__(self, other: Job) -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+def _percentile(samples: deque[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(round(q * (len(s) - 1))))]
+
+
+class InferenceQueue:
+    def __init__(
+        self,
+        run_batch: Callable[[list[Any], list[dict[str, Any]]], list[dict[str, Any]]],
+        max_batch: int = 16,
+        window_s: float = 0.01,
+        max_depth: int = 64,
+        lock: Any = None,
+    ) -> None:
+        self.run_batch = run_batch           # (images, items) -> one result dict per item
+        self.max_batch = max(1, max_batch)
+        self.window_s = window_s
+        self.max_depth = max_depth
+        self._model_lock = lock if lock is not None else threading.Lock()
+        self._cond = threading.Condition()
+        self._heap: list[Job] = []
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._depth: dict[int, int] = {p: 0 for p in PRIORITIES.values()}
+        self._waits: dict[int, deque[float]] = {p: deque(maxlen=_WAIT_SAMPLES) for p in PRIORITIES.values()}
+        self.running = 0                     # size of the batch on the model right now
+        self.batches = 0
+        self.completed = 0
+        self.expired = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ocr-scheduler", daemon=True)
+            self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(
+        self,
+        images: list[Any],
+        items: list[dict[str, Any]],
+        priority: str = "interactive",
+        deadline_s: float = 60.0,
+    ) -> list[Job]:
+        """Queue one job per (image, item); raises QueueFull / ValueError."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {sorted(PRIORITIES)}")
+        level = PRIORITIES[priority]
+        deadline = time.monotonic() + deadline_s
+        with self._cond:
+            if sum(self._depth.values()) + len(images) > self.max_depth:
+                self.rejected += len(images)
+                raise QueueFull(f"{sum(self._depth.values())} items queued (max {self.max_depth})")
+            jobs = [Job(level, next(self._seq), image, item, deadline) for image, item in zip(images, items)]
+            for job in jobs:
+                heapq.heappush(self._heap, job)
+            self._depth[level] += len(jobs)
+            self._cond.notify()
+        return jobs
+
+    def cancel(self, jobs: list[Job]) -> int:
+        """Cancel the jobs that have not reached the model yet."""
+        n = 0
+        with self._cond:
+            for job in jobs:
+                if job.state == "queued":
+                    job.state = "cancelled"
+                    self._depth[job.priority] -= 1
+                    job.done.set()
+                    n += 1
+            self.cancelled += n
+        return n
+
+    def wait(
+        self,
+        jobs: list[Job],
+        client_gone: Callable[[], bool] | None = None,
+        poll_s: float = 0.05,
+    ) -> list[dict[str, Any]]:
+        """Block until every job has a result, in order.
+
+        Raises the model call's error if the batch failed, DeadlineExceeded if
+        a job expired in the queue, and ConnectionAbortedError after
+        cancelling the remaining jobs when client_gone() reports the client
+        has disconnected.
+        """
+        for job in jobs:
+            while not job.done.wait(poll_s):
+                if client_gone is not None and client_gone():
+                    self.cancel(jobs)
+                    raise ConnectionAbortedError("client disconnected while its OCR request was queued")
+                if time.monotonic() > job.deadline and self._expire(job):
+                    self.cancel(jobs)
+                    raise DeadlineExceeded("OCR request deadline passed while queued")
+            if job.state == "expired":
+                self.cancel(jobs)
+                raise DeadlineExceeded("OCR request deadline passed while queued")
+            if job.error is not None:
+                raise job.error
+        return [job.result for job in jobs]  # type: ignore[misc]
+
+    def _expire(self, job: Job) -> bool:
+        with self._cond:
+            if job.state != "queued":
+                return False
+            job.state = "expired"
+            self._depth[job.priority] -= 1
+            self.expired += 1
+            job.done.set()
+            return True
+
+    def _pop_live(self, now: float) -> Job | None:
+        """Next queued job by priority (caller holds the condition); drops
+        cancelled and expired ones on the way."""
+        while self._heap:
+            job = heapq.heappop(self._heap)
+            if job.state != "queued":
+                continue
+            self._depth[job.priority] -= 1
+            if now > job.deadline:
+                job.state = "expired"
+                self.expired += 1
+                job.done.set()
+                continue
+            job.state = "running"
+            job.started = now
+            self._waits[job.priority].append(now - job.enqueued)
+            return job
+        return None
+
+    def _next_batch(self) -> list[Job]:
+        with self._cond:
+            first = None
+            while first is None:
+                first = self._pop_live(time.monotonic())
+                if first is None:
+                    self._cond.wait()
+            batch = [first]
+            window_end = time.monotonic() + self.window_s
+            while len(batch) < self.max_batch:
+                job = self._pop_live(time.monotonic())
+                if job is not None:
+                    batch.append(job)
+                    continue
+                remaining = window_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            self.running = len(batch)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                with self._model_lock:
+                    results = self.run_batch([job.image for job in batch], [job.item for job in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"run_batch returned {len(results)} results for {len(batch)} items")
+                for job, result in zip(batch, results):
+                    job.result = result
+            except BaseException as e:   # surfaced to every waiting handler
+                for job in batch:
+                    job.error = e
+                self.failed += len(batch)
+            with self._cond:
+                self.running = 0
+                self.batches += 1
+                self.completed += len(batch)
+            for job in batch:
+                job.state = "done"
+                job.image = None
+                job.done.set()
+
+    def metrics(self) -> dict[str, Any]:
+        """Queue depth, in-flight batch size and queue-wait percentiles per
+        priority, plus batch/outcome counters."""
+        with self._cond:
+            names = {level: name for name, level in PRIORITIES.items()}
+            return {
+                "depth": {names[p]: d for p, d in self._depth.items()},
+                "running": self.running,
+                "batches": self.batches,
+                "completed": self.completed,
+                "mean_batch": round(self.completed / self.batches, 2) if self.batches else 0.0,
+                "expired": self.expired,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "wait_ms": {
+                    names[p]: {
+                        "p50": round(_percentile(w, 0.5) * 1000, 1),
+                        "p95": round(_percentile(w, 0.95) * 1000, 1),
+                        "n": len(w),
+                    }
+                    for p, w in self._waits.items()
+                },
+                "max_batch": self.max_batch,
+                "window_ms": round(self.window_s * 1000, 1),
+                "scheduler_alive": self.alive,
+            }
@@ -6,6 +6,9 @@ Start the server:
 
 The server listens on port 5123 by default.
 
+Images may be PNG or binary PPM/PGM (raw pixels with a short header - what
+OCRClient sends: it crops client-side and skips PNG encode/decode).
+
 Endpoints:
     POST /ocr - Extract text from image
         Body: multipart/form-data with 'image' file and optional 'prompt', 'region' fields
@@ -15,26 +18,55 @@ Endpoints:
         Body: multipart/form-data with 'image' file and optional 'region' field
         Returns: {"number": 123} or {"number": null}
 
+    POST /ocr/batch - Read N crops in one batched generation
+        Body: multipart/form-data with files 'image0'..'image{N-1}' and an
+              'items' JSON field: [{"mode": "text"|"number", "prompt": ...}, ...]
+        Returns: {"results": [{"text": "..."} | {"number": 123}, ...]}
+
     GET /health - Health check
-        Returns: {"status": "ok", "model_loaded": true}
+        Returns: {"status": "ok", "model_loaded": true, "queue": {depth, running, wait_ms}}
+
+    GET /metrics - Inference queue metrics (depth, batches, wait percentiles, ...)
+
+POST requests may add a 'priority' field ("interactive", the default, or
+"background") and 'deadline_s' (max seconds queued). Requests wait in a
+priority queue for the model (503 only when the queue is full, 504 when the
+deadline passes first); requests arriving together are batched.
 """
 
 import io
 import json
 import base64
+import select
+import socket
+import sys
 from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
 import threading
 import traceback
+from typing import Any
 
 import torch
 from transformers import Qwen3VLForConditionalGeneration, AutoProcessor
 from PIL import Image
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from services.ocr_queue import PRIORITIES, DeadlineExceeded, InferenceQueue, QueueFull
+
 # Server config
 HOST = "127.0.0.1"
 PORT = 5123
 MAX_REQUEST_BYTES = 8 * 1024 * 1024
-MAX_IN_FLIGHT_REQUESTS = 4
+MAX_BATCH_ITEMS = 16
+
+# Inference queue (services/ocr_queue.py): every request waits its turn on the
+# model instead of being refused. Interactive reads go before background ones;
+# requests queued within BATCH_WINDOW_S share one model call.
+MAX_QUEUED_ITEMS = 64          # beyond this, 503 "Server busy"
+BATCH_WINDOW_S = 0.01
+# Seconds a request may wait in the queue, per priority, unless it sends its
+# own 'deadline_s' (a background stamina read is worthless once stale)
+DEADLINE_S = {"interactive": 60.0, "background": 15.0}
 
 # Common Windows socket disconnect errors
 _CLIENT_DISCONNECT_WINERRORS = {10053, 10054}
@@ -43,7 +75,6 @@ _CLIENT_DISCONNECT_WINERRORS = {10053, 10054}
 model = None
 processor = None
 model_lock = threading.Lock()
-request_slots = threading.BoundedSemaphore(MAX_IN_FLIGHT_REQUESTS)
 inference_healthy = True
 inference_last_error = ""
 
@@ -78,6 +109,8 @@ def load_model():
     )
 
     processor = AutoProcessor.from_pretrained(MODEL_ID)
+    # Batched generation appends new tokens after each row: pad on the left
+    processor.tokenizer.padding_side = "left"
     inference_healthy = True
     inference_last_error = ""
     print("Model loaded successfully!")
@@ -89,30 +122,34 @@ _EMPTY_CACHE_EVERY = 100
 _inference_count = 0
 
 
-def extract_text(image: Image.Image, prompt: str = None, max_new_tokens: int = 128) -> str:
-    """Extract text from image using Qwen."""
+TEXT_PROMPT = "Read the text in this image. Return only the text, nothing else."
+NUMBER_PROMPT = "Read the number in this image. Return only the digits, nothing else."
+TEXT_MAX_NEW_TOKENS = 128
+NUMBER_MAX_NEW_TOKENS = 16  # digits only - cap worst-case generation
+
+
+def generate_batch(images: list[Image.Image], prompts: list[str], max_new_tokens: int) -> list[str]:
+    """Run one batched generation: one chat per (image, prompt) pair."""
     global model, processor, _inference_count
 
-    if prompt is None:
-        prompt = "Read the text in this image. Return only the text, nothing else."
-
-    messages = [
-        {
-            "role": "user",
-            "content": [
-                {"type": "image", "image": image},
-                {"type": "text", "text": prompt},
-            ],
-        }
+    texts = [
+        processor.apply_chat_template(
+            [{
+                "role": "user",
+                "content": [
+                    {"type": "image", "image": image},
+                    {"type": "text", "text": prompt},
+                ],
+            }],
+            tokenize=False,
+            add_generation_prompt=True,
+        )
+        for image, prompt in zip(images, prompts)
     ]
 
-    text = processor.apply_chat_template(
-        messages, tokenize=False, add_generation_prompt=True
-    )
-
     inputs = processor(
-        text=[text],
-        images=[image],
+        text=texts,
+        images=images,
         padding=True,
         return_tensors="pt",
     ).to("cuda")
@@ -125,29 +162,107 @@ def extract_text(image: Image.Image, prompt: str = None, max_new_tokens: int = 1
         )
 
     generated_ids = output_ids[:, inputs.input_ids.shape[1]:]
-    result = processor.batch_decode(
+    results = processor.batch_decode(
         generated_ids, skip_special_tokens=True
-    )[0]
+    )
 
     del inputs, output_ids, generated_ids
-    _inference_count += 1
-    if _inference_count % _EMPTY_CACHE_EVERY == 0:
+    _inference_count += len(images)
+    if _inference_count % _EMPTY_CACHE_EVERY < len(images):
         torch.cuda.empty_cache()
 
-    return result.strip()
+    return [r.strip() for r in results]
 
 
-def extract_number(image: Image.Image) -> int | None:
-    """Extract number from image."""
-    text = extract_text(
-        image,
-        prompt="Read the number in this image. Return only the digits, nothing else.",
-        max_new_tokens=16,  # digits only - cap worst-case generation
-    )
+def _digits_to_number(text: str) -> int | None:
     digits = ''.join(c for c in text if c.isdigit())
     return int(digits) if digits else None
 
 
+def extract_text(image: Image.Image, prompt: str = None, max_new_tokens: int = TEXT_MAX_NEW_TOKENS) -> str:
+    """Extract text from image using Qwen."""
+    return generate_batch([image], [prompt or TEXT_PROMPT], max_new_tokens)[0]
+
+
+def extract_number(image: Image.Image) -> int | None:
+    """Extract number from image."""
+    return _digits_to_number(extract_text(image, NUMBER_PROMPT, NUMBER_MAX_NEW_TOKENS))
+
+
+def extract_batch(images: list[Image.Image], items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Read every (image, item) pair, one generation per mode.
+
+    Items are {"mode": "text"|"number", "prompt": optional str}. Number and
+    text items go through separate generate_batch calls so each keeps its
+    own token budget: a number crop never gets the text budget, even when
+    the queue put both modes in one batch. Results keep the items' order.
+    """
+    results: list[dict[str, Any]] = [{} for _ in items]
+    for mode, default_prompt, max_new_tokens in (
+        ("number", NUMBER_PROMPT, NUMBER_MAX_NEW_TOKENS),
+        ("text", TEXT_PROMPT, TEXT_MAX_NEW_TOKENS),
+    ):
+        rows = [i for i, item in enumerate(items) if item["mode"] == mode]
+        if not rows:
+            continue
+        texts = generate_batch([images[i] for i in rows],
+                               [items[i].get("prompt") or default_prompt for i in rows],
+                               max_new_tokens)
+        for i, text in zip(rows, texts):
+            results[i] = {"number": _digits_to_number(text)} if mode == "number" else {"text": text}
+    return results
+
+
+def _decode_image(image_bytes: bytes, name: str = "image") -> Image.Image:
+    """Decode an uploaded image to RGB.
+
+    Accepts PNG/JPEG and binary PPM/PGM (P6/P5) - the raw-pixel crops
+    OCRClient sends, which are a header plus pixel bytes (no decompression).
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as pil_image:
+            return pil_image.convert("RGB")
+    except Exception as e:
+        suffix = "" if name == "image" else f" for {name}"
+        raise ValueError(f"Invalid image data{suffix}") from e
+
+
+inference_queue = InferenceQueue(
+    extract_batch,
+    max_batch=MAX_BATCH_ITEMS,
+    window_s=BATCH_WINDOW_S,
+    max_depth=MAX_QUEUED_ITEMS,
+    lock=model_lock,
+)
+
+
+def _parse_batch_items(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Validate the /ocr/batch 'items' field against the uploaded images."""
+    items = data.get("items")
+    if isinstance(items, str):
+        try:
+            items = json.loads(items)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid items JSON: {e.msg}") from e
+    if not isinstance(items, list) or not items:
+        raise ValueError("items must be a non-empty list")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise ValueError(f"Too many items ({len(items)} > {MAX_BATCH_ITEMS})")
+
+    parsed: list[dict[str, Any]] = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"items[{i}] must be an object")
+        mode = item.get("mode", "text")
+        if mode not in ("text", "number"):
+            raise ValueError(f"items[{i}].mode must be 'text' or 'number'")
+        if f"image{i}" not in data:
+            raise ValueError(f"No image{i} provided")
+        prompt = item.get("prompt")
+        parsed.append({"mode": mode, "prompt": str(prompt) if prompt else None})
+    return parsed
+
+
 def _is_client_disconnect_error(error: Exception) -> bool:
     """Return True when client closed connection before response write completed."""
     if isinstance(error, (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)):
@@ -194,6 +309,14 @@ def _parse_region(region_raw, image_size: tuple[int, int]) -> tuple[int, int, in
 class OCRHandler(BaseHTTPRequestHandler):
     """HTTP request handler for OCR requests."""
 
+    # Keep-alive: OCRClient reuses one connection for many requests. A
+    # connection idle this long (s) is dropped (the client stops reusing
+    # its idle connections sooner). Headers and body go out as separate
+    # writes; without TCP_NODELAY the body waits on the client's delayed ACK.
+    protocol_version = "HTTP/1.1"
+    timeout = 120
+    disable_nagle_algorithm = True
+
     def log_message(self, format, *args):
         """Custom logging."""
         message = format % args
@@ -205,9 +328,17 @@ class OCRHandler(BaseHTTPRequestHandler):
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(payload)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
         self.end_headers()
         self.wfile.write(payload)
 
+    def _read_body(self, content_length: int) -> bytes:
+        """Read the request body; the connection may then serve another request."""
+        body = self.rfile.read(content_length)
+        self.close_connection = not self._keep_alive
+        return body
+
     def parse_multipart(self):
         """Parse multipart/form-data request."""
         content_type = self.headers.get("Content-Type", "")
@@ -226,7 +357,7 @@ class OCRHandler(BaseHTTPRequestHandler):
             if not boundary:
                 raise ValueError("multipart/form-data boundary is empty")
 
-            body = self.rfile.read(content_length)
+            body = self._read_body(content_length)
 
             parts = body.split(b"--" + boundary)
             result = {}
@@ -243,11 +374,8 @@ class OCRHandler(BaseHTTPRequestHandler):
                 headers = part[:header_end].decode(errors="ignore")
                 content = part[header_end + 4:]
 
-                # Remove trailing \r\n--
-                if content.endswith(b"\r\n"):
-                    content = content[:-2]
-                if content.endswith(b"--"):
-                    content = content[:-2]
+                # Remove the CRLF that precedes the next delimiter - only that:
+                # raw pixel data may itself end in "--" or "\r\n"
                 if content.endswith(b"\r\n"):
                     content = content[:-2]
 
@@ -265,7 +393,7 @@ class OCRHandler(BaseHTTPRequestHandler):
             return result
 
         elif "application/json" in content_type:
-            body = self.rfile.read(content_length)
+            body = self._read_body(content_length)
             try:
                 data = json.loads(body)
             except json.JSONDecodeError as e:
@@ -285,13 +413,17 @@ class OCRHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle GET requests."""
         if self.path == "/health":
-            status = "ok" if (model is not None and inference_healthy) else "error"
+            status = "ok" if (model is not None and inference_healthy and inference_queue.alive) else "error"
+            queue = inference_queue.metrics()
             self.send_json({
                 "status": status,
                 "model_loaded": model is not None,
                 "inference_healthy": inference_healthy,
                 "last_error": inference_last_error,
+                "queue": {"depth": queue["depth"], "running": queue["running"], "wait_ms": queue["wait_ms"]},
             })
+        elif self.path == "/metrics":
+            self.send_json(inference_queue.metrics())
         else:
             self.send_json({"error": "Not found"}, 404)
 
@@ -299,13 +431,13 @@ class OCRHandler(BaseHTTPRequestHandler):
         """Handle POST requests."""
         global inference_healthy, inference_last_error
 
-        if self.path not in ("/ocr", "/ocr/number"):
-            self.send_json({"error": "Not found"}, 404)
-            return
+        # Until the body has been read (_read_body), close after responding:
+        # unread body bytes would be parsed as the next request
+        self._keep_alive = not self.close_connection
+        self.close_connection = True
 
-        acquired = request_slots.acquire(blocking=False)
-        if not acquired:
-            self.send_json({"error": "Server busy, retry shortly"}, 503)
+        if self.path not in ("/ocr", "/ocr/number", "/ocr/batch"):
+            self.send_json({"error": "Not found"}, 404)
             return
 
         try:
@@ -315,6 +447,8 @@ class OCRHandler(BaseHTTPRequestHandler):
                 self._handle_ocr(data)
             elif self.path == "/ocr/number":
                 self._handle_ocr_number(data)
+            elif self.path == "/ocr/batch":
+                self._handle_ocr_batch(data)
             else:
                 self.send_json({"error": "Not found"}, 404)
             inference_healthy = True
@@ -325,6 +459,16 @@ class OCRHandler(BaseHTTPRequestHandler):
                 print(f"[OCR] Client disconnected during {self.path}: {e}")
                 return
 
+            if isinstance(e, QueueFull):
+                print(f"[OCR] Queue full on {self.path}: {e}")
+                self.send_json({"error": "Server busy, retry shortly"}, 503)
+                return
+
+            if isinstance(e, DeadlineExceeded):
+                print(f"[OCR] Deadline exceeded on {self.path}: {e}")
+                self.send_json({"error": str(e)}, 504)
+                return
+
             if isinstance(e, ValueError):
                 print(f"[OCR] Bad request on {self.path}: {e}")
                 self.send_json({"error": str(e)}, 400)
@@ -343,8 +487,29 @@ class OCRHandler(BaseHTTPRequestHandler):
                     print(f"[OCR] Client disconnected before error response on {self.path}")
                 else:
                     raise
-        finally:
-            request_slots.release()
+
+    def _client_gone(self) -> bool:
+        """True once the client has closed its connection (it sends nothing
+        else while waiting for this response, so readable means EOF)."""
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and self.connection.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def _infer(
+        self, data: dict[str, Any], images: list[Image.Image], items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Run crops through the inference queue; one result dict per item."""
+        priority = data.get("priority") or "interactive"
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {sorted(PRIORITIES)}")
+        try:
+            deadline_s = float(data.get("deadline_s") or DEADLINE_S[priority])
+        except (TypeError, ValueError) as e:
+            raise ValueError("deadline_s must be a number of seconds") from e
+        jobs = inference_queue.submit(images, items, priority, deadline_s)
+        return inference_queue.wait(jobs, self._client_gone)
 
     def _handle_ocr(self, data):
         """Handle /ocr endpoint."""
@@ -352,12 +517,7 @@ class OCRHandler(BaseHTTPRequestHandler):
             self.send_json({"error": "No image provided"}, 400)
             return
 
-        image_bytes = data["image"]
-        try:
-            with Image.open(io.BytesIO(image_bytes)) as pil_image:
-                image = pil_image.convert("RGB")
-        except Exception as e:
-            raise ValueError("Invalid image data") from e
+        image = _decode_image(data["image"])
 
         try:
             # Apply region crop if specified
@@ -368,11 +528,8 @@ class OCRHandler(BaseHTTPRequestHandler):
             # Get prompt
             prompt = data.get("prompt")
 
-            # Extract text (thread-safe)
-            with model_lock:
-                text = extract_text(image, prompt)
-
-            self.send_json({"text": text})
+            [result] = self._infer(data, [image], [{"mode": "text", "prompt": prompt or None}])
+            self.send_json({"text": result["text"]})
         finally:
             image.close()  # Prevent memory leak
 
@@ -382,12 +539,7 @@ class OCRHandler(BaseHTTPRequestHandler):
             self.send_json({"error": "No image provided"}, 400)
             return
 
-        image_bytes = data["image"]
-        try:
-            with Image.open(io.BytesIO(image_bytes)) as pil_image:
-                image = pil_image.convert("RGB")
-        except Exception as e:
-            raise ValueError("Invalid image data") from e
+        image = _decode_image(data["image"])
 
         try:
             # Apply region crop if specified
@@ -395,15 +547,27 @@ class OCRHandler(BaseHTTPRequestHandler):
             if crop_box:
                 image = image.crop(crop_box)
 
-            # Extract number (thread-safe)
-            with model_lock:
-                number = extract_number(image)
-
-            self.send_json({"number": number})
+            [result] = self._infer(data, [image], [{"mode": "number", "prompt": None}])
+            self.send_json({"number": result["number"]})
         finally:
             image.close()  # Prevent memory leak
 
 
+    def _handle_ocr_batch(self, data: dict[str, Any]) -> None:
+        """Handle /ocr/batch endpoint."""
+        items = _parse_batch_items(data)
+
+        images: list[Image.Image] = []
+        try:
+            for i in range(len(items)):
+                images.append(_decode_image(data[f"image{i}"], f"image{i}"))
+
+            self.send_json({"results": self._infer(data, images, items)})
+        finally:
+            for image in images:
+                image.close()  # Prevent memory leak
+
+
 def main():
     """Start the OCR server."""
     print("=" * 60)
@@ -412,6 +576,7 @@ def main():
 
     # Load model
     load_model()
+    inference_queue.start()
 
     # Start server
     server = ThreadingHTTPServer((HOST, PORT), OCRHandler)
@@ -420,7 +585,9 @@ def main():
     print("Endpoints:")
     print("  POST /ocr        - Extract text from image")
     print("  POST /ocr/number - Extract number from image")
+    print("  POST /ocr/batch  - Read several crops in one generation")
     print("  GET  /health     - Health check")
+    print("  GET  /metrics    - Inference queue metrics")
     print("\nPress Ctrl+C to stop")
 
     try:
@@ -5,7 +5,8 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Generator
+import time
+from typing import TYPE_CHECKING, Any, Callable, Generator
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -21,6 +22,8 @@ sys.path.insert(0, str(project_root))
 if TYPE_CHECKING:
     import numpy.typing as npt
 
+    from utils.opportunity_detector import DetectorThread
+
 
 # =============================================================================
 # Action Capture — force-disabled for the whole test suite
@@ -158,6 +161,67 @@ def mock_detect_view_world() -> Generator[MagicMock, None, None]:
         yield mock
 
 
+# =============================================================================
+# Detector Fixtures
+# =============================================================================
+
+class DetectorClock:
+    """Stands in for the `time` module inside opportunity_detector: wall time
+    is set by the test, perf_counter stays real, pacing sleeps are skipped."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        pass
+
+
+class CountingSpec:
+    """DetectorSpec fn that counts its calls and returns a fixed reading,
+    after sleeping `delay` s (releases the GIL, like cv2.matchTemplate)."""
+
+    def __init__(self, found: bool = True, score: float = 0.5,
+                 center: tuple[int, int] | None = None, delay: float = 0.0) -> None:
+        self.found = found
+        self.score = score
+        self.center = center
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, f: Any) -> tuple[bool, float, tuple[int, int] | None]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self.found, self.score, self.center
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> DetectorClock:
+    """Fake wall clock for utils.opportunity_detector."""
+    from utils import opportunity_detector
+    c = DetectorClock()
+    monkeypatch.setattr(opportunity_detector, "time", c)
+    return c
+
+
+@pytest.fixture
+def detector_tick(clock: DetectorClock) -> Callable[..., None]:
+    """detector_tick(det, frame=None, dt=0.5): advance the clock by dt,
+    publish `frame` (default: a blank 64x64 frame) on the detector's bus at
+    the clock's time and run one detector tick."""
+    def _tick(det: DetectorThread, frame: npt.NDArray[np.uint8] | None = None, dt: float = 0.5) -> None:
+        clock.now += dt
+        det.bus.publish(frame if frame is not None else np.zeros((64, 64, 3), np.uint8), ts=clock.now)
+        det._tick()
+    return _tick
+
+
 # =============================================================================
 # OCR Mock Fixtures
 # =============================================================================
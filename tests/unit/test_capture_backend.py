@@ -0,0 +1,165 @@
+"""Unit tests for utils/capture_backend.py (CaptureBackend + ReplayBackend)."""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.capture_backend import (ReplayBackend, bgrx_to_bgr, bgrx_view, capture_stats, capture_tag,
+                                   mostly_black)
+from utils.frame_bus import get_frame_bus
+
+
+def _write(path: Path, value: int, size: tuple[int, int] = (2160, 3840)) -> Path:
+    cv2.imwrite(str(path), np.full((*size, 3), value, np.uint8))
+    return path
+
+
+@pytest.fixture
+def frame_dir(tmp_path: Path) -> Path:
+    for i, value in enumerate((40, 80, 120)):
+        _write(tmp_path / f"frame_{i:02d}.png", value)
+    return tmp_path
+
+
+def test_directory_replay_in_order_then_eof(frame_dir: Path) -> None:
+    src = ReplayBackend.from_directory(frame_dir)
+    got = [int(src.get_screenshot_cv2()[0, 0, 0]) for _ in range(3)]
+    assert got == [40, 80, 120]
+    assert src.exhausted
+    with pytest.raises(EOFError):
+        src.get_screenshot_cv2()
+    src.rewind()
+    assert int(src.get_screenshot_cv2()[0, 0, 0]) == 40
+
+
+def test_loop_and_publish_to_bus(frame_dir: Path) -> None:
+    src = ReplayBackend.from_directory(frame_dir, loop=True)
+    for _ in range(4):
+        frame = src.get_screenshot_cv2()
+    assert not src.exhausted
+    latest = get_frame_bus().latest()
+    assert latest is not None and latest[0] is frame
+    assert int(frame[0, 0, 0]) == 40
+
+
+class _GovernedReplay(ReplayBackend):
+    GOVERNOR_MAX_AGE = 5.0
+
+
+def test_governor_serves_fresh_bus_frame_and_stats_per_caller(frame_dir: Path) -> None:
+    get_frame_bus().publish(np.zeros((1010, 1792, 3), np.uint8))   # native-scale: never served
+    src = _GovernedReplay.from_directory(frame_dir)
+    with capture_tag("test:governor"):
+        first = src.get_screenshot_cv2()
+        again = src.get_screenshot_cv2()                # a fresh 4K frame is on the bus
+        forced = src.get_screenshot_cv2(fresh=True)
+    assert again is first and src.served == 2
+    assert int(first[0, 0, 0]) == 40 and int(forced[0, 0, 0]) == 80
+
+    stats = capture_stats()["test:governor"]
+    assert stats["calls"] == 3 and stats["reused"] == 1
+    assert stats["work_p50_ms"] >= 0.0 and "wait_p95_ms" in stats
+    assert capture_stats()["captures_per_s"] > 0
+
+
+def test_small_frames_scaled_to_4k(tmp_path: Path) -> None:
+    _write(tmp_path / "half.jpg", 100, size=(1080, 1920))
+    src = ReplayBackend.from_directory(tmp_path, loop=True)
+    assert src.get_screenshot_cv2().shape == (2160, 3840, 3)
+    assert src.get_screenshot_cv2(native=True).shape == (1010, 1792, 3)
+
+
+def test_corrupt_recorded_frame_is_skipped_and_not_published(tmp_path: Path) -> None:
+    _write(tmp_path / "a.png", 0)          # all black: an unwritten PrintWindow capture
+    _write(tmp_path / "b.png", 90)
+    frame = ReplayBackend.from_directory(tmp_path).get_screenshot_cv2()
+    assert int(frame[0, 0, 0]) == 90
+    latest = get_frame_bus().latest()
+    assert latest is not None and latest[0] is frame
+
+
+def test_rate_paces_frames(frame_dir: Path) -> None:
+    src = ReplayBackend.from_directory(frame_dir, rate=20.0)
+    start = time.monotonic()
+    for _ in range(3):
+        src.get_screenshot_cv2()
+    assert time.monotonic() - start >= 0.09   # 3 frames at 20/s: two 50ms gaps
+
+
+def test_session_replay_before_and_after_shots(tmp_path: Path) -> None:
+    session = tmp_path / "20250101_120000"
+    session.mkdir()
+    records = []
+    for seq, (before, afters) in enumerate([(10, [11, 12]), (20, [21])]):
+        prefix = f"{seq:08d}"
+        _write(session / f"{prefix}_before.png", before, size=(1080, 1920))
+        after_paths = []
+        for k, v in enumerate(afters):
+            _write(session / f"{prefix}_after_{k:02d}.png", v, size=(1080, 1920))
+            after_paths.append(f"screenshots/action_capture/{session.name}/{prefix}_after_{k:02d}.png")
+        records.append({"seq": seq, "ts": 100.0 + seq,
+                        "before_shot": f"screenshots/action_capture/{session.name}/{prefix}_before.png",
+                        "after_shots": after_paths})
+    # written out of order, like the async after-burst completion
+    (session / "actions.jsonl").write_text("\n".join(json.dumps(r) for r in reversed(records)) + "\n")
+
+    src = ReplayBackend.from_session(session)
+    assert [int(src.get_screenshot_cv2()[0, 0, 0]) for _ in range(5)] == [10, 11, 12, 20, 21]
+    assert len(ReplayBackend.from_session(session, after=False).frames) == 2
+
+
+def _raw_bgrx(width: int, height: int, seed: int = 0) -> bytes:
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 4), dtype=np.uint8).tobytes()
+
+
+def _pil_path(raw: bytes, width: int, height: int, borders: tuple[int, int, int, int]) -> np.ndarray:
+    """The pre-bgrx_to_bgr conversion: PIL frombuffer/crop, resize, RGB->BGR."""
+    left, top, right, bottom = borders
+    img = Image.frombuffer("RGB", (width, height), raw, "raw", "BGRX", 0, 1)
+    img = img.crop((left, top, width - right, height - bottom))
+    rgb = cv2.resize(np.array(img), (3840, 2160), interpolation=cv2.INTER_LINEAR)
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+
+def test_bgrx_conversion_matches_pil_path() -> None:
+    raw = _raw_bgrx(1822, 1040)
+    borders = (0, 30, 30, 0)
+    frame = bgrx_to_bgr(raw, 1822, 1040, borders)
+    assert frame.shape == (2160, 3840, 3)
+    assert np.array_equal(frame, _pil_path(raw, 1822, 1040, borders))
+
+
+def test_bgrx_conversion_reuses_buffers() -> None:
+    raw = _raw_bgrx(400, 230, seed=1)
+    out = np.empty((2160, 3840, 3), np.uint8)
+    scratch = np.empty((200, 370, 3), np.uint8)
+    frame = bgrx_to_bgr(raw, 400, 230, (0, 30, 30, 0), out=out, scratch=scratch)
+    assert frame is out
+    assert np.array_equal(scratch, np.frombuffer(raw, np.uint8).reshape(230, 400, 4)[30:, :370, :3])
+    with pytest.raises(ValueError):
+        bgrx_to_bgr(raw[:-4], 400, 230)
+
+
+def _old_guard(frame: np.ndarray) -> bool:
+    """The pre-mostly_black guard: full gray + 256x144 INTER_AREA resize."""
+    small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (256, 144), interpolation=cv2.INTER_AREA)
+    return float((small <= ReplayBackend.CORRUPT_DARK_MAX).mean()) >= ReplayBackend.CORRUPT_ALLBLACK_FRAC
+
+
+@pytest.mark.parametrize("lit_rows", [0, 50, 150, 200, 250, 1000, 2160])
+def test_mostly_black_matches_full_frame_guard(lit_rows: int) -> None:
+    frame = np.zeros((2160, 3840, 3), np.uint8)
+    frame[2160 - lit_rows:] = 150                  # content only in the bottom rows
+    expected = _old_guard(frame)
+    args = (ReplayBackend.CORRUPT_DARK_MAX, ReplayBackend.CORRUPT_ALLBLACK_FRAC)
+    assert mostly_black(frame, *args) is expected
+    # Same verdict on the raw BGRX capture buffer before the 4K upscale.
+    small = cv2.resize(frame, (1792, 1010), interpolation=cv2.INTER_AREA)
+    raw = cv2.cvtColor(np.pad(small, ((30, 0), (0, 30), (0, 0))), cv2.COLOR_BGR2BGRA).tobytes()
+    assert mostly_black(bgrx_view(raw, 1822, 1040, (0, 30, 30, 0)), *args) is expected
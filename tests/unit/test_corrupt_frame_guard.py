@@ -91,6 +91,7 @@ def test_detector_premise() -> None:
 
 def test_retry_returns_first_clean_frame(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr("utils.windows_screenshot_helper.time.sleep", lambda *_: None)
+    monkeypatch.setattr(WindowsScreenshotHelper, "GOVERNOR_MAX_AGE", None)  # always capture
     clean = _bright_frame()
     frames = [_bright_frame_with_band(), _bright_frame_with_band(), clean]
     calls = {"n": 0}
@@ -108,6 +109,7 @@ def test_retry_returns_first_clean_frame(monkeypatch: pytest.MonkeyPatch) -> Non
 
 def test_retry_gives_up_returns_last(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr("utils.windows_screenshot_helper.time.sleep", lambda *_: None)
+    monkeypatch.setattr(WindowsScreenshotHelper, "GOVERNOR_MAX_AGE", None)  # always capture
     calls = {"n": 0}
 
     def fake_once(self: WindowsScreenshotHelper) -> np.ndarray:
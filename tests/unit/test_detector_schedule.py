@@ -0,0 +1,67 @@
+"""Unit tests for DetectorSpec cadence (min/max interval, backoff, priority)
+and the DetectorThread tick budget."""
+from __future__ import annotations
+
+from typing import Callable
+
+import pytest
+
+from tests.conftest import CountingSpec
+from utils.frame_bus import FrameBus
+from utils.opportunity_detector import DetectorSpec, DetectorThread, OpportunityBoard
+
+
+def test_backoff_while_absent_and_reset_on_sighting(detector_tick: Callable[..., None]) -> None:
+    fn = CountingSpec(found=False)
+    spec = DetectorSpec("gift", None, fn, min_interval=1.0, max_interval=4.0)
+    bus = FrameBus()
+    det = DetectorThread(bus, OpportunityBoard(), [spec], tick_interval=0.5, tile_size=None)
+
+    runs = []
+    for t in range(0, 12):
+        if t == 10:
+            fn.found = True
+        before = fn.calls
+        detector_tick(det, dt=1.0)
+        if fn.calls > before:
+            runs.append(t)
+    # misses: 1s -> 2s -> 4s (capped); the sighting at t=10 snaps back to 1s
+    assert runs == [0, 2, 6, 10, 11]
+    assert spec.interval == 1.0
+    assert det.schedule()["gift"]["interval_s"] == 1.0
+
+
+def test_min_interval_without_backoff(detector_tick: Callable[..., None]) -> None:
+    fn = CountingSpec(found=False)
+    bus = FrameBus()
+    det = DetectorThread(bus, OpportunityBoard(), [DetectorSpec("bubble", None, fn, min_interval=1.0)],
+                         tick_interval=0.5, tile_size=None)
+    for _ in range(8):
+        detector_tick(det, dt=0.5)
+    assert fn.calls == 4
+    assert det.state.spec_counters()["bubble"]["scan_hz"] == pytest.approx(4 / 3.5, abs=0.01)
+
+
+def test_budget_admits_by_priority_and_carries_over(detector_tick: Callable[..., None]) -> None:
+    fns = {name: CountingSpec(found=False, delay=0.03) for name in ("low", "high", "mid")}
+    specs = [DetectorSpec("low", None, fns["low"]),
+             DetectorSpec("high", None, fns["high"], priority=5),
+             DetectorSpec("mid", None, fns["mid"], priority=2)]
+    bus = FrameBus()
+    det = DetectorThread(bus, OpportunityBoard(), specs, tick_interval=0.5, tile_size=None,
+                         tick_budget=0.05)
+
+    detector_tick(det)                    # costs unknown yet: everything runs once
+    assert [f.calls for f in fns.values()] == [1, 1, 1]
+
+    detector_tick(det)                    # room for one: the highest priority
+    assert [f.calls for f in fns.values()] == [1, 2, 1]
+    assert specs[0].deferred == specs[2].deferred == 1
+
+    for _ in range(8):                    # deferral ages priority: nobody starves
+        detector_tick(det)
+    assert all(f.calls >= 2 for f in fns.values())
+    assert fns["high"].calls > fns["mid"].calls >= fns["low"].calls
+    counters = det.state.spec_counters()
+    assert counters["low"]["deferred"] > 0
+    assert counters["high"]["deferred"] < counters["low"]["deferred"]
@@ -0,0 +1,91 @@
+"""Unit tests for DetectorThread's worker-pool spec evaluation."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+
+import pytest
+
+from utils import opportunity_detector
+from utils.frame_bus import FrameBus
+from utils.opportunity_detector import DetectorSpec, DetectorThread, OpportunityBoard
+
+
+def _sleepy(name: str, delay: float, found: bool, threads: set[str]) -> DetectorSpec:
+    def fn(f: Any) -> tuple[bool, float, tuple[int, int] | None]:
+        threads.add(threading.current_thread().name)
+        time.sleep(delay)                  # releases the GIL, like cv2.matchTemplate
+        return found, delay, (1, 2) if found else None
+    return DetectorSpec(name, None, fn)
+
+
+def _run(tick: Callable[..., None], workers: int, specs: list[DetectorSpec]) -> DetectorThread:
+    det = DetectorThread(FrameBus(), OpportunityBoard(), specs, tick_interval=0.0,
+                         tile_size=None, workers=workers)
+    try:
+        tick(det)
+    finally:
+        if det._pool is not None:
+            det._pool.shutdown()
+    return det
+
+
+def test_pool_matches_serial_and_runs_concurrently(detector_tick: Callable[..., None]) -> None:
+    def specs(threads: set[str]) -> list[DetectorSpec]:
+        return [_sleepy(f"s{i}", 0.05, i % 2 == 0, threads) for i in range(4)]
+
+    serial_threads: set[str] = set()
+    pool_threads: set[str] = set()
+    serial = _run(detector_tick, 1, specs(serial_threads))
+    pooled = _run(detector_tick, 4, specs(pool_threads))
+
+    for name in ("s0", "s1", "s2", "s3"):
+        a, b = serial.state.get(name), pooled.state.get(name)
+        assert a is not None and b is not None
+        assert (a.found, a.score, a.center) == (b.found, b.score, b.center)
+    assert serial.board.snapshot().keys() == pooled.board.snapshot().keys() == {"s0", "s2"}
+
+    assert serial_threads == {threading.current_thread().name}
+    assert len(pool_threads) > 1
+
+
+def test_latency_recorded_and_failures_isolated(detector_tick: Callable[..., None]) -> None:
+    def boom(f: Any) -> tuple[bool, float, tuple[int, int] | None]:
+        raise RuntimeError("matcher crashed")
+
+    det = _run(detector_tick, 2, [_sleepy("ok", 0.01, True, set()), DetectorSpec("bad", None, boom)])
+    counters = det.state.spec_counters()
+    assert counters["ok"]["matched"] == 1
+    assert counters["ok"]["last_ms"] >= 10
+    assert "bad" not in counters
+    assert det.state.get("bad") is None
+    stats = det.tick_stats()
+    assert stats["workers"] == 2 and stats["n"] == 1
+
+
+def test_template_groups_run_concurrently(detector_tick: Callable[..., None],
+                                          monkeypatch: pytest.MonkeyPatch) -> None:
+    lock = threading.Lock()
+    running, peak, batches = [0], [0], []
+
+    def match_templates(ctx: Any, requests: list[Any]) -> list[tuple[bool, float, None]]:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            batches.append(sorted(r.template_name for r in requests))
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return [(False, 0.5, None)] * len(requests)
+
+    monkeypatch.setattr(opportunity_detector, "match_templates", match_templates)
+    toolbar = (120, 1400, 220, 200)
+    specs = [DetectorSpec.template("helmet", None, "helmet.png", search_region=toolbar),
+             DetectorSpec.template("handshake", None, "handshake.png", search_region=toolbar),
+             DetectorSpec.template("button", None, "button.png", search_region=(3600, 1920, 240, 240)),
+             DetectorSpec.template("gift", None, "gift.png")]
+    det = _run(detector_tick, 4, specs)
+    assert sorted(batches) == [["button.png"], ["gift.png"], ["handshake.png", "helmet.png"]]
+    assert peak[0] > 1                    # the groups overlapped on the pool
+    assert all(det.state.get(s.name) is not None for s in specs)
@@ -0,0 +1,105 @@
+"""Unit tests for find_all_templates() and the call sites built on it."""
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from utils import template_matcher
+from utils.template_matcher import TEMPLATE_DIR, _suppress_peaks, find_all_templates
+
+CLAIM = "claim_button_tavern_4k.png"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    template_matcher.clear_cache()
+    yield
+    template_matcher.clear_cache()
+
+
+def _frame(pastes: list[tuple[str, int, int]], seed: int = 4) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    frame = cv2.GaussianBlur(rng.integers(0, 256, (2160, 3840, 3), dtype=np.uint8), (5, 5), 0)
+    for name, x, y in pastes:
+        tmpl = cv2.imread(str(TEMPLATE_DIR / name))
+        th, tw = tmpl.shape[:2]
+        frame[y:y + th, x:x + tw] = tmpl
+    return frame
+
+
+def _greedy_nms(scores: np.ndarray, threshold: float, d: int) -> list[tuple[int, int]]:
+    """Reference: the per-pixel loop the call sites used to hand-roll."""
+    ys, xs = np.where(scores <= threshold)
+    pts = sorted(zip(xs, ys), key=lambda p: scores[p[1], p[0]])
+    kept: list[tuple[int, int]] = []
+    for x, y in pts:
+        if all(abs(x - kx) >= d or abs(y - ky) >= d for kx, ky in kept):
+            kept.append((int(x), int(y)))
+    return kept
+
+
+def test_suppress_peaks_matches_greedy_reference() -> None:
+    rng = np.random.default_rng(0)
+    scores = np.ones((300, 400), np.float32)
+    for cx, cy in [(30, 40), (200, 50), (350, 250), (100, 200)]:
+        yy, xx = np.mgrid[0:300, 0:400]
+        blob = 0.001 * ((xx - cx) ** 2 + (yy - cy) ** 2) + rng.uniform(0, 1e-4)
+        scores = np.minimum(scores, blob.astype(np.float32))
+    xs, ys, vals = _suppress_peaks(scores, 0.5, (40, 40))
+    assert sorted(zip(xs.tolist(), ys.tolist())) == sorted(_greedy_nms(scores, 0.5, 40))
+    assert list(vals) == sorted(vals)
+
+
+def test_plateau_ties_collapse_to_one_peak() -> None:
+    scores = np.ones((50, 50), np.float32)
+    scores[10:13, 10:13] = 0.0
+    xs, ys, _ = _suppress_peaks(scores, 0.1, (5, 5))
+    assert list(zip(xs, ys)) == [(10, 10)]
+
+
+def test_finds_every_row_sorted_by_y() -> None:
+    frame = _frame([(CLAIM, 2200, 900), (CLAIM, 2210, 1200), (CLAIM, 2200, 1500)])
+    hits = find_all_templates(frame, CLAIM, search_region=(2100, 0, 400, 2160),
+                              threshold=0.02, min_distance=(400, 100), sort_by="y")
+    assert [(x, y) for x, y, _ in hits] == [(2270, 930), (2280, 1230), (2270, 1530)]
+    assert all(score < 1e-3 for _, _, score in hits)
+
+    best = find_all_templates(frame, CLAIM, search_region=(2100, 0, 400, 2160),
+                              threshold=0.02, min_distance=(400, 100), max_results=1)
+    assert len(best) == 1
+
+
+def test_template_array_and_context_agree() -> None:
+    from utils.frame_context import FrameContext
+    frame = _frame([(CLAIM, 2200, 900)])
+    tmpl = cv2.imread(str(TEMPLATE_DIR / CLAIM))
+    by_name = find_all_templates(frame, CLAIM, threshold=0.02)
+    by_array = find_all_templates(FrameContext(frame), tmpl, threshold=0.02)
+    assert [h[:2] for h in by_name] == [h[:2] for h in by_array] == [(2270, 930)]
+
+
+def test_mask_is_honoured() -> None:
+    frame = _frame([("gold_scroll_4k.png", 1400, 1000), ("gold_scroll_4k.png", 1400, 1300)])
+    hits = find_all_templates(frame, "gold_scroll_4k.png", search_region=(1200, 800, 700, 900),
+                              threshold=0.08, min_distance=100, sort_by="y")
+    assert [(x, y) for x, y, _ in hits] == [(1462, 1070), (1462, 1370)]
+
+
+def test_rally_plus_matcher_column() -> None:
+    from utils.rally_plus_matcher import RallyPlusMatcher
+    m = RallyPlusMatcher()
+    x = m.PLUS_BUTTON_X
+    frame = _frame([("rally_plus_button_4k.png", x, 600), ("rally_plus_button_4k.png", x + 5, 900),
+                    ("rally_plus_button_4k.png", x - 400, 1200)])   # wrong slot: ignored
+    found = m.find_all_plus_buttons(frame)
+    assert [(cx, cy) for cx, cy, _ in found] == [(x + 65, 665), (x + 70, 965)]
+
+
+def test_ally_find_all_buttons_returns_top_left() -> None:
+    from utils.ally_quest_scanner import find_all_buttons, load_templates
+    templates = load_templates()
+    frame = _frame([("assist_button_ally_4k.png", 2200, 900), ("timer_clock_ally_4k.png", 2300, 1200)])
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    buttons = find_all_buttons(gray, templates.get("assist"), templates.get("clock"))
+    assert [(b["x"], b["y"], b["type"]) for b in buttons] == [(2200, 900, "assist"), (2300, 1200, "timer")]
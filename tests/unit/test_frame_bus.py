@@ -0,0 +1,187 @@
+"""Unit tests for FrameBus history (ring buffer) queries and collect_frames."""
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+
+from utils.frame_bus import FrameBus, collect_frames
+
+
+def _frame(value: int, size: int = 100) -> np.ndarray:
+    return np.full((size, size, 3), value, np.uint8)       # 30 KB
+
+
+def _values(items: list) -> list[int]:
+    return [int(f[0, 0, 0]) for f, _ts in items]
+
+
+def test_history_bounded_by_count_and_memory() -> None:
+    bus = FrameBus(history=4)
+    for v in range(6):
+        bus.publish(_frame(v))
+    assert _values(bus.last_n(10)) == [2, 3, 4, 5]
+    assert bus.stats()["frames"] == 4 and bus.stats()["published"] == 6
+
+    capped = FrameBus(history=10, max_mb=0.07)              # room for two 30 KB frames
+    for v in range(5):
+        capped.publish(_frame(v))
+    assert _values(capped.last_n(10)) == [3, 4]
+    assert capped.stats()["mb"] == 0.1
+
+    single = FrameBus()                                     # default: latest frame only
+    single.publish(_frame(1))
+    single.publish(_frame(2))
+    assert _values(single.last_n(5)) == [2]
+
+
+def test_frames_since_and_last_n_max_age() -> None:
+    bus = FrameBus(history=8)
+    bus.publish(_frame(1))
+    time.sleep(0.1)
+    mark = time.time()
+    bus.publish(_frame(2))
+    bus.publish(_frame(3))
+    assert _values(bus.frames_since(mark)) == [2, 3]
+    assert _values(bus.last_n(2)) == [2, 3]
+    assert _values(bus.last_n(5, max_age=0.05)) == [2, 3]
+    assert bus.last_n(0) == []
+
+
+def test_publish_with_caller_timestamp() -> None:
+    bus = FrameBus(history=4)
+    bus.publish(_frame(1), ts=10.0)
+    bus.publish(_frame(2), ts=10.5)
+    assert [ts for _f, ts in bus.last_n(4)] == [10.0, 10.5]
+    assert _values(bus.frames_since(10.0)) == [2]
+    item = bus.wait_for_frame(newer_than=10.0, timeout=0.0)
+    assert item is not None and item[1] == 10.5
+
+
+def test_wait_for_n_new_returns_frames_published_after_call() -> None:
+    bus = FrameBus(history=8)
+    bus.publish(_frame(9))                                  # older: not counted
+
+    def producer() -> None:
+        for v in range(3):
+            time.sleep(0.02)
+            bus.publish(_frame(v))
+
+    t = threading.Thread(target=producer)
+    t.start()
+    got = bus.wait_for_n_new(3, timeout=2.0)
+    t.join()
+    assert _values(got) == [0, 1, 2]
+
+    start = time.monotonic()
+    assert bus.wait_for_n_new(1, timeout=0.05) == []
+    assert time.monotonic() - start >= 0.05
+
+
+def test_collect_frames_prefers_published_frames() -> None:
+    bus = FrameBus(history=8)
+    captures = []
+
+    def capture() -> np.ndarray:
+        captures.append(1)
+        f = _frame(len(captures))
+        bus.publish(f)
+        return f
+
+    # Nobody else publishes: every frame is a capture of our own.
+    frames = collect_frames(capture, 3, interval=0.01, bus=bus)
+    assert len(frames) == 3 and len(captures) == 3
+
+    # Another thread publishes: those frames are used instead.
+    captures.clear()
+
+    def other() -> None:
+        for _ in range(2):
+            time.sleep(0.01)
+            bus.publish(_frame(200))
+
+    t = threading.Thread(target=other)
+    t.start()
+    frames = collect_frames(capture, 3, interval=1.0, bus=bus)
+    t.join()
+    assert len(captures) == 1
+    assert [int(f[0, 0, 0]) for f in frames] == [1, 200, 200]
+
+
+def _publisher(bus: FrameBus, values: list[int], interval: float = 0.03) -> threading.Thread:
+    def run() -> None:
+        for v in values:
+            time.sleep(interval)
+            bus.publish(_frame(v, size=256))
+    t = threading.Thread(target=run)
+    t.start()
+    return t
+
+
+def test_wait_until_stable_returns_once_pixels_stop_changing() -> None:
+    bus = FrameBus(history=4)
+    t = _publisher(bus, [10, 60, 110, 160] + [200] * 30)
+    start = time.monotonic()
+    item = bus.wait_until_stable(min_stable_ms=100, timeout=2.0)
+    elapsed = time.monotonic() - start
+    t.join()
+    assert item is not None and int(item[0][0, 0, 0]) == 200
+    assert elapsed < 0.6     # 4 changes + ~4 settled frames, not the whole ~1s stream
+
+
+def test_wait_until_stable_watches_only_its_region() -> None:
+    bus = FrameBus()
+
+    def run() -> None:
+        for v in range(12):
+            time.sleep(0.03)
+            f = _frame(50, size=256)
+            f[200:, 200:] = v * 20            # only the corner animates
+            bus.publish(f)
+    t = threading.Thread(target=run)
+    t.start()
+    # Regions are 4K coordinates, scaled to the (here 256px) frame.
+    assert bus.wait_until_stable(region=(0, 0, 1920, 1080), min_stable_ms=60, timeout=2.0) is not None
+    assert bus.wait_until_stable(region=(3000, 1700, 840, 460), min_stable_ms=60, timeout=0.2) is None
+    t.join()
+
+
+def test_wait_until_stable_drives_capture_and_requires_change() -> None:
+    bus = FrameBus()
+    bus.publish(_frame(5, size=256))          # the pre-tap screen
+    shown = {"v": 5}
+
+    def capture() -> np.ndarray:
+        f = _frame(shown["v"], size=256)
+        bus.publish(f)
+        return f
+
+    # Tap had no visible effect yet: never "settled" on the old screen.
+    assert bus.wait_until_stable(min_stable_ms=50, timeout=0.4, capture=capture,
+                                 poll=0.02, require_change=True) is None
+    shown["v"] = 99
+    item = bus.wait_until_stable(min_stable_ms=50, timeout=1.0, capture=capture,
+                                 poll=0.02, require_change=True)
+    assert item is not None and int(item[0][0, 0, 0]) == 99
+
+
+def test_settle_records_time_saved() -> None:
+    from utils.frame_bus import settle, settle_stats
+
+    bus = FrameBus()
+    bus.publish(_frame(0, size=256))
+
+    def capture() -> np.ndarray:
+        f = _frame(77, size=256)
+        bus.publish(f)
+        return f
+
+    frame = settle(capture, 1.0, "test:settled", min_stable_ms=50, bus=bus)
+    assert int(frame[0, 0, 0]) == 77
+    frame = settle(capture, 0.2, "test:timeout", min_stable_ms=50, bus=bus)   # never changes from 77
+    assert int(frame[0, 0, 0]) == 77
+
+    stats = settle_stats()
+    assert stats["test:settled"]["settled"] == 1 and stats["test:settled"]["saved_s"] > 0.5
+    assert stats["test:timeout"]["settled"] == 0 and stats["test:timeout"]["saved_s"] == 0.0
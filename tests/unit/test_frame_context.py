@@ -0,0 +1,138 @@
+"""Unit tests for utils/frame_context.py and its use by match_template."""
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from utils import template_matcher
+from utils.frame_context import FrameContext, frame_array, scale_region, to_4k
+from utils.template_matcher import (
+    TEMPLATE_DIR,
+    MatchRequest,
+    find_all_templates,
+    match_template,
+    match_templates,
+)
+
+MASKED = "assist_help_briefcase_4k.png"      # has *_mask_4k.png
+PLAIN = "world_button_4k.png"                # no mask
+REGION = (120, 1400, 220, 200)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    template_matcher.clear_cache()
+    yield
+    template_matcher.clear_cache()
+
+
+def _frame_with(template_name: str, x: int, y: int) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    frame = rng.integers(0, 256, (2160, 3840, 3), dtype=np.uint8)
+    tmpl = cv2.imread(str(TEMPLATE_DIR / template_name))
+    th, tw = tmpl.shape[:2]
+    frame[y:y + th, x:x + tw] = tmpl
+    return frame
+
+
+def test_planes_are_memoized_per_region() -> None:
+    frame = np.random.default_rng(1).integers(0, 256, (200, 300, 3), dtype=np.uint8)
+    ctx = FrameContext(frame)
+    g1 = ctx.gray((10, 20, 50, 40))
+    g2 = ctx.gray((10, 20, 50, 40))
+    assert g1 is g2
+    assert ctx.stats() == {"planes": 1, "hits": 1, "misses": 1}
+    np.testing.assert_array_equal(g1, cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)[20:60, 10:60])
+
+
+def test_region_plane_sliced_from_full_plane() -> None:
+    frame = np.random.default_rng(2).integers(0, 256, (100, 100, 3), dtype=np.uint8)
+    ctx = FrameContext(frame)
+    full = ctx.energy()
+    part = ctx.energy((5, 5, 10, 10))
+    assert part.base is full or np.shares_memory(part, full)
+    expected = np.sum(frame.astype(np.float32) ** 2, axis=2)[5:15, 5:15]
+    np.testing.assert_allclose(part, expected)
+
+
+def test_frame_array_unwraps_context() -> None:
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    assert frame_array(FrameContext(frame)) is frame
+    assert frame_array(frame) is frame
+
+
+@pytest.mark.parametrize("name", [MASKED, PLAIN])
+@pytest.mark.parametrize("grayscale", [False, True])
+def test_match_template_same_result_with_context(name: str, grayscale: bool) -> None:
+    frame = _frame_with(name, 150, 1420) if name == MASKED else _frame_with(name, 3600, 1920)
+    region = REGION if name == MASKED else (3600, 1920, 240, 240)
+    raw = match_template(frame, name, search_region=region, grayscale=grayscale)
+    via_ctx = match_template(FrameContext(frame), name, search_region=region, grayscale=grayscale)
+    assert raw[0] == via_ctx[0]
+    assert raw[2] == via_ctx[2]
+    assert raw[1] == pytest.approx(via_ctx[1], abs=1e-6)
+
+
+def test_masked_matches_share_conversions() -> None:
+    frame = _frame_with(MASKED, 150, 1420)
+    ctx = FrameContext(frame)
+    for name in ("assist_help_briefcase_4k.png", "assist_help_helmet_4k.png",
+                 "assist_help_handshake_4k.png"):
+        match_template(ctx, name, search_region=REGION, threshold=0.03)
+    stats = ctx.stats()
+    # f32 + energy computed once; the other two matches hit the memo
+    assert stats["misses"] == 2
+    assert stats["hits"] >= 4
+
+
+# --- native scale ---------------------------------------------------------
+
+WIDE = (100, 1380, 400, 320)                 # fits both templates
+
+def _native(frame: np.ndarray) -> np.ndarray:
+    return cv2.resize(frame, (1792, 1010), interpolation=cv2.INTER_AREA)
+
+
+def test_for_frame_infers_scale_and_upscales_once() -> None:
+    full = np.zeros((2160, 3840, 3), dtype=np.uint8)
+    assert not FrameContext.for_frame(full).native
+    assert FrameContext.for_frame(full).frame_4k() is full
+
+    ctx = FrameContext.for_frame(np.zeros((1010, 1792, 3), dtype=np.uint8))
+    assert ctx.native
+    assert ctx.scale == pytest.approx((1792 / 3840, 1010 / 2160))
+    up = frame_array(ctx)
+    assert up.shape == (2160, 3840, 3)
+    assert ctx.frame_4k() is up
+
+
+def test_scale_region_covers_and_nests() -> None:
+    scale = (1792 / 3840, 1010 / 2160)
+    outer = scale_region((100, 1400, 500, 300), scale)
+    inner = scale_region((120, 1410, 220, 200), scale)
+    assert outer[0] <= inner[0] and outer[1] <= inner[1]
+    assert inner[0] + inner[2] <= outer[0] + outer[2] and inner[1] + inner[3] <= outer[1] + outer[3]
+    assert to_4k((inner[0], inner[1]), scale)[0] <= 120
+
+
+@pytest.mark.parametrize("name", [MASKED, PLAIN])
+def test_native_match_reports_4k_location(name: str) -> None:
+    frame = _frame_with(name, 150, 1430)
+    _, _, loc_4k = match_template(frame, name, search_region=WIDE)
+    found, score, loc = match_template(FrameContext.for_frame(_native(frame)), name,
+                                       search_region=WIDE, threshold=0.2)
+    assert found, score
+    assert loc is not None and loc_4k is not None
+    assert abs(loc[0] - loc_4k[0]) <= 3 and abs(loc[1] - loc_4k[1]) <= 3
+
+
+def test_native_batch_and_find_all_match_single_calls() -> None:
+    frame = _frame_with(PLAIN, 150, 1430)
+    ctx = FrameContext.for_frame(_native(frame))
+    single = match_template(FrameContext.for_frame(_native(frame)), PLAIN, search_region=WIDE)
+    batch = match_templates(ctx, [MatchRequest(PLAIN, WIDE), MatchRequest(MASKED, (100, 1380, 300, 260))])
+    assert batch[0] == single
+    hits = find_all_templates(FrameContext.for_frame(_native(frame)), PLAIN,
+                              search_region=WIDE, threshold=0.1)
+    assert hits and (hits[0][0], hits[0][1]) == single[2]
@@ -0,0 +1,83 @@
+"""Unit tests for FrameBus content fingerprints and the detector's
+duplicate-frame short-circuit."""
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+from tests.conftest import CountingSpec, DetectorClock
+from utils.frame_bus import FrameBus, fingerprint
+from utils.opportunity_detector import DetectorSpec, DetectorThread, OpportunityBoard
+
+
+def _frame(value: int) -> np.ndarray:
+    f = np.full((144, 256, 3), 30, np.uint8)
+    f[100:120, 200:220] = value                      # an "icon" that may change
+    return f
+
+
+def test_bus_tags_pixel_identical_frames() -> None:
+    bus = FrameBus(history=4)
+    for _ in range(5):
+        bus.publish(_frame(200))                     # equal pixels, distinct arrays
+    bus.publish(_frame(201))
+    stats = bus.stats()
+    assert stats["duplicates"] == 4 and stats["dup_rate"] == round(4 / 6, 3)
+    (_, ts_a), (_, ts_b) = bus.last_n(2)
+    assert bus.fingerprint_of(ts_a) == fingerprint(_frame(200)) != bus.fingerprint_of(ts_b)
+    assert fingerprint(_frame(200)[:, :128]) != fingerprint(_frame(200))
+    one_row = _frame(200)
+    one_row[1, 5] = 31                               # a single pixel, off any sampling grid
+    assert fingerprint(one_row) != fingerprint(_frame(200))
+    assert bus.fingerprint_of(0.0) is None
+
+
+def test_static_sequence_restamps_instead_of_rescanning(
+    clock: DetectorClock, detector_tick: Callable[..., None],
+) -> None:
+    fn = CountingSpec(found=True, score=0.9, center=(210, 110))
+    det = DetectorThread(FrameBus(), OpportunityBoard(), [DetectorSpec("icon", None, fn)], tick_interval=0.5)
+
+    def tick(value: int) -> None:
+        detector_tick(det, _frame(value))
+
+    tick(200)
+    first = det.state.get("icon")
+    for _ in range(9):                               # the game idles: identical frames
+        tick(200)
+    assert fn.calls == 1
+    assert det.state.get("icon").ts == clock.now > first.ts      # reading re-stamped
+    assert det.board.snapshot()["icon"] is not None
+    counters = det.state.spec_counters()["icon"]
+    assert counters["matched"] == 1 and counters["skipped"] == 9
+    stats = det.tick_stats()
+    assert stats["dup_ticks"] == 9 and stats["dup_rate"] == 0.9
+    assert stats["n"] == 1                           # tick latencies cover real passes only
+
+    tick(90)                                         # the screen changed: a real pass
+    assert fn.calls == 2
+
+    spec = det.specs[0]
+    for _ in range(12):                              # static for longer than max_reuse_age (5 s)
+        tick(90)
+        assert clock.now - spec.last_matched <= det.max_reuse_age
+    assert fn.calls == 4                             # re-matched as readings age out, re-stamped between
+
+
+def test_restamp_is_bounded_by_each_readings_age(
+    clock: DetectorClock, detector_tick: Callable[..., None],
+) -> None:
+    fixed = CountingSpec(found=True, score=0.01, center=(230, 1500))
+    spec = DetectorSpec("union", None, fixed, region=(120, 1400, 220, 200))
+    det = DetectorThread(FrameBus(), OpportunityBoard(), [spec], tick_interval=0.0)
+    frame = np.random.default_rng(0).integers(0, 256, (2160, 3840, 3), dtype=np.uint8)
+    for i in range(8):                               # changes elsewhere: the reading is tile-reused
+        moved = frame.copy()
+        moved[1000, 2000] = i
+        detector_tick(det, moved)
+    assert fixed.calls == 1
+    for _ in range(6):                               # then the game idles on the last frame
+        detector_tick(det, moved)
+        assert clock.now - spec.last_matched <= det.max_reuse_age
+    assert fixed.calls == 2 and det.tick_stats()["dup_ticks"] == 5
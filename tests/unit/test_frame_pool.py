@@ -0,0 +1,80 @@
+"""Unit tests for FramePool buffer recycling and occupancy stats."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from utils.frame_bus import FrameBus
+from utils.frame_pool import FramePool
+
+SHAPE = (8, 16, 3)
+
+
+def test_buffer_recycled_once_unreferenced() -> None:
+    pool = FramePool(size=4)
+    a = pool.acquire(SHAPE)
+    b = pool.acquire(SHAPE)
+    assert a is not b and a.shape == SHAPE and a.dtype == np.uint8
+    a_id = id(a)
+    del a
+    c = pool.acquire(SHAPE)
+    assert id(c) == a_id                                # a's buffer, b is still held
+    stats = pool.stats()
+    assert stats["reused"] == 1 and stats["allocated"] == 2
+    assert stats["shapes"]["16x8"] == {"in_use": 2, "pooled": 2, "high_water": 2}
+
+
+def test_views_keep_a_buffer_in_use() -> None:
+    pool = FramePool(size=4)
+    frame = pool.acquire(SHAPE)
+    crop = frame[2:4, 2:6]                              # e.g. a vote-history crop
+    del frame
+    assert pool.acquire(SHAPE) is not crop.base
+    assert pool.stats()["shapes"]["16x8"]["in_use"] == 1
+
+
+def test_exhausted_pool_falls_back_to_fresh_arrays() -> None:
+    pool = FramePool(size=2)
+    held = [pool.acquire(SHAPE) for _ in range(3)]
+    assert pool.stats()["misses"] == 1 and pool.stats()["allocated"] == 2
+    assert len({id(f) for f in held}) == 3
+    assert pool.stats()["shapes"]["16x8"]["high_water"] == 3
+    other = pool.acquire((4, 4, 3))                     # shapes are pooled separately
+    assert other.shape == (4, 4, 3) and pool.stats()["misses"] == 1
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+@pytest.mark.skipif(not Path("/proc/self/statm").exists(), reason="needs /proc RSS")
+def test_1000_captures_keep_rss_flat() -> None:
+    pool = FramePool(size=10)
+    bus = FrameBus(history=6)
+    held = None                                         # the detector's current frame
+
+    def capture(i: int) -> np.ndarray:
+        frame = pool.acquire()                          # 4K
+        frame[:] = i % 256                              # a conversion writes every pixel
+        bus.publish(frame)
+        return frame
+
+    for i in range(50):
+        held = capture(i)
+    warm_rss = _rss_mb()
+    warm_allocated = pool.stats()["allocated"]
+    for i in range(50, 1000):
+        frame = capture(i)
+        if i % 3 == 0:
+            held = frame
+    del frame, held
+    stats = pool.stats()
+    assert stats["allocated"] == warm_allocated and stats["misses"] == 0
+    assert stats["reused"] == 1000 - warm_allocated
+    assert stats["shapes"]["3840x2160"]["high_water"] <= 9   # ring 6 + held + new
+    assert _rss_mb() - warm_rss < 30.0                  # not one extra 25 MB frame
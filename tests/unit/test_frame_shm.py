@@ -0,0 +1,123 @@
+"""Unit tests for the shared-memory FrameBus mirror (utils/frame_shm.py)."""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import struct
+import time
+
+import numpy as np
+import pytest
+
+from utils import frame_shm
+from utils.frame_bus import FrameBus
+from utils.frame_shm import GEN_OFFSET, FrameShmReader, FrameShmWriter, read_shared_frame
+
+
+@pytest.fixture
+def writer():
+    w = FrameShmWriter(f"xclash_test_{os.getpid()}", capacity=64 * 64 * 3)
+    yield w
+    w.close()
+
+
+def _frame(value: int, size: int = 64) -> np.ndarray:
+    return np.full((size, size, 3), value, np.uint8)
+
+
+def test_roundtrip_and_zero_copy_view(writer: FrameShmWriter) -> None:
+    with FrameShmReader(writer.name) as reader:
+        assert reader.read() is None                       # nothing published yet
+        writer.write(_frame(7), ts=123.0)
+        frame, ts, seq = reader.read()
+        assert frame.shape == (64, 64, 3) and int(frame[0, 0, 0]) == 7
+        assert ts == 123.0 and seq == 1
+
+        view, gen = reader.view()
+        writer.write(_frame(9, size=32), ts=time.time())   # smaller (native-scale) frame fits
+        assert reader.generation != gen                    # the old view is now stale
+        assert int(view[0, 0, 0]) == 9
+        assert reader.read()[0].shape == (32, 32, 3)
+        assert reader.read(max_age=60.0) is not None
+    assert not writer.write(_frame(1, size=128), ts=0.0)   # larger than capacity
+
+
+def test_reader_never_returns_a_frame_mid_write(writer: FrameShmWriter) -> None:
+    writer.write(_frame(1), ts=1.0)
+    with FrameShmReader(writer.name) as reader:
+        gen = reader.generation
+        struct.pack_into("<Q", writer._buf, GEN_OFFSET, gen + 1)    # odd: writer busy
+        assert reader.read() is None
+        view, _ = reader.view()
+        assert view is None
+        struct.pack_into("<Q", writer._buf, GEN_OFFSET, gen)
+        assert reader.read() is not None
+
+
+class _TornHeader:
+    """HEADER stand-in whose pack_into stores one field at a time, gen
+    first, and calls `between` after each store: what a reader in another
+    process may observe, since one pack_into is a plain memcpy."""
+
+    FIELDS = [(8, "<Q"), (0, "<4s"), (4, "<I"), (16, "<I"), (20, "<I"), (24, "<I"), (32, "<d"), (40, "<Q")]
+
+    def __init__(self, between) -> None:
+        self.between = between
+        self.unpack_from = frame_shm.HEADER.unpack_from
+
+    def pack_into(self, buf, offset: int, magic, version, gen, *rest) -> None:
+        for (start, fmt), value in zip(self.FIELDS, (gen, magic, version, *rest)):
+            struct.pack_into(fmt, buf, offset + start, value)
+            self.between()
+
+
+def test_reader_never_pairs_pixels_with_another_writes_header(
+        writer: FrameShmWriter, monkeypatch: pytest.MonkeyPatch) -> None:
+    writer.write(_frame(0), ts=0.0)
+    returned = []
+
+    def read_and_check() -> None:
+        item = reader.read()
+        if item is not None:                        # pixel value == ts; odd ts -> 32x32
+            frame, ts, _seq = item
+            size = 32 if int(ts) % 2 else 64
+            assert frame.shape == (size, size, 3) and int(frame[0, 0, 0]) == int(ts)
+            returned.append(ts)
+
+    with FrameShmReader(writer.name) as reader:
+        monkeypatch.setattr(frame_shm, "READ_RETRIES", 1)
+        monkeypatch.setattr(frame_shm, "HEADER", _TornHeader(read_and_check))
+        for i in range(1, 7):                       # new shape and ts on every write
+            writer.write(_frame(i, size=32 if i % 2 else 64), ts=float(i))
+            read_and_check()
+    assert returned[-1] == 6.0
+
+
+def test_bus_mirrors_published_frames(writer: FrameShmWriter) -> None:
+    bus = FrameBus(shm=writer)
+    bus.publish(_frame(42))
+    _, bus_ts = bus.latest()
+    frame = read_shared_frame(name=writer.name)
+    assert frame is not None and int(frame[0, 0, 0]) == 42
+    with FrameShmReader(writer.name) as reader:
+        assert reader.read()[1] == bus_ts
+    assert bus.stats()["shm"] == writer.name
+    assert read_shared_frame(name="xclash_test_missing") is None
+
+
+def _read_in_child(name: str, out: mp.Queue) -> None:
+    with FrameShmReader(name) as reader:
+        item = reader.read()
+        out.put(None if item is None else (int(item[0][5, 5, 0]), item[2]))
+
+
+def test_reader_in_another_process(writer: FrameShmWriter) -> None:
+    writer.write(_frame(200), ts=time.time())
+    ctx = mp.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_read_in_child, args=(writer.name, out))
+    proc.start()
+    assert out.get(timeout=30) == (200, 1)
+    proc.join(timeout=10)
+    # The child's exit must not have unlinked the writer's segment.
+    assert read_shared_frame(name=writer.name) is not None
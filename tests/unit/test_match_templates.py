@@ -0,0 +1,119 @@
+"""Unit tests for the batched match_templates() API and its detector use."""
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from utils import template_matcher
+from utils.frame_context import FrameContext
+from utils.template_matcher import (
+    TEMPLATE_DIR, MatchRequest, _group_regions, match_template, match_templates, region_groups,
+)
+
+UNION = (120, 1400, 220, 200)
+BUTTON = (3600, 1920, 240, 240)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    template_matcher.clear_cache()
+    yield
+    template_matcher.clear_cache()
+
+
+@pytest.fixture
+def frame() -> np.ndarray:
+    f = np.random.default_rng(3).integers(0, 256, (2160, 3840, 3), dtype=np.uint8)
+    tmpl = cv2.imread(str(TEMPLATE_DIR / "assist_help_helmet_4k.png"))
+    th, tw = tmpl.shape[:2]
+    f[1420:1420 + th, 150:150 + tw] = tmpl
+    f[1920:2160, 3600:3840] = cv2.imread(str(TEMPLATE_DIR / "town_button_4k.png"))
+    return f
+
+
+REQUESTS = [
+    MatchRequest("assist_help_briefcase_4k.png", UNION, 0.03),
+    MatchRequest("assist_help_helmet_4k.png", UNION, 0.03),
+    ("cobra_icon_4k.png", (20, 1380, 580, 210), 0.08),
+    ("world_button_4k.png", BUTTON, 0.05),
+    ("town_button_4k.png", BUTTON, 0.05),
+    ("town_button_4k.png", BUTTON, 0.05, True),
+]
+
+
+def test_batch_matches_individual_calls(frame: np.ndarray) -> None:
+    batch = match_templates(frame, REQUESTS)
+    assert len(batch) == len(REQUESTS)
+    for req, got in zip(REQUESTS, batch):
+        r = MatchRequest(*req)
+        want = match_template(frame, r.template_name, search_region=r.search_region,
+                              threshold=r.threshold, grayscale=r.grayscale)
+        assert got[0] == want[0]
+        assert got[2] == want[2]
+        assert got[1] == pytest.approx(want[1], abs=1e-5)
+    assert batch[1][0] is True      # helmet pasted into the union strip
+    assert batch[4][0] is True      # town button pasted at the view button
+
+
+def test_overlapping_regions_convert_once(frame: np.ndarray) -> None:
+    ctx = FrameContext(frame)
+    match_templates(ctx, [
+        ("assist_help_briefcase_4k.png", UNION, 0.03),
+        ("assist_help_helmet_4k.png", (130, 1410, 220, 200), 0.03),
+        ("cobra_icon_4k.png", (20, 1380, 580, 210), 0.08),   # unmasked: needs no planes
+    ])
+    # one energy plane (+ its float32) on the two masked regions' bounding
+    # box; both members slice it instead of converting their own crops
+    assert ctx.stats()["misses"] == 2
+    assert ctx.stats()["hits"] >= 2
+
+
+def test_stop_on_found_truncates(frame: np.ndarray) -> None:
+    reqs = [("world_button_4k.png", BUTTON, 0.05), ("town_button_4k.png", BUTTON, 0.05),
+            ("town_button_ice_4k.png", BUTTON, 0.05)]
+    results = match_templates(frame, reqs, stop_on_found=True)
+    assert len(results) == 2
+    assert results[-1][0] is True
+
+
+def test_group_regions() -> None:
+    groups = _group_regions([(0, 0, 10, 10), (2, 2, 10, 10), (500, 500, 5, 5), None])
+    assert groups[0] == groups[1] == (0, 0, 12, 12)
+    assert groups[2] == (500, 500, 5, 5)
+    assert groups[3] is None
+    # touching-corner boxes whose bounding box would mostly be empty stay apart
+    far = _group_regions([(0, 0, 100, 2), (98, 0, 2, 100)])
+    assert far == [(0, 0, 100, 2), (98, 0, 2, 100)]
+
+
+def test_region_groups_split_independent_requests() -> None:
+    reqs = [MatchRequest("a.png", UNION), MatchRequest("b.png", BUTTON), MatchRequest("c.png", None),
+            MatchRequest("d.png", (130, 1410, 200, 180)), MatchRequest("e.png", None)]
+    assert region_groups(reqs) == [[0, 3], [1], [2], [4]]
+    assert region_groups([]) == []
+
+
+def test_detector_tick_batches_template_specs(frame: np.ndarray) -> None:
+    from utils.frame_bus import FrameBus
+    from utils.opportunity_detector import DetectorSpec, DetectorThread, OpportunityBoard
+
+    bus = FrameBus()
+    board = OpportunityBoard()
+    calls: list[str] = []
+
+    def fn_spec(f):
+        calls.append(type(f).__name__)
+        return False, 0.5, None
+
+    specs = [
+        DetectorSpec.template("union_helmet", None, "assist_help_helmet_4k.png",
+                              search_region=UNION, threshold=0.03),
+        DetectorSpec("custom", None, fn_spec),
+    ]
+    det = DetectorThread(bus, board, specs, tick_interval=0.0)
+    bus.publish(frame)
+    det._tick()
+    assert board.get_fresh("union_helmet") is not None
+    assert det.state.get("custom").score == 0.5
+    assert calls == ["ndarray"]   # non-context fn still gets the raw frame
@@ -0,0 +1,83 @@
+"""Unit tests for OCRClient.extract_many() batching over /ocr/batch."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import numpy as np
+import pytest
+
+from utils import ocr_client
+from utils.ocr_client import OCRCache, OCRClient, OCRRequest
+
+
+class _Server:
+    """Stands in for _post_multipart; answers /ocr/batch unless `batch` is off."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, int, Any]] = []
+        self.batch = True
+
+    def __call__(self, endpoint: str, image_bytes: Any, fields: dict[str, Any] | None = None) -> dict[str, Any]:
+        n = 1 if isinstance(image_bytes, bytes) else len(image_bytes)
+        self.calls.append((endpoint, n, fields))
+        if endpoint == "/ocr/batch":
+            if not self.batch:
+                return {"error": "HTTP error 404: Not Found", "text": None}
+            json.dumps(fields)                                    # must be serialisable
+            return {"results": [{"number": 7} if item["mode"] == "number" else {"text": f"<ref>t{k}</ref>"}
+                                for k, item in enumerate(fields["items"])]}
+        if endpoint == "/ocr/number":
+            return {"number": 7}
+        return {"text": "single"}
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> _Server:
+    srv = _Server()
+    monkeypatch.setattr(OCRClient, "_cache", OCRCache(max_entries=64, ttl=60.0))
+    monkeypatch.setattr(OCRClient, "_post_multipart", lambda self, *a, **k: srv(*a, **k))
+    monkeypatch.setattr(OCRClient, "_ensure_server", lambda self: None)
+    return srv
+
+
+def _frame() -> np.ndarray:
+    f = np.zeros((100, 400, 3), np.uint8)
+    for i in range(10):
+        f[:, i * 40:(i + 1) * 40] = i * 20                       # ten distinct 40 px columns
+    return f
+
+
+def test_one_round_trip_for_mixed_requests(server: _Server) -> None:
+    reqs = [OCRRequest((0, 0, 40, 50), "number"), OCRRequest((40, 0, 40, 50), prompt="timer"),
+            OCRRequest((80, 0, 40, 50))]
+    out = OCRClient().extract_many(_frame(), reqs)
+    assert out == [7, "t1", "t2"]                                 # text sanitized like extract_text
+    assert server.calls == [("/ocr/batch", 3, {"items": [
+        {"mode": "number", "prompt": None}, {"mode": "text", "prompt": "timer"},
+        {"mode": "text", "prompt": None}]})]
+
+
+def test_cache_shared_with_single_reads(server: _Server) -> None:
+    client = OCRClient()
+    frame = _frame()
+    assert client.extract_number(frame, region=(0, 0, 40, 50)) == 7
+    out = client.extract_many(frame, [OCRRequest((0, 0, 40, 50), "number"), OCRRequest((40, 0, 40, 50), "number")])
+    assert out == [7, 7]
+    assert server.calls[-1][:2] == ("/ocr/batch", 1)              # only the uncached crop is sent
+    client.extract_many(frame, [OCRRequest((40, 0, 40, 50), "number")])
+    assert len(server.calls) == 2
+
+
+def test_chunks_and_falls_back_without_batch_endpoint(server: _Server, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ocr_client, "BATCH_MAX_ITEMS", 4)
+    reqs = [OCRRequest((i * 40, 0, 40, 50), "number") for i in range(10)]
+    assert OCRClient().extract_many(_frame(), reqs, cache=False) == [7] * 10
+    assert [n for _, n, _ in server.calls] == [4, 4, 2]
+
+    server.calls.clear()
+    server.batch = False
+    assert OCRClient().extract_many(_frame(), reqs[:2], cache=False) == [7, 7]
+    assert [e for e, _, _ in server.calls] == ["/ocr/batch", "/ocr/number", "/ocr/number"]
+    with pytest.raises(ValueError):
+        OCRClient().extract_many(_frame(), [OCRRequest(None, "json")])
@@ -0,0 +1,93 @@
+"""Unit tests for the OCRClient content-addressed result cache."""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from utils import ocr_client
+from utils.ocr_client import OCRCache, OCRClient
+
+
+class _Server:
+    """Stands in for _post_multipart: counts calls, answers per endpoint."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict[str, Any] | None]] = []
+        self.fail = False
+
+    def __call__(self, endpoint: str, image_bytes: bytes, fields: dict[str, Any] | None = None) -> dict[str, Any]:
+        self.calls.append((endpoint, fields))
+        if self.fail:
+            return {"error": "boom", "text": None}
+        if endpoint == "/ocr/number":
+            return {"number": 42}
+        return {"text": f"read {len(self.calls)}"}
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> _Server:
+    srv = _Server()
+    monkeypatch.setattr(OCRClient, "_cache", OCRCache(max_entries=3, ttl=60.0))
+    monkeypatch.setattr(OCRClient, "_post_multipart", lambda self, *a, **k: srv(*a, **k))
+    monkeypatch.setattr(OCRClient, "_ensure_server", lambda self: None)
+    return srv
+
+
+def _crop(value: int) -> np.ndarray:
+    return np.full((60, 96, 3), value, np.uint8)
+
+
+def test_identical_pixels_hit_the_cache(server: _Server) -> None:
+    client = OCRClient(auto_start=False)
+    assert client.extract_number(_crop(10)) == 42
+    assert OCRClient().extract_number(_crop(10).copy()) == 42      # new array, new client
+    assert len(server.calls) == 1
+    frame = np.zeros((200, 300, 3), np.uint8)
+    frame[20:80, 50:146] = 10
+    assert client.extract_number(frame, region=(50, 20, 96, 60)) == 42   # same pixels via region
+    assert len(server.calls) == 1
+    client.extract_number(_crop(11))
+    assert len(server.calls) == 2
+    stats = OCRClient.cache_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["hit_rate"] == 0.5
+
+
+def test_key_includes_endpoint_and_prompt(server: _Server) -> None:
+    client = OCRClient()
+    client.extract_number(_crop(10))
+    assert client.extract_text(_crop(10)) == "read 2"
+    assert client.extract_text(_crop(10), prompt="digits only") == "read 3"
+    assert client.extract_text(_crop(10), prompt="digits only") == "read 3"
+    assert client.extract_text(_crop(10)) == "read 2"
+    assert len(server.calls) == 3
+
+
+def test_opt_out_and_errors_always_reach_the_server(server: _Server) -> None:
+    client = OCRClient()
+    client.extract_text(_crop(5))
+    assert client.extract_text(_crop(5), cache=False) == "read 2"
+    assert client.extract_text(_crop(5)) == "read 1"               # opt-out did not overwrite
+    server.fail = True
+    client.extract_text(_crop(6))
+    client.extract_text(_crop(6))
+    assert len(server.calls) == 4                                  # failures are not cached
+
+
+def test_ttl_expiry_and_lru_eviction(server: _Server, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(ocr_client.time, "time", lambda: now[0])
+    client = OCRClient()
+    for v in (1, 2, 3):
+        client.extract_text(_crop(v))
+    client.extract_text(_crop(1))                                  # 1 is now most recent
+    client.extract_text(_crop(4))                                  # evicts 2
+    client.extract_text(_crop(1))
+    client.extract_text(_crop(2))
+    assert len(server.calls) == 5
+    now[0] += 61.0
+    client.extract_text(_crop(1))
+    assert len(server.calls) == 6
+    stats = OCRClient.cache_stats()
+    assert stats["evicted"] >= 1 and stats["expired"] == 1
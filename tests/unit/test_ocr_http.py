@@ -0,0 +1,93 @@
+"""Unit tests for the OCRClient keep-alive connection pool (against a local stub server)."""
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from utils import ocr_client
+from utils.ocr_client import ConnectionPool, OCRClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    drop_after_response = False          # close without telling the client (an idle timeout)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = json.dumps({"number": len(body), "path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.connections.add(self.client_address)  # type: ignore[attr-defined]
+        if type(self).drop_after_response:
+            self.close_connection = True
+
+
+@pytest.fixture
+def stub(monkeypatch: pytest.MonkeyPatch) -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.connections = set()  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    pool = ConnectionPool("127.0.0.1", server.server_address[1])
+    monkeypatch.setattr(ocr_client, "_pool", pool)
+    yield server
+    server.shutdown()
+    server.server_close()
+    pool.close()
+    _Handler.drop_after_response = False
+
+
+def test_sequential_requests_reuse_one_connection(stub: ThreadingHTTPServer) -> None:
+    client = OCRClient(auto_start=False)
+    results = [client._post_multipart("/ocr/number", b"P6\n1 1\n255\n\x00\x00\x00") for _ in range(10)]
+    assert all(r["path"] == "/ocr/number" and r["number"] > 0 for r in results)
+    assert ocr_client._pool.stats() == {"idle": 1, "created": 1, "reused": 9, "retried": 0}
+    assert len(stub.connections) == 1  # type: ignore[attr-defined]
+
+
+def test_threads_check_out_separate_connections(stub: ThreadingHTTPServer) -> None:
+    client = OCRClient(auto_start=False)
+    barrier = threading.Barrier(3)
+    out: list[dict] = []
+
+    def worker(i: int) -> None:
+        barrier.wait()
+        for _ in range(5):
+            out.append(client._post_multipart("/ocr", b"x" * (i + 1), {"prompt": "p"}))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(out) == 15 and not any("error" in r for r in out)
+    stats = ocr_client._pool.stats()
+    assert stats["created"] + stats["reused"] == 15 and stats["created"] <= 3
+
+
+def test_connection_closed_while_idle_is_retried(stub: ThreadingHTTPServer) -> None:
+    _Handler.drop_after_response = True
+    client = OCRClient(auto_start=False)
+    for _ in range(3):
+        assert "error" not in client._post_multipart("/ocr", b"img")
+    stats = ocr_client._pool.stats()
+    assert stats["retried"] == 2 and stats["created"] == 3
+
+
+def test_unreachable_server_is_an_error_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    with ThreadingHTTPServer(("127.0.0.1", 0), _Handler) as probe:
+        port = probe.server_address[1]                      # a port nothing listens on afterwards
+    monkeypatch.setattr(ocr_client, "_pool", ConnectionPool("127.0.0.1", port))
+    result = OCRClient(auto_start=False)._post_multipart("/ocr", b"img")
+    assert result["text"] is None and result["error"].startswith("Connection error")
@@ -0,0 +1,112 @@
+"""Unit tests for the OCR server inference queue (priorities, batching, deadlines, cancellation)."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from services.ocr_queue import DeadlineExceeded, InferenceQueue, QueueFull
+
+
+class _Model:
+    """run_batch stand-in: records batches; blocks while `gate` is cleared."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.fail: BaseException | None = None
+
+    def __call__(self, images: list[Any], items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        self.entered.set()
+        self.gate.wait(5)
+        self.batches.append(list(images))
+        if self.fail is not None:
+            raise self.fail
+        return [{"text": f"read {image}"} for image in images]
+
+
+def _queue(model: _Model, **kw: Any) -> InferenceQueue:
+    q = InferenceQueue(model, **{"max_batch": 4, "window_s": 0.05, **kw})
+    q.start()
+    return q
+
+
+def _block(model: _Model, q: InferenceQueue) -> list:
+    """Occupy the model with one job so later submissions queue up."""
+    model.gate.clear()
+    model.entered.clear()
+    jobs = q.submit(["blocker"], [{"mode": "text"}])
+    assert model.entered.wait(2)
+    return jobs
+
+
+def test_interactive_served_before_background_and_batched() -> None:
+    model = _Model()
+    q = _queue(model)
+    blocker = _block(model, q)
+    bg = q.submit(["bg1", "bg2"], [{"mode": "text"}] * 2, priority="background")
+    fg = q.submit(["fg1", "fg2", "fg3"], [{"mode": "number"}] * 3)
+    assert q.metrics()["depth"] == {"interactive": 3, "background": 2}
+    model.gate.set()
+    assert q.wait(fg) == [{"text": "read fg1"}, {"text": "read fg2"}, {"text": "read fg3"}]
+    assert q.wait(bg)[1] == {"text": "read bg2"}
+    q.wait(blocker)
+    assert model.batches == [["blocker"], ["fg1", "fg2", "fg3", "bg1"], ["bg2"]]
+    m = q.metrics()
+    assert m["batches"] == 3 and m["completed"] == 6 and m["mean_batch"] == 2.0
+    assert m["wait_ms"]["background"]["n"] == 2 and m["depth"] == {"interactive": 0, "background": 0}
+
+
+def test_window_coalesces_requests_arriving_together() -> None:
+    model = _Model()
+    q = _queue(model, window_s=0.2)
+    results: list[Any] = []
+    threads = [threading.Thread(target=lambda i=i: results.append(q.wait(q.submit([f"c{i}"], [{}]))))
+               for i in range(3)]
+    for t in threads:
+        t.start()
+        time.sleep(0.02)
+    for t in threads:
+        t.join()
+    assert len(results) == 3 and model.batches == [["c0", "c1", "c2"]]
+
+
+def test_deadline_and_disconnect_drop_queued_jobs() -> None:
+    model = _Model()
+    q = _queue(model)
+    blocker = _block(model, q)
+    late = q.submit(["late"], [{}], deadline_s=0.05)
+    with pytest.raises(DeadlineExceeded):
+        q.wait(late, poll_s=0.01)
+    gone = q.submit(["gone1", "gone2"], [{}, {}])
+    with pytest.raises(ConnectionAbortedError):
+        q.wait(gone, client_gone=lambda: True, poll_s=0.01)
+    model.gate.set()
+    q.wait(blocker)
+    kept = q.wait(q.submit(["kept"], [{}]))
+    assert kept == [{"text": "read kept"}]
+    assert all("late" not in b and "gone1" not in b for b in model.batches)   # never reached the model
+    m = q.metrics()
+    assert m["expired"] == 1 and m["cancelled"] == 2
+
+
+def test_full_queue_rejects_and_model_errors_reach_every_waiter() -> None:
+    model = _Model()
+    q = _queue(model, max_depth=3)
+    blocker = _block(model, q)
+    queued = q.submit(["a", "b"], [{}, {}])
+    with pytest.raises(QueueFull):
+        q.submit(["c", "d"], [{}, {}])
+    with pytest.raises(ValueError):
+        q.submit(["e"], [{}], priority="urgent")
+    model.fail = RuntimeError("CUDA error: device-side assert triggered")
+    model.gate.set()
+    for jobs in (blocker, queued):
+        with pytest.raises(RuntimeError, match="CUDA error"):
+            q.wait(jobs)
+    m = q.metrics()
+    assert m["rejected"] == 2 and m["failed"] == 3 and m["scheduler_alive"]
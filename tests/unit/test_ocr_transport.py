@@ -0,0 +1,41 @@
+"""Unit tests for OCRClient crop-first raw-pixel serialisation."""
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.ocr_client import RAW_MAX_BYTES, OCRClient
+
+
+def _old_png_path(image: np.ndarray, region: tuple[int, int, int, int]) -> np.ndarray:
+    """What the server saw before: full-frame flip, PIL crop (zero-padded), PNG."""
+    x, y, w, h = region
+    src = Image.fromarray(image[:, :, ::-1] if image.ndim == 3 else image)
+    return np.asarray(src.crop((x, y, x + w, y + h)).convert("RGB"))
+
+
+def _server_sees(payload: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(payload)) as im:               # services/ocr_server._decode_image
+        return np.asarray(im.convert("RGB"))
+
+
+@pytest.mark.parametrize("region", [(30, 20, 50, 40), (280, 190, 40, 30), (-10, -5, 30, 20), (900, 900, 8, 8)])
+@pytest.mark.parametrize("gray", [False, True])
+def test_raw_crop_matches_png_pixels(region: tuple[int, int, int, int], gray: bool) -> None:
+    frame = np.random.default_rng(1).integers(0, 256, (200, 300, 3), dtype=np.uint8)
+    if gray:
+        frame = frame[:, :, 0].copy()
+    payload = OCRClient(auto_start=False)._image_to_bytes(frame, region)
+    assert payload[:2] == (b"P5" if gray else b"P6")
+    assert np.array_equal(_server_sees(payload), _old_png_path(frame, region))
+
+
+def test_large_and_rgba_images_stay_png() -> None:
+    client = OCRClient(auto_start=False)
+    side = int((RAW_MAX_BYTES / 3) ** 0.5) + 1
+    assert client._image_to_bytes(np.zeros((side, side, 3), np.uint8))[:4] == b"\x89PNG"
+    assert client._image_to_bytes(np.zeros((8, 8, 4), np.uint8))[:4] == b"\x89PNG"
+    assert client._image_to_bytes(Image.new("RGB", (8, 8)))[:2] == b"P6"
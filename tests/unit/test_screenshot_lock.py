@@ -7,7 +7,6 @@ import time
 from pathlib import Path
 
 import pytest
-from PIL import Image
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -28,7 +27,7 @@ def test_concurrent_captures_are_serialized(monkeypatch: pytest.MonkeyPatch) ->
     max_inside = 0
     counter_lock = threading.Lock()
 
-    def fake_capture(self: WindowsScreenshotHelper, max_retries: int = 3) -> Image.Image:
+    def fake_capture(self: WindowsScreenshotHelper, max_retries: int = 3) -> tuple[bytes, int, int]:
         nonlocal inside, max_inside
         with counter_lock:
             inside += 1
@@ -36,11 +35,12 @@ def test_concurrent_captures_are_serialized(monkeypatch: pytest.MonkeyPatch) ->
         time.sleep(0.05)
         with counter_lock:
             inside -= 1
-        return Image.new("RGB", (200, 200))
+        return bytes(200 * 200 * 4), 200, 200
 
     monkeypatch.setattr(WindowsScreenshotHelper, "_find_window", lambda self: None)
     monkeypatch.setattr(WindowsScreenshotHelper, "ensure_window_size", lambda self: None)
     monkeypatch.setattr(WindowsScreenshotHelper, "capture_window", fake_capture)
+    monkeypatch.setattr(WindowsScreenshotHelper, "GOVERNOR_MAX_AGE", None)  # always capture
 
     helpers = [_bare_helper() for _ in range(4)]
     errors: list[Exception] = []
@@ -934,5 +934,132 @@ class TestEdgeCases:
             assert found is True
 
 
+class TestCpuMaskedArtifactCache:
+    """CPU masked-template artifacts are built once per (template, grayscale)."""
+
+    @pytest.fixture(autouse=True)
+    def setup_and_teardown(self):
+        """Clear template cache before and after each test."""
+        from utils import template_matcher
+        template_matcher.clear_cache()
+        yield
+        template_matcher.clear_cache()
+
+    @pytest.fixture
+    def template_and_mask(self):
+        rng = np.random.default_rng(5)
+        template = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        mask = np.zeros((20, 30), dtype=np.uint8)
+        mask[4:16, 5:25] = 255
+        return template, mask
+
+    def test_artifacts_prepared_once(self, template_and_mask):
+        from utils import template_matcher
+        template, mask = template_and_mask
+        frame = np.random.default_rng(6).integers(0, 256, (80, 90, 3), dtype=np.uint8)
+        frame[30:50, 40:70] = template
+
+        with patch.object(template_matcher, "_prepare_masked_template_data",
+                          wraps=template_matcher._prepare_masked_template_data) as prep:
+            for _ in range(3):
+                score, loc = template_matcher._match_template_cpu_masked(
+                    frame, template, mask, template_name="t_4k.png")
+            assert prep.call_count == 1
+        assert score == pytest.approx(0.0, abs=1e-4)
+        assert loc == (55, 40)
+
+    def test_cached_result_matches_uncached(self, template_and_mask):
+        from utils import template_matcher
+        template, mask = template_and_mask
+        frame = np.random.default_rng(7).integers(0, 256, (60, 60, 3), dtype=np.uint8)
+        uncached = template_matcher._match_template_cpu_masked(frame, template, mask)
+        cached = template_matcher._match_template_cpu_masked(
+            frame, template, mask, template_name="t_4k.png")
+        assert cached == uncached
+
+    def test_keyed_by_grayscale_and_cleared(self, template_and_mask):
+        from utils import template_matcher
+        template, mask = template_and_mask
+        gray = template[:, :, 0].copy()
+        template_matcher._get_cpu_masked_data("t_4k.png", False, template, mask)
+        template_matcher._get_cpu_masked_data("t_4k.png", True, gray, mask)
+        assert set(template_matcher._cpu_masked_data) == {("t_4k.png", False), ("t_4k.png", True)}
+        assert template_matcher._cpu_masked_data[("t_4k.png", True)][0].ndim == 2
+        template_matcher.clear_cache()
+        assert len(template_matcher._cpu_masked_data) == 0
+
+    def test_cache_is_size_bounded(self, template_and_mask):
+        from utils import template_matcher
+        template, mask = template_and_mask
+        with patch.object(template_matcher, "_CPU_MASKED_CACHE_MAX", 3):
+            for i in range(5):
+                template_matcher._get_cpu_masked_data(f"t{i}_4k.png", False, template, mask)
+            assert list(template_matcher._cpu_masked_data) == [
+                ("t2_4k.png", False), ("t3_4k.png", False), ("t4_4k.png", False)]
+
+
+class TestPyramidSearch:
+    """Coarse-to-fine search must agree with the exhaustive search."""
+
+    @pytest.fixture(autouse=True)
+    def setup_and_teardown(self):
+        from utils import template_matcher
+        template_matcher.clear_cache()
+        saved = dict(template_matcher._get_pyramid_scales())
+        yield
+        template_matcher._get_pyramid_scales().clear()
+        template_matcher._get_pyramid_scales().update(saved)
+        template_matcher.clear_cache()
+
+    @staticmethod
+    def _frame_with(name, x, y):
+        import cv2
+        from utils.template_matcher import TEMPLATE_DIR
+        rng = np.random.default_rng(11)
+        frame = cv2.GaussianBlur(rng.integers(0, 256, (1080, 1920, 3), dtype=np.uint8), (9, 9), 0)
+        tmpl = cv2.imread(str(TEMPLATE_DIR / name))
+        th, tw = tmpl.shape[:2]
+        frame[y:y + th, x:x + tw] = tmpl
+        return frame, (x + tw // 2, y + th // 2)
+
+    @pytest.mark.parametrize("name", ["cobra_icon_4k.png", "map_gift_box_4k.png"])  # plain, masked
+    @pytest.mark.parametrize("scale", [2, 4])
+    def test_pyramid_matches_exhaustive(self, name, scale):
+        from utils.frame_context import FrameContext
+        from utils.template_matcher import match_template
+        frame, center = self._frame_with(name, 700, 400)
+        exact = match_template(frame, name, pyramid=1)
+        coarse = match_template(frame, name, pyramid=scale)
+        via_ctx = match_template(FrameContext(frame), name, pyramid=scale)
+        assert exact[0] and exact[2] == center
+        assert coarse[0] and coarse[2] == center
+        assert via_ctx[2] == center
+        assert coarse[1] == pytest.approx(exact[1], abs=1e-4)
+
+    def test_small_search_area_falls_back(self):
+        from utils import template_matcher
+        frame, center = self._frame_with("cobra_icon_4k.png", 700, 400)
+        with patch.object(template_matcher, "_match_template_pyramid",
+                          wraps=template_matcher._match_template_pyramid) as pyr:
+            # Region only slightly larger than the template: not worth a coarse pass
+            found, _, loc = template_matcher.match_template(
+                frame, "cobra_icon_4k.png", search_region=(680, 380, 200, 140), pyramid=4)
+        assert pyr.call_count == 0
+        assert found and loc == center
+
+    def test_set_pyramid_scale_is_the_default(self):
+        from utils import template_matcher
+        frame, center = self._frame_with("cobra_icon_4k.png", 700, 400)
+        template_matcher.set_pyramid_scale("cobra_icon_4k.png", 4)
+        with patch.object(template_matcher, "_match_template_pyramid",
+                          wraps=template_matcher._match_template_pyramid) as pyr:
+            assert template_matcher.match_template(frame, "cobra_icon_4k.png")[2] == center
+            assert pyr.call_count == 1
+            template_matcher.match_template(frame, "cobra_icon_4k.png", pyramid=1)
+            assert pyr.call_count == 1
+        template_matcher.set_pyramid_scale("cobra_icon_4k.png", None)
+        assert "cobra_icon_4k.png" not in template_matcher._get_pyramid_scales()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
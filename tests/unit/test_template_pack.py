@@ -0,0 +1,84 @@
+"""Unit tests for utils/template_pack.py and its use by the TemplateRegistry."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from utils.template_pack import TemplatePack, build_pack
+from utils.template_registry import TemplateRegistry
+
+
+@pytest.fixture
+def template_dir(tmp_path: Path) -> Path:
+    src = tmp_path / "ground_truth"
+    (src / "sub").mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    cv2.imwrite(str(src / "icon_4k.png"), rng.integers(0, 256, (21, 33, 3), dtype=np.uint8))
+    cv2.imwrite(str(src / "icon_mask_4k.png"), (rng.random((21, 33)) > 0.5).astype(np.uint8) * 255)
+    cv2.imwrite(str(src / "sub" / "monster_4k.png"), rng.integers(0, 256, (7, 5, 3), dtype=np.uint8))
+    return src
+
+
+@pytest.fixture
+def pack_dir(template_dir: Path, tmp_path: Path) -> Path:
+    out = tmp_path / "pack"
+    summary = build_pack(template_dir, out)
+    assert summary["files"] == 3
+    assert summary["arrays"] == 6
+    return out
+
+
+def _registry(template_dir: Path, pack: TemplatePack | None) -> TemplateRegistry:
+    return TemplateRegistry(path_fn=lambda n: template_dir / n, check_interval=0.0, pack=pack)
+
+
+def test_pack_views_match_png_decode(template_dir: Path, pack_dir: Path) -> None:
+    pack = TemplatePack.open(pack_dir)
+    assert pack is not None
+    reg = _registry(template_dir, pack)
+    for name in ("icon_4k.png", "icon_mask_4k.png", "sub/monster_4k.png"):
+        for variant, flag in (("color", cv2.IMREAD_COLOR), ("gray", cv2.IMREAD_GRAYSCALE)):
+            got = reg.get(name, variant)
+            np.testing.assert_array_equal(got, cv2.imread(str(template_dir / name), flag))
+    assert reg.disk_reads == 0
+    assert pack.stats()["hits"] == 6
+    assert reg.stats()["mapped_bytes"] == reg.stats()["bytes"]
+
+
+def test_views_are_zero_copy_and_read_only(template_dir: Path, pack_dir: Path) -> None:
+    reg = _registry(template_dir, TemplatePack.open(pack_dir))
+    img = reg.get("icon_4k.png")
+    assert img is not None
+    assert not img.flags.writeable
+    assert not img.flags.owndata
+
+
+def test_changed_file_falls_back_to_png(template_dir: Path, pack_dir: Path) -> None:
+    pack = TemplatePack.open(pack_dir)
+    reg = _registry(template_dir, pack)
+    new = np.full((21, 33, 3), 200, np.uint8)
+    cv2.imwrite(str(template_dir / "icon_4k.png"), new)
+    np.testing.assert_array_equal(reg.get("icon_4k.png"), new)
+    assert reg.disk_reads == 1
+    assert pack is not None and pack.stats()["stale"] == ["icon_4k.png"]
+
+
+def test_touched_but_identical_file_stays_packed(template_dir: Path, pack_dir: Path) -> None:
+    path = template_dir / "icon_4k.png"
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    reg = _registry(template_dir, TemplatePack.open(pack_dir))
+    assert reg.get("icon_4k.png") is not None
+    assert reg.disk_reads == 0       # content hash still matches
+
+
+def test_missing_pack_and_unknown_names(template_dir: Path, tmp_path: Path, pack_dir: Path) -> None:
+    assert TemplatePack.open(tmp_path / "nowhere") is None
+    cv2.imwrite(str(template_dir / "new_4k.png"), np.zeros((4, 4, 3), np.uint8))
+    reg = _registry(template_dir, TemplatePack.open(pack_dir))
+    assert reg.get("new_4k.png") is not None   # not in the pack: decoded from PNG
+    assert reg.disk_reads == 1
@@ -0,0 +1,123 @@
+"""Unit tests for utils/template_registry.py and the process-wide registry."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from utils import template_matcher
+from utils.template_registry import TemplateRegistry
+
+
+@pytest.fixture
+def template_dir(tmp_path: Path) -> Path:
+    img = np.random.default_rng(0).integers(0, 256, (20, 30, 3), dtype=np.uint8)
+    cv2.imwrite(str(tmp_path / "icon_4k.png"), img)
+    return tmp_path
+
+
+def _registry(template_dir: Path, check_interval: float = 0.0) -> TemplateRegistry:
+    return TemplateRegistry(path_fn=lambda name: template_dir / name, check_interval=check_interval)
+
+
+def test_each_variant_read_once(template_dir: Path) -> None:
+    reg = _registry(template_dir)
+    for _ in range(5):
+        color = reg.get("icon_4k.png")
+        gray = reg.get("icon_4k.png", "gray")
+        f32 = reg.get("icon_4k.png", "f32")
+    assert color is not None and color.shape == (20, 30, 3)
+    assert gray is not None and gray.ndim == 2
+    assert f32 is not None and f32.dtype == np.float32
+    assert reg.disk_reads == 2          # color + gray; f32 derived in memory
+    assert reg.get("icon_4k.png") is color
+
+
+def test_missing_file_cached(template_dir: Path) -> None:
+    reg = _registry(template_dir, check_interval=60.0)
+    assert reg.get("nope_4k.png") is None
+    assert reg.get("nope_4k.png") is None
+    assert not reg.exists("nope_4k.png")
+    assert reg.disk_reads == 0
+
+
+def test_hot_reload_on_mtime_change(template_dir: Path) -> None:
+    reg = _registry(template_dir)
+    reloaded: list[str] = []
+    reg.add_reload_listener(reloaded.append)
+    first = reg.get("icon_4k.png")
+    reg.get("icon_4k.png", "f32")
+
+    cv2.imwrite(str(template_dir / "icon_4k.png"), np.zeros((20, 30, 3), np.uint8))
+    st = (template_dir / "icon_4k.png").stat()
+    os.utime(template_dir / "icon_4k.png", (st.st_atime, st.st_mtime + 10))
+
+    second = reg.get("icon_4k.png")
+    assert second is not first and not second.any()
+    assert reloaded == ["icon_4k.png"]
+    assert reg.reloads == 1
+    assert not reg.get("icon_4k.png", "f32").any()   # derived variant dropped too
+
+
+def test_no_stat_within_check_interval(template_dir: Path) -> None:
+    reg = _registry(template_dir, check_interval=60.0)
+    reg.get("icon_4k.png")
+    os.utime(template_dir / "icon_4k.png", (0, 0))
+    reg.get("icon_4k.png")
+    assert reg.reloads == 0
+
+
+def test_stats_report_bytes(template_dir: Path) -> None:
+    reg = _registry(template_dir)
+    reg.get("icon_4k.png")
+    reg.get("icon_4k.png", "f32")
+    stats = reg.stats()
+    assert stats["entries"] == 2
+    assert stats["variants"]["color"] == {"entries": 1, "bytes": 20 * 30 * 3}
+    assert stats["variants"]["f32"]["bytes"] == 20 * 30 * 3 * 4
+    assert stats["bytes"] == 20 * 30 * 3 * 5
+    assert stats["disk_reads"] == 1
+
+
+def test_path_and_name_share_an_entry() -> None:
+    template_matcher.clear_cache()
+    by_name = template_matcher.get_template("go_button_4k.png")
+    by_path = template_matcher.get_template(template_matcher.TEMPLATE_DIR / "go_button_4k.png")
+    assert by_name is not None and by_path is by_name
+
+
+def test_helpers_do_no_disk_reads_in_steady_state() -> None:
+    """I/O counter: after one warm-up pass, helpers fetch every template from
+    the registry - cv2.imread is never called again."""
+    from utils.arms_race_ocr import detect_active_event, is_arms_race_panel_open
+    from utils.rally_plus_matcher import RallyPlusMatcher
+    from utils.safe_ground_matcher import find_safe_ground
+    from utils.shaded_button_helper import is_button_shaded
+    from utils.soldier_panel_slider import find_plus_button, find_slider_circle
+
+    template_matcher.clear_cache()
+    frame = np.random.default_rng(1).integers(0, 256, (2160, 3840, 3), dtype=np.uint8)
+    plus = RallyPlusMatcher()
+
+    def run_all() -> None:
+        detect_active_event(frame)
+        is_arms_race_panel_open(frame)
+        plus.find_all_plus_buttons(frame)
+        is_button_shaded(frame)
+        find_slider_circle(frame)
+        find_plus_button(frame)
+        find_safe_ground(frame)
+
+    # PNG path (a built template pack would serve everything without imread)
+    with patch.object(template_matcher.get_template_registry(), "pack", None), \
+            patch.object(cv2, "imread", wraps=cv2.imread) as imread:
+        run_all()
+        warm = imread.call_count
+        run_all()
+        run_all()
+    assert warm > 0
+    assert imread.call_count == warm
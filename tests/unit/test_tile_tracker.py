@@ -0,0 +1,167 @@
+"""Unit tests for utils/tile_tracker.py and dirty-tile reuse in DetectorThread."""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+
+from tests.conftest import CountingSpec
+from utils.frame_bus import FrameBus
+from utils.opportunity_detector import DetectorSpec, DetectorThread, OpportunityBoard
+from utils.tile_tracker import FULL_FRAME, TileTracker
+
+REGION = (120, 1400, 220, 200)
+
+
+def _frame(seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, (2160, 3840, 3), dtype=np.uint8)
+
+
+def test_first_frame_is_all_dirty() -> None:
+    tracker = TileTracker()
+    assert tracker.update(_frame()) is None
+    assert not tracker.unchanged(REGION)
+    assert tracker.changed_fraction() == 1.0
+
+
+def test_identical_frame_is_clean() -> None:
+    tracker = TileTracker()
+    frame = _frame()
+    tracker.update(frame)
+    dirty = tracker.update(frame.copy())
+    assert dirty is not None and dirty.shape == (34, 60) and not dirty.any()
+    assert tracker.unchanged(REGION)
+    assert tracker.unchanged(FULL_FRAME)
+    assert not tracker.unchanged(None)
+
+
+def test_change_marks_only_its_tiles() -> None:
+    tracker = TileTracker()
+    frame = _frame()
+    tracker.update(frame)
+    changed = frame.copy()
+    changed[1450:1470, 150:170] = 255 - changed[1450:1470, 150:170]
+    tracker.update(changed)
+    assert not tracker.unchanged(REGION)
+    assert tracker.unchanged((3600, 1920, 240, 240))
+    assert not tracker.unchanged(FULL_FRAME)
+    assert 0 < tracker.changed_fraction() < 0.01
+
+
+def test_unchanged_since_spans_several_frames() -> None:
+    tracker = TileTracker()
+    frame = _frame()
+    tracker.update(frame)
+    seen = tracker.frames                    # a result computed on frame 1
+    elsewhere = frame.copy()
+    elsewhere[100:110, 3000:3010] = 0
+    tracker.update(elsewhere)
+    tracker.update(elsewhere.copy())
+    assert tracker.unchanged_since(REGION, seen)
+    assert not tracker.unchanged_since((2990, 90, 40, 40), seen)
+    assert tracker.unchanged((2990, 90, 40, 40))          # clean vs the previous frame only
+    changed = elsewhere.copy()
+    changed[1450:1470, 150:170] = 0
+    tracker.update(changed)
+    tracker.update(changed.copy())
+    assert not tracker.unchanged_since(REGION, seen)
+    assert tracker.unchanged_since(REGION, tracker.frames - 1)
+    assert not tracker.unchanged_since(REGION, 0)
+
+
+def test_resolution_change_resets() -> None:
+    tracker = TileTracker()
+    tracker.update(_frame())
+    assert tracker.update(np.zeros((1080, 1920, 3), np.uint8)) is None
+
+
+def test_unaligned_and_strided_frames() -> None:
+    small = np.zeros((100, 130, 3), np.uint8)
+    changed = small.copy()
+    changed[99, 129] = 1                     # bottom-right partial tile
+    tracker = TileTracker()
+    tracker.update(small)
+    dirty = tracker.update(changed)
+    assert dirty is not None and dirty.tolist() == [[False, False, False], [False, False, True]]
+
+    strided = _frame()[:, ::2]               # not contiguous: byte-wise fallback
+    tracker = TileTracker()
+    tracker.update(strided)
+    assert not tracker.update(strided.copy()).any()
+    with pytest.raises(ValueError):
+        TileTracker(tile=0)
+
+
+def _counting() -> CountingSpec:
+    return CountingSpec(found=True, score=0.01, center=(230, 1500))
+
+
+def _detector(specs: list[DetectorSpec], **kw: Any) -> DetectorThread:
+    return DetectorThread(FrameBus(), OpportunityBoard(), specs, tick_interval=0.0, **kw)
+
+
+def test_unchanged_region_reuses_reading(detector_tick: Callable[..., None]) -> None:
+    fixed, roaming = _counting(), _counting()
+    specs = [DetectorSpec("union", None, fixed, region=REGION),
+             DetectorSpec("roaming", None, roaming)]
+    det = _detector(specs)
+    frame = _frame()
+    for i in range(4):
+        moved = frame.copy()
+        moved[1000, 2000] = i               # away from REGION and the view regions: not a duplicate
+        detector_tick(det, moved)
+    assert fixed.calls == 1                 # matched once, then reused
+    assert roaming.calls == 4               # no region: always re-run
+    counters = det.state.spec_counters()
+    assert (counters["union"]["matched"], counters["union"]["skipped"]) == (1, 3)
+    assert counters["union"]["skip_ratio"] == 0.75
+    assert counters["roaming"]["skipped"] == 0
+    assert counters["view"]["skipped"] == 3
+    reading = det.state.get("union", max_age=1.0)
+    assert reading is not None and reading.found and reading.center == (230, 1500)
+    assert det.board.get_fresh("union") is not None
+    assert specs[0].hits == 4
+
+    changed = frame.copy()
+    changed[1450:1470, 150:170] = 0
+    detector_tick(det, changed)
+    assert fixed.calls == 2
+
+
+def test_interval_spec_reuses_across_skipped_frames(detector_tick: Callable[..., None]) -> None:
+    fixed = _counting()
+    det = _detector([DetectorSpec("union", None, fixed, region=REGION, min_interval=1.0)])
+    frame = _frame()
+    for i in range(5):                      # due every other tick (dt=0.5)
+        moved = frame.copy()
+        moved[1000, 2000] = i
+        detector_tick(det, moved)
+    assert fixed.calls == 1                 # matched once; reused on each later due tick
+    assert det.state.spec_counters()["union"]["skipped"] == 2
+
+    changed = frame.copy()
+    changed[1450:1470, 150:170] = 0
+    detector_tick(det, changed)             # not due
+    changed = changed.copy()
+    changed[1000, 2000] = 9
+    detector_tick(det, changed)             # due: REGION clean vs the previous frame, not vs its reading
+    assert fixed.calls == 2
+
+
+def test_reuse_is_bounded_in_time(detector_tick: Callable[..., None]) -> None:
+    fixed = _counting()
+    det = _detector([DetectorSpec("union", None, fixed, region=REGION)], max_reuse_age=0.0)
+    frame = _frame()
+    for _ in range(3):
+        detector_tick(det, frame)
+    assert fixed.calls == 3
+
+
+def test_disabled_tracking_always_matches(detector_tick: Callable[..., None]) -> None:
+    fixed = _counting()
+    det = _detector([DetectorSpec("union", None, fixed, region=REGION)], tile_size=None)
+    frame = _frame()
+    for _ in range(3):
+        detector_tick(det, frame)
+    assert fixed.calls == 3
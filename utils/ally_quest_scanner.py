@@ -22,9 +22,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import numpy as np
 import numpy.typing as npt
 
+from utils.template_matcher import find_all_templates, get_template
+
 if TYPE_CHECKING:
     from utils.adb_helper import ADBHelper
     from utils.windows_screenshot_helper import WindowsScreenshotHelper
@@ -86,12 +87,11 @@ def load_templates() -> dict[str, npt.NDArray[Any]]:
     }
 
     for name, filename in template_files.items():
-        path = TEMPLATES_DIR / filename
-        template: npt.NDArray[Any] | None = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        template = get_template(filename, grayscale=True)
         if template is not None:
             templates[name] = template
         else:
-            logger.warning(f"Template not found: {path}")
+            logger.warning(f"Template not found: {TEMPLATES_DIR / filename}")
 
     return templates
 
@@ -108,36 +108,25 @@ def find_all_buttons(
     """
     buttons: list[dict[str, Any]] = []
 
-    # Search in the right side of the quest list
-    roi = frame_gray[SEARCH_Y_START:SEARCH_Y_END, SEARCH_X_START:SEARCH_X_END]
-
-    # Find Assist buttons
-    if assist_template is not None:
-        result = cv2.matchTemplate(roi, assist_template, cv2.TM_SQDIFF_NORMED)
-        locations = np.where(result <= threshold)
-        for pt in zip(*locations[::-1]):
-            x = int(pt[0]) + SEARCH_X_START
-            y = int(pt[1]) + SEARCH_Y_START
-            buttons.append({"x": x, "y": y, "type": "assist", "score": float(result[pt[1], pt[0]])})
-
-    # Find timer clocks
-    if clock_template is not None:
-        result = cv2.matchTemplate(roi, clock_template, cv2.TM_SQDIFF_NORMED)
-        locations = np.where(result <= threshold)
-        for pt in zip(*locations[::-1]):
-            x = int(pt[0]) + SEARCH_X_START
-            y = int(pt[1]) + SEARCH_Y_START
-            buttons.append({"x": x, "y": y, "type": "timer", "score": float(result[pt[1], pt[0]])})
-
-    # Remove duplicates (buttons within 50 pixels of each other)
+    # Search in the right side of the quest list, one hit per row per type
+    roi = (SEARCH_X_START, SEARCH_Y_START, SEARCH_X_END - SEARCH_X_START, SEARCH_Y_END - SEARCH_Y_START)
+    for btn_type, template in (("assist", assist_template), ("timer", clock_template)):
+        if template is None:
+            continue
+        th, tw = template.shape[:2]
+        hits = find_all_templates(
+            frame_gray, template, search_region=roi, threshold=threshold, min_distance=(roi[2], 50),
+        )
+        # Callers work from the button's top-left corner
+        buttons.extend(
+            {"x": x - tw // 2, "y": y - th // 2, "type": btn_type, "score": score}
+            for x, y, score in hits
+        )
+
+    # An assist button and a clock on the same row: keep the better match
     filtered: list[dict[str, Any]] = []
     for btn in sorted(buttons, key=lambda b: b["score"]):
-        is_dup = False
-        for existing in filtered:
-            if abs(btn["y"] - existing["y"]) < 50:
-                is_dup = True
-                break
-        if not is_dup:
+        if all(abs(btn["y"] - existing["y"]) >= 50 for existing in filtered):
             filtered.append(btn)
 
     return sorted(filtered, key=lambda b: b["y"])
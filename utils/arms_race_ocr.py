@@ -19,6 +19,8 @@ import cv2
 import numpy as np
 import numpy.typing as npt
 
+from utils.template_matcher import get_template
+
 if TYPE_CHECKING:
     from utils.windows_screenshot_helper import WindowsScreenshotHelper
 
@@ -46,8 +48,16 @@ def extract_region(frame: npt.NDArray[Any], region: tuple[int, int, int, int]) -
     return frame[y:y+h, x:x+w]
 
 
-def ocr_number_from_region(frame: npt.NDArray[Any], region: tuple[int, int, int, int]) -> int | None:
-    """Extract a number from a specific region using OCR."""
+def ocr_number_from_region(
+    frame: npt.NDArray[Any],
+    region: tuple[int, int, int, int],
+    cache: bool = True,
+) -> int | None:
+    """Extract a number from a specific region using OCR.
+
+    cache=False always asks the server (consensus reads must be independent,
+    not one result repeated from the OCR cache).
+    """
     from utils.ocr_client import OCRClient
 
     roi = extract_region(frame, region)
@@ -55,7 +65,19 @@ def ocr_number_from_region(frame: npt.NDArray[Any], region: tuple[int, int, int,
         return None
 
     ocr = OCRClient()
-    return ocr.extract_number(roi)
+    return ocr.extract_number(roi, cache=cache)
+
+
+def ocr_numbers_from_regions(
+    frame: npt.NDArray[Any],
+    regions: dict[str, tuple[int, int, int, int]],
+) -> dict[str, int | None]:
+    """Extract a number from each named region with one batched OCR call."""
+    from utils.ocr_client import OCRClient, OCRRequest
+
+    names = list(regions)
+    values = OCRClient().extract_many(frame, [OCRRequest(regions[name], "number") for name in names])
+    return {name: value if isinstance(value, int) else None for name, value in zip(names, values)}
 
 
 def get_current_points(frame: npt.NDArray[Any]) -> int | None:
@@ -115,9 +137,11 @@ def get_current_points_verified(
     """
     Get the player's current points with consensus + plausibility verification.
 
-    Takes multiple screenshots and performs OCR on each. A value needs at
-    least 2 matching readings. When last_known (same event, same block) is
-    provided, one extra rule applies, because scores within a block only go up:
+    Reads several frames (one fresh capture, then frames the process publishes
+    anyway - see frame_bus.collect_frames - capturing only for the shortfall)
+    and performs OCR on each. A value needs at least 2 matching readings.
+    When last_known (same event, same block) is provided, one extra rule
+    applies, because scores within a block only go up:
 
     - A consensus value BELOW last_known is rejected unless every reading
       unanimously agrees (unanimity means our stored state was stale, not OCR
@@ -134,17 +158,15 @@ def get_current_points_verified(
     Returns:
         Points if consistent and plausible, None otherwise
     """
-    import time
     from collections import Counter
 
+    from utils.frame_bus import collect_frames
+
     results = []
-    for i in range(retries):
-        frame = win.get_screenshot_cv2()
-        val = ocr_number_from_region(frame, CURRENT_POINTS_REGION)
+    for frame in collect_frames(win.get_screenshot_cv2, retries, interval=0.1):
+        val = ocr_number_from_region(frame, CURRENT_POINTS_REGION, cache=False)
         if val is not None:
             results.append(val)
-        if i < retries - 1:
-            time.sleep(0.1)  # Small delay between screenshots
 
     if not results:
         return None
@@ -174,20 +196,21 @@ def get_current_points_verified(
 
 def get_chest_thresholds(frame: npt.NDArray[Any]) -> dict[str, int | None]:
     """Get all three chest thresholds from the Arms Race panel."""
-    return {
-        "chest1": ocr_number_from_region(frame, CHEST1_REGION),
-        "chest2": ocr_number_from_region(frame, CHEST2_REGION),
-        "chest3": ocr_number_from_region(frame, CHEST3_REGION),
-    }
+    return ocr_numbers_from_regions(frame, {
+        "chest1": CHEST1_REGION,
+        "chest2": CHEST2_REGION,
+        "chest3": CHEST3_REGION,
+    })
 
 
 def get_all_scores(frame: npt.NDArray[Any]) -> dict[str, int | None]:
-    """Get current points and all chest thresholds."""
-    thresholds = get_chest_thresholds(frame)
-    return {
-        "current_points": get_current_points(frame),
-        **thresholds,
-    }
+    """Get current points and all chest thresholds (one batched OCR call)."""
+    return ocr_numbers_from_regions(frame, {
+        "current_points": CURRENT_POINTS_REGION,
+        "chest1": CHEST1_REGION,
+        "chest2": CHEST2_REGION,
+        "chest3": CHEST3_REGION,
+    })
 
 
 def detect_active_event(frame: npt.NDArray[Any]) -> tuple[str | None, float]:
@@ -220,13 +243,9 @@ def detect_active_event(frame: npt.NDArray[Any]) -> tuple[str | None, float]:
         if not template_name or not isinstance(template_name, str):
             continue
 
-        template_path = TEMPLATE_DIR / template_name
-        if not template_path.exists():
-            continue
-
-        template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
+        template = get_template(template_name, grayscale=True)
         if template is None:
-            continue  # type: ignore[unreachable]
+            continue
 
         # Resize template if needed (should be same size ideally)
         if template.shape != title_gray.shape:
@@ -253,13 +272,9 @@ def is_arms_race_panel_open(frame: npt.NDArray[Any], threshold: float = 0.1) ->
     Uses template matching on the active Arms Race icon button.
     """
     # Check for active Arms Race icon
-    active_template_path = TEMPLATE_DIR / "arms_race_icon_active_4k.png"
-    if not active_template_path.exists():
-        return False
-
-    template = cv2.imread(str(active_template_path))
+    template = get_template("arms_race_icon_active_4k.png")
     if template is None:
-        return False  # type: ignore[unreachable]
+        return False
 
     # Arms Race icon position
     ICON_X, ICON_Y = 1512, 1935
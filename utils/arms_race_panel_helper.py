@@ -40,6 +40,7 @@ from utils.view_state_detector import detect_view, go_to_town, ViewState
 from utils.return_to_base_view import return_to_base_view
 from utils.arms_race import get_event_metadata
 from utils.events_icon_matcher import EventsIconMatcher
+from utils.template_matcher import get_template
 
 logger = logging.getLogger(__name__)
 
@@ -107,14 +108,11 @@ def is_arms_race_icon_visible(frame: npt.NDArray[Any], use_active: bool = False)
     """
     template_path = ACTIVE_ICON_TEMPLATE if use_active else INACTIVE_ICON_TEMPLATE
 
-    if not template_path.exists():
+    template = get_template(template_path, grayscale=True)
+    if template is None:
         logger.warning(f"Template not found: {template_path}")
         return False, 1.0, (0, 0)
 
-    template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
-    if template is None:  # pragma: no cover
-        return False, 1.0, (0, 0)  # type: ignore[unreachable]
-
     # Convert frame to grayscale
     if len(frame.shape) == 3:
         frame_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
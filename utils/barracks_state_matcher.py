@@ -28,6 +28,7 @@ from enum import Enum
 from typing import Any
 
 from config import BARRACKS_POSITIONS, BARRACKS_TEMPLATE_SIZE, BARRACKS_MATCH_THRESHOLD, BARRACKS_YELLOW_PIXEL_THRESHOLD
+from utils.frame_context import FrameContext, frame_array
 from utils.template_matcher import match_template
 
 # Use config values
@@ -73,7 +74,7 @@ class BarracksStateMatcher:
         mask = cv2.inRange(hsv, lower_yellow, upper_yellow)
         return int(np.count_nonzero(mask))
 
-    def get_barrack_matches(self, frame: npt.NDArray[Any], barrack_index: int) -> dict[str, tuple[bool, float]]:
+    def get_barrack_matches(self, frame: npt.NDArray[Any] | FrameContext, barrack_index: int) -> dict[str, tuple[bool, float]]:
         """
         Get template match results for a single barrack.
 
@@ -117,7 +118,7 @@ class BarracksStateMatcher:
             'white': (white_found, white_score)
         }
 
-    def get_barrack_scores(self, frame: npt.NDArray[Any], barrack_index: int) -> dict[str, float]:
+    def get_barrack_scores(self, frame: npt.NDArray[Any] | FrameContext, barrack_index: int) -> dict[str, float]:
         """
         Get all template scores for a single barrack (for debugging/display).
 
@@ -131,7 +132,7 @@ class BarracksStateMatcher:
             'white': matches['white'][1]
         }
 
-    def get_barrack_state(self, frame: npt.NDArray[Any], barrack_index: int, frame_gray: Any = None) -> tuple[BarrackState, float]:
+    def get_barrack_state(self, frame: npt.NDArray[Any] | FrameContext, barrack_index: int, frame_gray: Any = None) -> tuple[BarrackState, float]:
         """
         Get the state of a single barrack.
 
@@ -176,7 +177,7 @@ class BarracksStateMatcher:
         # Best match is yellow or white - use yellow pixel counting to distinguish
         x, y = BARRACKS_POSITIONS[barrack_index]
         tw, th = TEMPLATE_SIZE
-        roi_bgr = frame[y:y+th, x:x+tw]
+        roi_bgr = frame_array(frame)[y:y+th, x:x+tw]
         yellow_pixels = self._count_yellow_pixels(roi_bgr)
 
         if yellow_pixels >= BARRACKS_YELLOW_PIXEL_THRESHOLD:
@@ -184,8 +185,8 @@ class BarracksStateMatcher:
         else:
             return BarrackState.PENDING, white_score
 
-    def get_all_states(self, frame: npt.NDArray[Any]) -> list[tuple[BarrackState, float]]:
-        """Get the state of all 4 barracks."""
+    def get_all_states(self, frame: npt.NDArray[Any] | FrameContext) -> list[tuple[BarrackState, float]]:
+        """Get the state of all 4 barracks (accepts a FrameContext)."""
         return [self.get_barrack_state(frame, i) for i in range(4)]
 
     def get_states_summary(self, frame: npt.NDArray[Any]) -> dict[str, int]:
@@ -0,0 +1,461 @@
+"""
+Capture backends - where 4K frames come from.
+
+Everything downstream of capture (FrameBus, DetectorThread, view detection,
+matchers, flows) only needs an object with get_screenshot_cv2(). That method
+lives here, on CaptureBackend, together with the parts every source shares:
+
+- the corrupt-frame guard (re-capture an unwritten, all-black frame)
+- publishing every VERIFIED frame to the FrameBus
+- per-caller timing (capture_stats(): rolling rate, lock wait and capture
+  work percentiles per thread or capture_tag(), in the daemon status)
+- the capture governor: a backend with GOVERNOR_MAX_AGE set returns the
+  bus's newest 4K frame instead of capturing when it is younger than that
+
+A backend only implements _capture_once(native=False) -> 4K BGR frame (or,
+with native=True, the frame at capture resolution - no 4K upscale - for
+native-scale perception; see utils/frame_context.py):
+
+- WindowsScreenshotHelper (utils/windows_screenshot_helper.py): PrintWindow
+  on the BlueStacks window - the production backend (Windows only)
+- ReplayBackend: frames from disk - a directory of screenshots, or an
+  action_capture session's before/after shots in recorded order - at a fixed
+  rate or as fast as possible. Runs anywhere, so the perception stack can be
+  exercised and benchmarked off the Windows box:
+
+    from utils.capture_backend import ReplayBackend
+
+    src = ReplayBackend.from_session("screenshots/action_capture/20250101_120000", rate=5)
+    while not src.exhausted:
+        frame = src.get_screenshot_cv2()     # published to the FrameBus
+"""
+from __future__ import annotations
+
+import json
+import logging
+import statistics
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+FRAME_W, FRAME_H = 3840, 2160
+NATIVE_W, NATIVE_H = 1792, 1010   # BlueStacks client area at the target window size, minus borders
+_IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+
+def bgrx_to_bgr(
+    raw: Any,
+    width: int,
+    height: int,
+    borders: tuple[int, int, int, int] = (0, 0, 0, 0),
+    size: tuple[int, int] = (FRAME_W, FRAME_H),
+    out: npt.NDArray[Any] | None = None,
+    scratch: npt.NDArray[Any] | None = None,
+) -> npt.NDArray[Any]:
+    """Raw top-down 32-bit BGRX bitmap bytes -> BGR frame of `size` (w, h).
+
+    `borders` (left, top, right, bottom) are cropped by slicing a view of
+    `raw` - no copy. The X byte is dropped at source resolution (into
+    `scratch` if given, shape (h-top-bottom, w-left-right, 3)), then resized
+    straight into `out` (shape (size[1], size[0], 3)) if given. Pixels are
+    identical to the old PIL frombuffer/crop/resize/RGB2BGR path, which
+    made three full-frame copies and swapped channels twice.
+    """
+    view = bgrx_view(raw, width, height, borders)
+    bgr: npt.NDArray[Any] = cv2.cvtColor(view, cv2.COLOR_BGRA2BGR, dst=scratch)
+    if bgr.shape[1] == size[0] and bgr.shape[0] == size[1]:
+        if out is None:
+            return bgr
+        np.copyto(out, bgr)
+        return out
+    return cv2.resize(bgr, size, dst=out, interpolation=cv2.INTER_LINEAR)
+
+
+def bgrx_view(
+    raw: Any,
+    width: int,
+    height: int,
+    borders: tuple[int, int, int, int] = (0, 0, 0, 0),
+) -> npt.NDArray[Any]:
+    """Zero-copy (h, w, 4) view of a raw BGRX bitmap with `borders` cropped."""
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    if buf.size != width * height * 4:
+        raise ValueError(f"expected {width}x{height} BGRX ({width * height * 4} bytes), got {buf.size}")
+    left, top, right, bottom = borders
+    return buf.reshape(height, width, 4)[top:height - bottom, left:width - right]
+
+
+GUARD_GRID = (256, 144)   # sample points per axis (w, h) - one per cell of the old 256x144 resize
+GUARD_BANDS = 12          # sample rows are scanned in this many bands, stopping once decided
+
+
+def mostly_black(
+    img: npt.NDArray[Any],
+    dark_max: int,
+    min_frac: float,
+    grid: tuple[int, int] = GUARD_GRID,
+    bands: int = GUARD_BANDS,
+) -> bool:
+    """True if at least `min_frac` of `img` (BGR or BGRX, any resolution -
+    a 4K frame or the raw capture) has gray value <= `dark_max`.
+
+    Estimated from a strided grid of single pixels at the cell centres
+    (no full-frame grayscale or resize pass), scanned band by band: the
+    scan stops as soon as enough non-black samples rule "mostly black" out
+    (a real frame: after ~2 bands) or enough black ones confirm it.
+    """
+    h, w = img.shape[:2]
+    sx, sy = max(1, w // grid[0]), max(1, h // grid[1])
+    ys = range(sy // 2, h, sy)
+    total = len(ys) * len(range(sx // 2, w, sx))
+    need_black = min_frac * total
+    allowed_lit = total - need_black
+    black = lit = 0
+    step = max(1, -(-len(ys) // bands))
+    for i in range(0, len(ys), step):
+        rows = img[ys[i]:ys[min(i + step, len(ys)) - 1] + 1:sy, sx // 2::sx]
+        sample = np.ascontiguousarray(rows)
+        if sample.ndim == 3:
+            sample = cv2.cvtColor(sample, cv2.COLOR_BGRA2GRAY if sample.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+        n_black = int(np.count_nonzero(sample <= dark_max))
+        black += n_black
+        lit += sample.size - n_black
+        if lit > allowed_lit:
+            return False
+        if black >= need_black:
+            return True
+    return black >= need_black
+
+
+_caller_local = threading.local()
+
+
+@contextmanager
+def capture_tag(name: str) -> Iterator[None]:
+    """Attribute this thread's captures to `name` (default: the thread name,
+    e.g. "flow:union_gifts", "OpportunityDetector", "capture-burst")."""
+    prev = getattr(_caller_local, "tag", None)
+    _caller_local.tag = name
+    try:
+        yield
+    finally:
+        _caller_local.tag = prev
+
+
+def current_caller() -> str:
+    return getattr(_caller_local, "tag", None) or threading.current_thread().name
+
+
+class CaptureStats:
+    """Rolling per-caller record of get_screenshot_cv2 calls: time waiting
+    for the backend's capture lock, time capturing (GDI + conversion +
+    guard, retries included), and calls the governor served from the bus."""
+
+    WINDOW_S = 60.0    # rates and percentiles cover this much recent history
+
+    def __init__(self, maxlen: int = 1024) -> None:
+        self._lock = threading.Lock()
+        self._maxlen = maxlen
+        self._by_caller: dict[str, deque[tuple[float, float, float, bool]]] = {}
+
+    def record(self, caller: str, wait_ms: float, work_ms: float, reused: bool = False) -> None:
+        with self._lock:
+            rows = self._by_caller.setdefault(caller, deque(maxlen=self._maxlen))
+            rows.append((time.time(), wait_ms, work_ms, reused))
+
+    def snapshot(self) -> dict[str, Any]:
+        cutoff = time.time() - self.WINDOW_S
+        with self._lock:
+            recent = {k: [r for r in v if r[0] >= cutoff] for k, v in self._by_caller.items()}
+        out: dict[str, Any] = {}
+        for caller, rows in sorted(recent.items()):
+            if not rows:
+                continue
+            captured = [r for r in rows if not r[3]]
+            out[caller] = {
+                "calls": len(rows),
+                "per_s": round(len(rows) / self.WINDOW_S, 2),
+                "reused": len(rows) - len(captured),
+                **_percentiles("wait", [r[1] for r in captured]),
+                **_percentiles("work", [r[2] for r in captured]),
+            }
+        calls = sum(v["calls"] for v in out.values())
+        captured = calls - sum(v["reused"] for v in out.values())
+        out["total_per_s"] = round(calls / self.WINDOW_S, 2)
+        out["captures_per_s"] = round(captured / self.WINDOW_S, 2)
+        return out
+
+
+def _percentiles(prefix: str, samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {}
+    s = sorted(samples)
+    return {f"{prefix}_p50_ms": round(statistics.median(s), 2),
+            f"{prefix}_p95_ms": round(s[min(len(s) - 1, int(round(0.95 * (len(s) - 1))))], 2)}
+
+
+_capture_stats = CaptureStats()
+
+
+def capture_stats() -> dict[str, Any]:
+    """Per-caller capture rates and latencies for the daemon status."""
+    return _capture_stats.snapshot()
+
+
+class CaptureBackend(ABC):
+    """A frame source: subclasses implement _capture_once(); callers use
+    get_screenshot_cv2()."""
+
+    # Corrupt-frame guard: PrintWindow intermittently returns a frame with a
+    # wide near-black band across the top while the rest renders fine, which
+    # silently breaks fixed-region template detection (rally panel, tavern
+    # tabs, harvest bubbles). Detect that signature - a large dark band in an
+    # otherwise BRIGHT frame - and re-capture. The brightness gate ensures a
+    # genuinely dark screen (loading/night) is NOT treated as corrupt.
+    CORRUPT_DARK_MAX = 8          # pixel value <= this = PURE-black "unwritten" memory (real game
+                                  # screens, even dark ones, use grays >8 so they don't count)
+    CORRUPT_ALLBLACK_FRAC = 0.90  # corrupt ONLY if >=90% of the frame is pure black (a totally
+                                  # unwritten capture). Real screens measured <=1.4% pure black,
+                                  # corrupt ~100% - so anything that isn't almost-all black is fine.
+    MAX_CORRUPT_RETRIES = 2       # extra re-captures when a corrupt frame is seen
+    CORRUPT_RETRY_DELAY = 0.12    # seconds between corrupt-frame re-captures
+    _guard_local = threading.local()   # per-thread raw-buffer guard verdict (_remember_guard)
+    GOVERNOR_MAX_AGE: float | None = None   # serve bus frames younger than this (s) instead of capturing
+
+    @abstractmethod
+    def _capture_once(self, native: bool = False) -> npt.NDArray[Any]:
+        """Perform a single capture and return a 4K BGR numpy array (native:
+        at capture resolution instead)."""
+
+    def _frame_looks_corrupt(self, img_bgr: npt.NDArray[Any]) -> bool:
+        """True only for a totally UNWRITTEN PrintWindow capture: (nearly) the
+        WHOLE frame is pure black. Any real game screen has content, so even the
+        darkest ones stay tiny on pure-black (measured: Forest Trial 1.4%, most
+        panels 0.0%); a corrupt capture is ~100%. So the rule is simply: if it's
+        not almost-all black, it's a real frame - not corrupt.
+        """
+        return mostly_black(img_bgr, self.CORRUPT_DARK_MAX, self.CORRUPT_ALLBLACK_FRAC)
+
+    def _remember_guard(self, frame: npt.NDArray[Any], corrupt: bool) -> None:
+        """Called by a backend that already ran the guard on its raw capture
+        buffer (cheaper: pre-upscale), so it is not re-run on `frame`."""
+        self._guard_local.verdict = (frame, corrupt)
+
+    def _guard_verdict(self, frame: npt.NDArray[Any]) -> bool:
+        pending = getattr(self._guard_local, "verdict", None)
+        self._guard_local.verdict = None
+        if pending is not None and pending[0] is frame:
+            return bool(pending[1])
+        return self._frame_looks_corrupt(frame)
+
+    def _note_lock_wait(self, seconds: float) -> None:
+        """Called by a backend with a capture lock: time spent acquiring it
+        (reported separately from the capture work)."""
+        self._guard_local.lock_wait = getattr(self._guard_local, "lock_wait", 0.0) + seconds
+
+    def _governed_frame(self) -> npt.NDArray[Any] | None:
+        """The bus's newest frame if it is a 4K frame younger than
+        GOVERNOR_MAX_AGE (native-scale detector frames are never served)."""
+        if not self.GOVERNOR_MAX_AGE:
+            return None
+        try:
+            from utils.frame_bus import get_frame_bus
+            item = get_frame_bus().latest(max_age=self.GOVERNOR_MAX_AGE)
+        except Exception:
+            return None
+        if item is None or getattr(item[0], "shape", None) != (FRAME_H, FRAME_W, 3):
+            return None
+        frame: npt.NDArray[Any] = item[0]
+        return frame
+
+    def get_screenshot_cv2(self, native: bool = False, fresh: bool = False) -> npt.NDArray[Any]:
+        """Get a 4K screenshot as cv2 numpy array (compatible with template matching).
+
+        This is the main method to use for template matching pipelines.
+        native=True skips the 4K upscale (perception only: match it through
+        FrameContext.for_frame, which keeps coordinates in 4K).
+
+        Re-captures up to MAX_CORRUPT_RETRIES times if the frame shows the
+        PrintWindow black-band artifact; always returns a frame (never raises
+        or hangs on persistent corruption).
+
+        Governor: when the FrameBus already holds a 4K frame younger than
+        GOVERNOR_MAX_AGE, that frame is returned without capturing.
+        fresh=True always captures (e.g. right after a tap whose effect the
+        caller is about to check).
+
+        Every call is timed per caller (capture_stats()).
+
+        Returns:
+            np.ndarray: BGR image at 4K resolution (3840x2160x3)
+        """
+        caller = current_caller()
+        start = time.perf_counter()
+        if not (native or fresh):
+            governed = self._governed_frame()
+            if governed is not None:
+                _capture_stats.record(caller, 0.0, (time.perf_counter() - start) * 1000.0, reused=True)
+                return governed
+        self._guard_local.lock_wait = 0.0
+        try:
+            return self._capture_verified(native)
+        finally:
+            wait = self._guard_local.lock_wait
+            _capture_stats.record(caller, wait * 1000.0, (time.perf_counter() - start - wait) * 1000.0)
+
+    def _capture_verified(self, native: bool) -> npt.NDArray[Any]:
+        last: npt.NDArray[Any] | None = None
+        for attempt in range(self.MAX_CORRUPT_RETRIES + 1):
+            last = self._capture_once(native=True) if native else self._capture_once()
+            if not self._guard_verdict(last):
+                self._publish_to_bus(last)
+                return last
+            logger.warning(
+                "Corrupt capture frame detected (black band), re-capturing "
+                "(attempt %d/%d)", attempt + 1, self.MAX_CORRUPT_RETRIES
+            )
+            time.sleep(self.CORRUPT_RETRY_DELAY)
+
+        logger.warning(
+            "Capture still corrupt after %d retries; returning last frame",
+            self.MAX_CORRUPT_RETRIES
+        )
+        assert last is not None  # loop runs at least once
+        # Deliberately NOT published: a corrupt frame would feed garbage into
+        # perception (vote histories, stamina OCR). Callers still get it.
+        return last
+
+    def _publish_to_bus(self, frame: npt.NDArray[Any]) -> None:
+        """Publish a VERIFIED (non-corrupt) frame to the FrameBus so the
+        perception thread sees fresh frames with zero extra GDI load (flows
+        capture constantly while running - exactly when the actor is busy)."""
+        try:
+            from utils.frame_bus import get_frame_bus
+            get_frame_bus().publish(frame)
+        except Exception:
+            pass  # perception is best-effort; never break capture
+
+    def save_screenshot(self, output_path: str) -> str:
+        """Capture and save a 4K screenshot.
+
+        Args:
+            output_path: Path to save the screenshot
+
+        Returns:
+            str: The output path where the screenshot was saved
+        """
+        img_bgr = self.get_screenshot_cv2()
+        cv2.imwrite(output_path, img_bgr)
+        return output_path
+
+
+class ReplayBackend(CaptureBackend):
+    """Serves recorded frames in order, paced to `rate` frames/s (None = as
+    fast as possible). Frames that are not 4K (e.g. downscaled action-capture
+    shots) are resized to 3840x2160 like a live capture; native captures are
+    resized to `native_size` instead.
+
+    When the frames run out: start over if `loop`, else raise EOFError from
+    get_screenshot_cv2() (check `exhausted` first)."""
+
+    CORRUPT_RETRY_DELAY = 0.0     # a recorded corrupt frame: skip straight to the next one
+
+    def __init__(self, frames: list[Path], rate: float | None = None, loop: bool = False,
+                 native_size: tuple[int, int] = (NATIVE_W, NATIVE_H)) -> None:
+        if not frames:
+            raise ValueError("ReplayBackend needs at least one frame")
+        self.frames = [Path(p) for p in frames]
+        self.rate = rate
+        self.loop = loop
+        self.native_size = native_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._next_due = 0.0
+        self.served = 0
+
+    @classmethod
+    def from_directory(cls, directory: str | Path, pattern: str = "*",
+                       rate: float | None = None, loop: bool = False) -> ReplayBackend:
+        """Every image in `directory` matching `pattern`, in name order."""
+        frames = sorted(p for p in Path(directory).glob(pattern) if p.suffix.lower() in _IMAGE_SUFFIXES)
+        return cls(frames, rate=rate, loop=loop)
+
+    @classmethod
+    def from_session(cls, session_dir: str | Path, after: bool = True,
+                     rate: float | None = None, loop: bool = False) -> ReplayBackend:
+        """An action_capture session (actions.jsonl): each action's before-shot
+        followed (if `after`) by its after-burst, in recorded order."""
+        session_dir = Path(session_dir)
+        records = []
+        with open(session_dir / "actions.jsonl", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+        frames: list[Path] = []
+        for rec in sorted(records, key=lambda r: (r.get("ts", 0.0), r.get("seq", 0))):
+            shots = [rec.get("before_shot") or ""] + (list(rec.get("after_shots") or []) if after else [])
+            for shot in shots:
+                path = _resolve_shot(shot, session_dir)
+                if path is not None:
+                    frames.append(path)
+        return cls(frames, rate=rate, loop=loop)
+
+    @property
+    def exhausted(self) -> bool:
+        with self._lock:
+            return not self.loop and self._next >= len(self.frames)
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._next = 0
+            self._next_due = 0.0
+
+    def _capture_once(self, native: bool = False) -> npt.NDArray[Any]:
+        with self._lock:
+            if self._next >= len(self.frames):
+                if not self.loop:
+                    raise EOFError(f"replay finished ({len(self.frames)} frames)")
+                self._next = 0
+            path = self.frames[self._next]
+            self._next += 1
+            wait = 0.0
+            if self.rate:
+                now = time.monotonic()
+                wait = max(0.0, self._next_due - now)
+                self._next_due = max(now, self._next_due) + 1.0 / self.rate
+        if wait:
+            time.sleep(wait)
+
+        w, h = self.native_size if native else (FRAME_W, FRAME_H)
+        frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if frame is None:
+            logger.warning(f"Replay: unreadable frame {path}, substituting black")
+            frame = np.zeros((h, w, 3), np.uint8)
+        elif frame.shape[:2] != (h, w):
+            interp = cv2.INTER_AREA if frame.shape[1] > w else cv2.INTER_LINEAR
+            frame = cv2.resize(frame, (w, h), interpolation=interp)
+        self.served += 1
+        return frame
+
+
+def _resolve_shot(shot: str, session_dir: Path) -> Path | None:
+    """action_capture stores shot paths relative to the project root; fall
+    back to the file name inside the session dir (a copied session)."""
+    if not shot:
+        return None
+    for path in (Path(shot), PROJECT_ROOT / shot, session_dir / Path(shot).name):
+        if path.is_file():
+            return path
+    return None
@@ -10,30 +10,97 @@ when the old serial design was blind - so the bus is freshest during flows.
 Consumers call latest(max_age) and get (frame, ts) or None. Frames are BGR
 numpy arrays at 4K; the bus stores only a reference (no copies) - consumers
 must treat frames as read-only (all matchers do).
+
+The bus also keeps a bounded history: the last `history` frames, evicting
+the oldest beyond `max_mb` of pixel data. Temporal readers (consensus OCR,
+vote histories) query it - frames_since(ts), last_n(n, max_age),
+wait_for_n_new(n, timeout) - instead of triggering captures of their own;
+collect_frames() is the capture-only-for-the-shortfall helper. stats()
+reports occupancy and memory for the daemon status.
+
+wait_until_stable(region, min_stable_ms, timeout) returns as soon as a
+region stops changing (downsampled grayscale differencing across frames).
+settle() is the flow-side replacement for `time.sleep(FIXED_DELAY)` plus a
+capture: never slower than the fixed delay, and every call records how much
+wall time it saved (settle_stats(), shown in the daemon status).
+
+Every published frame gets a content fingerprint (crc32 of all its
+pixels); a frame whose fingerprint equals the
+previous one is counted as a duplicate (stats()), and consumers compare
+fingerprint_of(ts) to skip work on pixel-identical frames (the detector
+re-stamps its previous readings).
+
+With a FrameShmWriter attached (config FRAME_SHM_ENABLED), every published
+frame is also copied into a shared-memory segment that other processes map
+with utils.frame_shm.FrameShmReader.
 """
 from __future__ import annotations
 
+import logging
 import threading
 import time
-from typing import Any
+import zlib
+from collections import deque
+from typing import Any, Callable
+
+import cv2
+import numpy as np
+
+from utils.frame_context import FRAME_H, FRAME_W, scale_region
+
+logger = logging.getLogger("frame_bus")
+
+STABLE_TOLERANCE = 2.0     # mean |diff| (0-255) of the downsampled region that still counts as "same"
+STABLE_DOWNSAMPLE = 8      # region shrunk by 1/8 per axis before differencing
 
 
 class FrameBus:
-    def __init__(self) -> None:
+    def __init__(self, history: int = 1, max_mb: float | None = None, shm: Any = None) -> None:
         self._lock = threading.Lock()
         self._cond = threading.Condition(self._lock)
         self._frame: Any = None
         self._ts: float = 0.0
+        self.history = max(1, history)
+        self.max_bytes = int(max_mb * 1e6) if max_mb is not None else None
+        self._ring: deque[tuple[Any, float]] = deque()
+        self._ring_fps: deque[int | None] = deque()      # fingerprint per ring entry
+        self._ring_bytes = 0
+        self._seq = 0            # frames ever published
+        self._fp: int | None = None
+        self.duplicates = 0      # published frames identical to the one before
+        self.shm = shm           # optional FrameShmWriter mirror
 
-    def publish(self, frame: Any) -> None:
+    def publish(self, frame: Any, ts: float | None = None) -> None:
         """Store the newest frame. Called from get_screenshot_cv2 on every
-        capture - must be effectively free (reference swap under a lock)."""
+        capture - must stay cheap: reference swaps under a lock, after the
+        content fingerprint (~10 ms at 4K) is taken outside it. The
+        shared-memory mirror copy happens after the lock is released.
+
+        ts is the frame's timestamp (default: now); replays and tests pass
+        their own clock's time. Consumers wait for a ts newer than the last
+        one they saw, so it must increase from one publish to the next."""
         if frame is None:
             return
+        fp = fingerprint(frame)     # before the lock: consumers see frame and fingerprint together
         with self._cond:
+            if fp is not None and fp == self._fp:
+                self.duplicates += 1
+            self._fp = fp
             self._frame = frame
-            self._ts = time.time()
+            self._ts = ts = time.time() if ts is None else ts
+            self._seq += 1
+            self._ring.append((frame, self._ts))
+            self._ring_fps.append(fp)
+            self._ring_bytes += _nbytes(frame)
+            while len(self._ring) > 1 and (
+                    len(self._ring) > self.history
+                    or (self.max_bytes is not None and self._ring_bytes > self.max_bytes)):
+                old, _ = self._ring.popleft()
+                self._ring_fps.popleft()
+                self._ring_bytes -= _nbytes(old)
             self._cond.notify_all()
+        if self.shm is not None:
+            self.shm.write(frame, ts)
 
     def latest(self, max_age: float | None = None) -> tuple[Any, float] | None:
         """Newest (frame, ts), or None if empty / older than max_age."""
@@ -55,12 +122,241 @@ class FrameBus:
                 self._cond.wait(remaining)
             return self._frame, self._ts
 
+    def fingerprint_of(self, ts: float) -> int | None:
+        """Content fingerprint of the retained frame published at `ts`
+        (None if evicted, or not a frame fingerprint() understands)."""
+        with self._lock:
+            for (_, item_ts), fp in zip(reversed(self._ring), reversed(self._ring_fps)):
+                if item_ts == ts:
+                    return fp
+            return None
+
+    def frames_since(self, ts: float) -> list[tuple[Any, float]]:
+        """Retained (frame, ts) published after `ts`, oldest first."""
+        with self._lock:
+            return [item for item in self._ring if item[1] > ts]
+
+    def last_n(self, n: int, max_age: float | None = None) -> list[tuple[Any, float]]:
+        """Up to the `n` newest retained (frame, ts), oldest first; with
+        max_age, only frames younger than that."""
+        with self._lock:
+            items = list(self._ring)[-n:] if n > 0 else []
+        if max_age is not None:
+            cutoff = time.time() - max_age
+            items = [item for item in items if item[1] >= cutoff]
+        return items
+
+    def wait_for_n_new(self, n: int, timeout: float) -> list[tuple[Any, float]]:
+        """Block until `n` frames are published after the call (or timeout)
+        and return the new ones still retained, oldest first - fewer than n
+        on timeout, or if the history is shorter than n."""
+        deadline = time.time() + timeout
+        with self._cond:
+            start = self._seq
+            while self._seq - start < n:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            new = min(self._seq - start, len(self._ring))
+            return list(self._ring)[len(self._ring) - new:]
+
+    def wait_until_stable(
+        self,
+        region: tuple[int, int, int, int] | None = None,
+        min_stable_ms: float = 300.0,
+        timeout: float = 2.0,
+        capture: Callable[[], Any] | None = None,
+        poll: float = 0.1,
+        tolerance: float = STABLE_TOLERANCE,
+        require_change: bool = False,
+    ) -> tuple[Any, float] | None:
+        """Wait until `region` (4K x, y, w, h; None = whole frame) has not
+        changed for `min_stable_ms` and return that settled (frame, ts), or
+        None on timeout.
+
+        Only frames published after the call count. When none arrives within
+        `poll`, `capture()` is called (it publishes) - pass the flow's
+        get_screenshot_cv2 so the wait does not depend on other capturers.
+        require_change: the region must first differ from the frame that was
+        newest at the call (a tap whose effect has not rendered yet is not
+        "settled").
+        """
+        deadline = time.time() + timeout
+        with self._lock:
+            seen = self._ts
+            before = self._frame
+        # require_change: the region's signature at the call, cleared once a
+        # frame differs from it.
+        baseline = _signature(before, region) if require_change and before is not None else None
+        prev: Any = None
+        stable_since = 0.0
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            item = self.wait_for_frame(newer_than=seen, timeout=min(poll, remaining))
+            if item is None:
+                if capture is not None:
+                    capture()
+                continue
+            frame, seen = item
+            sig = _signature(frame, region)
+            if baseline is not None:
+                if sig.shape == baseline.shape and not _differs(sig, baseline, tolerance):
+                    continue
+                baseline = None
+            if prev is None or sig.shape != prev.shape or _differs(sig, prev, tolerance):
+                prev, stable_since = sig, seen
+                continue
+            if (seen - stable_since) * 1000.0 >= min_stable_ms:
+                return frame, seen
+
+    def stats(self) -> dict[str, Any]:
+        """Ring occupancy and memory (frames are shared references, so this
+        is what the history keeps alive, not extra copies)."""
+        with self._lock:
+            return {
+                "frames": len(self._ring),
+                "history": self.history,
+                "mb": round(self._ring_bytes / 1e6, 1),
+                "max_mb": round(self.max_bytes / 1e6, 1) if self.max_bytes is not None else None,
+                "published": self._seq,
+                "duplicates": self.duplicates,
+                "dup_rate": round(self.duplicates / self._seq, 3) if self._seq else 0.0,
+                "age_s": round(time.time() - self._ts, 2) if self._frame is not None else None,
+                "shm": self.shm.name if self.shm is not None else None,
+            }
+
     @property
     def age(self) -> float:
         with self._lock:
             return (time.time() - self._ts) if self._frame is not None else float("inf")
 
 
+def _nbytes(frame: Any) -> int:
+    return int(getattr(frame, "nbytes", 0))
+
+
+def fingerprint(frame: Any) -> int | None:
+    """crc32 over the shape and every pixel - equal for pixel-identical
+    frames; a change of any size changes it (~10 ms per 4K frame)."""
+    if not isinstance(frame, np.ndarray) or frame.ndim < 2:
+        return None
+    crc = zlib.crc32(np.asarray(frame.shape, np.int64).tobytes())
+    return zlib.crc32(np.ascontiguousarray(frame), crc)
+
+
+def _signature(frame: Any, region: tuple[int, int, int, int] | None) -> Any:
+    """Downsampled grayscale of `region` (4K coordinates, scaled for a
+    native-resolution frame) - cheap to compare, blind to sensor-level noise."""
+    if region is not None:
+        fh, fw = frame.shape[:2]
+        if fw != FRAME_W:
+            region = scale_region(region, (fw / FRAME_W, fh / FRAME_H))
+        x, y, rw, rh = region
+        frame = frame[max(0, y):y + rh, max(0, x):x + rw]
+    if frame.ndim == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    h, w = frame.shape[:2]
+    size = (max(1, w // STABLE_DOWNSAMPLE), max(1, h // STABLE_DOWNSAMPLE))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def _differs(a: Any, b: Any, tolerance: float) -> bool:
+    return float(np.abs(a - b).mean()) > tolerance
+
+
+def collect_frames(capture: Callable[[], Any], n: int, interval: float = 0.1,
+                   bus: FrameBus | None = None) -> list[Any]:
+    """`n` frames for a consensus read: one fresh capture, then whatever the
+    process publishes next (detector heartbeat, another thread), capturing
+    only when nothing arrives within `interval` - the old fixed sleep.
+    Frames of another size than the first (native-scale detector captures)
+    are not used."""
+    bus = bus if bus is not None else get_frame_bus()
+    first = capture()
+    frames = [first]
+    shape = getattr(first, "shape", None)
+    seen = time.time()
+    while len(frames) < n:
+        item = bus.wait_for_frame(newer_than=seen, timeout=interval)
+        if item is not None and getattr(item[0], "shape", None) == shape:
+            frames.append(item[0])
+            seen = item[1]
+        else:
+            frames.append(capture())
+            seen = time.time()
+    return frames
+
+
+class SettleStats:
+    """Per-label record of settle() calls: how long each waited and how much
+    of the fixed delay it replaced was saved."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_label: dict[str, list[float]] = {}   # [calls, settled, waited_s, saved_s]
+
+    def record(self, label: str, waited: float, saved: float, settled: bool) -> None:
+        with self._lock:
+            row = self._by_label.setdefault(label, [0, 0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += int(settled)
+            row[2] += waited
+            row[3] += saved
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            rows = {k: list(v) for k, v in self._by_label.items()}
+        out: dict[str, Any] = {
+            label: {"calls": int(c), "settled": int(n), "waited_s": round(w, 2), "saved_s": round(sv, 2),
+                    "avg_saved_ms": round(1000.0 * sv / c, 1) if c else 0.0}
+            for label, (c, n, w, sv) in sorted(rows.items())
+        }
+        out["total_saved_s"] = round(sum(v[3] for v in rows.values()), 2)
+        return out
+
+
+_settle_stats = SettleStats()
+
+
+def settle_stats() -> dict[str, Any]:
+    """settle() instrumentation for the daemon status."""
+    return _settle_stats.snapshot()
+
+
+def settle(
+    capture: Callable[[], Any],
+    fixed_delay: float,
+    label: str,
+    region: tuple[int, int, int, int] | None = None,
+    min_stable_ms: float = 300.0,
+    require_change: bool = True,
+    bus: FrameBus | None = None,
+) -> Any:
+    """Replacement for `time.sleep(fixed_delay); frame = capture()` after a
+    tap: returns the settled frame as soon as `region` stops changing, or a
+    fresh capture once `fixed_delay` has passed (never slower than the old
+    sleep). Records waited / saved time under `label` (settle_stats()).
+    config.SETTLE_WAIT_ENABLED = False restores the plain fixed sleep."""
+    try:
+        from config import SETTLE_WAIT_ENABLED
+    except ImportError:
+        SETTLE_WAIT_ENABLED = True
+    start = time.time()
+    if not SETTLE_WAIT_ENABLED:
+        time.sleep(fixed_delay)
+        return capture()
+    bus = bus if bus is not None else get_frame_bus()
+    item = bus.wait_until_stable(region, min_stable_ms=min_stable_ms, timeout=fixed_delay,
+                                 capture=capture, require_change=require_change)
+    frame = item[0] if item is not None else capture()
+    waited = time.time() - start
+    _settle_stats.record(label, waited, max(0.0, fixed_delay - waited), item is not None)
+    return frame
+
+
 _bus: FrameBus | None = None
 _bus_lock = threading.Lock()
 
@@ -69,5 +365,26 @@ def get_frame_bus() -> FrameBus:
     global _bus
     with _bus_lock:
         if _bus is None:
-            _bus = FrameBus()
+            try:
+                from config import FRAME_BUS_HISTORY, FRAME_BUS_MAX_MB
+            except ImportError:
+                FRAME_BUS_HISTORY, FRAME_BUS_MAX_MB = 6, 160.0
+            _bus = FrameBus(history=FRAME_BUS_HISTORY, max_mb=FRAME_BUS_MAX_MB, shm=_open_shm_mirror())
         return _bus
+
+
+def _open_shm_mirror() -> Any:
+    """FrameShmWriter per config, or None when disabled / unavailable (the
+    bus works the same without it; readers fall back to capturing)."""
+    try:
+        from config import FRAME_SHM_ENABLED, FRAME_SHM_NAME
+    except ImportError:
+        return None
+    if not FRAME_SHM_ENABLED:
+        return None
+    from utils.frame_shm import FrameShmWriter
+    try:
+        return FrameShmWriter(FRAME_SHM_NAME)
+    except OSError as e:
+        logger.warning(f"FrameBus shared-memory mirror unavailable: {e}")
+        return None
@@ -0,0 +1,211 @@
+"""
+FrameContext - per-frame memo of derived images shared by every matcher.
+
+One DetectorThread tick runs ~25 specs against the SAME frame, and each
+match_template() call used to redo its own ROI slice, grayscale conversion
+and (for masked templates) float32 conversion + squaring. A FrameContext wraps
+one published frame and computes each derived plane lazily, at most once per
+(kind, region), for the lifetime of the frame.
+
+Planes:
+- gray:   BGR -> grayscale (uint8)
+- f32:    float32 copy of the (color or gray) pixels
+- energy: per-pixel squared intensity, summed over channels (float32) - the
+          frame side of the masked-correlation denominator
+- downN:  the region shrunk by 1/N (coarse pass of pyramid search)
+- up4k:   a native-scale frame resized to 3840x2160 (see below)
+
+If a plane of the same kind already covers a requested region (the full
+frame, or a larger region warmed by match_templates() for a group of
+overlapping searches), the region plane is sliced from it instead of being
+recomputed. The wrapped frame is treated as read-only (like the
+FrameBus), and so are the returned planes - callers must not mutate them.
+
+Native scale: everything in the codebase - templates, search regions, click
+targets - is in 4K (3840x2160) coordinates. A context built with
+FrameContext.for_frame() on a frame at capture resolution (~1792x1010, no
+4K upscale) records its `scale` (frame px per 4K px, per axis); the template
+matcher then scales templates and regions down to it and maps locations
+back to 4K. Consumers that index pixels themselves use frame_array(), which
+returns a (lazily upscaled, memoized) 4K frame, so their 4K regions stay
+valid.
+
+Usage:
+    from utils.frame_context import FrameContext
+
+    ctx = FrameContext(frame)
+    view, _ = detect_view(ctx)
+    found, score, loc = match_template(ctx, "search_button_4k.png", search_region=...)
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+NDArray = npt.NDArray[Any]
+Region = tuple[int, int, int, int]
+
+FRAME_W, FRAME_H = 3840, 2160
+
+
+class FrameContext:
+    """Lazily derived, memoized planes for one frame. Thread-safe."""
+
+    def __init__(self, frame: NDArray, ts: float | None = None,
+                 scale: tuple[float, float] = (1.0, 1.0)) -> None:
+        self.frame = frame
+        self.ts = ts
+        self.scale = scale
+        self._lock = threading.Lock()
+        self._planes: dict[tuple[str, Region | None], NDArray] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_frame(cls, frame: NDArray, ts: float | None = None) -> FrameContext:
+        """Context for a FULL captured frame at any resolution: the scale is
+        inferred from its size (1.0 for a 4K frame). Not for crops."""
+        h, w = frame.shape[:2]
+        return cls(frame, ts, scale=(w / FRAME_W, h / FRAME_H))
+
+    @property
+    def native(self) -> bool:
+        """True when the frame is not at 4K (coordinates need scaling)."""
+        return self.scale != (1.0, 1.0)
+
+    def frame_4k(self) -> NDArray:
+        """The frame in 4K coordinates: itself, or (native scale) upscaled once."""
+        if not self.native:
+            return self.frame
+        return self._plane("up4k", None)
+
+    # ndarray-ish conveniences for the `frame is None or frame.size == 0` guards
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(self.frame.shape)
+
+    @property
+    def size(self) -> int:
+        return int(self.frame.size)
+
+    def region(self, region: Region | None = None, grayscale: bool = False) -> NDArray:
+        """Pixels of `region` (x, y, w, h) - a view of the frame, or of the
+        memoized grayscale plane when grayscale=True."""
+        if grayscale:
+            return self.gray(region)
+        return _slice(self.frame, region)
+
+    def gray(self, region: Region | None = None) -> NDArray:
+        """Grayscale plane for `region` (the frame itself if already 1-channel)."""
+        if self.frame.ndim == 2:
+            return _slice(self.frame, region)
+        return self._plane("gray", region)
+
+    def float32(self, region: Region | None = None, grayscale: bool = False) -> NDArray:
+        """float32 pixels for `region`."""
+        return self._plane("f32_gray" if grayscale else "f32", region)
+
+    def energy(self, region: Region | None = None, grayscale: bool = False) -> NDArray:
+        """Channel-summed squared intensity (float32) for `region`."""
+        return self._plane("energy_gray" if grayscale else "energy", region)
+
+    def downscaled(self, region: Region | None, scale: int, grayscale: bool = False) -> NDArray:
+        """`region` shrunk by 1/scale (INTER_AREA) for coarse pyramid search."""
+        return self._plane(f"down{scale}_gray" if grayscale else f"down{scale}", region)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"planes": len(self._planes), "hits": self.hits, "misses": self.misses}
+
+    def _plane(self, kind: str, region: Region | None) -> NDArray:
+        key = (kind, region)
+        with self._lock:
+            plane = self._planes.get(key)
+            if plane is None and region is not None:
+                plane = self._slice_from_cover(kind, region)
+                if plane is not None:
+                    self._planes[key] = plane
+            if plane is not None:
+                self.hits += 1
+                return plane
+            self.misses += 1
+
+        # Compute outside the lock (conversions can be large); a concurrent
+        # duplicate computation is harmless - the first one stored wins.
+        plane = self._compute(kind, region)
+        with self._lock:
+            return self._planes.setdefault(key, plane)
+
+    def _slice_from_cover(self, kind: str, region: Region) -> NDArray | None:
+        """Slice `region` out of a cached plane of `kind` that contains it.
+        Caller holds the lock. All planes are pointwise transforms of the
+        frame, so a sub-slice is identical to converting the region itself."""
+        x, y, w, h = region
+        if x < 0 or y < 0 or kind.startswith(("down", "up")):
+            return None  # resampled planes are not pointwise - never slice them
+        for (k, r), plane in self._planes.items():
+            if k != kind:
+                continue
+            if r is None:
+                return _slice(plane, region)
+            rx, ry, rw, rh = r
+            if rx <= x and ry <= y and x + w <= rx + rw and y + h <= ry + rh:
+                return _slice(plane, (x - rx, y - ry, w, h))
+        return None
+
+    def _compute(self, kind: str, region: Region | None) -> NDArray:
+        grayscale = kind.endswith("_gray")
+        if kind == "up4k":
+            up: NDArray = cv2.resize(self.frame, (FRAME_W, FRAME_H), interpolation=cv2.INTER_LINEAR)
+            return up
+        if kind == "gray":
+            src = _slice(self.frame, region)
+            out: NDArray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY)
+            return out
+        if kind.startswith("down"):
+            scale = int(kind[4:].split("_")[0])
+            src = self.region(region, grayscale=grayscale)
+            h, w = src.shape[:2]
+            small: NDArray = cv2.resize(src, (w // scale, h // scale), interpolation=cv2.INTER_AREA)
+            return small
+        if kind in ("f32", "f32_gray"):
+            src = self.region(region, grayscale=grayscale)
+            return src.astype(np.float32)
+        # energy / energy_gray
+        f32 = self.float32(region, grayscale=grayscale)
+        sq: NDArray = f32 * f32
+        if sq.ndim == 3:
+            sq = sq.sum(axis=2, dtype=np.float32)
+        return np.ascontiguousarray(sq, dtype=np.float32)
+
+
+def frame_array(frame: NDArray | FrameContext) -> NDArray:
+    """The BGR array behind `frame` (a FrameContext or a plain array), in 4K
+    coordinates - a native-scale context returns its upscaled frame."""
+    return frame.frame_4k() if isinstance(frame, FrameContext) else frame
+
+
+def scale_region(region: Region, scale: tuple[float, float]) -> Region:
+    """4K (x, y, w, h) -> the covering region at `scale` (frame px per 4K px).
+    Monotone: a region inside another stays inside it after scaling."""
+    sx, sy = scale
+    x0, y0 = int(region[0] * sx), int(region[1] * sy)
+    x1 = int(np.ceil((region[0] + region[2]) * sx))
+    y1 = int(np.ceil((region[1] + region[3]) * sy))
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def to_4k(point: tuple[int, int], scale: tuple[float, float]) -> tuple[int, int]:
+    """A frame location at `scale` -> 4K coordinates."""
+    return (int(round(point[0] / scale[0])), int(round(point[1] / scale[1])))
+
+
+def _slice(arr: NDArray, region: Region | None) -> NDArray:
+    if region is None:
+        return arr
+    x, y, w, h = region
+    return arr[y:y + h, x:x + w]
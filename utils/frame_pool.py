@@ -0,0 +1,103 @@
+"""
+FramePool - recycled capture buffers, so steady-state capture allocates nothing.
+
+Every capture used to allocate a fresh ~25 MB 4K frame (and, native-scale,
+a capture-resolution one). The pool keeps a small set of buffers per shape
+and hands out one that nobody references any more.
+
+"Reference-counted" is Python's own reference count: a frame is in use as
+long as anything holds it - the FrameBus ring, the detector's tick context,
+an action-capture write queued on the encoder, a flow's local variable - or
+holds any numpy view/crop of it (a view keeps its base alive). Consumers
+release a frame by dropping it, which they all already do (the bus evicts
+beyond its history, the encoder drops after imwrite), so no consumer can
+release too early and nothing can be written into a frame still in use.
+
+When every pooled buffer of a shape is busy, acquire() returns a fresh
+unpooled array (counted as a miss) - capture never blocks on the pool.
+
+Usage:
+    from utils.frame_pool import get_frame_pool
+
+    out = get_frame_pool().acquire((2160, 3840, 3))   # write every pixel
+    get_frame_pool().stats()                           # occupancy, high water
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from utils.frame_context import FRAME_H, FRAME_W
+
+_IDLE_REFS = 2   # sys.getrefcount of an unused buffer: the pool's list slot + the call's argument
+
+
+class FramePool:
+    def __init__(self, size: int = 12) -> None:
+        self.size = max(0, size)                        # buffers kept per shape
+        self._lock = threading.Lock()
+        self._bufs: dict[tuple[int, ...], list[npt.NDArray[Any]]] = {}
+        self._high_water: dict[tuple[int, ...], int] = {}
+        self.reused = 0          # acquires served by a recycled buffer
+        self.allocated = 0       # pooled buffers created (<= size per shape)
+        self.misses = 0          # acquires with every pooled buffer busy (unpooled array)
+
+    def acquire(self, shape: tuple[int, ...] = (FRAME_H, FRAME_W, 3)) -> npt.NDArray[Any]:
+        """A uint8 buffer of `shape` with undefined contents, not referenced
+        anywhere else. Hold it (or views of it) for as long as it is used."""
+        shape = tuple(shape)
+        with self._lock:
+            bufs = self._bufs.setdefault(shape, [])
+            free = next((i for i in range(len(bufs)) if sys.getrefcount(bufs[i]) <= _IDLE_REFS), None)
+            busy = len(bufs) - (free is not None)
+            self._high_water[shape] = max(self._high_water.get(shape, 0), busy + 1)
+            if free is not None:
+                self.reused += 1
+                return bufs[free]
+            if len(bufs) < self.size:
+                bufs.append(np.empty(shape, np.uint8))
+                self.allocated += 1
+                return bufs[-1]
+            self.misses += 1
+        return np.empty(shape, np.uint8)
+
+    def stats(self) -> dict[str, Any]:
+        """Per-shape occupancy (buffers in use / pooled / high water) and
+        totals, for the daemon status."""
+        with self._lock:
+            shapes = {
+                "x".join(str(d) for d in shape[1::-1]): {
+                    "in_use": sum(1 for i in range(len(bufs)) if sys.getrefcount(bufs[i]) > _IDLE_REFS),
+                    "pooled": len(bufs),
+                    "high_water": self._high_water.get(shape, 0),
+                }
+                for shape, bufs in self._bufs.items()
+            }
+            return {
+                "size": self.size,
+                "shapes": shapes,
+                "mb": round(sum(b.nbytes for bufs in self._bufs.values() for b in bufs) / 1e6, 1),
+                "reused": self.reused,
+                "allocated": self.allocated,
+                "misses": self.misses,
+            }
+
+
+_pool: FramePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_frame_pool() -> FramePool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            try:
+                from config import FRAME_POOL_SIZE
+            except ImportError:
+                FRAME_POOL_SIZE = 12
+            _pool = FramePool(size=FRAME_POOL_SIZE)
+        return _pool
@@ -0,0 +1,199 @@
+"""
+Shared-memory mirror of the FrameBus's newest frame, for other processes.
+
+The daemon's FrameBus can mirror every published frame into one
+multiprocessing.shared_memory segment (config FRAME_SHM_ENABLED). Any
+process on the machine - the dashboard, the OCR server, analysis tools -
+then reads the newest 4K frame without a GDI capture of its own and without
+shipping ~25 MB over a socket.
+
+Segment layout: a 64-byte header followed by the pixel data (capacity for
+one 3840x2160x3 frame; smaller native-scale frames fit too):
+
+    magic "XCFB" | version u32 | generation u64 | height u32 | width u32
+    | channels u32 | (pad) | ts f64 | seq u64
+
+`generation` is a seqlock: the single writer makes it odd, writes the pixels
+and the other header fields, then stores the even generation on its own. A
+reader copies the header and frame between two reads of the generation and
+retries if they differ or are odd, so it never returns a torn frame and
+never blocks the writer.
+
+Usage (any process):
+    from utils.frame_shm import FrameShmReader
+
+    with FrameShmReader() as reader:
+        item = reader.read(max_age=2.0)          # (frame copy, ts, seq) or None
+        view, gen = reader.view()                 # zero-copy view, valid while
+        ...                                       # reader.generation == gen
+"""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+DEFAULT_NAME = "xclash_frame_bus"
+MAGIC = b"XCFB"
+VERSION = 1
+HEADER = struct.Struct("<4sIQIII4xdQ")      # magic, version, gen, h, w, c, ts, seq
+HEADER_SIZE = 64
+GEN_OFFSET = 8
+CAPACITY = 3840 * 2160 * 3
+READ_RETRIES = 50
+
+
+class FrameShmWriter:
+    """Creates (or takes over) the segment and mirrors frames into it. One
+    writer per segment: the daemon's FrameBus."""
+
+    def __init__(self, name: str = DEFAULT_NAME, capacity: int = CAPACITY) -> None:
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + capacity)
+        except FileExistsError:
+            # Left behind by a crashed daemon: reuse it if it is big enough.
+            self.shm = shared_memory.SharedMemory(name=name)
+            if self.shm.size < HEADER_SIZE + capacity:
+                self.shm.close()
+                stale = shared_memory.SharedMemory(name=name)
+                stale.unlink()
+                stale.close()
+                self.shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + capacity)
+        buf = self.shm.buf
+        assert buf is not None
+        self._buf = buf
+        self.name = name
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._seq = 0
+        HEADER.pack_into(buf, 0, MAGIC, VERSION, 0, 0, 0, 0, 0.0, 0)
+
+    def write(self, frame: npt.NDArray[Any], ts: float) -> bool:
+        """Mirror `frame` (uint8 HxW or HxWxC); False if it does not fit."""
+        if frame.dtype != np.uint8 or frame.nbytes > self.capacity:
+            return False
+        h, w = frame.shape[:2]
+        c = frame.shape[2] if frame.ndim == 3 else 1
+        with self._lock:
+            self._gen += 1                                     # odd: write in progress
+            struct.pack_into("<Q", self._buf, GEN_OFFSET, self._gen)
+            self._seq += 1
+            dst = np.ndarray((frame.nbytes,), np.uint8, self._buf, HEADER_SIZE)
+            dst[:] = np.ascontiguousarray(frame).reshape(-1)
+            HEADER.pack_into(self._buf, 0, MAGIC, VERSION, self._gen, h, w, c, ts, self._seq)
+            self._gen += 1                                     # even: consistent
+            struct.pack_into("<Q", self._buf, GEN_OFFSET, self._gen)
+        return True
+
+    def close(self, unlink: bool = True) -> None:
+        self.shm.close()
+        if unlink:
+            if os.name == "posix":
+                # A reader sharing this process's resource tracker (in-process,
+                # or a spawned child) unregistered the name on attach; unlink
+                # unregisters it again, so put it back first (a set: idempotent).
+                from multiprocessing import resource_tracker
+                resource_tracker.register(getattr(self.shm, "_name"), "shared_memory")
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class FrameShmReader:
+    """Maps the segment read-only-by-convention from any process."""
+
+    def __init__(self, name: str = DEFAULT_NAME) -> None:
+        self.shm = _attach_untracked(name)                 # FileNotFoundError if no writer
+        buf = self.shm.buf
+        assert buf is not None
+        self._buf = buf
+        magic, version = HEADER.unpack_from(buf, 0)[:2]
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f"shared memory {name!r} is not a v{VERSION} frame segment")
+        self.name = name
+
+    @property
+    def generation(self) -> int:
+        gen: int = struct.unpack_from("<Q", self._buf, GEN_OFFSET)[0]
+        return gen
+
+    def view(self) -> tuple[npt.NDArray[Any] | None, int]:
+        """Zero-copy (frame view, generation); the view's pixels are only
+        consistent while `generation` still equals the returned one."""
+        _, _, gen, h, w, c, _, seq = HEADER.unpack_from(self._buf, 0)
+        if seq == 0 or gen % 2:
+            return None, gen
+        shape = (h, w, c) if c > 1 else (h, w)
+        return np.ndarray(shape, np.uint8, self._buf, HEADER_SIZE), gen
+
+    def read(self, max_age: float | None = None) -> tuple[npt.NDArray[Any], float, int] | None:
+        """Consistent copy of the newest frame as (frame, ts, seq), or None
+        if nothing was published yet, it is older than max_age, or the
+        writer kept it busy for READ_RETRIES attempts."""
+        for _ in range(READ_RETRIES):
+            _, _, gen, h, w, c, ts, seq = HEADER.unpack_from(self._buf, 0)
+            if seq == 0:
+                return None
+            if gen % 2:
+                time.sleep(0.001)
+                continue
+            if h * w * c > self.shm.size - HEADER_SIZE:       # torn header: retry
+                continue
+            shape = (h, w, c) if c > 1 else (h, w)
+            frame = np.ndarray(shape, np.uint8, self._buf, HEADER_SIZE).copy()
+            if self.generation != gen:
+                continue
+            if max_age is not None and time.time() - ts > max_age:
+                return None
+            return frame, ts, seq
+        return None
+
+    def close(self) -> None:
+        self.shm.close()
+
+    def __enter__(self) -> FrameShmReader:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def read_shared_frame(max_age: float | None = None, name: str = DEFAULT_NAME) -> npt.NDArray[Any] | None:
+    """One-shot: newest mirrored frame (a copy), or None if no daemon is
+    mirroring or the frame is older than max_age."""
+    try:
+        reader = FrameShmReader(name)
+    except (FileNotFoundError, ValueError):
+        return None
+    try:
+        item = reader.read(max_age=max_age)
+        return item[0] if item is not None else None
+    finally:
+        reader.close()
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """Attach without leaving the segment registered with this process's
+    resource tracker, which would otherwise unlink it when a READER exits.
+    Only the writer owns it. Before 3.13 this unregisters after attaching,
+    which also drops the writer's registration when the tracker is shared
+    (same process or a spawned child): FrameShmWriter.close restores it, and
+    a segment leaked by a crash is taken over by the next writer."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)   # type: ignore[call-arg]  # 3.13+
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":                  # the only platform SharedMemory registers on
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(getattr(shm, "_name"), "shared_memory")   # "/name", as registered
+    return shm
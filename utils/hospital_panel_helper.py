@@ -19,6 +19,7 @@ from typing import TYPE_CHECKING, Any
 
 import numpy.typing as npt
 from config import HOSPITAL_HEAL_MAX_SAFE_SECONDS
+from utils.template_matcher import get_template
 
 if TYPE_CHECKING:
     from utils.adb_helper import ADBHelper
@@ -58,23 +59,13 @@ SCROLL_CENTER_X = 1920
 SCROLL_TOP_Y = 700
 SCROLL_BOTTOM_Y = 1100
 
-# Template caches
-_slider_template: npt.NDArray[Any] | None = None
-_plus_template: npt.NDArray[Any] | None = None
-
 
 def _get_slider_template() -> npt.NDArray[Any] | None:
-    global _slider_template
-    if _slider_template is None:
-        _slider_template = cv2.imread(str(SLIDER_TEMPLATE_PATH), cv2.IMREAD_GRAYSCALE)
-    return _slider_template
+    return get_template(SLIDER_TEMPLATE_PATH, grayscale=True)
 
 
 def _get_plus_template() -> npt.NDArray[Any] | None:
-    global _plus_template
-    if _plus_template is None:
-        _plus_template = cv2.imread(str(PLUS_TEMPLATE_PATH), cv2.IMREAD_GRAYSCALE)
-    return _plus_template
+    return get_template(PLUS_TEMPLATE_PATH, grayscale=True)
 
 
 def find_plus_buttons(
@@ -34,6 +34,7 @@ from config import (
     HOSPITAL_CLICK_POSITION,
     HOSPITAL_MATCH_THRESHOLD,
 )
+from utils.frame_context import FrameContext
 from utils.template_matcher import match_template
 
 
@@ -68,7 +69,7 @@ class HospitalStateMatcher:
         self.click_x, self.click_y = HOSPITAL_CLICK_POSITION
         self.threshold = HOSPITAL_MATCH_THRESHOLD
 
-    def get_scores(self, frame: npt.NDArray[Any]) -> dict[str, float]:
+    def get_scores(self, frame: npt.NDArray[Any] | FrameContext) -> dict[str, float]:
         """
         Get all template scores for the hospital position.
 
@@ -106,9 +107,9 @@ class HospitalStateMatcher:
 
         return scores
 
-    def get_state(self, frame: npt.NDArray[Any], debug: bool = False) -> tuple[HospitalState, float]:
+    def get_state(self, frame: npt.NDArray[Any] | FrameContext, debug: bool = False) -> tuple[HospitalState, float]:
         """
-        Get the current state of the hospital.
+        Get the current state of the hospital (accepts a FrameContext).
 
         Returns:
             (HospitalState, best_score) tuple
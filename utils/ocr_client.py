@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import hashlib
+import http.client
 import io
 import json
 import re
 import subprocess
 import sys
+import threading
 import time
-import urllib.request
-import urllib.error
+from collections import OrderedDict
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple, Sequence
 
 
 def _sanitize_ocr_text(text: str) -> str:
@@ -43,6 +45,18 @@ SERVER_URL = f"http://{SERVER_HOST}:{SERVER_PORT}"
 
 TIMEOUT = 120
 
+# Keep-alive connections to the OCR server kept idle for reuse, and how long
+# an idle one is trusted (the server drops connections idle for 120 s)
+POOL_MAX_IDLE = 4
+POOL_IDLE_TIMEOUT = 60.0
+
+# Crops up to this many raw bytes are sent as PPM/PGM; larger images (whole
+# frames) as PNG, which compresses UI screens well below the server's 8 MB cap
+RAW_MAX_BYTES = 2 * 1024 * 1024
+
+# Crops per /ocr/batch request (the server accepts up to 16)
+BATCH_MAX_ITEMS = 8
+
 RETRY_COOLDOWN = 300
 
 HEALTH_CHECK_TTL = 30
@@ -54,6 +68,12 @@ _OCR_SERVER_SCRIPT = Path(__file__).parent.parent / "services" / "ocr_server.py"
 
 _OCR_SERVER_LOG = Path(__file__).parent.parent / "logs" / "ocr_server.log"
 
+try:
+    from config import OCR_CACHE_SIZE, OCR_CACHE_TTL
+except ImportError:
+    OCR_CACHE_SIZE = 512
+    OCR_CACHE_TTL = 600.0
+
 _server_process: subprocess.Popen[bytes] | None = None
 _server_log_file: Any = None
 
@@ -157,16 +177,303 @@ def ensure_ocr_server(auto_start: bool = True) -> bool:
     return start_ocr_server()
 
 
+class ConnectionPool:
+    """Persistent HTTP/1.1 connections to the OCR server.
+
+    Each request checks a connection out for its whole round trip, so threads
+    never share one; afterwards it goes back to the idle list (most recently
+    used first) unless the server said it will close it. A request that fails
+    on a reused connection before getting a response - the server closed it
+    while idle - is retried once on a fresh connection (OCR requests have no
+    side effects).
+    """
+
+    def __init__(self, host: str, port: int, max_idle: int = POOL_MAX_IDLE,
+                 idle_timeout: float = POOL_IDLE_TIMEOUT) -> None:
+        self.host = host
+        self.port = port
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self.created = 0
+        self.reused = 0
+        self.retried = 0
+
+    def _checkout(self, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        stale: list[http.client.HTTPConnection] = []
+        conn = None
+        with self._lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if now - last_used < self.idle_timeout:
+                    conn = candidate
+                    self.reused += 1
+                    break
+                stale.append(candidate)
+            if conn is None:
+                self.created += 1
+        for old in stale:
+            old.close()
+        if conn is None:
+            return http.client.HTTPConnection(self.host, self.port, timeout=timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = TIMEOUT,
+    ) -> tuple[int, str, bytes]:
+        """(status, reason, body) of one request; raises OSError /
+        http.client.HTTPException when the server cannot be reached."""
+        for attempt in range(2):
+            conn, reused = self._checkout(timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                data = resp.read()
+            except ConnectionError:   # incl. RemoteDisconnected: closed while idle
+                conn.close()
+                if reused and attempt == 0:
+                    with self._lock:
+                        self.retried += 1
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(conn)
+            return resp.status, resp.reason, data
+        raise ConnectionError("unreachable")  # pragma: no cover - loop returns or raises
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"idle": len(self._idle), "created": self.created,
+                    "reused": self.reused, "retried": self.retried}
+
+
+_pool = ConnectionPool(SERVER_HOST, SERVER_PORT)
+
+
+def _crop(
+    image: npt.NDArray[Any] | Image.Image,
+    region: tuple[int, int, int, int] | None = None
+) -> npt.NDArray[Any] | Image.Image:
+    """The region of image as it is sent: a NumPy view for arrays (no copy,
+    no colour conversion of the full frame), a PIL crop for PIL images."""
+    if region is None:
+        return image
+    x, y, w, h = region
+    if isinstance(image, np.ndarray):
+        crop = image[max(0, y):max(0, y + h), max(0, x):max(0, x + w)]
+        if crop.shape[:2] != (h, w) and w > 0 and h > 0:
+            # Partly outside the frame: zero-pad to the region, as PIL's crop does
+            padded = np.zeros((h, w) + image.shape[2:], image.dtype)
+            oy, ox = max(0, -y), max(0, -x)
+            padded[oy:oy + crop.shape[0], ox:ox + crop.shape[1]] = crop
+            crop = padded
+        return crop
+    return image.crop((x, y, x + w, y + h))
+
+
+def _crop_digest(
+    image: npt.NDArray[Any] | Image.Image,
+    region: tuple[int, int, int, int] | None = None
+) -> str:
+    """Content hash of the pixels the server would be sent (shape + bytes)."""
+    crop = _crop(image, region)
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(crop, np.ndarray):
+        h.update(f"{crop.shape}{crop.dtype}".encode())
+        h.update(np.ascontiguousarray(crop).data)
+    else:
+        h.update(f"{crop.mode}{crop.size}".encode())
+        h.update(crop.tobytes())
+    return h.hexdigest()
+
+
+def encode_crop(crop: npt.NDArray[Any] | Image.Image) -> bytes:
+    """Serialise a crop for the server.
+
+    uint8 BGR / gray arrays become binary PPM (P6) / PGM (P5): a short header
+    plus the raw RGB / gray bytes - no compression on either side. PIL images
+    in RGB/L mode are written the same way; anything else (RGBA, empty
+    crops, more than RAW_MAX_BYTES of pixels) falls back to PNG.
+    """
+    if isinstance(crop, np.ndarray) and crop.size and crop.nbytes <= RAW_MAX_BYTES and crop.dtype == np.uint8:
+        h, w = crop.shape[:2]
+        if crop.ndim == 3 and crop.shape[2] == 3:
+            return b"P6\n%d %d\n255\n" % (w, h) + np.ascontiguousarray(crop[:, :, ::-1]).tobytes()
+        if crop.ndim == 2:
+            return b"P5\n%d %d\n255\n" % (w, h) + np.ascontiguousarray(crop).tobytes()
+
+    pil_image: Image.Image
+    if isinstance(crop, np.ndarray):
+        if len(crop.shape) == 3 and crop.shape[2] == 3:
+            pil_image = Image.fromarray(crop[:, :, ::-1])
+        else:
+            pil_image = Image.fromarray(crop)
+    else:
+        pil_image = crop
+
+    buffer = io.BytesIO()
+    n_bytes = pil_image.width * pil_image.height * len(pil_image.getbands())
+    fmt = "PPM" if pil_image.mode in ("RGB", "L") and 0 < n_bytes <= RAW_MAX_BYTES else "PNG"
+    pil_image.save(buffer, format=fmt)
+    result = buffer.getvalue()
+    buffer.close()  # Prevent memory leak
+    return result
+
+
+MULTIPART_BOUNDARY = b"----OCRClientBoundary"
+
+
+def multipart_body(image_bytes: bytes | Sequence[bytes], fields: dict[str, Any] | None = None) -> bytes:
+    """multipart/form-data body with one image (field "image") or a list of
+    them ("image0".."imageN") plus form fields (lists/dicts as JSON)."""
+    if isinstance(image_bytes, bytes):
+        files = [("image", image_bytes)]
+    else:
+        files = [(f"image{i}", data) for i, data in enumerate(image_bytes)]
+
+    parts: list[bytes] = []
+    for name, data in files:
+        ext, mime = ("ppm", "image/x-portable-anymap") if data[:2] in (b"P5", b"P6") else ("png", "image/png")
+        parts += [
+            b"--", MULTIPART_BOUNDARY, b"\r\n",
+            f'Content-Disposition: form-data; name="{name}"; filename="{name}.{ext}"\r\n'.encode(),
+            f"Content-Type: {mime}\r\n\r\n".encode(),
+            data, b"\r\n",
+        ]
+
+    if fields:
+        for name, value in fields.items():
+            if value is not None:
+                if isinstance(value, (list, tuple, dict)):
+                    encoded = json.dumps(value).encode()
+                else:
+                    encoded = str(value).encode()
+                parts += [
+                    b"--", MULTIPART_BOUNDARY, b"\r\n",
+                    f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode(),
+                    encoded, b"\r\n",
+                ]
+
+    parts += [b"--", MULTIPART_BOUNDARY, b"--\r\n"]
+    return b"".join(parts)   # one copy of the image bytes
+
+
+class OCRCache:
+    """LRU + TTL map from (endpoint, fields, crop digest) to a server result.
+
+    Only successful results are stored. Each entry remembers how long its
+    server call took, so hits can report the inference time they saved.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 600.0) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str, str], tuple[float, float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.saved_s = 0.0
+
+    def get(self, key: tuple[str, str, str]) -> dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_s += entry[1]
+            return dict(entry[2])
+
+    def put(self, key: tuple[str, str, str], result: dict[str, Any], cost_s: float) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), cost_s, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "saved_s": round(self.saved_s, 2),
+            }
+
+
+class OCRRequest(NamedTuple):
+    """One entry of an extract_many() batch: mode "text" (extract_text, with
+    an optional prompt) or "number" (extract_number, prompt ignored)."""
+    region: tuple[int, int, int, int] | None = None
+    mode: str = "text"
+    prompt: str | None = None
+
+
 class OCRClient:
 
+    # Shared by every client instance (callers construct OCRClient() per read).
+    _cache = OCRCache(OCR_CACHE_SIZE, OCR_CACHE_TTL)
+
     _server_checked = False
     _server_available = False
     _last_health_check = 0.0
     _auto_start_attempted = False
     _last_start_attempt = 0.0
 
-    def __init__(self, auto_start: bool = True) -> None:
+    def __init__(self, auto_start: bool = True, priority: str = "interactive") -> None:
         self._auto_start = auto_start
+        # Server queue class: "interactive" (flow reads) or "background"
+        # (periodic tracker reads, served after any queued interactive ones)
+        self.priority = priority
 
     @classmethod
     def check_server(cls, force: bool = False) -> bool:
@@ -174,13 +481,12 @@ class OCRClient:
         if not force and cls._server_checked and (now - cls._last_health_check) < HEALTH_CHECK_TTL:
             return cls._server_available
         try:
-            req = urllib.request.Request(f"{SERVER_URL}/health", method="GET")
-            with urllib.request.urlopen(req, timeout=5) as resp:
-                data = json.loads(resp.read())
-                cls._server_available = data.get("status") == "ok"
-                cls._server_checked = True
-                cls._last_health_check = now
-                return cls._server_available
+            _, _, body = _pool.request("GET", "/health", timeout=5)
+            data = json.loads(body)
+            cls._server_available = data.get("status") == "ok"
+            cls._server_checked = True
+            cls._last_health_check = now
+            return cls._server_available
         except Exception:
             cls._server_available = False
             cls._server_checked = True
@@ -229,105 +535,165 @@ class OCRClient:
         image: npt.NDArray[Any] | Image.Image,
         region: tuple[int, int, int, int] | None = None
     ) -> bytes:
-        pil_image: Image.Image
-        if isinstance(image, np.ndarray):
-            if len(image.shape) == 3 and image.shape[2] == 3:
-                pil_image = Image.fromarray(image[:, :, ::-1])
-            else:
-                pil_image = Image.fromarray(image)
-        else:
-            pil_image = image
-
-        if region is not None:
-            x, y, w, h = region
-            pil_image = pil_image.crop((x, y, x + w, y + h))
-
-        buffer = io.BytesIO()
-        pil_image.save(buffer, format="PNG")
-        result = buffer.getvalue()
-        buffer.close()  # Prevent memory leak
-        return result
+        """Crop first, then serialise only the crop (see encode_crop)."""
+        return encode_crop(_crop(image, region))
 
     def _post_multipart(
         self,
         endpoint: str,
-        image_bytes: bytes,
+        image_bytes: bytes | Sequence[bytes],
         fields: dict[str, Any] | None = None
     ) -> dict[str, Any]:
-        boundary = b"----OCRClientBoundary"
-
-        body = b""
-
-        body += b"--" + boundary + b"\r\n"
-        body += b'Content-Disposition: form-data; name="image"; filename="image.png"\r\n'
-        body += b"Content-Type: image/png\r\n\r\n"
-        body += image_bytes + b"\r\n"
-
-        if fields:
-            for name, value in fields.items():
-                if value is not None:
-                    body += b"--" + boundary + b"\r\n"
-                    body += f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
-                    if isinstance(value, (list, tuple, dict)):
-                        body += json.dumps(value).encode() + b"\r\n"
-                    else:
-                        body += str(value).encode() + b"\r\n"
-
-        body += b"--" + boundary + b"--\r\n"
-
-        req = urllib.request.Request(
-            f"{SERVER_URL}{endpoint}",
-            data=body,
-            headers={
-                "Content-Type": f"multipart/form-data; boundary={boundary.decode()}"
-            },
-            method="POST"
-        )
-
+        """POST one image or a list of them (see multipart_body)."""
+        body = multipart_body(image_bytes, {"priority": self.priority, **(fields or {})})
+        try:
+            status, reason, data = _pool.request(
+                "POST", endpoint, body,
+                {"Content-Type": f"multipart/form-data; boundary={MULTIPART_BOUNDARY.decode()}"},
+            )
+        except (OSError, http.client.HTTPException) as e:
+            return {"error": f"Connection error: {e}", "text": None}
+        if status != 200:
+            return {"error": f"HTTP error {status}: {reason}", "text": None}
         try:
-            with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
-                result: dict[str, Any] = json.loads(resp.read())
-                return result
-        except urllib.error.URLError as e:
-            return {"error": f"URL error: {e}", "text": None}
-        except urllib.error.HTTPError as e:
-            return {"error": f"HTTP error {e.code}: {e.reason}", "text": None}
+            result: dict[str, Any] = json.loads(data)
+            return result
         except Exception as e:
             return {"error": str(e), "text": None}
 
+    def _request(
+        self,
+        endpoint: str,
+        image: npt.NDArray[Any] | Image.Image,
+        region: tuple[int, int, int, int] | None,
+        fields: dict[str, Any] | None,
+        cache: bool,
+    ) -> dict[str, Any]:
+        """POST one crop, or answer from the result cache when the same pixels
+        were read at the same endpoint with the same prompt within the TTL."""
+        key = None
+        if cache and OCRClient._cache.max_entries:
+            key = (endpoint, json.dumps(fields or {}, sort_keys=True), _crop_digest(image, region))
+            hit = OCRClient._cache.get(key)
+            if hit is not None:
+                return hit
+        self._ensure_server()
+        t0 = time.perf_counter()
+        result = self._post_multipart(endpoint, self._image_to_bytes(image, region), fields)
+        if key is not None and "error" not in result:
+            OCRClient._cache.put(key, result, time.perf_counter() - t0)
+        return result
+
+    @classmethod
+    def cache_stats(cls) -> dict[str, Any]:
+        """Result-cache hit/miss counters, for the daemon status."""
+        return cls._cache.stats()
+
     def extract_text(
         self,
         image: npt.NDArray[Any] | Image.Image,
         region: tuple[int, int, int, int] | None = None,
-        prompt: str | None = None
+        prompt: str | None = None,
+        cache: bool = True
     ) -> str:
-        self._ensure_server()
-        image_bytes = self._image_to_bytes(image, region)
         fields: dict[str, Any] = {"prompt": prompt} if prompt else {}
-        result = self._post_multipart("/ocr", image_bytes, fields)
+        result = self._request("/ocr", image, region, fields, cache)
         text = result.get("text", "")
         return _sanitize_ocr_text(str(text) if text else "")
 
     def extract_number(
         self,
         image: npt.NDArray[Any] | Image.Image,
-        region: tuple[int, int, int, int] | None = None
+        region: tuple[int, int, int, int] | None = None,
+        cache: bool = True
     ) -> int | None:
-        self._ensure_server()
-        image_bytes = self._image_to_bytes(image, region)
-        result = self._post_multipart("/ocr/number", image_bytes)
+        result = self._request("/ocr/number", image, region, None, cache)
         number = result.get("number")
         if number is None:
             return None
         return int(number)
 
+    def extract_many(
+        self,
+        image: npt.NDArray[Any] | Image.Image,
+        requests: Sequence[OCRRequest],
+        cache: bool = True
+    ) -> list[str | int | None]:
+        """Read several regions of one image in batched server calls.
+
+        Returns one result per request, in order: the sanitized text for
+        "text" requests, the number (or None) for "number" requests - what
+        extract_text/extract_number would return. Cached crops are answered
+        locally; the rest go to /ocr/batch, BATCH_MAX_ITEMS at a time. If a
+        batch call fails (e.g. a server without /ocr/batch), its crops are
+        read one by one instead.
+        """
+        results: list[dict[str, Any] | None] = [None] * len(requests)
+        keys: list[tuple[str, str, str] | None] = [None] * len(requests)
+        pending: list[int] = []
+        for i, req in enumerate(requests):
+            if req.mode not in ("text", "number"):
+                raise ValueError(f"OCRRequest.mode must be 'text' or 'number', got {req.mode!r}")
+            endpoint, fields = self._endpoint_for(req)
+            if cache and OCRClient._cache.max_entries:
+                key = (endpoint, json.dumps(fields or {}, sort_keys=True), _crop_digest(image, req.region))
+                keys[i] = key
+                results[i] = OCRClient._cache.get(key)
+            if results[i] is None:
+                pending.append(i)
+
+        if pending:
+            self._ensure_server()
+        for start in range(0, len(pending), BATCH_MAX_ITEMS):
+            chunk = pending[start:start + BATCH_MAX_ITEMS]
+            t0 = time.perf_counter()
+            batch = self._post_multipart(
+                "/ocr/batch",
+                [self._image_to_bytes(image, requests[i].region) for i in chunk],
+                {"items": [{"mode": requests[i].mode,
+                            "prompt": requests[i].prompt if requests[i].mode == "text" else None}
+                           for i in chunk]},
+            )
+            items = batch.get("results")
+            if "error" in batch or not isinstance(items, list) or len(items) != len(chunk):
+                for i in chunk:
+                    endpoint, fields = self._endpoint_for(requests[i])
+                    results[i] = self._request(endpoint, image, requests[i].region, fields, cache=False)
+                items = [results[i] for i in chunk]
+            cost_s = (time.perf_counter() - t0) / len(chunk)
+            for i, item in zip(chunk, items):
+                results[i] = item
+                cache_key = keys[i]
+                if cache_key is not None and isinstance(item, dict) and "error" not in item:
+                    OCRClient._cache.put(cache_key, item, cost_s)
+
+        out: list[str | int | None] = []
+        for req, result in zip(requests, results):
+            result = result or {}
+            if req.mode == "number":
+                number = result.get("number")
+                out.append(None if number is None else int(number))
+            else:
+                text = result.get("text", "")
+                out.append(_sanitize_ocr_text(str(text) if text else ""))
+        return out
+
+    @staticmethod
+    def _endpoint_for(req: OCRRequest) -> tuple[str, dict[str, Any] | None]:
+        """The single-crop endpoint and fields equivalent to a batch request
+        (also its cache key, so batched and single reads share entries)."""
+        if req.mode == "number":
+            return "/ocr/number", None
+        return "/ocr", {"prompt": req.prompt} if req.prompt else {}
+
     def extract_json(
         self,
         image: npt.NDArray[Any] | Image.Image,
         region: tuple[int, int, int, int] | None = None,
-        prompt: str | None = None
+        prompt: str | None = None,
+        cache: bool = True
     ) -> dict[str, Any] | None:
-        text = self.extract_text(image, region=region, prompt=prompt)
+        text = self.extract_text(image, region=region, prompt=prompt, cache=cache)
 
         text = text.strip()
 
@@ -356,7 +722,9 @@ class OCRClient:
         draw = ImageDraw.Draw(img)
         draw.text((14, 20), "12345", fill="black")
         image_bytes = self._image_to_bytes(img)
-        result = self._post_multipart("/ocr/number", image_bytes)
+        # Interactive even on a background client: a probe stuck behind
+        # queued reads must not look like dead inference
+        result = self._post_multipart("/ocr/number", image_bytes, {"priority": "interactive"})
         return "error" not in result
 
 
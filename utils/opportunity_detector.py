@@ -12,22 +12,67 @@ the moment the actor (main loop) is free, instead of being missed entirely.
 The main loop consumes the board at the same code sites (and with the same
 mode/cooldown gates) where it used to inline-match, and flows still re-verify
 on execution - a slightly stale center can never misfire a click.
+
+Most specs watch fixed regions whose pixels rarely change between frames: a
+TileTracker (utils/tile_tracker.py) tracks which 64x64 tiles changed on
+which frame, and a spec whose region has not changed since its last reading
+(however many frames ago - interval specs skip frames) reuses that
+SpecReading instead of re-matching (PerceptionState.spec_counters() reports
+matched vs skipped per spec).
+
+A frame that is pixel-identical to the last one scanned (same FrameBus
+fingerprint - common while the game idles) skips the pass entirely: the
+previous tick's readings are re-stamped while each is younger than
+max_reuse_age, like tile reuse (and, like it, off with tile_size=None).
+tick_stats() reports the duplicate rate and the estimated time saved.
+
+With workers > 1 the specs that do need matching are fanned out over a
+thread pool (cv2.matchTemplate releases the GIL): each group of template
+specs with overlapping regions is one match_templates job and every fn spec
+is another, so a tick costs about max(job) instead of sum(job). Results are
+applied on the detector thread in spec order, so the board and
+PerceptionState see exactly what the serial mode would.
+
+Not every spec needs every tick: a spec runs when its current interval has
+elapsed. The interval starts at min_interval, grows by `backoff` per miss
+up to max_interval (rare targets like the full-frame gift box search slow
+down while absent) and snaps back after a sighting. With a tick_budget, due
+specs are admitted in priority order by their measured cost; the rest are
+carried over (deferred) and age up in priority until they run.
+
+Frames need not be 4K: the tick's FrameContext infers the frame's scale, so
+a frame at capture resolution (native=True heartbeat captures, or a native
+ReplayBackend) is matched with downscaled templates and every reading stays
+in 4K coordinates. Fn specs and trackers that take the raw array get the
+context's 4K frame (upscaled once per tick, only if one of them runs).
 """
 from __future__ import annotations
 
 import logging
+import statistics
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Any, Callable
 
 from utils.frame_bus import FrameBus
-from utils.view_state_detector import detect_view, ViewState
+from utils.frame_context import FrameContext, scale_region
+from utils.template_matcher import MatchRequest, match_template, match_templates, region_groups
+from utils.tile_tracker import FULL_FRAME, TileTracker
+from utils.view_state_detector import VIEW_REGIONS, detect_view, ViewState
 
 logger = logging.getLogger("opportunity_detector")
 
-# A spec's matcher: frame -> (found, score, center|None)
+# A spec's matcher: frame -> (found, score, center|None). Specs with
+# uses_context=True receive the tick's shared FrameContext instead of the raw
+# array (only for fns that route through match_template/detect_view & co).
 MatcherFn = Callable[[Any], tuple[bool, float, tuple[int, int] | None]]
+Reading = tuple[bool, float, tuple[int, int] | None]
+
+SCAN_RATE_SAMPLES = 256   # reading times kept per spec for the scan-rate estimate
 
 
 @dataclass
@@ -44,7 +89,49 @@ class DetectorSpec:
     name: str
     views: set[ViewState] | None   # which views this target can appear in; None = ANY view (incl. CHAT/UNKNOWN)
     fn: MatcherFn
+    uses_context: bool = False     # fn accepts a FrameContext (shared derived planes)
+    query: MatchRequest | None = None  # plain template match: batched per tick instead of fn
+    # Pixels fn reads (x, y, w, h): while every tile under it is unchanged the
+    # previous reading is reused. None = unknown -> always re-run.
+    region: tuple[int, int, int, int] | None = None
+    # Cadence: seconds between runs (0 = every tick). With max_interval set,
+    # each miss multiplies the interval by `backoff` up to max_interval and a
+    # sighting resets it to min_interval. Higher priority is scheduled first
+    # when the tick budget can't fit every due spec.
+    min_interval: float = 0.0
+    max_interval: float | None = None
+    backoff: float = 2.0
+    priority: int = 0
     hits: int = field(default=0, compare=False)
+    last_tick: int = field(default=-1, compare=False)       # tick of the last reading (run or reused)
+    last_frame: int = field(default=-1, compare=False)      # TileTracker frame number of that reading
+    last_matched: float = field(default=0.0, compare=False)  # time fn/query last actually ran
+    interval: float = field(default=0.0, compare=False)     # current (adaptive) interval
+    last_run: float = field(default=0.0, compare=False)     # time of the last reading (run or reused)
+    deferred: int = field(default=0, compare=False)         # consecutive ticks skipped for budget
+    cost: float = field(default=0.0, compare=False)         # smoothed seconds per run
+
+    def __post_init__(self) -> None:
+        self.interval = self.min_interval
+
+    @classmethod
+    def template(cls, name: str, views: set[ViewState] | None, template_name: str,
+                 search_region: tuple[int, int, int, int] | None = None,
+                 threshold: float | None = None, pyramid: int | None = None,
+                 min_interval: float = 0.0, max_interval: float | None = None,
+                 priority: int = 0) -> DetectorSpec:
+        """A spec that is a single match_template call. The detector batches
+        such specs through match_templates, one call per group of overlapping
+        regions; fn stays usable for direct callers."""
+        query = MatchRequest(template_name, search_region, threshold, pyramid=pyramid)
+
+        def fn(f: Any) -> tuple[bool, float, tuple[int, int] | None]:
+            return match_template(f, template_name, search_region=search_region,
+                                  threshold=threshold, pyramid=pyramid)
+
+        return cls(name, views, fn, uses_context=True, query=query,
+                   region=search_region if search_region is not None else FULL_FRAME,
+                   min_interval=min_interval, max_interval=max_interval, priority=priority)
 
 
 @dataclass
@@ -67,6 +154,7 @@ class TrackerSpec:
     fn: Callable[[Any], Any]           # frame -> value (None = skip sink)
     sink: Callable[[Any], None]        # receives the value; runs on perception thread
     max_frame_age: float = 1.5
+    uses_context: bool = False         # fn accepts a FrameContext
     last_sample: float = field(default=0.0, compare=False)
     samples: int = field(default=0, compare=False)
 
@@ -93,6 +181,9 @@ class PerceptionState:
         self._view: ViewState = ViewState.UNKNOWN
         self._view_ts: float = 0.0
         self._view_since: float = 0.0   # when the CURRENT view classification began
+        self._counters: dict[str, list[int]] = {}   # name -> [matched, skipped, deferred]
+        self._scans: dict[str, deque[float]] = {}    # name -> recent reading times (scan rate)
+        self._latency: dict[str, list[float]] = {}  # name -> [runs, total_s, last_s, max_s]
 
     def record(self, name: str, found: bool, score: float,
                center: tuple[int, int] | None) -> None:
@@ -108,6 +199,59 @@ class PerceptionState:
                 return None
             return r
 
+    def reuse(self, name: str) -> SpecReading | None:
+        """Re-stamp the last reading of `name` as current (its region did not
+        change) and return it; None if there is nothing to reuse."""
+        with self._lock:
+            r = self._readings.get(name)
+            if r is None:
+                return None
+            r = SpecReading(r.found, r.score, r.center, time.time())
+            self._readings[name] = r
+            return r
+
+    def count(self, name: str, skipped: bool) -> None:
+        """Tally one evaluation of `name`: actually matched, or skipped
+        because its region was unchanged (the reading was reused)."""
+        with self._lock:
+            c = self._counters.setdefault(name, [0, 0, 0])
+            c[1 if skipped else 0] += 1
+            self._scans.setdefault(name, deque(maxlen=SCAN_RATE_SAMPLES)).append(time.time())
+
+    def defer(self, name: str) -> None:
+        """Tally a tick on which `name` was due but did not fit the budget."""
+        with self._lock:
+            self._counters.setdefault(name, [0, 0, 0])[2] += 1
+
+    def record_latency(self, name: str, seconds: float) -> None:
+        """Wall time of one actual evaluation of `name` (batched template
+        specs all report the batch's time - that is when their result lands)."""
+        with self._lock:
+            lat = self._latency.setdefault(name, [0, 0.0, 0.0, 0.0])
+            lat[0] += 1
+            lat[1] += seconds
+            lat[2] = seconds
+            lat[3] = max(lat[3], seconds)
+
+    def spec_counters(self) -> dict[str, dict[str, Any]]:
+        """{name: {"matched", "skipped", "skip_ratio", "deferred", "scan_hz"[,
+        "last_ms", "avg_ms", "max_ms"]}} - how much matching work the
+        dirty-tile check avoided, what the remaining work costs, and how often
+        each spec is effectively scanned (readings/s over the last minute)."""
+        now = time.time()
+        with self._lock:
+            out: dict[str, dict[str, Any]] = {}
+            for n, (m, k, d) in self._counters.items():
+                c: dict[str, Any] = {"matched": m, "skipped": k,
+                                     "skip_ratio": round(k / (m + k), 3) if m + k else 0.0,
+                                     "deferred": d, "scan_hz": _rate(self._scans.get(n), now)}
+                lat = self._latency.get(n)
+                if lat is not None and lat[0]:
+                    c.update(last_ms=round(lat[2] * 1000, 2), avg_ms=round(lat[1] / lat[0] * 1000, 2),
+                             max_ms=round(lat[3] * 1000, 2))
+                out[n] = c
+            return out
+
     def score_of(self, name: str, default: float = 1.0, max_age: float = 10.0) -> float:
         """Last score for the status line; `default` when never/staleley scanned."""
         r = self.get(name, max_age=max_age)
@@ -133,6 +277,21 @@ class PerceptionState:
             return self._view, now - self._view_ts, now - self._view_since
 
 
+def _evaluate(spec: DetectorSpec, ctx: FrameContext) -> list[Reading]:
+    """Run a fn spec on the tick's frame: the shared FrameContext if the fn
+    takes one, else the context's 4K array."""
+    return [spec.fn(ctx if spec.uses_context else ctx.frame_4k())]
+
+
+def _rate(times: deque[float] | None, now: float, window: float = 60.0) -> float:
+    """Events per second over the last `window` seconds (or since the first
+    retained event, if more recent)."""
+    if not times:
+        return 0.0
+    recent = sum(1 for t in times if now - t <= window)
+    return round(recent / max(1.0, min(window, now - times[0])), 3)
+
+
 class OpportunityBoard:
     """Lock-guarded {name: Opportunity}. Sightings refresh last_seen; stale
     entries (not re-sighted within ttl) simply stop being 'fresh'."""
@@ -195,6 +354,11 @@ class DetectorThread(threading.Thread):
         paused_fn: Callable[[], bool] | None = None,  # daemon pause: no heartbeat captures
         trackers: list[TrackerSpec] | None = None,
         busy_fn: Callable[[], bool] | None = None,     # actor executing a flow -> suppress trackers
+        tile_size: int | None = 64,    # dirty-tile / duplicate-frame reuse; None = always re-match
+        max_reuse_age: float = 5.0,    # re-match a reused spec at least this often
+        workers: int = 1,              # >1: evaluate specs concurrently on a thread pool
+        tick_budget: float | None = None,  # seconds of matching per tick; None = run every due spec
+        native: bool = False,          # heartbeat captures at capture resolution (no 4K upscale)
     ) -> None:
         super().__init__(daemon=True, name="OpportunityDetector")
         self.bus = bus
@@ -207,23 +371,72 @@ class DetectorThread(threading.Thread):
         self.paused_fn = paused_fn
         self.trackers = trackers if trackers is not None else []
         self.busy_fn = busy_fn
+        self.tiles = TileTracker(tile_size) if tile_size else None
+        self.max_reuse_age = max_reuse_age
+        self._view_matched = 0.0
+        self._view_frame = -1              # TileTracker frame number of the current view reading
+        self.workers = max(1, workers)
+        self._pool = (ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="DetectorWorker")
+                      if self.workers > 1 else None)
+        self.tick_ms: deque[float] = deque(maxlen=256)   # recent tick latencies (excl. pacing sleep)
+        self.lag_ms: deque[float] = deque(maxlen=256)    # frame publish -> its readings recorded
+        self.tick_budget = tick_budget
+        self.native = native
+        self._scale = (1.0, 1.0)
         self._stop = threading.Event()
         self._last_ts = 0.0
         self.ticks = 0
         self.last_view: str = "?"
+        self._last_fp: int | None = None   # FrameBus fingerprint of the last frame scanned
+        self._scan_ms = 0.0                # smoothed full-pass cost, for the saved-time estimate
+        self.dup_ticks = 0
+        self.dup_saved_ms = 0.0
 
     def stop(self) -> None:
         self._stop.set()
 
     def run(self) -> None:
-        logger.info(f"DETECTOR: started ({len(self.specs)} specs, tick={self.tick_interval}s)")
-        while not self._stop.is_set():
-            try:
-                self._tick()
-            except Exception as e:
-                # Detection is best-effort; log and keep going.
-                logger.warning(f"DETECTOR: tick error: {e}")
-                time.sleep(1.0)
+        logger.info(f"DETECTOR: started ({len(self.specs)} specs, tick={self.tick_interval}s, "
+                    f"workers={self.workers})")
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._tick()
+                except Exception as e:
+                    # Detection is best-effort; log and keep going.
+                    logger.warning(f"DETECTOR: tick error: {e}")
+                    time.sleep(1.0)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+
+    def tick_stats(self) -> dict[str, Any]:
+        """Distribution of recent tick latencies (ms, frame receipt to results
+        applied - the pacing sleep is excluded) and of the lag from a frame's
+        publication to its readings being recorded."""
+        dedup = {"dup_ticks": self.dup_ticks, "dup_rate": round(self.dup_ticks / self.ticks, 3) if self.ticks else 0.0,
+                 "dup_saved_s": round(self.dup_saved_ms / 1000.0, 2)}
+        s = sorted(self.tick_ms)
+        if not s:
+            return {"workers": self.workers, "n": 0, **dedup}
+        lag = sorted(self.lag_ms)
+        return {
+            **dedup,
+            "workers": self.workers,
+            "n": len(s),
+            "p50_ms": round(statistics.median(s), 2),
+            "p95_ms": round(s[min(len(s) - 1, int(round(0.95 * (len(s) - 1))))], 2),
+            "max_ms": round(s[-1], 2),
+            "lag_p50_ms": round(statistics.median(lag), 2),
+            "lag_p95_ms": round(lag[min(len(lag) - 1, int(round(0.95 * (len(lag) - 1))))], 2),
+            "budget_ms": round(self.tick_budget * 1000, 1) if self.tick_budget is not None else None,
+        }
+
+    def schedule(self) -> dict[str, dict[str, Any]]:
+        """Current cadence per spec: adaptive interval, priority and how many
+        ticks in a row it has been deferred by the budget."""
+        return {s.name: {"interval_s": round(s.interval, 2), "priority": s.priority,
+                         "deferred": s.deferred} for s in self.specs}
 
     def _tick(self) -> None:
         item = self.bus.wait_for_frame(newer_than=self._last_ts, timeout=self.tick_interval)
@@ -235,38 +448,41 @@ class DetectorThread(threading.Thread):
             if (self.win is not None and self.bus.age > self.heartbeat_after
                     and not (self.paused_fn is not None and self.paused_fn())):
                 try:
-                    self.win.get_screenshot_cv2()
+                    if self.native:
+                        self.win.get_screenshot_cv2(native=True)
+                    else:
+                        self.win.get_screenshot_cv2()
                 except Exception:
                     time.sleep(0.5)
             return
 
         frame, ts = item
+        t0 = time.perf_counter()
         self._last_ts = ts
         self.ticks += 1
+        # One FrameContext per frame: grayscale/float32/energy planes are
+        # derived once and shared by detect_view and every context-aware spec.
+        ctx = FrameContext.for_frame(frame, ts)
+        self._scale = ctx.scale
+        now = time.time()
 
-        # Classify the view ONCE per frame; always record it (recovery and
-        # chat-stuck logic need CHAT/UNKNOWN persistence, not just TOWN/WORLD).
-        view, _score = detect_view(frame)
-        self.last_view = getattr(view, "value", str(view))
-        self.state.set_view(view)
-
-        for spec in self.specs:
-            # views=None -> runs on ANY frame (e.g. handshake, state monitors);
-            # otherwise only when the frame's view matches.
-            if spec.views is not None and view not in spec.views:
-                continue
-            try:
-                found, score, center = spec.fn(frame)
-            except Exception as e:
-                logger.debug(f"DETECTOR: spec {spec.name} error: {e}")
-                continue
-            # Record EVERY reading (found or not) - the status line reports
-            # scores for absent icons; the board only gets actual sightings.
-            self.state.record(spec.name, found, score, center)
-            if found:
-                spec.hits += 1
-                self.board.sighting(spec.name, center, score)
-                logger.debug(f"DETECTOR: sighted {spec.name} score={score:.4f} at {center}")
+        # A pixel-identical frame (same FrameBus fingerprint as the last one
+        # scanned) yields the same readings: re-stamp them instead of
+        # classifying and matching again.
+        fp = self.bus.fingerprint_of(ts)
+        duplicate = (self.tiles is not None and fp is not None and fp == self._last_fp
+                     and self._restamp(now))
+        self._last_fp = fp
+        if duplicate:
+            view = self.state.view
+            self.dup_ticks += 1
+            self.dup_saved_ms += max(0.0, self._scan_ms - (time.perf_counter() - t0) * 1000.0)
+        else:
+            view = self._scan(ctx, frame, now, t0)
+            elapsed = (time.perf_counter() - t0) * 1000.0
+            self._scan_ms = elapsed if self._scan_ms == 0.0 else 0.8 * self._scan_ms + 0.2 * elapsed
+            self.tick_ms.append(elapsed)
+        self.lag_ms.append((time.time() - ts) * 1000.0)
 
         # Stateful trackers (vote histories, stamina OCR): sample only on
         # fresh, non-busy frames at each tracker's own cadence.
@@ -282,7 +498,7 @@ class DetectorThread(threading.Thread):
                     continue
                 tr.last_sample = now
                 try:
-                    value = tr.fn(frame)
+                    value = tr.fn(ctx if tr.uses_context else ctx.frame_4k())
                     if value is not None:
                         tr.sink(value)
                         tr.samples += 1
@@ -292,3 +508,184 @@ class DetectorThread(threading.Thread):
         # Pace ourselves: never rescan faster than tick_interval even when
         # frames pour in (flows can capture 5+/s).
         time.sleep(self.tick_interval)
+
+    def _restamp(self, now: float) -> bool:
+        """Duplicate frame: re-stamp the reading of every due spec taken on
+        the last scanned frame (re-sighting hits on the board), as if it had
+        been matched on this one. False - and nothing touched - if the view
+        or some due spec has no such reading (it was gated off, deferred or
+        new) or last actually ran more than max_reuse_age ago: that frame
+        needs a real pass."""
+        if self.tiles is None or now - self._view_matched > self.max_reuse_age:
+            return False
+        view = self.state.view
+        due = [s for s in self.specs
+               if (s.views is None or view in s.views) and now - s.last_run >= s.interval]
+        if any(s.last_frame != self.tiles.frames or now - s.last_matched > self.max_reuse_age
+               or self.state.get(s.name) is None for s in due):
+            return False
+        self.state.set_view(view)
+        self.state.count("view", skipped=True)
+        for spec in due:
+            r = self.state.reuse(spec.name)
+            if r is None:
+                continue
+            spec.last_tick = self.ticks
+            self._reschedule(spec, r.found, now)
+            self.state.count(spec.name, skipped=True)
+            if r.found:
+                spec.hits += 1
+                self.board.sighting(spec.name, r.center, r.score)
+        return True
+
+    def _scan(self, ctx: FrameContext, frame: Any, now: float, t0: float) -> Any:
+        """The full perception pass on a new frame: classify the view, then
+        match (or tile-reuse) every due spec. Returns the view."""
+        if self.tiles is not None:
+            self.tiles.update(frame)
+        frame_no = self.tiles.frames if self.tiles is not None else -1
+
+        # Classify the view ONCE per frame; always record it (recovery and
+        # chat-stuck logic need CHAT/UNKNOWN persistence, not just TOWN/WORLD).
+        # The classification only reads the toggle button / chat header /
+        # webview close regions - unchanged pixels, unchanged view.
+        if self._reusable(self._view_frame, self._view_matched, VIEW_REGIONS, now):
+            view = self.state.view
+            self.state.count("view", skipped=True)
+        else:
+            view, _score = detect_view(ctx)
+            self._view_matched = now
+            self.state.count("view", skipped=False)
+        self._view_frame = frame_no
+        self.last_view = getattr(view, "value", str(view))
+        self.state.set_view(view)
+
+        # views=None -> runs on ANY frame (e.g. handshake, state monitors);
+        # otherwise only when the frame's view matches.
+        active = [s for s in self.specs if s.views is None or view in s.views]
+        # Cadence: only specs whose current interval has elapsed are due.
+        active = [s for s in active if now - s.last_run >= s.interval]
+
+        # Specs whose region lies in tiles unchanged since their last reading
+        # keep it (re-stamped, and re-sighted on the board if it was a hit) -
+        # also when that reading is several frames old because the spec's
+        # interval or view gate skipped the frames in between.
+        reused = {s.name for s in active
+                  if self._reusable(s.last_frame, s.last_matched, (s.region,), now)}
+        for spec in active:
+            if spec.name not in reused:
+                continue
+            r = self.state.reuse(spec.name)
+            if r is None:
+                reused.discard(spec.name)
+                continue
+            spec.last_tick = self.ticks
+            spec.last_frame = frame_no
+            self._reschedule(spec, r.found, now)
+            self.state.count(spec.name, skipped=True)
+            if r.found:
+                spec.hits += 1
+                self.board.sighting(spec.name, r.center, r.score)
+        active = self._admit([s for s in active if s.name not in reused], now, t0)
+
+        # Plain template specs are batched per group of overlapping regions
+        # (one match_templates call shares crops and conversions, e.g. the
+        # union toolbar trio); groups and every other spec are separate jobs,
+        # so the pool can run them side by side.
+        jobs: list[tuple[list[DetectorSpec], Callable[[], list[Reading]]]] = []
+        queried = [s for s in active if s.query is not None]
+        queries = [s.query for s in queried if s.query is not None]
+        for group in region_groups(queries):
+            jobs.append(([queried[i] for i in group], partial(match_templates, ctx, [queries[i] for i in group])))
+        for spec in active:
+            if spec.query is None:
+                jobs.append(([spec], partial(_evaluate, spec, ctx)))
+        results = self._run_jobs(jobs)
+
+        for spec in active:
+            if spec.name not in results:
+                continue
+            (found, score, center), elapsed, share = results[spec.name]
+            spec.cost = share if spec.cost == 0.0 else 0.7 * spec.cost + 0.3 * share
+            self._reschedule(spec, found, now)
+            # Record EVERY reading (found or not) - the status line reports
+            # scores for absent icons; the board only gets actual sightings.
+            self.state.record(spec.name, found, score, center)
+            self.state.count(spec.name, skipped=False)
+            self.state.record_latency(spec.name, elapsed)
+            spec.last_tick = self.ticks
+            spec.last_frame = frame_no
+            spec.last_matched = now
+            if found:
+                spec.hits += 1
+                self.board.sighting(spec.name, center, score)
+                logger.debug(f"DETECTOR: sighted {spec.name} score={score:.4f} at {center}")
+        return view
+
+    def _run_jobs(
+        self, jobs: list[tuple[list[DetectorSpec], Callable[[], list[Reading]]]],
+    ) -> dict[str, tuple[Reading, float, float]]:
+        """Run matching jobs (serially, or on the pool) and return
+        {spec name: (reading, job seconds, per-spec share of them)}; a failing
+        job drops its specs for this tick. Matchers are already safe to call
+        concurrently (the main loop and flows match while this thread does):
+        shared caches sit behind _cache_lock and CUDA work behind _gpu_lock in
+        template_matcher."""
+        def run(job: tuple[list[DetectorSpec], Callable[[], list[Reading]]],
+                ) -> list[tuple[str, Reading, float, float]]:
+            specs, call = job
+            start = time.perf_counter()
+            try:
+                readings = call()
+            except Exception as e:
+                logger.debug(f"DETECTOR: spec {', '.join(s.name for s in specs)} error: {e}")
+                return []
+            elapsed = time.perf_counter() - start
+            return [(s.name, r, elapsed, elapsed / len(specs)) for s, r in zip(specs, readings)]
+
+        if self._pool is None or len(jobs) < 2:
+            done = [run(job) for job in jobs]
+        else:
+            done = list(self._pool.map(run, jobs))
+        return {name: (reading, elapsed, share) for out in done for name, reading, elapsed, share in out}
+
+    def _admit(self, due: list[DetectorSpec], now: float, t0: float) -> list[DetectorSpec]:
+        """Fit due specs into what is left of the tick budget: highest
+        priority first (each deferred tick adds one, so nothing starves),
+        most overdue first within a priority, by smoothed cost (across all
+        workers). At least one spec always runs. Returns the admitted specs
+        in spec order; the rest are deferred to the next tick."""
+        if self.tick_budget is None or not due:
+            return due
+        left = (self.tick_budget - (time.perf_counter() - t0)) * self.workers
+        order = sorted(due, key=lambda s: (-(s.priority + s.deferred), -(now - s.last_run - s.interval)))
+        admitted: set[str] = set()
+        for spec in order:
+            if admitted and spec.cost > left:
+                spec.deferred += 1
+                self.state.defer(spec.name)
+                continue
+            admitted.add(spec.name)
+            left -= spec.cost
+        return [s for s in due if s.name in admitted]
+
+    def _reschedule(self, spec: DetectorSpec, found: bool, now: float) -> None:
+        """Adaptive cadence after a reading: a sighting snaps the interval back
+        to min_interval, a miss backs it off towards max_interval."""
+        spec.last_run = now
+        spec.deferred = 0
+        if found or spec.max_interval is None:
+            spec.interval = spec.min_interval
+        else:
+            spec.interval = min(spec.max_interval, max(spec.interval, self.tick_interval) * spec.backoff)
+
+    def _reusable(self, last_frame: int, last_matched: float,
+                  regions: tuple[tuple[int, int, int, int] | None, ...], now: float) -> bool:
+        """A previous result can stand for this frame if it is younger than
+        max_reuse_age and no tile under a region it depends on changed since
+        the frame it was produced (or reused) on, `last_frame`."""
+        if self.tiles is None or now - last_matched > self.max_reuse_age:
+            return False
+        if self._scale != (1.0, 1.0):    # tiles are in frame pixels, regions in 4K
+            regions = tuple(r if r is None else scale_region(r, self._scale) for r in regions)
+        return all(self.tiles.unchanged_since(r, last_frame) for r in regions)
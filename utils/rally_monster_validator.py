@@ -20,6 +20,8 @@ import numpy.typing as npt
 import re
 from datetime import datetime
 
+from utils.template_matcher import get_template_f32
+
 if TYPE_CHECKING:
     from utils.ocr_client import OCRClient
 
@@ -53,13 +55,14 @@ def _load_monster_templates() -> dict[str, npt.NDArray[Any]]:
         return _template_cache
 
     if current_mtime != _template_dir_mtime:
-        # Reload all templates as BGR float32
+        # Reload all templates as BGR float32 (unchanged files come from the
+        # template registry without touching disk)
         _template_cache = {}
         for path in MONSTER_TEMPLATE_DIR.glob("*.png"):
             name = path.stem  # e.g., "elite_zombie_24"
-            template = cv2.imread(str(path))
+            template = get_template_f32(path)
             if template is not None:
-                _template_cache[name] = template.astype(np.float32)
+                _template_cache[name] = template
         _template_dir_mtime = current_mtime
         if _template_cache:
             logger.info(f"Loaded {len(_template_cache)} monster templates from {MONSTER_TEMPLATE_DIR}")
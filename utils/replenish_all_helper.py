@@ -15,6 +15,8 @@ from typing import TYPE_CHECKING, Any
 import cv2
 import numpy.typing as npt
 
+from utils.template_matcher import get_template
+
 if TYPE_CHECKING:
     from utils.adb_helper import ADBHelper
     from utils.windows_screenshot_helper import WindowsScreenshotHelper
@@ -48,26 +50,23 @@ class ReplenishAllHelper:
         self.logger = logging.getLogger(__name__)
 
         # Replenish all button template (372x125)
-        replenish_path = Path(__file__).parent.parent / "templates" / "ground_truth" / "replenish_all_button_4k.png"
-        replenish_img = cv2.imread(str(replenish_path), cv2.IMREAD_GRAYSCALE)
+        replenish_img = get_template("replenish_all_button_4k.png", grayscale=True)
         if replenish_img is None:
-            raise FileNotFoundError(f"Template not found: {replenish_path}")
+            raise FileNotFoundError("Template not found: replenish_all_button_4k.png")
         self.replenish_template: npt.NDArray[Any] = replenish_img
 
         # Use Items header template (983x113)
-        header_path = Path(__file__).parent.parent / "templates" / "ground_truth" / "use_items_header_4k.png"
-        header_img = cv2.imread(str(header_path), cv2.IMREAD_GRAYSCALE)
+        header_img = get_template("use_items_header_4k.png", grayscale=True)
         if header_img is None:
-            raise FileNotFoundError(f"Template not found: {header_path}")
+            raise FileNotFoundError("Template not found: use_items_header_4k.png")
         self.header_template: npt.NDArray[Any] = header_img
 
         # Insufficient Resources tab template (1163x126)
-        tab_path = Path(__file__).parent.parent / "templates" / "ground_truth" / "insufficient_resources_tab_4k.png"
-        tab_img: npt.NDArray[Any] | None = cv2.imread(str(tab_path), cv2.IMREAD_GRAYSCALE)
-        self.insufficient_tab_template: npt.NDArray[Any] | None = tab_img
+        self.insufficient_tab_template: npt.NDArray[Any] | None = get_template(
+            "insufficient_resources_tab_4k.png", grayscale=True)
         # Tab template is optional - don't fail if not found
         if self.insufficient_tab_template is None:
-            self.logger.warning(f"Optional template not found: {tab_path}")
+            self.logger.warning("Optional template not found: insufficient_resources_tab_4k.png")
 
         # Replenish all button - fixed coordinates from Gemini detection (2026-01-03)
         self.REPLENISH_BUTTON_X = 1728  # Top-left X
@@ -27,7 +27,7 @@ from utils.back_button_matcher import BackButtonMatcher
 from utils.windows_screenshot_helper import WindowsScreenshotHelper
 from utils.adb_helper import ADBHelper
 from utils.send_zoom import send_zoom
-from utils.template_matcher import match_template
+from utils.template_matcher import get_template, match_template
 
 # Import from centralized config
 from config import (
@@ -56,17 +56,15 @@ MAX_ZOOM_OUT_ATTEMPTS = 3   # Max zoom-outs when grass visible but town button n
 # Track consecutive restarts (module-level state, for logging only - never gives up)
 _consecutive_restarts = 0
 
-# Cached templates
+# Templates (cached by the template registry)
 _form_team_template: npt.NDArray[Any] | None = None
 _resource_bar_template: npt.NDArray[Any] | None = None
 
 
 def _load_templates() -> None:
     global _form_team_template, _resource_bar_template
-    if _form_team_template is None and FORM_TEAM_TEMPLATE.exists():
-        _form_team_template = cv2.imread(str(FORM_TEAM_TEMPLATE))
-    if _resource_bar_template is None and RESOURCE_BAR_TEMPLATE.exists():
-        _resource_bar_template = cv2.imread(str(RESOURCE_BAR_TEMPLATE))
+    _form_team_template = get_template(FORM_TEAM_TEMPLATE)
+    _resource_bar_template = get_template(RESOURCE_BAR_TEMPLATE)
 
 
 def _detect_troop_selected(frame: npt.NDArray[Any] | None) -> tuple[bool, float]:
@@ -11,6 +11,8 @@ import numpy.typing as npt
 from pathlib import Path
 from typing import Any
 
+from utils.template_matcher import get_template
+
 # Search region - UPPER map band only. The center-bottom is the player's base
 # cluster (incl. the Lv.2 Union Center); a "safe ground" tap there lands on a
 # building's hitbox and OPENS it instead of dismissing the popup (the "keeps
@@ -24,16 +26,10 @@ MATCH_THRESHOLD = 0.02
 # Template path - resolve from module location, not CWD
 TEMPLATE_PATH = Path(__file__).parent.parent / "templates" / "ground_truth" / "safe_ground_tile_4k.png"
 
-# Cached template (BGR color)
-_template: npt.NDArray[Any] | None = None
-
 
 def _load_template() -> npt.NDArray[Any] | None:
     """Load template in COLOR (BGR), not grayscale."""
-    global _template
-    if _template is None:
-        _template = cv2.imread(str(TEMPLATE_PATH), cv2.IMREAD_COLOR)
-    return _template
+    return get_template(TEMPLATE_PATH)
 
 
 def find_safe_ground(frame: npt.NDArray[Any], debug: bool = False) -> tuple[int, int] | None:
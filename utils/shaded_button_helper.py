@@ -18,6 +18,8 @@ import cv2
 import numpy as np
 import numpy.typing as npt
 
+from utils.template_matcher import get_template
+
 if TYPE_CHECKING:
     from utils.adb_helper import ADBHelper
     from utils.windows_screenshot_helper import WindowsScreenshotHelper
@@ -56,13 +58,9 @@ def is_button_shaded(frame: npt.NDArray[Any], debug: bool = False) -> tuple[bool
     best_template = None
 
     for template_name in SHADED_TEMPLATES:
-        template_path = BASE_DIR / template_name
-        if not template_path.exists():
-            continue
-
-        template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
+        template = get_template(template_name, grayscale=True)
         if template is None:
-            continue  # type: ignore[unreachable]
+            continue
 
         result = cv2.matchTemplate(roi_gray, template, cv2.TM_SQDIFF_NORMED)
         score = cv2.minMaxLoc(result)[0]
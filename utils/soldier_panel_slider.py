@@ -16,6 +16,8 @@ from typing import TYPE_CHECKING, Any
 import cv2
 import numpy.typing as npt
 
+from utils.template_matcher import get_template
+
 if TYPE_CHECKING:
     from utils.adb_helper import ADBHelper
 
@@ -38,15 +40,10 @@ MINUS_BUTTON = (1525, 1175)
 # Template path
 TEMPLATE_PATH = Path(__file__).parent.parent / "templates" / "ground_truth" / "slider_circle_4k.png"
 
-_template_cache: npt.NDArray[Any] | None = None
-
 
 def _get_template() -> npt.NDArray[Any] | None:
-    """Load and cache the slider circle template."""
-    global _template_cache
-    if _template_cache is None:
-        _template_cache = cv2.imread(str(TEMPLATE_PATH), cv2.IMREAD_GRAYSCALE)
-    return _template_cache
+    """The slider circle template (grayscale, from the template registry)."""
+    return get_template(TEMPLATE_PATH, grayscale=True)
 
 
 def find_slider_circle(frame: npt.NDArray[Any]) -> tuple[int | None, int | None, float]:
@@ -84,10 +81,9 @@ def find_plus_button(frame: npt.NDArray[Any]) -> tuple[int | None, int | None, f
         (x, y, score) tuple where x,y is the button center,
         or (None, None, score) if not found
     """
-    template_path = Path(__file__).parent.parent / "templates" / "ground_truth" / "hospital_plus_button_4k.png"
-    template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
+    template = get_template("hospital_plus_button_4k.png", grayscale=True)
     if template is None:
-        return None, None, 1.0  # type: ignore[unreachable]
+        return None, None, 1.0
 
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
     result = cv2.matchTemplate(gray, template, cv2.TM_SQDIFF_NORMED)
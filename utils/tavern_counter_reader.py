@@ -23,6 +23,8 @@ if TYPE_CHECKING:
 ASSIST_ALLIES_REGION = (1700, 545, 120, 65)
 PLUNDER_OTHERS_REGION = (1700, 608, 120, 65)
 
+COUNTER_PROMPT = "Extract only the counter number in X/Y format like '2/5'"
+
 
 def _parse_counter(text: str) -> tuple[int, int] | None:
     """
@@ -63,7 +65,7 @@ def read_assist_counter(frame: npt.NDArray[Any]) -> tuple[int, int] | None:
     text = ocr.extract_text(
         frame,
         region=ASSIST_ALLIES_REGION,
-        prompt="Extract only the counter number in X/Y format like '2/5'"
+        prompt=COUNTER_PROMPT
     )
 
     return _parse_counter(text)
@@ -85,7 +87,7 @@ def read_plunder_counter(frame: npt.NDArray[Any]) -> tuple[int, int] | None:
     text = ocr.extract_text(
         frame,
         region=PLUNDER_OTHERS_REGION,
-        prompt="Extract only the counter number in X/Y format like '2/5'"
+        prompt=COUNTER_PROMPT
     )
 
     return _parse_counter(text)
@@ -93,7 +95,7 @@ def read_plunder_counter(frame: npt.NDArray[Any]) -> tuple[int, int] | None:
 
 def read_tavern_counters(frame: npt.NDArray[Any]) -> dict[str, tuple[int, int] | None]:
     """
-    Read both Assist Allies and Plunder Others counters.
+    Read both Assist Allies and Plunder Others counters (one batched OCR call).
 
     Args:
         frame: BGR image from WindowsScreenshotHelper
@@ -102,9 +104,15 @@ def read_tavern_counters(frame: npt.NDArray[Any]) -> dict[str, tuple[int, int] |
         Dict with keys 'assist_allies' and 'plunder_others',
         values are (current, max) tuples or None if failed
     """
+    from utils.ocr_client import OCRClient, OCRRequest
+
+    assist, plunder = OCRClient().extract_many(frame, [
+        OCRRequest(ASSIST_ALLIES_REGION, prompt=COUNTER_PROMPT),
+        OCRRequest(PLUNDER_OTHERS_REGION, prompt=COUNTER_PROMPT),
+    ])
     return {
-        "assist_allies": read_assist_counter(frame),
-        "plunder_others": read_plunder_counter(frame),
+        "assist_allies": _parse_counter(str(assist)),
+        "plunder_others": _parse_counter(str(plunder)),
     }
 
 
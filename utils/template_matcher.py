@@ -30,6 +30,17 @@ Usage:
     # Check if template has a mask
     if has_mask("search_button_4k.png"):
         print("Will use masked matching")
+
+    # Every occurrence (center_x, center_y, score), de-duplicated, top to bottom
+    hits = find_all_templates(frame, "claim_button_tavern_4k.png",
+                              search_region=(2100, 0, 400, 2160), threshold=0.02,
+                              min_distance=(400, 100), sort_by="y")
+
+    # Batch: many templates against one frame in a single call
+    results = match_templates(frame, [
+        MatchRequest("world_button_4k.png", (3600, 1920, 240, 240), 0.05),
+        ("town_button_4k.png", (3600, 1920, 240, 240), 0.05),
+    ])
 """
 
 from __future__ import annotations
@@ -37,20 +48,47 @@ from __future__ import annotations
 import cv2
 import numpy as np
 import numpy.typing as npt
+from collections import OrderedDict
 from pathlib import Path
 import threading
 
+from utils.frame_context import FrameContext, frame_array, scale_region, to_4k
+from utils.template_pack import TemplatePack
+from utils.template_registry import TemplateRegistry
+
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates" / "ground_truth"
 
 # Type alias for numpy arrays (using Any for cv2 compatibility)
-from typing import Any
+from typing import Any, NamedTuple, Sequence
 NDArray = npt.NDArray[Any]
+MatchResult = tuple[bool, float, tuple[int, int] | None]
+
+# Loaded templates and masks: the process-wide TemplateRegistry. Paths and
+# reads are late-bound through this module's TEMPLATE_DIR / cv2 so tests can
+# redirect both. Reloads of an edited file evict derived artifacts below.
+def _registry_check_interval() -> float:
+    try:
+        from config import TEMPLATE_HOT_RELOAD_INTERVAL
+        return float(TEMPLATE_HOT_RELOAD_INTERVAL)
+    except ImportError:
+        return 2.0
 
-# Caches for loaded templates and masks (COLOR by default)
-_templates_color: dict[str, NDArray | None] = {}
-_templates_gray: dict[str, NDArray | None] = {}
-_masks: dict[str, NDArray | None] = {}
-_mask_exists: dict[str, bool] = {}  # Cache for mask existence checks
+
+def _open_template_pack() -> TemplatePack | None:
+    """Memory-map the precompiled pack (scripts/build_template_pack.py)."""
+    try:
+        from config import TEMPLATE_PACK_ENABLED
+    except ImportError:
+        TEMPLATE_PACK_ENABLED = True
+    return TemplatePack.open() if TEMPLATE_PACK_ENABLED else None
+
+
+_registry = TemplateRegistry(
+    path_fn=lambda name: TEMPLATE_DIR / name,
+    read_fn=lambda path, flag: cv2.imread(str(path), flag),
+    check_interval=_registry_check_interval(),
+    pack=_open_template_pack(),
+)
 
 # GPU template cache
 _gpu_templates: dict[str, Any] = {}  # cv2.cuda_GpuMat
@@ -63,10 +101,28 @@ _gpu_masked_data: dict[str, tuple[Any, Any, float]] = {}
 # Serialize all GPU cache and matching operations through a single lock.
 _gpu_lock = threading.RLock()
 
-# Template/mask disk-cache loads are dict get-or-load; without a lock, two
+# Derived-artifact caches below are dict get-or-build; without a lock, two
 # threads (main loop / flow thread / detector thread) can race the mutation.
+# (The registry has its own lock.)
 _cache_lock = threading.RLock()
 
+# CPU counterpart of _gpu_masked_data: (masked_template_f32, mask_sq_f32,
+# template_energy) keyed by (template_name, grayscale). LRU-bounded; guarded
+# by _cache_lock; invalidated by clear_cache().
+_CPU_MASKED_CACHE_MAX = 64
+_cpu_masked_data: OrderedDict[tuple[str, bool], tuple[NDArray, NDArray, float] | None] = OrderedDict()
+
+# Coarse-to-fine (pyramid) search: downscaled (template, mask) per
+# (template_name, grayscale, scale), and per-template default scales
+# (config.PYRAMID_TEMPLATES, overridable via set_pyramid_scale).
+_pyramid_templates: dict[tuple[str, bool, int], tuple[NDArray, NDArray | None]] = {}
+_pyramid_scales: dict[str, int] | None = None
+
+# Native-scale matching (FrameContext.native): (template, mask) resized to the
+# frame's scale, per (template_name, grayscale, scale). Built once per
+# template and capture resolution; guarded by _cache_lock.
+_native_templates: dict[tuple[str, bool, tuple[float, float]], tuple[NDArray, NDArray | None]] = {}
+
 
 def clear_gpu_cache() -> int:
     """
@@ -124,11 +180,45 @@ def _is_gpu_enabled() -> bool:
     except ImportError:
         return True  # Default to GPU if config not available
 
+def _get_pyramid_scales() -> dict[str, int]:
+    """Per-template default pyramid scales, loaded once from config."""
+    global _pyramid_scales
+    with _cache_lock:
+        if _pyramid_scales is None:
+            try:
+                from config import PYRAMID_TEMPLATES
+                _pyramid_scales = dict(PYRAMID_TEMPLATES)
+            except ImportError:
+                _pyramid_scales = {}
+        return _pyramid_scales
+
+
+def set_pyramid_scale(template_name: str, scale: int | None) -> None:
+    """
+    Set (or with None/1, clear) the default pyramid scale for a template.
+
+    Calls to match_template() for this template that don't pass `pyramid`
+    explicitly then use coarse-to-fine search at 1/scale.
+    """
+    scales = _get_pyramid_scales()
+    with _cache_lock:
+        if scale is None or scale <= 1:
+            scales.pop(template_name, None)
+        else:
+            scales[template_name] = scale
+
+
 # Default thresholds (all TM_SQDIFF_NORMED: lower=better)
 DEFAULT_THRESHOLD = 0.1   # Max score for TM_SQDIFF_NORMED
 DEFAULT_MASKED_THRESHOLD = 0.05   # Stricter threshold for masked matching
 _MASKED_ENERGY_EPS = 1e-6
 
+# Pyramid search tuning
+PYRAMID_SCALES = (2, 4)            # supported downscale factors
+PYRAMID_CANDIDATES = 3             # coarse peaks refined at full resolution
+PYRAMID_MIN_TEMPLATE_PX = 12       # downscaled template must keep this many px per side
+PYRAMID_MIN_AREA_RATIO = 16        # only worth it when search area >= 16x template area
+
 
 def _get_mask_name(template_name: str) -> str:
     """
@@ -149,17 +239,42 @@ def _get_mask_name(template_name: str) -> str:
 
 def _load_template(name: str, grayscale: bool = False) -> NDArray | None:
     """Load template with caching. COLOR by default. Thread-safe."""
-    cache = _templates_gray if grayscale else _templates_color
-    with _cache_lock:
-        if name not in cache:
-            path = TEMPLATE_DIR / name
-            if path.exists():
-                flag = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
-                img = cv2.imread(str(path), flag)
-                cache[name] = img if img is not None else None
-            else:
-                cache[name] = None
-        return cache[name]
+    return _registry.get(name, "gray" if grayscale else "color")
+
+
+def _template_key(name: str | Path) -> str:
+    """Registry key for a template: its path relative to TEMPLATE_DIR when it
+    lives there (so a Path constant and a bare name share one entry)."""
+    path = Path(name)
+    if path.is_absolute():
+        try:
+            return path.relative_to(TEMPLATE_DIR).as_posix()
+        except ValueError:
+            return str(path)
+    return path.as_posix()
+
+
+def get_template(name: str | Path, grayscale: bool = False) -> NDArray | None:
+    """
+    Cached template image by name (or path) - the replacement for cv2.imread
+    in helpers and flows. Read from disk once; re-read only if the file
+    changes. Returns None if missing. Do not modify the returned array.
+
+    Args:
+        name: File name in templates/ground_truth (subpaths allowed), or a path
+        grayscale: Grayscale (uint8, 2D) instead of BGR
+    """
+    return _load_template(_template_key(name), grayscale=grayscale)
+
+
+def get_template_f32(name: str | Path, grayscale: bool = False) -> NDArray | None:
+    """float32 copy of get_template(name, grayscale), cached alongside it."""
+    return _registry.get(_template_key(name), "f32_gray" if grayscale else "f32")
+
+
+def get_template_registry() -> TemplateRegistry:
+    """The process-wide registry (for stats() / reload listeners)."""
+    return _registry
 
 
 def _get_gpu_template(name: str, template: NDArray) -> Any:
@@ -204,6 +319,33 @@ def _prepare_masked_template_data(
     return masked_template.astype(np.float32), mask_sq, template_energy
 
 
+def _get_cpu_masked_data(
+    template_name: str,
+    grayscale: bool,
+    template: NDArray,
+    mask: NDArray,
+) -> tuple[NDArray, NDArray, float] | None:
+    """
+    Get cached CPU artifacts for masked matching (see _prepare_masked_template_data).
+
+    Templates and masks are immutable once loaded, so the float conversion,
+    mask normalisation and energy sum only need to happen once per
+    (template, grayscale) - not on every match.
+    """
+    key = (template_name, grayscale)
+    with _cache_lock:
+        if key in _cpu_masked_data:
+            _cpu_masked_data.move_to_end(key)
+            return _cpu_masked_data[key]
+    prepared = _prepare_masked_template_data(template, mask)
+    with _cache_lock:
+        _cpu_masked_data[key] = prepared
+        _cpu_masked_data.move_to_end(key)
+        while len(_cpu_masked_data) > _CPU_MASKED_CACHE_MAX:
+            _cpu_masked_data.popitem(last=False)
+    return prepared
+
+
 def _normalize_masked_correlation(
     corr_result: NDArray,
     frame_energy: NDArray,
@@ -322,7 +464,8 @@ def _match_template_gpu_masked(
     frame: NDArray,
     template: NDArray,
     mask: NDArray,
-    template_name: str
+    template_name: str,
+    frame_f: NDArray | None = None,
 ) -> tuple[float, tuple[int, int]]:
     """
     GPU-accelerated masked template matching with robust normalization.
@@ -330,6 +473,8 @@ def _match_template_gpu_masked(
     Identical math to CPU cv2.matchTemplate with mask:
     R(x,y) = sum(T*M*I) / sqrt(sum((T*M)^2) * sum((I*M)^2))
 
+    frame_f: optional precomputed float32 frame (from a FrameContext).
+
     Returns (score, location) where score is lower=better (0 = perfect match).
     """
     with _gpu_lock:
@@ -348,7 +493,7 @@ def _match_template_gpu_masked(
 
             # Upload frame as float32 to match masked template type
             gpu_frame_f = cv2.cuda_GpuMat()
-            gpu_frame_f.upload(frame.astype(np.float32))
+            gpu_frame_f.upload(frame_f if frame_f is not None else frame.astype(np.float32))
             gpu_objects.append(gpu_frame_f)
 
             # Step 1: Compute correlation sum(T*M*I) using TM_CCORR (non-normalized)
@@ -411,31 +556,69 @@ def _match_template_gpu_masked(
                     pass
 
 
-def _match_template_cpu_masked(
+def _masked_correlation_map(
     frame: NDArray,
     template: NDArray,
     mask: NDArray,
-) -> tuple[float, tuple[int, int]]:
+    frame_f: NDArray | None = None,
+    frame_sq: NDArray | None = None,
+    template_name: str | None = None,
+    grayscale: bool = False,
+) -> NDArray | None:
     """
-    CPU masked matching with robust normalization and flat-region gating.
+    Normalized masked correlation at every position (0..1, higher=better).
+
+    Returns None when the template/mask pair is unusable (shape mismatch or a
+    flat, zero-energy masked template). Arguments as _match_template_cpu_masked.
     """
-    prepared = _prepare_masked_template_data(template, mask)
+    if template_name is not None:
+        prepared = _get_cpu_masked_data(template_name, grayscale, template, mask)
+    else:
+        prepared = _prepare_masked_template_data(template, mask)
     if prepared is None:
-        return 1.0, (0, 0)
+        return None
 
     masked_template, mask_sq, template_energy = prepared
     if template_energy <= _MASKED_ENERGY_EPS:
-        return 1.0, (0, 0)
+        return None
 
-    frame_f = frame.astype(np.float32)
+    if frame_f is None:
+        frame_f = frame.astype(np.float32)
     corr_result = cv2.matchTemplate(frame_f, masked_template, cv2.TM_CCORR).astype(np.float64)
 
-    frame_sq = frame_f * frame_f
-    if len(frame_sq.shape) == 3:
-        frame_sq = np.sum(frame_sq, axis=2).astype(np.float32)
+    if frame_sq is None:
+        frame_sq = frame_f * frame_f
+        if len(frame_sq.shape) == 3:
+            frame_sq = np.sum(frame_sq, axis=2).astype(np.float32)
     frame_energy = cv2.matchTemplate(frame_sq, mask_sq, cv2.TM_CCORR).astype(np.float64)
 
-    normalized = _normalize_masked_correlation(corr_result, frame_energy, template_energy)
+    return _normalize_masked_correlation(corr_result, frame_energy, template_energy)
+
+
+def _match_template_cpu_masked(
+    frame: NDArray,
+    template: NDArray,
+    mask: NDArray,
+    frame_f: NDArray | None = None,
+    frame_sq: NDArray | None = None,
+    template_name: str | None = None,
+    grayscale: bool = False,
+) -> tuple[float, tuple[int, int]]:
+    """
+    CPU masked matching with robust normalization and flat-region gating.
+
+    frame_f / frame_sq: optional precomputed float32 frame and channel-summed
+    squared frame (from a FrameContext); computed here when not supplied.
+    template_name: when given, the masked-template artifacts come from the
+    CPU artifact cache instead of being rebuilt on every call.
+    """
+    normalized = _masked_correlation_map(
+        frame, template, mask, frame_f=frame_f, frame_sq=frame_sq,
+        template_name=template_name, grayscale=grayscale,
+    )
+    if normalized is None:
+        return 1.0, (0, 0)
+
     th, tw = template.shape[:2]
     _, max_val, _, max_loc = cv2.minMaxLoc(normalized)
     if not np.isfinite(max_val):
@@ -445,20 +628,154 @@ def _match_template_cpu_masked(
     return score, location
 
 
+def _get_pyramid_template(
+    template_name: str,
+    grayscale: bool,
+    scale: int,
+    template: NDArray,
+    mask: NDArray | None,
+) -> tuple[NDArray, NDArray | None]:
+    """Downscaled (template, mask) for coarse search, cached per scale."""
+    key = (template_name, grayscale, scale)
+    with _cache_lock:
+        cached = _pyramid_templates.get(key)
+        if cached is not None:
+            return cached
+    th, tw = template.shape[:2]
+    size = (max(1, tw // scale), max(1, th // scale))
+    small_t = cv2.resize(template, size, interpolation=cv2.INTER_AREA)
+    small_m = cv2.resize(mask, size, interpolation=cv2.INTER_AREA) if mask is not None else None
+    with _cache_lock:
+        return _pyramid_templates.setdefault(key, (small_t, small_m))
+
+
+def _get_native_template(
+    template_name: str,
+    grayscale: bool,
+    scale: tuple[float, float],
+    template: NDArray,
+    mask: NDArray | None,
+) -> tuple[NDArray, NDArray | None]:
+    """(template, mask) resized from 4K to a native-scale frame's `scale`
+    (INTER_AREA, like the capture's own downsampling), cached."""
+    key = (template_name, grayscale, scale)
+    with _cache_lock:
+        cached = _native_templates.get(key)
+        if cached is not None:
+            return cached
+    th, tw = template.shape[:2]
+    size = (max(1, int(round(tw * scale[0]))), max(1, int(round(th * scale[1]))))
+    small_t = cv2.resize(template, size, interpolation=cv2.INTER_AREA)
+    small_m = cv2.resize(mask, size, interpolation=cv2.INTER_AREA) if mask is not None else None
+    with _cache_lock:
+        return _native_templates.setdefault(key, (small_t, small_m))
+
+
+def _native_key(template_name: str, scale: tuple[float, float]) -> str:
+    """Cache key for artifacts (masked data, GPU uploads) of a scaled template."""
+    return f"{template_name}@{scale[0]:.4f}x{scale[1]:.4f}"
+
+
+def _pick_candidates(score_map: NDArray, count: int, radius: tuple[int, int]) -> list[tuple[int, int]]:
+    """Top `count` minima of a lower=better score map, at least `radius` apart."""
+    work = np.array(score_map, dtype=np.float32, copy=True)
+    work[~np.isfinite(work)] = np.inf
+    rx, ry = radius
+    out: list[tuple[int, int]] = []
+    for _ in range(count):
+        min_val, _, min_loc, _ = cv2.minMaxLoc(work)
+        if not np.isfinite(min_val):
+            break
+        x, y = min_loc
+        out.append((x, y))
+        work[max(0, y - ry):y + ry + 1, max(0, x - rx):x + rx + 1] = np.inf
+    return out
+
+
+def _match_template_pyramid(
+    search_area: NDArray,
+    template: NDArray,
+    mask: NDArray | None,
+    template_name: str,
+    grayscale: bool,
+    scale: int,
+    ctx: FrameContext | None = None,
+    region: tuple[int, int, int, int] | None = None,
+) -> tuple[float, tuple[int, int]] | None:
+    """
+    Coarse-to-fine search: match at 1/scale to find candidate positions, then
+    run the exact full-resolution match only in small windows around them.
+
+    Scores come from the full-resolution refinement, so they are on the same
+    scale as the exhaustive search (TM_SQDIFF_NORMED, or 1 - masked
+    correlation). Returns None when the pyramid does not apply (template too
+    small to downscale) so the caller falls back to the exhaustive search.
+    """
+    th, tw = template.shape[:2]
+    if th // scale < PYRAMID_MIN_TEMPLATE_PX or tw // scale < PYRAMID_MIN_TEMPLATE_PX:
+        return None
+
+    small_t, small_m = _get_pyramid_template(template_name, grayscale, scale, template, mask)
+    if ctx is not None:
+        small_area = ctx.downscaled(region, scale, grayscale=grayscale)
+    else:
+        sh, sw = search_area.shape[:2]
+        small_area = cv2.resize(search_area, (sw // scale, sh // scale), interpolation=cv2.INTER_AREA)
+    if small_area.shape[0] < small_t.shape[0] or small_area.shape[1] < small_t.shape[1]:
+        return None
+
+    # Coarse pass (lower=better map on either scoring scale)
+    coarse: NDArray
+    if small_m is not None:
+        corr = _masked_correlation_map(
+            small_area, small_t, small_m,
+            template_name=f"{template_name}@{scale}", grayscale=grayscale,
+        )
+        if corr is None:
+            return None
+        coarse = 1.0 - corr
+    else:
+        coarse = cv2.matchTemplate(small_area, small_t, cv2.TM_SQDIFF_NORMED)
+
+    candidates = _pick_candidates(
+        coarse, PYRAMID_CANDIDATES, (max(1, small_t.shape[1] // 2), max(1, small_t.shape[0] // 2))
+    )
+
+    # Fine pass: exact match in a window of +/- margin around each candidate
+    sh, sw = search_area.shape[:2]
+    margin = 2 * scale
+    best: tuple[float, tuple[int, int]] | None = None
+    for cx, cy in candidates:
+        x0 = max(0, cx * scale - margin)
+        y0 = max(0, cy * scale - margin)
+        x1 = min(sw - tw, cx * scale + margin)
+        y1 = min(sh - th, cy * scale + margin)
+        if x1 < x0 or y1 < y0:
+            continue
+        window = search_area[y0:y1 + th, x0:x1 + tw]
+        if mask is not None:
+            score, (lx, ly) = _match_template_cpu_masked(
+                window, template, mask, template_name=template_name, grayscale=grayscale
+            )
+        else:
+            result = cv2.matchTemplate(window, template, cv2.TM_SQDIFF_NORMED)
+            min_val, _, min_loc, _ = cv2.minMaxLoc(result)
+            if not np.isfinite(min_val):
+                continue
+            score, (lx, ly) = float(min_val), (min_loc[0] + tw // 2, min_loc[1] + th // 2)
+        if best is None or score < best[0]:
+            best = (score, (x0 + lx, y0 + ly))
+    return best
+
+
 def _load_mask(template_name: str) -> NDArray | None:
     """Load mask for template if it exists, with caching. Thread-safe."""
-    with _cache_lock:
-        if template_name not in _masks:
-            mask_name = _get_mask_name(template_name)
-            path = TEMPLATE_DIR / mask_name
-            if path.exists():
-                img = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
-                _masks[template_name] = img if img is not None else None
-                _mask_exists[template_name] = True
-            else:
-                _masks[template_name] = None
-                _mask_exists[template_name] = False
-        return _masks[template_name]
+    return _registry.get(_get_mask_name(template_name), "gray")
+
+
+def get_mask(template_name: str | Path) -> NDArray | None:
+    """Cached mask (grayscale) for a template, or None if it has none."""
+    return _load_mask(_template_key(template_name))
 
 
 def has_mask(template_name: str) -> bool:
@@ -471,9 +788,7 @@ def has_mask(template_name: str) -> bool:
     Returns:
         True if mask file exists, False otherwise
     """
-    if template_name not in _mask_exists:
-        _load_mask(template_name)  # This populates _mask_exists
-    return _mask_exists.get(template_name, False)
+    return _registry.exists(_get_mask_name(template_name))
 
 
 def get_mask_path(template_name: str) -> Path:
@@ -491,11 +806,12 @@ def get_mask_path(template_name: str) -> Path:
 
 
 def match_template(
-    frame: NDArray,
+    frame: NDArray | FrameContext,
     template_name: str,
     search_region: tuple[int, int, int, int] | None = None,
     threshold: float | None = None,
-    grayscale: bool = False
+    grayscale: bool = False,
+    pyramid: int | None = None,
 ) -> tuple[bool, float, tuple[int, int] | None]:
     """
     Match template in frame with automatic mask detection.
@@ -506,11 +822,22 @@ def match_template(
     it will be used automatically with robust masked normalization (score converted to lower=better).
 
     Args:
-        frame: BGR image
+        frame: BGR image, or a FrameContext wrapping one - derived planes
+            (grayscale, float32, squared energy) are then computed once per
+            frame and shared across every match against it
         template_name: Name of template file (e.g., "search_button_4k.png")
         search_region: Optional (x, y, w, h) to limit search area
         threshold: Override default threshold (max allowed score, lower=better)
         grayscale: Use grayscale matching instead of color (default False)
+        pyramid: Coarse-to-fine search at 1/pyramid scale (2 or 4) for large
+            search areas; 1 forces exhaustive search; None uses the template's
+            default (config PYRAMID_TEMPLATES / set_pyramid_scale). Scores stay
+            on the exhaustive scale - only the candidate search is coarse.
+            Ignored at native scale (the frame is already ~1/2 per axis).
+
+    A native-scale FrameContext (FrameContext.for_frame on a frame at capture
+    resolution) matches a downscaled template in the scaled search region;
+    search_region and the returned location stay in 4K coordinates.
 
     Returns:
         (found: bool, score: float, location: tuple or None)
@@ -524,33 +851,65 @@ def match_template(
 
     mask = _load_mask(template_name)
 
-    # Convert frame if needed
-    if grayscale:
-        if len(frame.shape) == 3:
-            search_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            search_frame = frame
-    else:
-        search_frame = frame
-
-    # Extract search region
+    ctx = frame if isinstance(frame, FrameContext) else None
+    native = ctx is not None and ctx.native
+    region: tuple[int, int, int, int] | None = None
     if search_region:
-        x, y, w, h = search_region
-        search_area = search_frame[y:y+h, x:x+w]
-        offset = (x, y)
+        rx, ry, rw, rh = search_region
+        region = (rx, ry, rw, rh)  # normalized to a hashable FrameContext key
+        if ctx is not None and native:
+            region = scale_region(region, ctx.scale)
+
+    if ctx is not None:
+        search_area = ctx.region(region, grayscale=grayscale)
+        offset = (region[0], region[1]) if region else (0, 0)
     else:
-        search_area = search_frame
-        offset = (0, 0)
+        # Convert frame if needed
+        search_frame = frame_array(frame)
+        if grayscale and len(search_frame.shape) == 3:
+            search_frame = cv2.cvtColor(search_frame, cv2.COLOR_BGR2GRAY)
+
+        # Extract search region
+        if search_region:
+            x, y, w, h = search_region
+            search_area = search_frame[y:y+h, x:x+w]
+            offset = (x, y)
+        else:
+            search_area = search_frame
+            offset = (0, 0)
 
     th, tw = template.shape[:2]
     if mask is not None and mask.shape[:2] != (th, tw):
         # Defensive fallback: malformed mask dimensions should not crash matching.
         mask = None
 
+    if ctx is not None and native:
+        template, mask = _get_native_template(template_name, grayscale, ctx.scale, template, mask)
+        template_name = _native_key(template_name, ctx.scale)
+        th, tw = template.shape[:2]
+
     # Check if search area is large enough
     if search_area.shape[0] < th or search_area.shape[1] < tw:
         return False, 1.0, None
 
+    if native:
+        scale = 1
+    else:
+        scale = pyramid if pyramid is not None else _get_pyramid_scales().get(template_name, 1)
+    if (scale in PYRAMID_SCALES
+            and search_area.shape[0] * search_area.shape[1] >= PYRAMID_MIN_AREA_RATIO * th * tw):
+        pyr = _match_template_pyramid(
+            search_area, template, mask, template_name, grayscale, scale, ctx=ctx, region=region
+        )
+        if pyr is not None:
+            score, rel_location = pyr
+            if not np.isfinite(score):
+                return False, 1.0, None
+            location = (offset[0] + rel_location[0], offset[1] + rel_location[1])
+            default = DEFAULT_MASKED_THRESHOLD if mask is not None else DEFAULT_THRESHOLD
+            thresh = threshold if threshold is not None else default
+            return score <= thresh, score, location
+
     use_gpu = _is_gpu_enabled()
 
     if mask is not None:
@@ -561,16 +920,30 @@ def match_template(
         if use_gpu_masked:
             # GPU masked matching with proper normalization
             score, rel_location = _match_template_gpu_masked(
-                search_area, template, mask, template_name
+                search_area, template, mask, template_name,
+                frame_f=ctx.float32(region, grayscale=grayscale) if ctx is not None else None,
             )
             location = (offset[0] + rel_location[0], offset[1] + rel_location[1])
         else:
             # CPU masked matching with robust energy-gated normalization
-            score, rel_location = _match_template_cpu_masked(search_area, template, mask)
+            if ctx is not None:
+                score, rel_location = _match_template_cpu_masked(
+                    search_area, template, mask,
+                    frame_f=ctx.float32(region, grayscale=grayscale),
+                    frame_sq=ctx.energy(region, grayscale=grayscale),
+                    template_name=template_name, grayscale=grayscale,
+                )
+            else:
+                score, rel_location = _match_template_cpu_masked(
+                    search_area, template, mask,
+                    template_name=template_name, grayscale=grayscale,
+                )
             location = (offset[0] + rel_location[0], offset[1] + rel_location[1])
 
         thresh = threshold if threshold is not None else DEFAULT_MASKED_THRESHOLD
         found = score <= thresh
+        if ctx is not None and native:
+            location = to_4k(location, ctx.scale)
         return found, score, location
     else:
         # Non-masked matching - use GPU only for small regions (GPU contention with BlueStacks)
@@ -597,13 +970,330 @@ def match_template(
         if not np.isfinite(score):
             return False, 1.0, None
         found = score <= thresh
+        if ctx is not None and native:
+            location = to_4k(location, ctx.scale)
         return found, score, location
 
 
+class MatchRequest(NamedTuple):
+    """One entry of a match_templates() batch (same meaning as match_template args)."""
+    template_name: str
+    search_region: tuple[int, int, int, int] | None = None
+    threshold: float | None = None
+    grayscale: bool = False
+    pyramid: int | None = None
+
+
+def region_groups(requests: Sequence[MatchRequest]) -> list[list[int]]:
+    """
+    Indices of `requests` grouped by overlapping search region (the groups
+    whose crops match_templates shares), in order of each group's first
+    member. Full-frame requests are each their own group.
+
+    Each group can be matched as its own match_templates call - e.g. on its
+    own worker thread - without losing any shared conversion.
+    """
+    boxes = _group_regions([r.search_region or None for r in requests])
+    groups: dict[Any, list[int]] = {}
+    for i, box in enumerate(boxes):
+        groups.setdefault(box if box is not None else ("full", i), []).append(i)
+    return list(groups.values())
+
+
+def _group_regions(
+    regions: list[tuple[int, int, int, int] | None],
+) -> list[tuple[int, int, int, int] | None]:
+    """
+    Map each region to the bounding box of its group of overlapping regions.
+
+    Two regions are merged only when they overlap and their bounding box is no
+    larger than their combined area, so a group never converts much more than
+    its members would have converted individually. None (full frame) stays None.
+    """
+    boxes: list[list[int]] = []   # [x0, y0, x1, y1] per group
+    owner: list[int | None] = []
+    for region in regions:
+        if region is None:
+            owner.append(None)
+            continue
+        x, y, w, h = region
+        box = [x, y, x + w, y + h]
+        merged = True
+        while merged:
+            merged = False
+            for i, g in enumerate(boxes):
+                if g[0] >= g[2]:
+                    continue  # absorbed group
+                if box[0] < g[2] and g[0] < box[2] and box[1] < g[3] and g[1] < box[3]:
+                    ux0, uy0 = min(box[0], g[0]), min(box[1], g[1])
+                    ux1, uy1 = max(box[2], g[2]), max(box[3], g[3])
+                    area_union = (ux1 - ux0) * (uy1 - uy0)
+                    area_sum = (box[2] - box[0]) * (box[3] - box[1]) + (g[2] - g[0]) * (g[3] - g[1])
+                    if area_union <= area_sum:
+                        box = [ux0, uy0, ux1, uy1]
+                        g[0] = g[2]  # mark absorbed; members re-pointed below
+                        owner[:] = [len(boxes) if o == i else o for o in owner]
+                        merged = True
+        owner.append(len(boxes))
+        boxes.append(box)
+
+    out: list[tuple[int, int, int, int] | None] = []
+    for o in owner:
+        if o is None:
+            out.append(None)
+        else:
+            x0, y0, x1, y1 = boxes[o]
+            out.append((x0, y0, x1 - x0, y1 - y0))
+    return out
+
+
+def match_templates(
+    frame: NDArray | FrameContext,
+    requests: Sequence[MatchRequest | tuple[Any, ...]],
+    stop_on_found: bool = False,
+) -> list[MatchResult]:
+    """
+    Match many templates against one frame in a single call.
+
+    Requests are grouped by overlapping search region; each group's crop is
+    converted (grayscale / float32 / squared energy, as its members need) once
+    on the group's bounding box, and every member matches against slices of
+    those shared planes. Scores are identical to calling match_template() per
+    request.
+
+    Args:
+        frame: BGR image or FrameContext (pass the tick's context to also share
+            planes with other callers on the same frame)
+        requests: MatchRequest entries, or plain tuples in the same field order
+            (template_name, search_region, threshold, grayscale, pyramid)
+        stop_on_found: Evaluate in order and stop after the first found match;
+            the returned list then ends at that entry
+
+    Returns:
+        List of (found, score, location) in request order.
+    """
+    reqs = [r if isinstance(r, MatchRequest) else MatchRequest(*r) for r in requests]
+    ctx = frame if isinstance(frame, FrameContext) else FrameContext(frame)
+
+    regions: list[tuple[int, int, int, int] | None] = []
+    for r in reqs:
+        if r.search_region:
+            x, y, w, h = r.search_region
+            regions.append((x, y, w, h))
+        else:
+            regions.append(None)
+
+    # Which derived plane each request needs: grayscale crops for grayscale
+    # matching, float32 + squared energy for masked matching. Group per kind
+    # so e.g. an unmasked neighbour never inflates a masked group's box.
+    kinds: list[list[str]] = []
+    for r in reqs:
+        k = []
+        if r.grayscale:
+            k.append("gray")
+        if has_mask(r.template_name):
+            k.append("energy_gray" if r.grayscale else "energy")
+        kinds.append(k)
+
+    warm: list[list[tuple[str, tuple[int, int, int, int]]]] = [[] for _ in reqs]
+    for kind in ("gray", "energy", "energy_gray"):
+        idx = [i for i, k in enumerate(kinds) if kind in k and regions[i] is not None]
+        if len(idx) < 2:
+            continue
+        for i, group in zip(idx, _group_regions([regions[i] for i in idx])):
+            if group is not None and group != regions[i]:
+                warm[i].append((kind, group))
+
+    results: list[MatchResult] = []
+    for req, region, to_warm in zip(reqs, regions, warm):
+        # Derive the group's planes (once - FrameContext memoizes) so this
+        # member and later ones slice them instead of converting their own crop.
+        for kind, group in to_warm:
+            if ctx.native:
+                group = scale_region(group, ctx.scale)
+            if kind == "gray":
+                ctx.gray(group)
+            else:
+                ctx.energy(group, grayscale=(kind == "energy_gray"))  # also derives float32
+        result = match_template(
+            ctx, req.template_name, search_region=region,
+            threshold=req.threshold, grayscale=req.grayscale, pyramid=req.pyramid,
+        )
+        results.append(result)
+        if stop_on_found and result[0]:
+            break
+    return results
+
+
+def _suppress_peaks(
+    scores: NDArray,
+    threshold: float,
+    min_distance: tuple[int, int],
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    Local minima of a lower=better score map that pass `threshold`, at least
+    `min_distance` = (dx, dy) apart (a peak suppresses others with |x| < dx
+    AND |y| < dy). Returns (xs, ys, scores) sorted best-first.
+
+    Peak extraction is erode-and-compare (a pixel survives only if it is the
+    minimum of its (2dx-1, 2dy-1) neighbourhood), so the Python-level work is
+    proportional to the number of PEAKS, not the number of pixels under
+    threshold. The only loop left resolves exact ties on flat plateaus.
+    """
+    dx, dy = max(1, min_distance[0]), max(1, min_distance[1])
+    candidates = scores <= threshold
+    if not candidates.any():
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    kh = min(2 * dy - 1, 2 * scores.shape[0] - 1)
+    kw = min(2 * dx - 1, 2 * scores.shape[1] - 1)
+    local_min = cv2.erode(scores, np.ones((kh, kw), np.uint8))
+    ys, xs = np.nonzero(candidates & (scores <= local_min))
+    vals = scores[ys, xs]
+
+    order = np.lexsort((xs, ys, vals))   # best score first, then top-left
+    xs, ys, vals = xs[order], ys[order], vals[order]
+    keep = np.ones(len(xs), dtype=bool)
+    for i in range(len(xs)):
+        if keep[i]:
+            near = (np.abs(xs[i + 1:] - xs[i]) < dx) & (np.abs(ys[i + 1:] - ys[i]) < dy)
+            keep[i + 1:] &= ~near
+    return xs[keep], ys[keep], vals[keep]
+
+
+def find_all_templates(
+    frame: NDArray | FrameContext,
+    template: str | NDArray,
+    search_region: tuple[int, int, int, int] | None = None,
+    threshold: float | None = None,
+    min_distance: int | tuple[int, int] = 10,
+    max_results: int | None = None,
+    grayscale: bool = False,
+    sort_by: str = "score",
+) -> list[tuple[int, int, float]]:
+    """
+    Find EVERY occurrence of a template (lists of buttons, rows, slots).
+
+    Same scoring as match_template (SQDIFF_NORMED, or 1 - masked correlation
+    when the template has a mask), then vectorised peak extraction with
+    non-maximum suppression instead of a Python loop over every pixel under
+    threshold.
+
+    Args:
+        frame: BGR image (or grayscale when grayscale=True), or a FrameContext
+        template: Template filename (mask auto-detected) or a template array
+            (matched unmasked, as loaded - e.g. a grayscale template against a
+            grayscale frame)
+        search_region: Optional (x, y, w, h) to search within
+        threshold: Max score to accept (default: DEFAULT_THRESHOLD or
+            DEFAULT_MASKED_THRESHOLD)
+        min_distance: Minimum spacing between results, in pixels; an int or
+            (dx, dy). Two hits are duplicates when |x| < dx AND |y| < dy, so
+            (region_width, dy) de-duplicates by row only.
+        max_results: Keep only the best N (None = all)
+        grayscale: Match in grayscale (template names only)
+        sort_by: "score" (best first), "y" (top to bottom) or "x" (left to right)
+
+    Returns:
+        List of (center_x, center_y, score) in frame coordinates
+    """
+    if frame is None or frame.size == 0:
+        return []
+    ctx = frame if isinstance(frame, FrameContext) else FrameContext(frame)
+
+    mask = None
+    template_name = None
+    if isinstance(template, str):
+        template_name = template
+        tmpl = _load_template(template, grayscale=grayscale)
+        if tmpl is None:
+            return []
+        mask = _load_mask(template)
+        if mask is not None and mask.shape[:2] != tmpl.shape[:2]:
+            mask = None
+    else:
+        tmpl = template
+
+    if isinstance(min_distance, int):
+        min_distance = (min_distance, min_distance)
+    if ctx.native:
+        # Scaled template/region/spacing; hits are mapped back to 4K below.
+        sx, sy = ctx.scale
+        if template_name is not None:
+            tmpl, mask = _get_native_template(template_name, grayscale, ctx.scale, tmpl, mask)
+            template_name = _native_key(template_name, ctx.scale)
+        else:
+            th, tw = tmpl.shape[:2]
+            tmpl = cv2.resize(tmpl, (max(1, int(round(tw * sx))), max(1, int(round(th * sy)))),
+                              interpolation=cv2.INTER_AREA)
+        min_distance = (max(1, int(round(min_distance[0] * sx))), max(1, int(round(min_distance[1] * sy))))
+
+    offset = (0, 0)
+    region = None
+    if search_region is not None:
+        x, y, w, h = (int(v) for v in search_region)
+        x, y = max(0, x), max(0, y)
+        region = (x, y, w, h)
+        if ctx.native:
+            region = scale_region(region, ctx.scale)
+        offset = (region[0], region[1])
+    search_area = ctx.region(region, grayscale=grayscale)
+    th, tw = tmpl.shape[:2]
+    if search_area.shape[0] < th or search_area.shape[1] < tw:
+        return []
+
+    scores: NDArray
+    if mask is not None:
+        corr = _masked_correlation_map(
+            search_area, tmpl, mask,
+            frame_f=ctx.float32(region, grayscale=grayscale),
+            frame_sq=ctx.energy(region, grayscale=grayscale),
+            template_name=template_name, grayscale=grayscale,
+        )
+        if corr is None:
+            return []
+        scores = (1.0 - corr).astype(np.float32)
+        default = DEFAULT_MASKED_THRESHOLD
+    else:
+        scores = cv2.matchTemplate(search_area, tmpl, cv2.TM_SQDIFF_NORMED)
+        default = DEFAULT_THRESHOLD
+    scores[~np.isfinite(scores)] = 1.0
+    thresh = threshold if threshold is not None else default
+
+    xs, ys, vals = _suppress_peaks(scores, thresh, min_distance)
+    if max_results is not None:
+        xs, ys, vals = xs[:max_results], ys[:max_results], vals[:max_results]
+
+    hits = [
+        (int(x) + offset[0] + tw // 2, int(y) + offset[1] + th // 2, float(v))
+        for x, y, v in zip(xs, ys, vals)
+    ]
+    if ctx.native:
+        hits = [(*to_4k((x, y), ctx.scale), v) for x, y, v in hits]
+    if sort_by == "y":
+        hits.sort(key=lambda h: (h[1], h[0]))
+    elif sort_by == "x":
+        hits.sort(key=lambda h: (h[0], h[1]))
+    return hits
+
+
 def clear_cache() -> None:
     """Clear template and mask caches. Useful for testing or reloading."""
-    _templates_color.clear()
-    _templates_gray.clear()
-    _masks.clear()
-    _mask_exists.clear()
+    _registry.clear()
+    _clear_derived()
+
+
+def _clear_derived(_name: str | None = None) -> None:
+    """Drop artifacts derived from template images (masked data, pyramid
+    levels, GPU uploads). Reload listener: a template or mask changed on
+    disk. Reloads are rare, so everything is dropped rather than tracking
+    which artifacts depend on which mask file."""
+    with _cache_lock:
+        _cpu_masked_data.clear()
+        _pyramid_templates.clear()
+        _native_templates.clear()
     clear_gpu_cache()
+
+
+_registry.add_reload_listener(_clear_derived)
@@ -0,0 +1,182 @@
+"""
+Precompiled template pack - every template decoded once at build time.
+
+Cold start used to decode hundreds of 4K PNGs from templates/ground_truth
+one at a time. The pack stores all of them, already decoded, in a single
+uncompressed blob that is memory-mapped at import; the TemplateRegistry then
+hands out zero-copy (read-only) views into it and only falls back to the PNG
+when a template is missing from the pack or stale.
+
+Layout (templates/pack/):
+- templates.npy: one flat uint8 .npy array (np.load(mmap_mode="r")-able);
+  every image starts on a 64-byte boundary
+- index.json: {"version", "files": {name: {"size", "mtime_ns", "sha1"}},
+  "arrays": {name: {variant: {"offset", "shape", "dtype"}}}}
+  with variants "color" (IMREAD_COLOR) and "gray" (IMREAD_GRAYSCALE)
+
+Staleness is per file, checked by content hash: a file whose size and
+mtime still match the index is trusted; otherwise its SHA-1 is compared
+(so a git checkout that only touches mtimes keeps the pack valid) and a
+changed file is served from its PNG until the pack is rebuilt.
+
+Build (with the daemon stopped - Windows cannot replace a mapped file):
+    python scripts/build_template_pack.py
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+NDArray = npt.NDArray[Any]
+
+logger = logging.getLogger(__name__)
+
+PACK_VERSION = 1
+DEFAULT_PACK_DIR = Path(__file__).parent.parent / "templates" / "pack"
+BLOB_NAME = "templates.npy"
+INDEX_NAME = "index.json"
+_ALIGN = 64
+_READ_FLAGS = {"color": cv2.IMREAD_COLOR, "gray": cv2.IMREAD_GRAYSCALE}
+
+
+def _sha1(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def build_pack(template_dir: Path, pack_dir: Path = DEFAULT_PACK_DIR) -> dict[str, Any]:
+    """
+    Decode every PNG under `template_dir` (recursively) in both variants and
+    write the pack to `pack_dir`. Returns a summary dict.
+    """
+    template_dir = Path(template_dir)
+    pack_dir = Path(pack_dir)
+    pack_dir.mkdir(parents=True, exist_ok=True)
+
+    files: dict[str, dict[str, Any]] = {}
+    arrays: dict[str, dict[str, dict[str, Any]]] = {}
+    chunks: list[NDArray] = []
+    offset = 0
+    for path in sorted(template_dir.rglob("*.png")):
+        name = path.relative_to(template_dir).as_posix()
+        st = path.stat()
+        entry: dict[str, dict[str, Any]] = {}
+        for variant, flag in _READ_FLAGS.items():
+            img = cv2.imread(str(path), flag)
+            if img is None:
+                continue
+            img = np.ascontiguousarray(img)
+            pad = (-offset) % _ALIGN
+            if pad:
+                chunks.append(np.zeros(pad, np.uint8))
+                offset += pad
+            entry[variant] = {"offset": offset, "shape": list(img.shape), "dtype": img.dtype.str}
+            chunks.append(img.reshape(-1).view(np.uint8))
+            offset += img.nbytes
+        if entry:
+            arrays[name] = entry
+            files[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": _sha1(path)}
+
+    blob = np.concatenate(chunks) if chunks else np.zeros(0, np.uint8)
+    # Write-then-rename so a crashed build never leaves a torn pack behind
+    tmp_blob = pack_dir / (BLOB_NAME + ".tmp")
+    tmp_index = pack_dir / (INDEX_NAME + ".tmp")
+    with open(tmp_blob, "wb") as f:
+        np.save(f, blob)
+    tmp_index.write_text(json.dumps({"version": PACK_VERSION, "files": files, "arrays": arrays}))
+    os.replace(tmp_blob, pack_dir / BLOB_NAME)
+    os.replace(tmp_index, pack_dir / INDEX_NAME)
+    return {"files": len(files), "arrays": sum(len(v) for v in arrays.values()), "bytes": int(blob.nbytes)}
+
+
+class TemplatePack:
+    """A memory-mapped pack: lookup() returns zero-copy views for fresh files."""
+
+    def __init__(self, blob: NDArray, index: dict[str, Any]) -> None:
+        self._blob = blob
+        self._files: dict[str, dict[str, Any]] = index["files"]
+        self._arrays: dict[str, dict[str, dict[str, Any]]] = index["arrays"]
+        self._lock = threading.Lock()
+        self._verified: dict[str, tuple[int, int]] = {}   # name -> (size, mtime_ns) known fresh
+        self._stale: set[str] = set()
+        self.hits = 0
+
+    @classmethod
+    def open(cls, pack_dir: Path = DEFAULT_PACK_DIR) -> TemplatePack | None:
+        """Map the pack in `pack_dir`, or None if absent/unreadable."""
+        blob_path = Path(pack_dir) / BLOB_NAME
+        index_path = Path(pack_dir) / INDEX_NAME
+        if not blob_path.exists() or not index_path.exists():
+            return None
+        try:
+            index = json.loads(index_path.read_text())
+            if index.get("version") != PACK_VERSION:
+                logger.warning(f"Template pack {pack_dir} has version {index.get('version')}, "
+                               f"expected {PACK_VERSION} - ignoring (rebuild it)")
+                return None
+            blob = np.load(blob_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Template pack {pack_dir} unreadable, using PNGs: {e}")
+            return None
+        return cls(blob, index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._arrays
+
+    def lookup(self, name: str, variant: str, path: Path) -> NDArray | None:
+        """Read-only view of `name`/`variant`, or None when the pack does not
+        have it or the file at `path` no longer matches the packed content."""
+        spec = self._arrays.get(name, {}).get(variant)
+        if spec is None or not self._is_fresh(name, path):
+            return None
+        n = int(np.prod(spec["shape"])) * np.dtype(spec["dtype"]).itemsize
+        raw = self._blob[spec["offset"]:spec["offset"] + n]
+        with self._lock:
+            self.hits += 1
+        image: NDArray = np.asarray(raw).view(np.dtype(spec["dtype"])).reshape(spec["shape"])
+        return image
+
+    def _is_fresh(self, name: str, path: Path) -> bool:
+        try:
+            st = path.stat()
+            stamp = (int(st.st_size), int(st.st_mtime_ns))
+        except (OSError, AttributeError, TypeError, ValueError):
+            return False
+        meta = self._files[name]
+        with self._lock:
+            if self._verified.get(name) == stamp:
+                return True
+        if stamp[0] != meta["size"]:
+            fresh = False
+        elif stamp[1] == meta["mtime_ns"]:
+            fresh = True
+        else:
+            try:
+                fresh = _sha1(path) == meta["sha1"]
+            except OSError:
+                fresh = False
+        with self._lock:
+            if fresh:
+                self._verified[name] = stamp
+                self._stale.discard(name)
+            elif name not in self._stale:
+                self._stale.add(name)
+                logger.info(f"Template pack: {name} changed since the pack was built - using the PNG")
+        return fresh
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "mapped_bytes": int(self._blob.nbytes),
+                "hits": self.hits,
+                "stale": sorted(self._stale),
+            }
@@ -0,0 +1,197 @@
+"""
+TemplateRegistry - every template/mask image is read from disk once.
+
+Helpers and flows used to call cv2.imread() for their templates directly,
+some on every invocation (arms race headers, team-up buttons, the go
+button...). The registry is the single owner of decoded template arrays:
+
+- one entry per (file, variant): "color" (BGR uint8), "gray" (uint8) and the
+  float32 copies "f32" / "f32_gray" derived from them without touching disk
+- hot reload: an entry's file mtime is re-checked at most every
+  `check_interval` seconds; an edited template is re-read and reload
+  listeners (template_matcher's derived-artifact caches) are notified
+- stats(): entry count and bytes per variant, plus disk read / reload
+  counters - steady-state operation should show disk_reads flat
+- optional TemplatePack (utils/template_pack.py): base variants of files in
+  a fresh precompiled pack are zero-copy views into its memory map instead
+  of PNG decodes (read-only, like every registry array should be treated)
+
+Missing files are cached too (as None), so probing optional templates is
+free after the first call. Returned arrays are shared: callers must not
+modify them in place.
+
+The process-wide instance lives in utils/template_matcher.py:
+
+    from utils.template_matcher import get_template, get_template_registry
+
+    tmpl = get_template("go_button_4k.png", grayscale=True)
+    print(get_template_registry().stats())
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from utils.template_pack import TemplatePack
+
+NDArray = npt.NDArray[Any]
+
+# variant -> (base variant it is derived from, imread flag for base variants)
+_VARIANTS: dict[str, tuple[str | None, int]] = {
+    "color": (None, cv2.IMREAD_COLOR),
+    "gray": (None, cv2.IMREAD_GRAYSCALE),
+    "f32": ("color", 0),
+    "f32_gray": ("gray", 0),
+}
+
+
+@dataclass
+class _Entry:
+    image: NDArray | None
+    exists: bool
+    mtime: float | None
+    checked: float
+    mapped: bool = False   # view into the template pack, not a decoded copy
+
+
+class TemplateRegistry:
+    """Thread-safe cache of decoded template images keyed by (name, variant)."""
+
+    def __init__(
+        self,
+        path_fn: Callable[[str], Path],
+        read_fn: Callable[[Path, int], NDArray | None] | None = None,
+        check_interval: float = 2.0,
+        pack: TemplatePack | None = None,
+    ) -> None:
+        """
+        Args:
+            path_fn: Template name -> file path (looked up on every load, so a
+                late-bound directory can be redirected, e.g. in tests)
+            read_fn: (path, imread flag) -> image; default cv2.imread
+            check_interval: Seconds between mtime checks per entry
+                (0 = every access, None/negative = never - no hot reload)
+            pack: Precompiled pack to serve fresh files from (None = PNGs only)
+        """
+        self._path_fn = path_fn
+        self._read_fn = read_fn or (lambda p, flag: cv2.imread(str(p), flag))
+        self.check_interval = check_interval
+        self.pack = pack
+        self._lock = threading.RLock()
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._listeners: list[Callable[[str], None]] = []
+        self.disk_reads = 0
+        self.reloads = 0
+
+    def get(self, name: str, variant: str = "color") -> NDArray | None:
+        """The decoded image for `name` ("color", "gray", "f32", "f32_gray"),
+        or None if the file is missing or unreadable."""
+        base, flag = _VARIANTS[variant]
+        with self._lock:
+            entry = self._entries.get((name, variant))
+            if entry is not None and not self._stale(name, variant, entry):
+                return entry.image
+
+            if base is not None:
+                src = self.get(name, base)
+                image: NDArray | None = src.astype(np.float32) if src is not None else None
+                src_entry = self._entries[(name, base)]
+                self._entries[(name, variant)] = _Entry(image, src_entry.exists, src_entry.mtime, src_entry.checked)
+                return image
+
+            path = self._path_fn(name)
+            if self.pack is not None and name in self.pack:
+                image = self.pack.lookup(name, variant, path)
+                if image is not None:
+                    self._entries[(name, variant)] = _Entry(image, True, _mtime(path), time.monotonic(), mapped=True)
+                    return image
+            exists = bool(path.exists())
+            image = None
+            if exists:
+                image = self._read_fn(path, flag)
+                self.disk_reads += 1
+            self._entries[(name, variant)] = _Entry(image, exists, _mtime(path) if exists else None, time.monotonic())
+            return image
+
+    def exists(self, name: str) -> bool:
+        """Whether the template file exists (cached like the image itself)."""
+        with self._lock:
+            for variant in ("color", "gray"):
+                entry = self._entries.get((name, variant))
+                if entry is not None and not self._stale(name, variant, entry):
+                    return entry.exists
+            self.get(name, "gray")
+            return self._entries[(name, "gray")].exists
+
+    def add_reload_listener(self, fn: Callable[[str], None]) -> None:
+        """Call fn(name) whenever a cached template changes on disk."""
+        with self._lock:
+            self._listeners.append(fn)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Entries and bytes per variant plus disk read / reload counters."""
+        with self._lock:
+            by_variant: dict[str, dict[str, int]] = {}
+            total = 0
+            mapped = 0
+            for (_, variant), entry in self._entries.items():
+                v = by_variant.setdefault(variant, {"entries": 0, "bytes": 0})
+                v["entries"] += 1
+                if entry.image is not None:
+                    v["bytes"] += int(entry.image.nbytes)
+                    total += int(entry.image.nbytes)
+                    if entry.mapped:
+                        mapped += int(entry.image.nbytes)
+            stats: dict[str, Any] = {
+                "entries": len(self._entries),
+                "bytes": total,
+                "mapped_bytes": mapped,     # part of `bytes` backed by the pack's mmap
+                "variants": by_variant,
+                "disk_reads": self.disk_reads,
+                "reloads": self.reloads,
+            }
+            if self.pack is not None:
+                stats["pack"] = self.pack.stats()
+            return stats
+
+    def _stale(self, name: str, variant: str, entry: _Entry) -> bool:
+        """Re-stat the file if the check interval elapsed; on change, drop
+        every variant of `name` and notify listeners. Caller holds the lock."""
+        if self.check_interval is None or self.check_interval < 0:
+            return False
+        now = time.monotonic()
+        if now - entry.checked < self.check_interval:
+            return False
+        entry.checked = now
+        path = self._path_fn(name)
+        exists = bool(path.exists())
+        mtime = _mtime(path) if exists else None
+        if exists == entry.exists and mtime == entry.mtime:
+            return False
+
+        for key in [k for k in self._entries if k[0] == name]:
+            del self._entries[key]
+        self.reloads += 1
+        for fn in list(self._listeners):
+            fn(name)
+        return True
+
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except (OSError, AttributeError):
+        return None
@@ -12,12 +12,13 @@ Flow:
 from __future__ import annotations
 
 import time
-from pathlib import Path
 from typing import TYPE_CHECKING
 
 import cv2
 import numpy as np
 
+from utils.template_matcher import get_template
+
 if TYPE_CHECKING:
     import numpy.typing as npt
     from typing import Any
@@ -232,17 +233,12 @@ def find_slider_circle(frame: npt.NDArray[Any], debug: bool = False) -> int:
         X coordinate of slider handle center, or -1 if not found
     """
     # Load slider circle template
-    template_path = Path(__file__).parent.parent / "templates" / "ground_truth" / "slider_circle_4k.png"
-
     fallback = (SLIDER_LEFT_X + SLIDER_RIGHT_X) // 2
 
-    if not template_path.exists():
-        if debug:
-            print(f"  Slider template not found: {template_path}")
-        return fallback
-
-    template: npt.NDArray[Any] | None = cv2.imread(str(template_path))
+    template = get_template("slider_circle_4k.png")
     if template is None:
+        if debug:
+            print("  Slider template not found: slider_circle_4k.png")
         return fallback
 
     # Search in horizontal band around slider Y
@@ -27,7 +27,8 @@ from typing import TYPE_CHECKING, Any
 import numpy as np
 import numpy.typing as npt
 
-from utils.template_matcher import match_template
+from utils.frame_context import FrameContext
+from utils.template_matcher import MatchRequest, match_templates
 
 if TYPE_CHECKING:
     from utils.adb_helper import ADBHelper
@@ -59,6 +60,13 @@ WEBVIEW_CLOSE_Y = 10
 WEBVIEW_CLOSE_W = 150
 WEBVIEW_CLOSE_H = 120
 
+# Every region detect_view() reads: if none changed, neither did the view
+VIEW_REGIONS = (
+    (BUTTON_X, BUTTON_Y, BUTTON_W, BUTTON_H),
+    (CHAT_HEADER_X, CHAT_HEADER_Y, CHAT_HEADER_W, CHAT_HEADER_H),
+    (WEBVIEW_CLOSE_X, WEBVIEW_CLOSE_Y, WEBVIEW_CLOSE_W, WEBVIEW_CLOSE_H),
+)
+
 # Import from centralized config
 from config import BACK_BUTTON_CLICK, TOGGLE_BUTTON_CLICK
 from utils.ui_helpers import click_back
@@ -67,64 +75,42 @@ THRESHOLD = 0.05  # For TM_SQDIFF_NORMED (lower = better match)
 CHAT_THRESHOLD = 0.05  # For chat header detection
 
 
-def detect_view(frame: npt.NDArray[Any], debug: bool = False) -> tuple[ViewState, float]:
+def detect_view(frame: npt.NDArray[Any] | FrameContext, debug: bool = False) -> tuple[ViewState, float]:
     """
     Detect view state by comparing corner to templates.
 
+    Accepts a FrameContext so the detector tick shares derived planes with
+    the specs it runs afterwards.
+
     Returns (ViewState, best_score)
     """
 
-    # Templates to check for main view
-    templates = [
-        ("world_button_4k.png", ViewState.TOWN),
-        ("world_button_ice_4k.png", ViewState.TOWN),  # Winter/ice theme
-        ("town_button_4k.png", ViewState.WORLD),
-        ("town_button_zoomed_out_4k.png", ViewState.WORLD),
-        ("town_button_ice_4k.png", ViewState.WORLD),  # Winter/ice theme
+    button_region = (BUTTON_X, BUTTON_Y, BUTTON_W, BUTTON_H)
+    checks = [
+        # Main view: the toggle button shows the OTHER view's name
+        (MatchRequest("world_button_4k.png", button_region, THRESHOLD), ViewState.TOWN),
+        (MatchRequest("world_button_ice_4k.png", button_region, THRESHOLD), ViewState.TOWN),  # Winter/ice theme
+        (MatchRequest("town_button_4k.png", button_region, THRESHOLD), ViewState.WORLD),
+        (MatchRequest("town_button_zoomed_out_4k.png", button_region, THRESHOLD), ViewState.WORLD),
+        (MatchRequest("town_button_ice_4k.png", button_region, THRESHOLD), ViewState.WORLD),  # Winter/ice theme
+        # CHAT state uses the Chat header template (NOT back button!)
+        (MatchRequest("chat_header_4k.png",
+                      (CHAT_HEADER_X, CHAT_HEADER_Y, CHAT_HEADER_W, CHAT_HEADER_H),
+                      CHAT_THRESHOLD), ViewState.CHAT),
+        # WEBVIEW state (community page or other in-game browser)
+        (MatchRequest("webview_close_button_4k.png",
+                      (WEBVIEW_CLOSE_X, WEBVIEW_CLOSE_Y, WEBVIEW_CLOSE_W, WEBVIEW_CLOSE_H),
+                      THRESHOLD), ViewState.WEBVIEW),
     ]
 
-    for template_name, state in templates:
-        found, score, _ = match_template(
-            frame,
-            template_name,
-            search_region=(BUTTON_X, BUTTON_Y, BUTTON_W, BUTTON_H),
-            threshold=THRESHOLD
-        )
-
+    # One batched call, evaluated in priority order and stopping at the first hit
+    results = match_templates(frame, [req for req, _ in checks], stop_on_found=True)
+    for (req, state), (found, score, _) in zip(checks, results):
         if debug:
-            print(f"{template_name}: {score:.4f}")
-
+            print(f"{req.template_name}: {score:.4f}")
         if found:
             return state, score
 
-    # Check for CHAT state using Chat header template (NOT back button!)
-    found, score, _ = match_template(
-        frame,
-        "chat_header_4k.png",
-        search_region=(CHAT_HEADER_X, CHAT_HEADER_Y, CHAT_HEADER_W, CHAT_HEADER_H),
-        threshold=CHAT_THRESHOLD
-    )
-
-    if debug:
-        print(f"chat_header_4k.png: {score:.4f}")
-
-    if found:
-        return ViewState.CHAT, score
-
-    # Check for WEBVIEW state (community page or other in-game browser)
-    found, score, _ = match_template(
-        frame,
-        "webview_close_button_4k.png",
-        search_region=(WEBVIEW_CLOSE_X, WEBVIEW_CLOSE_Y, WEBVIEW_CLOSE_W, WEBVIEW_CLOSE_H),
-        threshold=THRESHOLD
-    )
-
-    if debug:
-        print(f"webview_close_button_4k.png: {score:.4f}")
-
-    if found:
-        return ViewState.WEBVIEW, score
-
     return ViewState.UNKNOWN, 1.0
 
 
@@ -284,6 +270,8 @@ if __name__ == "__main__":
     adb.take_screenshot("view_check.png")
 
     frame = cv2.imread("view_check.png")
+    if frame is None:
+        sys.exit("Could not read view_check.png")
     state, score = detect_view(frame, debug=True)
     print(f"\nCurrent view: {state.value} (score={score:.4f}")
 
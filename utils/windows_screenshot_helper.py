@@ -5,11 +5,13 @@ Captures BlueStacks window using PrintWindow API, removes borders,
 and scales to 4K resolution for compatibility with existing template matching.
 
 Performance: ~50ms vs ~2700ms for ADB screencap
+
+This is the production CaptureBackend (utils/capture_backend.py), which
+provides get_screenshot_cv2() - corrupt-frame guard + FrameBus publish.
 """
 
 from __future__ import annotations
 
-import logging
 import threading
 import time
 from typing import Any
@@ -18,15 +20,19 @@ import win32gui
 import win32ui
 import ctypes
 from ctypes import windll
-from PIL import Image
 import numpy as np
 import numpy.typing as npt
-import cv2
 
-logger = logging.getLogger(__name__)
+from utils.capture_backend import CaptureBackend, bgrx_to_bgr, bgrx_view, mostly_black
+from utils.frame_pool import get_frame_pool
+
+try:
+    from config import CAPTURE_GOVERNOR_MAX_AGE
+except ImportError:
+    CAPTURE_GOVERNOR_MAX_AGE = 0.1
 
 
-class WindowsScreenshotHelper:
+class WindowsScreenshotHelper(CaptureBackend):
     """Fast screenshot capture for BlueStacks using Windows API."""
 
     # BlueStacks window border sizes (empirically determined)
@@ -48,19 +54,13 @@ class WindowsScreenshotHelper:
     # calls (PrintWindow/DC handling) crash, so serialize across instances.
     _capture_lock = threading.Lock()
 
-    # Corrupt-frame guard: PrintWindow intermittently returns a frame with a
-    # wide near-black band across the top while the rest renders fine, which
-    # silently breaks fixed-region template detection (rally panel, tavern
-    # tabs, harvest bubbles). Detect that signature - a large dark band in an
-    # otherwise BRIGHT frame - and re-capture. The brightness gate ensures a
-    # genuinely dark screen (loading/night) is NOT treated as corrupt.
-    CORRUPT_DARK_MAX = 8          # pixel value <= this = PURE-black "unwritten" memory (real game
-                                  # screens, even dark ones, use grays >8 so they don't count)
-    CORRUPT_ALLBLACK_FRAC = 0.90  # corrupt ONLY if >=90% of the frame is pure black (a totally
-                                  # unwritten capture). Real screens measured <=1.4% pure black,
-                                  # corrupt ~100% - so anything that isn't almost-all black is fine.
-    MAX_CORRUPT_RETRIES = 2       # extra re-captures when a corrupt frame is seen
-    CORRUPT_RETRY_DELAY = 0.12    # seconds between corrupt-frame re-captures
+    # Per-thread source-size scratch for bgrx_to_bgr (conversion runs
+    # outside the capture lock, so threads sharing a helper must not share it).
+    _local = threading.local()
+
+    # A capture request with a 4K bus frame younger than this (s) gets that
+    # frame instead of another PrintWindow (CaptureBackend governor).
+    GOVERNOR_MAX_AGE = CAPTURE_GOVERNOR_MAX_AGE
 
     def __init__(self, window_title: str = "BlueStacks App Player") -> None:
         """Initialize the screenshot helper.
@@ -87,14 +87,15 @@ class WindowsScreenshotHelper:
                                   self.TARGET_WINDOW_WIDTH, self.TARGET_WINDOW_HEIGHT,
                                   win32con.SWP_NOZORDER)
 
-    def capture_window(self, max_retries: int = 3) -> Image.Image:
+    def capture_window(self, max_retries: int = 3) -> tuple[bytes, int, int]:
         """Capture window content using PrintWindow API.
 
         Args:
             max_retries: Number of retry attempts if PrintWindow fails
 
         Returns:
-            PIL.Image: Raw captured window content (includes borders)
+            (raw, width, height): top-down 32-bit BGRX bitmap bytes of the
+            window content (includes borders)
         """
         import time
 
@@ -132,12 +133,9 @@ class WindowsScreenshotHelper:
                     win32gui.ReleaseDC(self.hwnd, hwnd_dc)
                     raise RuntimeError("PrintWindow returned 0")
 
-                # Convert to PIL Image
+                # Raw BGRX bits; bgrx_to_bgr() views them in place
                 bmpinfo = save_bitmap.GetInfo()
                 bmpstr = save_bitmap.GetBitmapBits(True)
-                img = Image.frombuffer('RGB',
-                                      (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                                      bmpstr, 'raw', 'BGRX', 0, 1)
 
                 # Cleanup
                 win32gui.DeleteObject(save_bitmap.GetHandle())
@@ -145,7 +143,7 @@ class WindowsScreenshotHelper:
                 mfc_dc.DeleteDC()
                 win32gui.ReleaseDC(self.hwnd, hwnd_dc)
 
-                return img
+                return bmpstr, bmpinfo['bmWidth'], bmpinfo['bmHeight']
 
             except Exception as e:
                 if attempt < max_retries - 1:
@@ -155,48 +153,20 @@ class WindowsScreenshotHelper:
         # This should never be reached due to the raise in the loop, but mypy needs it
         raise RuntimeError(f"PrintWindow failed after {max_retries} attempts")
 
-    def remove_borders(self, img: Image.Image) -> Image.Image:
-        """Remove BlueStacks window borders from captured image.
-
-        Args:
-            img: PIL.Image with borders
-
-        Returns:
-            PIL.Image: Cropped image without borders
-        """
-        width, height = img.size
-        return img.crop((
-            self.LEFT_BORDER,
-            self.TOP_BORDER,
-            width - self.RIGHT_BORDER,
-            height - self.BOTTOM_BORDER
-        ))
-
-    def scale_to_4k(self, img: Image.Image) -> npt.NDArray[Any]:
-        """Scale image to 4K resolution for template matching.
-
-        Uses cv2 INTER_LINEAR for speed (9ms vs 163ms for PIL LANCZOS).
-        Template matching results are functionally identical.
-
-        Args:
-            img: PIL.Image to scale
-
-        Returns:
-            np.ndarray: RGB image scaled to 3840x2160
-        """
-        # Convert PIL to numpy and use cv2 for fast scaling
-        arr = np.array(img)
-        scaled: npt.NDArray[Any] = cv2.resize(arr, (self.TARGET_WIDTH, self.TARGET_HEIGHT), interpolation=cv2.INTER_LINEAR)
-        return scaled
-
-    def _capture_once(self) -> npt.NDArray[Any]:
-        """Perform a single capture and return a 4K BGR numpy array.
+    def _capture_once(self, native: bool = False) -> npt.NDArray[Any]:
+        """Perform a single capture and return a 4K BGR numpy array (native:
+        at capture resolution, ~1792x1010).
 
         Holds the class capture lock only for the GDI section (concurrent
         PrintWindow/DC access on the shared HWND crashes); border removal,
-        scaling and color conversion run outside the lock.
+        color conversion and scaling (bgrx_to_bgr) run outside the lock.
+        The returned frame comes from the FramePool: a recycled buffer that
+        nothing (FrameBus ring, detector, action capture, flows) references
+        any more; the source-size scratch buffer is reused per thread.
         """
+        wait_start = time.perf_counter()
         with WindowsScreenshotHelper._capture_lock:
+            self._note_lock_wait(time.perf_counter() - wait_start)
             # Re-find window handle in case it became stale
             self._find_window()
 
@@ -204,86 +174,28 @@ class WindowsScreenshotHelper:
             self.ensure_window_size()
 
             # Capture raw window
-            raw_img = self.capture_window()
-
-        # Remove borders
-        cropped_img = self.remove_borders(raw_img)
-
-        # Scale to 4K (returns numpy RGB array)
-        scaled_rgb = self.scale_to_4k(cropped_img)
-
-        # Convert RGB to BGR for cv2/template matching
-        img_bgr: npt.NDArray[Any] = cv2.cvtColor(scaled_rgb, cv2.COLOR_RGB2BGR)
-
-        return img_bgr
-
-    def _frame_looks_corrupt(self, img_bgr: npt.NDArray[Any]) -> bool:
-        """True only for a totally UNWRITTEN PrintWindow capture: (nearly) the
-        WHOLE frame is pure black. Any real game screen has content, so even the
-        darkest ones stay tiny on pure-black (measured: Forest Trial 1.4%, most
-        panels 0.0%); a corrupt capture is ~100%. So the rule is simply: if it's
-        not almost-all black, it's a real frame - not corrupt.
-        """
-        gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-        small = cv2.resize(gray, (256, 144), interpolation=cv2.INTER_AREA)
-        black_frac = float((small <= self.CORRUPT_DARK_MAX).mean())
-        return black_frac >= self.CORRUPT_ALLBLACK_FRAC
-
-    def get_screenshot_cv2(self) -> npt.NDArray[Any]:
-        """Get a 4K screenshot as cv2 numpy array (compatible with template matching).
-
-        This is the main method to use for template matching pipelines.
-
-        Re-captures up to MAX_CORRUPT_RETRIES times if the frame shows the
-        PrintWindow black-band artifact; always returns a frame (never raises
-        or hangs on persistent corruption).
-
-        Returns:
-            np.ndarray: BGR image at 4K resolution (3840x2160x3)
-        """
-        last: npt.NDArray[Any] | None = None
-        for attempt in range(self.MAX_CORRUPT_RETRIES + 1):
-            last = self._capture_once()
-            if not self._frame_looks_corrupt(last):
-                self._publish_to_bus(last)
-                return last
-            logger.warning(
-                "Corrupt capture frame detected (black band), re-capturing "
-                "(attempt %d/%d)", attempt + 1, self.MAX_CORRUPT_RETRIES
-            )
-            time.sleep(self.CORRUPT_RETRY_DELAY)
-
-        logger.warning(
-            "Capture still corrupt after %d retries; returning last frame",
-            self.MAX_CORRUPT_RETRIES
-        )
-        assert last is not None  # loop runs at least once
-        # Deliberately NOT published: a corrupt frame would feed garbage into
-        # perception (vote histories, stamina OCR). Callers still get it.
-        return last
-
-    def _publish_to_bus(self, frame: npt.NDArray[Any]) -> None:
-        """Publish a VERIFIED (non-corrupt) frame to the FrameBus so the
-        perception thread sees fresh frames with zero extra GDI load (flows
-        capture constantly while running - exactly when the actor is busy)."""
-        try:
-            from utils.frame_bus import get_frame_bus
-            get_frame_bus().publish(frame)
-        except Exception:
-            pass  # perception is best-effort; never break capture
-
-    def save_screenshot(self, output_path: str) -> str:
-        """Capture and save a 4K screenshot.
-
-        Args:
-            output_path: Path to save the screenshot
-
-        Returns:
-            str: The output path where the screenshot was saved
-        """
-        img_bgr = self.get_screenshot_cv2()
-        cv2.imwrite(output_path, img_bgr)
-        return output_path
+            raw, width, height = self.capture_window()
+
+        borders = (self.LEFT_BORDER, self.TOP_BORDER, self.RIGHT_BORDER, self.BOTTOM_BORDER)
+        src_shape = (height - self.TOP_BORDER - self.BOTTOM_BORDER,
+                     width - self.LEFT_BORDER - self.RIGHT_BORDER, 3)
+        # Corrupt-frame guard on the raw buffer - a strided sample, no conversion
+        corrupt = mostly_black(bgrx_view(raw, width, height, borders),
+                               self.CORRUPT_DARK_MAX, self.CORRUPT_ALLBLACK_FRAC)
+        pool = get_frame_pool()
+        if native:
+            # Capture resolution: the border crop + BGRX->BGR is the whole job
+            frame = bgrx_to_bgr(raw, width, height, borders, (src_shape[1], src_shape[0]),
+                                scratch=pool.acquire(src_shape))
+        else:
+            scratch = getattr(self._local, "scratch", None)
+            if scratch is None or scratch.shape != src_shape:
+                scratch = self._local.scratch = np.empty(src_shape, np.uint8)
+            out = pool.acquire((self.TARGET_HEIGHT, self.TARGET_WIDTH, 3))
+            frame = bgrx_to_bgr(raw, width, height, borders,
+                                (self.TARGET_WIDTH, self.TARGET_HEIGHT), out=out, scratch=scratch)
+        self._remember_guard(frame, corrupt)
+        return frame
 
 
 if __name__ == "__main__":